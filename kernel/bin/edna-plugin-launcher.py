@@ -51,8 +51,17 @@ os.environ["EDNA_HOME"] = pyStrEdnaHomePath
 #
 sys.path.append(os.path.join(pyStrEdnaHomePath, "kernel", "src"))
 #
+# Start-up profiling has to start before importing the EDNA modules
+#
+bProfileStartup = "--profile-startup" in sys.argv
+if bProfileStartup:
+    from EDStartupProfiler import EDStartupProfiler
+    EDStartupProfiler.start()
+#
 # Now the EDApplication can be imported and started
 #
 from EDApplication import EDApplication
 edApplication = EDApplication()
 edApplication.execute()
+if bProfileStartup:
+    EDStartupProfiler.report()
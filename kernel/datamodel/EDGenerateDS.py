@@ -31,6 +31,7 @@ python EDGenerateDS.py [ options ] -
 --super="XXX"            Super module name in subclass module. Default="???"
 --validator-bodies=path  Path to a directory containing files that provide bodies (implementations) of validator methods.                         
 --use-old-getter-setter  Name getters and setters getVar() and setVar(), instead of get_var() and set_var().                         
+--slots                  Generate classes with __slots__ (no instance dictionary) for the member variables.
 --user-methods= <module>,
 -u <module               Optional module containing user methods.  See section "User Methods" in the documentation.
                          
@@ -94,6 +95,7 @@ import keyword
 #
 GenerateProperties = 0
 UseOldGetterSetter = 0
+UseSlots = 0
 DelayedElements = []
 DelayedElements_subclass = []
 AlreadyGenerated = []
@@ -1387,13 +1389,53 @@ def generateStaticParseFile(outfile, prefix, element):
     outfile.write('    parseFile = staticmethod( parseFile ) \n')
     outfile.write("\n")
 
+# Added by EDNA
+def generateStaticParseStream(outfile, prefix, element):
+    s1 = "    #Static methods for parsing a string or a file without building a DOM\n"
+    outfile.write("\n")
+    outfile.write(s1)
+    outfile.write('    def parseStringStream( _inString ):\n')
+    outfile.write('        return parseStringStream(_inString, %s.factory())\n' % element.getName())
+    outfile.write('    parseStringStream = staticmethod( parseStringStream ) \n')
+    outfile.write('    def parseFileStream( _inFilePath ):\n')
+    outfile.write('        return parseFileStream(_inFilePath, %s.factory())\n' % element.getName())
+    outfile.write('    parseFileStream = staticmethod( parseFileStream ) \n')
+    outfile.write("\n")
+
+# Added by EDNA
+def generateCopy(outfile, prefix, element):
+    s1 = "    #Method for making a copy in a new instance\n"
+    s2 = "    def copy( self ):\n"
+    outfile.write("\n")
+    outfile.write(s1)
+    outfile.write(s2)
+    outfile.write('        return copyObject(self)\n')
+    outfile.write("\n")
+
+# Added by EDNA
+def generateCompact(outfile, prefix, element):
+    s1 = "    #Methods for marshalling and parsing the compact JSON and binary formats\n"
+    outfile.write("\n")
+    outfile.write(s1)
+    outfile.write('    def marshalJSON( self ):\n')
+    outfile.write('        return marshalJSON(self, "%s")\n' % element.getName())
+    outfile.write('    def marshalBinary( self ):\n')
+    outfile.write('        return marshalBinary(self, "%s")\n' % element.getName())
+    outfile.write('    def parseJSON( _inString ):\n')
+    outfile.write('        return parseJSON(_inString, %s.factory())\n' % element.getName())
+    outfile.write('    parseJSON = staticmethod( parseJSON ) \n')
+    outfile.write('    def parseBinary( _inBytes ):\n')
+    outfile.write('        return parseBinary(_inBytes, %s.factory())\n' % element.getName())
+    outfile.write('    parseBinary = staticmethod( parseBinary ) \n')
+    outfile.write("\n")
+
 def generateMarshal(outfile, prefix, element):
     s1 = "    #Method for marshalling an object\n"
     s2 = "    def marshal( self ):\n"
     outfile.write("\n")
     outfile.write(s1)
     outfile.write(s2)
-    outfile.write('        oStreamString = StringIO.StringIO()\n')
+    outfile.write('        oStreamString = StringIO()\n')
     outfile.write('        oStreamString.write(\'<?xml version="1.0" ?>\\n\')\n')
     outfile.write('        self.export( oStreamString, 0, name_="%s" )\n' % element.getName())
     outfile.write('        oStringXML = oStreamString.getvalue()\n')
@@ -2352,6 +2394,31 @@ def generateCtor(outfile, element):
             outfile.write('        pass\n')
 # end generateCtor
 
+# Added by EDNA
+# Generate __slots__ for the members set in the constructor. Members of the
+# base class are in the __slots__ of the base class.
+def generateSlots(outfile, element):
+    if not UseSlots:
+        return
+    memberNames = []
+    attrDefs = element.getAttributeDefs()
+    for key in attrDefs:
+        attrDef = attrDefs[key]
+        memberNames.append(mapName(cleanupName(attrDef.getName())))
+    if element.isMixed():
+        memberNames.extend(['mixedclass_', 'content_'])
+    else:
+        nestedElements = 0
+        for child in element.getChildren():
+            memberNames.append(cleanupName(child.getCleanName()))
+            nestedElements = 1
+        if not nestedElements:
+            memberNames.append('valueOf_')
+        if element.getAnyAttribute():
+            memberNames.append('anyAttributes_')
+    s1 = ''.join(["'%s', " % memberName for memberName in memberNames])
+    outfile.write('    __slots__ = (%s)\n' % s1.rstrip())
+
 #
 # Attempt to retrieve the body (implementation) of a validator
 #   from a directory containing one file for each simpleType.
@@ -2553,6 +2620,7 @@ def generateClasses(outfile, prefix, element, delayed):
     wrt(s1)
     if UserMethodsModule:
         generateMemberSpec(outfile, element)
+    generateSlots(outfile, element)
     wrt('    subclass = None\n')
     generateCtor(outfile, element)
     wrt('    def factory(*args_, **kwargs_):\n')
@@ -2566,7 +2634,10 @@ def generateClasses(outfile, prefix, element, delayed):
     generateExportFnXML(outfile, prefix, element)
     generateStaticParseString(outfile, prefix, element)
     generateStaticParseFile(outfile, prefix, element)
+    generateStaticParseStream(outfile, prefix, element)
+    generateCompact(outfile, prefix, element)
     generateMarshal(outfile, prefix, element)
+    generateCopy(outfile, prefix, element)
     generateExportLiteralFn(outfile, prefix, element)
     generateBuildFn(outfile, prefix, element, delayed)
     generateUserMethods(outfile, element)
@@ -2977,9 +3048,13 @@ TEMPLATE_HEADER = """\
 
 import sys
 import getopt
-import StringIO
+from io import BytesIO
 from xml.dom import minidom
 from xml.dom import Node
+from xml.etree import ElementTree
+from copy import deepcopy
+from json import dumps as jsonDumps, loads as jsonLoads
+from struct import Struct
 
 #
 # If you have installed IPython you can uncomment and use the following.
@@ -3000,9 +3075,17 @@ from xml.dom import Node
 # Support/utility functions.
 #
 
+# Compabiltity between Python 2 and 3:
+if sys.version.startswith('3'):
+    unicode = str
+    from io import StringIO
+else:
+    from StringIO import StringIO
+
+
 def showIndent(outfile, level):
     for idx in range(level):
-        outfile.write('    ')
+        outfile.write(unicode('    '))
 
 def quote_xml(inStr):
     s1 = inStr
@@ -3091,6 +3174,449 @@ class MixedContainer:
             outfile.write(')\\n')
 
 
+#
+# Streaming parse support: the generated build methods only use a small part
+# of the DOM API, which is provided by light-weight views of ElementTree
+# elements. The children of the root element are built and discarded one by
+# one while the document is parsed, so no DOM is ever created.
+#
+
+class XSDataStreamText(object):
+    __slots__ = ("nodeValue",)
+    nodeType = Node.TEXT_NODE
+    nodeName = "#text"
+    childNodes = ()
+    firstChild = None
+    def __init__(self, nodeValue):
+        self.nodeValue = nodeValue
+
+
+class XSDataStreamAttribute(object):
+    __slots__ = ("value",)
+    def __init__(self, value):
+        self.value = value
+
+
+class XSDataStreamAttributes(object):
+    __slots__ = ("_attrib",)
+    def __init__(self, attrib):
+        self._attrib = attrib
+    def get(self, name, default=None):
+        if name in self._attrib:
+            return XSDataStreamAttribute(self._attrib[name])
+        return default
+
+
+class XSDataStreamNode(object):
+    __slots__ = ("_element", "nodeName")
+    nodeType = Node.ELEMENT_NODE
+    nodeValue = None
+    def __init__(self, element):
+        self._element = element
+        tag = element.tag
+        if tag[0] == "{":
+            tag = tag[tag.index("}") + 1:]
+        self.nodeName = tag
+    def getChildNodes(self):
+        # Whitespace between elements is skipped, the generated bindings
+        # have no mixed content
+        element = self._element
+        if len(element) == 0:
+            if element.text is None:
+                return []
+            return [XSDataStreamText(element.text)]
+        listNode = []
+        if element.text is not None and not element.text.isspace():
+            listNode.append(XSDataStreamText(element.text))
+        for child in element:
+            listNode.append(XSDataStreamNode(child))
+            if child.tail is not None and not child.tail.isspace():
+                listNode.append(XSDataStreamText(child.tail))
+        return listNode
+    childNodes = property(getChildNodes)
+    def getFirstChild(self):
+        element = self._element
+        if element.text is not None:
+            return XSDataStreamText(element.text)
+        elif len(element) > 0:
+            return XSDataStreamNode(element[0])
+        return None
+    firstChild = property(getFirstChild)
+    def getAttributes(self):
+        return XSDataStreamAttributes(self._element.attrib)
+    attributes = property(getAttributes)
+    def toxml(self):
+        return ElementTree.tostring(self._element).decode("utf-8")
+
+
+# Builds rootObj from ElementTree "start" and "end" events. Each child of the
+# root element is built as soon as it is complete and then removed from the
+# partial tree.
+def buildFromEvents(rootObj, iterEvents):
+    depth = 0
+    elementRoot = None
+    elementPrevious = None
+    for (event, element) in iterEvents:
+        if event == "start":
+            depth += 1
+            if depth == 1:
+                elementRoot = element
+                if hasattr(rootObj, "buildAttributes"):
+                    rootObj.buildAttributes(XSDataStreamAttributes(element.attrib))
+            continue
+        depth -= 1
+        if depth == 1:
+            if elementPrevious is None:
+                text = elementRoot.text
+            else:
+                text = elementPrevious.tail
+                elementRoot.remove(elementPrevious)
+            if text is not None and not text.isspace():
+                rootObj.buildChildren(XSDataStreamText(text), "#text")
+            node = XSDataStreamNode(element)
+            rootObj.buildChildren(node, node.nodeName.split(':')[-1])
+            elementPrevious = element
+        elif depth == 0:
+            if elementPrevious is None:
+                # No element children, build the root element as a whole
+                rootObj.build(XSDataStreamNode(element))
+            elif elementPrevious.tail is not None and not elementPrevious.tail.isspace():
+                rootObj.buildChildren(XSDataStreamText(elementPrevious.tail), "#text")
+    return rootObj
+
+
+def iterStringEvents(inString, chunkSize=65536):
+    if not hasattr(ElementTree, "XMLPullParser"):
+        # Python 2 has no pull parser, the string is parsed as a file
+        if isinstance(inString, unicode):
+            inString = inString.encode("utf-8")
+        for event in ElementTree.iterparse(BytesIO(inString), events=("start", "end")):
+            yield event
+        return
+    parser = ElementTree.XMLPullParser(events=("start", "end"))
+    for index in range(0, len(inString), chunkSize):
+        parser.feed(inString[index:index + chunkSize])
+        for event in parser.read_events():
+            yield event
+    parser.close()
+    for event in parser.read_events():
+        yield event
+
+
+# Contrary to parseString the objects are not exported afterwards to check
+# the minOccurs, the values are checked while the objects are built.
+def parseStringStream(inString, rootObj):
+    return buildFromEvents(rootObj, iterStringEvents(inString))
+
+
+def parseFileStream(inFilePath, rootObj):
+    return buildFromEvents(rootObj, ElementTree.iterparse(inFilePath, events=("start", "end")))
+
+
+#
+# Copy and conversion support: objects are copied structurally, and converted
+# to another class by building an instance of that class from a light-weight
+# view of the object, without writing and parsing XML.
+#
+
+# Names of the slots of a class and its base classes, classes generated
+# with __slots__ have no instance dictionary
+dictSlotNames = {}
+slotUnset = object()
+
+def getSlotNames(cls):
+    listSlotNames = dictSlotNames.get(cls)
+    if listSlotNames is None:
+        listSlotNames = []
+        for clsBase in reversed(cls.__mro__):
+            for name in clsBase.__dict__.get("__slots__", ()):
+                if name not in listSlotNames and name not in ("__dict__", "__weakref__"):
+                    listSlotNames.append(name)
+        dictSlotNames[cls] = listSlotNames
+    return listSlotNames
+
+
+def iterAttributes(obj):
+    for name in getSlotNames(obj.__class__):
+        value = getattr(obj, name, slotUnset)
+        if value is not slotUnset:
+            yield (name, value)
+    dictObj = getattr(obj, "__dict__", None)
+    if dictObj is not None:
+        for item in dictObj.items():
+            yield item
+
+
+def isDataObject(value):
+    return hasattr(value, "__dict__") or hasattr(value.__class__, "__slots__")
+
+
+tupleValueClass = (str, int, float, bool)
+
+def copyValue(value):
+    if value is None or value.__class__ in tupleValueClass:
+        return value
+    elif value.__class__ is list:
+        return [copyValue(item) for item in value]
+    elif id(value) in setInternedObjectId:
+        # Interned objects cannot be modified and can therefore be shared
+        return value
+    elif isDataObject(value):
+        return copyObject(value)
+    return deepcopy(value)
+
+
+def copyObject(obj):
+    objCopy = obj.__class__.__new__(obj.__class__)
+    for key, value in iterAttributes(obj):
+        setattr(objCopy, key, copyValue(value))
+    return objCopy
+
+
+#
+# Interning of the simple value objects (XSDataBoolean, XSDataDouble,
+# XSDataFloat, XSDataInteger and XSDataString): XSDataInteger.intern(0)
+# always returns the same instance, which cannot be modified.
+#
+
+iMaxInternedObjects = 4096
+dictInternedObject = {}
+setInternedObjectId = set()
+
+def internValue(cls, value):
+    if "intern" not in cls.__dict__:
+        # Only the simple value classes themselves, not their subclasses
+        return cls(value)
+    key = (cls, value.__class__, value)
+    obj = dictInternedObject.get(key)
+    if obj is None:
+        obj = cls(value)
+        if value == value and len(dictInternedObject) < iMaxInternedObjects:
+            dictInternedObject[key] = obj
+            setInternedObjectId.add(id(obj))
+    return obj
+
+
+def checkNotInterned(obj):
+    if id(obj) in setInternedObjectId:
+        strMessage = "ERROR! Interned %%s objects cannot be modified, use copy() for a modifiable instance" %% obj.__class__.__name__
+        raise BaseException(strMessage)
+
+
+def valueToText(value):
+    if value is True:
+        return "true"
+    elif value is False:
+        return "false"
+    elif value.__class__ is float:
+        return repr(value)
+    return unicode(value)
+
+
+class XSDataObjectNode(object):
+    __slots__ = ("_obj", "nodeName")
+    nodeType = Node.ELEMENT_NODE
+    nodeValue = None
+    def __init__(self, obj, nodeName):
+        self._obj = obj
+        self.nodeName = nodeName
+    def getChildNodes(self):
+        obj = self._obj
+        if obj.__class__ is dict:
+            iterItems = obj.items()
+        elif obj.__class__ in tupleValueClass or not isDataObject(obj):
+            return [XSDataStreamText(valueToText(obj))]
+        else:
+            iterItems = iterAttributes(obj)
+        listNode = []
+        for key, value in iterItems:
+            if value is None or callable(value):
+                continue
+            if key[0] == "_":
+                key = key[1:]
+            if value.__class__ is list:
+                for item in value:
+                    listNode.append(XSDataObjectNode(item, key))
+            else:
+                listNode.append(XSDataObjectNode(value, key))
+        return listNode
+    childNodes = property(getChildNodes)
+    def getFirstChild(self):
+        obj = self._obj
+        if obj.__class__ in tupleValueClass:
+            return XSDataStreamText(valueToText(obj))
+        listNode = self.getChildNodes()
+        if len(listNode) > 0:
+            return listNode[0]
+        return None
+    firstChild = property(getFirstChild)
+    def getAttributes(self):
+        return XSDataStreamAttributes({})
+    attributes = property(getAttributes)
+    def toxml(self):
+        return unicode("<%%s>%%r</%%s>" %% (self.nodeName, self._obj, self.nodeName))
+
+
+def convertObject(obj, targetClass):
+    rootObj = targetClass()
+    rootObj.build(XSDataObjectNode(obj, targetClass.__name__))
+    return rootObj
+
+
+#
+# Compact serialisation: an object is exported as a tree of dictionaries,
+# lists and values, i.e. the XML elements without the mark-up, which is
+# written as JSON or in a binary format. The objects are built
+# from the tree by the generated build methods, as when parsing XML.
+#
+
+def exportToTree(obj):
+    if not isDataObject(obj):
+        return obj
+    dictTree = {}
+    for key, value in iterAttributes(obj):
+        if value is None or callable(value):
+            continue
+        if key[0] == "_":
+            key = key[1:]
+        if value.__class__ is list:
+            if len(value) > 0:
+                dictTree[key] = [exportToTree(item) for item in value]
+        else:
+            dictTree[key] = exportToTree(value)
+    return dictTree
+
+
+def buildFromTree(rootObj, dictRoot):
+    # The tree has one item, the name of the root element
+    for (name, tree) in dictRoot.items():
+        rootObj.build(XSDataObjectNode(tree, name))
+    return rootObj
+
+
+def marshalJSON(obj, name):
+    return jsonDumps({name: exportToTree(obj)}, separators=(",", ":"))
+
+
+def parseJSON(inString, rootObj):
+    return buildFromTree(rootObj, jsonLoads(inString))
+
+
+#
+# Binary format (version 1): a header, BINARY_MAGIC followed by the version
+# (uint16), then the tree. Each item of the tree starts with a one byte tag,
+# the numbers are little endian:
+#   "N" None, "T" true, "F" false,
+#   "i" integer (int64), "d" double (float64),
+#   "s" string (uint32 length in bytes, UTF-8),
+#   "l" list (uint32 number of items, items),
+#   "m" dictionary (uint32 number of items, keys as strings without tag, items).
+# Other values (e.g. integers not fitting in 64 bits) are written as strings,
+# as they would be in XML.
+#
+
+BINARY_MAGIC = b"XSDB"
+BINARY_VERSION = 1
+structBinaryHeader = Struct("<4sH")
+structUInt32 = Struct("<I")
+structInt64 = Struct("<q")
+structFloat64 = Struct("<d")
+
+
+def writeBinaryString(value, listBytes):
+    bytesValue = value.encode("utf-8")
+    listBytes.append(structUInt32.pack(len(bytesValue)))
+    listBytes.append(bytesValue)
+
+
+def writeBinaryTree(value, listBytes):
+    valueClass = value.__class__
+    if value is None:
+        listBytes.append(b"N")
+    elif value is True:
+        listBytes.append(b"T")
+    elif value is False:
+        listBytes.append(b"F")
+    elif valueClass is dict:
+        listBytes.append(b"m")
+        listBytes.append(structUInt32.pack(len(value)))
+        for key, item in value.items():
+            writeBinaryString(key, listBytes)
+            writeBinaryTree(item, listBytes)
+    elif valueClass is list:
+        listBytes.append(b"l")
+        listBytes.append(structUInt32.pack(len(value)))
+        for item in value:
+            writeBinaryTree(item, listBytes)
+    elif isinstance(value, float):
+        listBytes.append(b"d")
+        listBytes.append(structFloat64.pack(value))
+    elif isinstance(value, int) and -2 ** 63 <= value < 2 ** 63:
+        listBytes.append(b"i")
+        listBytes.append(structInt64.pack(value))
+    else:
+        listBytes.append(b"s")
+        writeBinaryString(valueToText(value), listBytes)
+
+
+def readBinaryString(inBytes, offset):
+    length = structUInt32.unpack_from(inBytes, offset)[0]
+    offset += structUInt32.size
+    return inBytes[offset:offset + length].decode("utf-8"), offset + length
+
+
+def readBinaryTree(inBytes, offset):
+    tag = inBytes[offset:offset + 1]
+    offset += 1
+    if tag == b"m":
+        length = structUInt32.unpack_from(inBytes, offset)[0]
+        offset += structUInt32.size
+        dictTree = {}
+        for index in range(length):
+            key, offset = readBinaryString(inBytes, offset)
+            dictTree[key], offset = readBinaryTree(inBytes, offset)
+        return dictTree, offset
+    elif tag == b"l":
+        length = structUInt32.unpack_from(inBytes, offset)[0]
+        offset += structUInt32.size
+        listTree = []
+        for index in range(length):
+            item, offset = readBinaryTree(inBytes, offset)
+            listTree.append(item)
+        return listTree, offset
+    elif tag == b"s":
+        return readBinaryString(inBytes, offset)
+    elif tag == b"d":
+        return structFloat64.unpack_from(inBytes, offset)[0], offset + structFloat64.size
+    elif tag == b"i":
+        return structInt64.unpack_from(inBytes, offset)[0], offset + structInt64.size
+    elif tag == b"N":
+        return None, offset
+    elif tag == b"T":
+        return True, offset
+    elif tag == b"F":
+        return False, offset
+    raise ValueError("XSData binary format: unknown tag " + repr(tag))
+
+
+def marshalBinary(obj, name):
+    listBytes = [structBinaryHeader.pack(BINARY_MAGIC, BINARY_VERSION)]
+    writeBinaryTree({name: exportToTree(obj)}, listBytes)
+    return b"".join(listBytes)
+
+
+def parseBinary(inBytes, rootObj):
+    if len(inBytes) < structBinaryHeader.size:
+        raise ValueError("XSData binary format: data too short")
+    magic, version = structBinaryHeader.unpack_from(inBytes, 0)
+    if magic != BINARY_MAGIC:
+        raise ValueError("XSData binary format: wrong header " + repr(magic))
+    if version > BINARY_VERSION:
+        raise ValueError("XSData binary format: unsupported version " + str(version))
+    dictRoot, offset = readBinaryTree(inBytes, structBinaryHeader.size)
+    return buildFromTree(rootObj, dictRoot)
+
+
 class _MemberSpec(object):
     def __init__(self, name='', data_type='', container=0):
         self.name = name
@@ -3831,12 +4357,12 @@ def usage():
 def main():
     global Force, GenerateProperties, SubclassSuffix, RootElement, \
         ValidatorBodiesBasePath, UseOldGetterSetter, \
-        UserMethodsPath, XsdNameSpace
+        UserMethodsPath, XsdNameSpace, UseSlots
     args = sys.argv[1:]
     options, args = getopt.getopt(args, 'hfyo:s:p:a:b:mu:',
         ['help', 'subclass-suffix=', 'root-element=', 'super=',
         'validator-bodies=', 'use-old-getter-setter',
-        'user-methods=',
+        'user-methods=', 'slots',
         ])
     prefix = ''
     outFilename = None
@@ -3871,6 +4397,8 @@ def main():
             ValidatorBodiesBasePath = option[1]
         elif option[0] == '--use-old-getter-setter':
             UseOldGetterSetter = 1
+        elif option[0] == '--slots':
+            UseSlots = 1
         elif option[0] in ('-u', '--user-methods'):
             UserMethodsPath = option[1]
     XsdNameSpace = nameSpace
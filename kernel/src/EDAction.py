@@ -43,11 +43,13 @@ This class is taking care of the workflow preProcess - process - postProcess.
 
 
 import time, os
-from threading   import Thread
+from threading   import Thread, Event
+from concurrent.futures import wait, FIRST_COMPLETED
 from EDSlot      import EDSlot
 from EDVerbose   import EDVerbose
 from EDLogging   import EDLogging
 from EDUtilsPath import EDUtilsPath
+from EDExecutor  import EDExecutor, EDExecutorTask
 
 
 class EDAction(EDLogging, Thread):
@@ -65,17 +67,21 @@ class EDAction(EDLogging, Thread):
     if not failure: slotSUCCESS 
     if failure: slotFAILURE 
     Always: finally Process 
+
+    The workflow is not run in a thread of its own but submitted to the
+    process-wide EDExecutor (see EDExecutor for configuration).
     """
 
     def __init__(self):
         EDLogging.__init__(self)
         Thread.__init__(self)
-        self.__edSlotPreProcess = EDSlot()
-        self.__edSlotProcess = EDSlot()
-        self.__edSlotPostProcess = EDSlot()
-        self.__edSlotSUCCESS = EDSlot()
-        self.__edSlotFAILURE = EDSlot()
-        self.__edSlotFinallyProcess = EDSlot()
+        # The slots are created when a method is connected
+        self.__edSlotPreProcess = None
+        self.__edSlotProcess = None
+        self.__edSlotPostProcess = None
+        self.__edSlotSUCCESS = None
+        self.__edSlotFAILURE = None
+        self.__edSlotFinallyProcess = None
         self.__bIsFailure = False
         self.__bIsTimeOut = False
         self.__fTimeOutInSeconds = None
@@ -88,45 +94,53 @@ class EDAction(EDLogging, Thread):
         self.__edObject = None
         self.__lExtraTime = [] # list of extra allowed time for execution (in second)
         self.__bLogTiming = False
+        # Task submitted to the EDExecutor when the action is executed
+        self.__edExecutorTask = None
+        # Set as soon as the action has been executed (or started)
+        self.__eventExecuted = Event()
 
     def executeKernel(self):
         dictTimeStamps = { "init": time.time() }
         self.setTimeInit()
+        self.__eventExecuted.set()
         try:
 
             if (not self.isFailure()):
-                self.DEBUG("EDAction.executeKernel preProcess " + self.getClassName())
+                self.DEBUG("EDAction.executeKernel preProcess %s", self.getClassName())
                 self.preProcess()
                 if self.__bLogTiming:
                     dictTimeStamps["preProcess"] = time.time()
 
             if (not self.isFailure()):
-                self.DEBUG("EDAction.executeKernel slotPreProcess " + self.getClassName())
-                self.__edSlotPreProcess.call(self)
+                self.DEBUG("EDAction.executeKernel slotPreProcess %s", self.getClassName())
+                if self.__edSlotPreProcess is not None:
+                    self.__edSlotPreProcess.call(self)
                 if self.__bLogTiming:
                     dictTimeStamps["slotPreProcess"] = time.time()
 
             if (not self.isFailure()):
-                self.DEBUG("EDAction.executeKernel process " + self.getClassName())
+                self.DEBUG("EDAction.executeKernel process %s", self.getClassName())
                 self.process()
                 if self.__bLogTiming:
                     dictTimeStamps["process"] = time.time()
 
             if (not self.isFailure()):
-                self.DEBUG("EDAction.executeKernel slotProcess " + self.getClassName())
-                self.__edSlotProcess.call(self)
+                self.DEBUG("EDAction.executeKernel slotProcess %s", self.getClassName())
+                if self.__edSlotProcess is not None:
+                    self.__edSlotProcess.call(self)
                 if self.__bLogTiming:
                     dictTimeStamps["slotProcess"] = time.time()
 
             if (not self.isFailure()):
-                self.DEBUG("EDAction.executeKernel postProcess " + self.getClassName())
+                self.DEBUG("EDAction.executeKernel postProcess %s", self.getClassName())
                 self.postProcess()
                 if self.__bLogTiming:
                     dictTimeStamps["postProcess"] = time.time()
 
             if (not self.isFailure()):
-                self.DEBUG("EDAction.executeKernel slotPostProcess " + self.getClassName())
-                self.__edSlotPostProcess.call(self)
+                self.DEBUG("EDAction.executeKernel slotPostProcess %s", self.getClassName())
+                if self.__edSlotPostProcess is not None:
+                    self.__edSlotPostProcess.call(self)
                 if self.__bLogTiming:
                     dictTimeStamps["slotPostProcess"] = time.time()
 
@@ -135,7 +149,7 @@ class EDAction(EDLogging, Thread):
             self.setFailure()
 
         # Execute finally process even in case of failure
-        self.DEBUG("EDAction.executeKernel finallyProcess" + self.getClassName())
+        self.DEBUG("EDAction.executeKernel finallyProcess %s", self.getClassName())
         try:
             self.finallyProcess()
             if  self.__bLogTiming:
@@ -145,7 +159,8 @@ class EDAction(EDLogging, Thread):
             self.writeErrorTrace()
             self.setFailure()
         try:
-            self.__edSlotFinallyProcess.call(self)
+            if self.__edSlotFinallyProcess is not None:
+                self.__edSlotFinallyProcess.call(self)
         except Exception:
             self.DEBUG("EDAction.executeKernel: ERROR in slotFinallyProcess!")
             self.writeErrorTrace()
@@ -155,7 +170,8 @@ class EDAction(EDLogging, Thread):
             self.DEBUG("EDAction.executeKernel slotSUCCESS")
             # Check that something doesn't go wrong in the success method!
             try:
-                self.__edSlotSUCCESS.call(self)
+                if self.__edSlotSUCCESS is not None:
+                    self.__edSlotSUCCESS.call(self)
                 if  self.__bLogTiming:
                     dictTimeStamps["slotSUCCESS"] = time.time()
 
@@ -168,7 +184,8 @@ class EDAction(EDLogging, Thread):
             self.DEBUG("EDAction.executeKernel slotFAILURE")
             # Check that something doesn't go wrong in the success method!
             try:
-                self.__edSlotFAILURE.call(self)
+                if self.__edSlotFAILURE is not None:
+                    self.__edSlotFAILURE.call(self)
                 if  self.__bLogTiming:
                     dictTimeStamps["slotFAILURE"] = time.time()
             except Exception:
@@ -213,29 +230,25 @@ class EDAction(EDLogging, Thread):
         because the extra second is only used for time-outs. The method
         returns immediately once the thread has finished.
         """
-        self.DEBUG("EDAction.synchronize() for %s" % self.getName())
+        self.DEBUG("EDAction.synchronize() for %s", self.getName())
 #        fTimeOut = self.__fTimeOutInSeconds
         if self.__fTimeOutInSeconds is None:
             self.__fTimeOutInSeconds = self.__fDefaultTimeOutInSeconds
 
-        #Wait for the thread to be started up to timeout
-        if self.isStarted() == False:
-            tStartWait = time.time()
-            while self.isStarted() == False:
-                time.sleep(1)
-                if time.time() - tStartWait > self.__fTimeOutInSeconds:
-                    self.__bIsTimeOut = True
-                    strErrorMessage = "Timeout when waiting for %s to start!" % self.getClassName()
-                    self.DEBUG("EDAction.synchronize: " + strErrorMessage)
-                    self.ERROR(strErrorMessage)
-                    self.setFailure()
-                    return
+        #Wait for the action to be executed up to timeout
+        if not self.__eventExecuted.wait(self.__fTimeOutInSeconds):
+            self.__bIsTimeOut = True
+            strErrorMessage = "Timeout when waiting for %s to start!" % self.getClassName()
+            self.DEBUG("EDAction.synchronize: %s", strErrorMessage)
+            self.ERROR(strErrorMessage)
+            self.setFailure()
+            return
         # We add an extra second in order to allow execution plugin to finish
         # which have the same timeout
         self.join(float(self.__fTimeOutInSeconds + 1))
         for fExtraTime in self.__lExtraTime:
             self.join(float(fExtraTime))
-        if self.is_alive():
+        if self.isRunning():
             # Timeout!
             self.__bIsTimeOut = True
             self.DEBUG("EDAction.synchronize: Timeout!")
@@ -244,6 +257,105 @@ class EDAction(EDLogging, Thread):
             self.setFailure()
 
 
+    def join(self, _fTimeOut=None):
+        """
+        Waits for the action to finish. If the action is still queued in the
+        executor it is run in the calling thread, so that waiting for a child
+        action can never exhaust the executor. The time out can't interrupt an
+        action run in the calling thread, so with a time out the action is only
+        run inline by a worker of the executor (i.e. a nested wait), any other
+        thread waits at most _fTimeOut for a worker to run it.
+        """
+        edExecutorTask = self.__edExecutorTask
+        if edExecutorTask is None:
+            Thread.join(self, _fTimeOut)
+        else:
+            if _fTimeOut is None or EDExecutor.isWorkerThread():
+                edExecutorTask.runInline()
+            wait([edExecutorTask.future], timeout=_fTimeOut)
+
+
+    def getFuture(self):
+        """
+        Returns the future of the action in the EDExecutor, None if the action
+        has not yet been executed.
+        """
+        edExecutorTask = self.__edExecutorTask
+        if edExecutorTask is None:
+            return None
+        return edExecutorTask.future
+
+
+    def isExecuted(self):
+        """
+        Returns True once execute has been called (the action might still be
+        waiting in the executor queue)
+        """
+        return self.__eventExecuted.is_set()
+
+
+    @staticmethod
+    def waitAll(_listEDAction, _fTimeOut=None):
+        """
+        Waits for all actions in the list to finish. Contrary to synchronize
+        neither time out nor failure is set on the actions.
+        @param _listEDAction: list of executed actions
+        @param _fTimeOut: max time to wait (in seconds), None for no limit
+        @return: True if all actions have finished
+        @rtype: boolean
+        """
+        fTimeEnd = None
+        if _fTimeOut is not None:
+            fTimeEnd = time.time() + _fTimeOut
+        for edAction in _listEDAction:
+            fTimeOut = None
+            if fTimeEnd is not None:
+                fTimeOut = max(0.0, fTimeEnd - time.time())
+            if not edAction.__eventExecuted.wait(fTimeOut):
+                return False
+            if fTimeEnd is not None:
+                fTimeOut = max(0.0, fTimeEnd - time.time())
+            edAction.join(fTimeOut)
+            if edAction.isRunning():
+                return False
+        return True
+
+
+    @staticmethod
+    def waitAny(_listEDAction, _fTimeOut=None):
+        """
+        Waits for the first of the executed actions in the list to finish.
+        If all actions are still queued in the executor the first one is run
+        in the calling thread (with a time out only by a worker of the
+        executor, see join).
+        @param _listEDAction: list of executed actions
+        @param _fTimeOut: max time to wait (in seconds), None for no limit
+        @return: the first finished action, None in case of time out
+        @rtype: EDAction
+        """
+        dictFuture = {}
+        for edAction in _listEDAction:
+            future = edAction.getFuture()
+            if future is None:
+                if edAction.isEnded():
+                    return edAction
+            elif future.done():
+                return edAction
+            else:
+                dictFuture[future] = edAction
+        if dictFuture == {}:
+            return None
+        if not any(future.running() for future in dictFuture) and \
+                (_fTimeOut is None or EDExecutor.isWorkerThread()):
+            for edAction in dictFuture.values():
+                if edAction.__edExecutorTask.runInline():
+                    return edAction
+        setDone, setNotDone = wait(list(dictFuture.keys()), timeout=_fTimeOut, return_when=FIRST_COMPLETED)
+        if setDone:
+            return dictFuture[setDone.pop()]
+        return None
+
+
     def isTimeOut(self):
         return self.__bIsTimeOut
 
@@ -282,6 +394,8 @@ class EDAction(EDLogging, Thread):
     def connectPreProcess(self, _oMethod):
         self.synchronizeOn()
         if (_oMethod != None):
+            if self.__edSlotPreProcess is None:
+                self.__edSlotPreProcess = EDSlot()
             self.__edSlotPreProcess.connect(_oMethod)
         self.synchronizeOff()
 
@@ -289,6 +403,8 @@ class EDAction(EDLogging, Thread):
     def connectProcess(self, _oMethod):
         self.synchronizeOn()
         if (_oMethod != None):
+            if self.__edSlotProcess is None:
+                self.__edSlotProcess = EDSlot()
             self.__edSlotProcess.connect(_oMethod)
         self.synchronizeOff()
 
@@ -296,6 +412,8 @@ class EDAction(EDLogging, Thread):
     def connectPostProcess(self, _oMethod):
         self.synchronizeOn()
         if (_oMethod != None):
+            if self.__edSlotPostProcess is None:
+                self.__edSlotPostProcess = EDSlot()
             self.__edSlotPostProcess.connect(_oMethod)
         self.synchronizeOff()
 
@@ -303,6 +421,8 @@ class EDAction(EDLogging, Thread):
     def connectSUCCESS(self, _oMethod):
         self.synchronizeOn()
         if (_oMethod != None):
+            if self.__edSlotSUCCESS is None:
+                self.__edSlotSUCCESS = EDSlot()
             self.__edSlotSUCCESS.connect(_oMethod)
         self.synchronizeOff()
 
@@ -310,24 +430,35 @@ class EDAction(EDLogging, Thread):
     def connectFAILURE(self, _oMethod):
         self.synchronizeOn()
         if (_oMethod != None):
+            if self.__edSlotFAILURE is None:
+                self.__edSlotFAILURE = EDSlot()
             self.__edSlotFAILURE.connect(_oMethod)
         self.synchronizeOff()
 
     def connectFinallyProcess(self, _oMethod):
         self.synchronizeOn()
         if (_oMethod != None):
+            if self.__edSlotFinallyProcess is None:
+                self.__edSlotFinallyProcess = EDSlot()
             self.__edSlotFinallyProcess.connect(_oMethod)
         self.synchronizeOff()
 
     def isRunning(self):
-        return self.is_alive()
+        """
+        Returns True if the action has been executed and has not yet finished
+        (including actions waiting in the executor queue)
+        """
+        edExecutorTask = self.__edExecutorTask
+        if edExecutorTask is None:
+            return self.is_alive()
+        return not edExecutorTask.future.done()
 
     def isEnded(self):
-        self.DEBUG("%s.isEnded return %s" % (self.getName(), (self.getTimeEnd() is not None)))
+        self.DEBUG("%s.isEnded return %s", self.getName(), (self.getTimeEnd() is not None))
         return (self.getTimeEnd() is not None)
 
     def isStarted(self):
-        self.DEBUG("%s.isStarted return %s, %s " % (self.getName(), (self.getTimeInit() is not None), self.getTimeInit()))
+        self.DEBUG("%s.isStarted return %s, %s ", self.getName(), (self.getTimeInit() is not None), self.getTimeInit())
         return (self.getTimeInit() is not None)
 
 
@@ -335,7 +466,7 @@ class EDAction(EDLogging, Thread):
         """
         Sets the time out
         """
-        self.DEBUG("EDAction.setTimeOut called with value %s" % _fTimeOut)
+        self.DEBUG("EDAction.setTimeOut called with value %s", _fTimeOut)
         self.__fTimeOutInSeconds = float(_fTimeOut)
 
 
@@ -364,10 +495,16 @@ class EDAction(EDLogging, Thread):
 
 
     def getSlotSUCCESS(self):
+        with self.locked():
+            if self.__edSlotSUCCESS is None:
+                self.__edSlotSUCCESS = EDSlot()
         return self.__edSlotSUCCESS
 
 
     def getSlotFAILURE(self):
+        with self.locked():
+            if self.__edSlotFAILURE is None:
+                self.__edSlotFAILURE = EDSlot()
         return self.__edSlotFAILURE
 
 
@@ -392,9 +529,10 @@ class EDAction(EDLogging, Thread):
 
 
     def execute(self, _edObject=None):
-        self.__bIsStarted = True
         self.__edObject = _edObject
-        self.start()
+        self.__edExecutorTask = EDExecutorTask(self.executeKernel)
+        self.__eventExecuted.set()
+        EDExecutor.submitTask(self.__edExecutorTask, self.getName())
 
 
     def executeSynchronous(self, _edObject=None):
@@ -38,6 +38,7 @@ from EDMessage              import EDMessage
 from EDUtilsPath            import EDUtilsPath
 from EDUtilsFile            import EDUtilsFile
 from EDFactoryPluginStatic  import EDFactoryPluginStatic
+from EDStartupProfiler      import EDStartupProfiler
 
 
 class EDApplication(object):
@@ -53,6 +54,7 @@ class EDApplication(object):
     -v or --version : Displays the application name and version
     --verbose    : Turns on verbose mode
     --no-log     : Turns off logging
+    --profile-startup : Reports the start-up time (module imports, configuration, plugin index)
     -h or --help : Prints out an usage message
     """
 
@@ -67,6 +69,7 @@ class EDApplication(object):
     VERSION_PARAM_LABEL_2 = "--version"
     VERBOSE_MODE_LABEL = "--verbose"
     NO_LOG_LABEL = "--no-log"
+    PROFILE_STARTUP_LABEL = "--profile-startup"
     HELP_LABEL_1 = "-h"
     HELP_LABEL_2 = "--help"
 
@@ -175,7 +178,8 @@ class EDApplication(object):
         Calls the Plugin to be executed
         """
         if (not self._bIsFailure):
-            self._edPlugin = EDFactoryPluginStatic.loadPlugin(self._strPluginName)
+            with EDStartupProfiler.timer("Loading of plugin"):
+                self._edPlugin = EDFactoryPluginStatic.loadPlugin(self._strPluginName)
             if(self._edPlugin is not None):
                 self._edPlugin.setBaseDirectory(self._strFullApplicationWorkingDirectory)
                 self._edPlugin.setBaseName(self._strPluginName)
@@ -183,6 +187,7 @@ class EDApplication(object):
                 self._edPlugin.connectSUCCESS(self.doSuccessActionPlugin)
                 self._edPlugin.connectFAILURE(self.doFailureActionPlugin)
                 EDVerbose.DEBUG("EDApplication.process: Executing " + self._strPluginName)
+                EDStartupProfiler.markExecution()
                 self._edPlugin.execute()
                 self._edPlugin.synchronize()
             else:
@@ -356,6 +361,8 @@ class EDApplication(object):
         EDVerbose.screen("")
         EDVerbose.screen("%35s : No log file" % (cls.NO_LOG_LABEL))
         EDVerbose.screen("")
+        EDVerbose.screen("%35s : Start-up time report" % (cls.PROFILE_STARTUP_LABEL))
+        EDVerbose.screen("")
         EDVerbose.screen("%35s : This help message" % (cls.HELP_LABEL_1 + " or " + cls.HELP_LABEL_2))
         EDVerbose.screen("")
 
@@ -39,7 +39,8 @@ from EDLogging import EDLogging
 from EDUtilsFile import EDUtilsFile
 from EDUtilsPath import EDUtilsPath
 from EDFactoryPluginStatic import EDFactoryPluginStatic
-from XSDataCommon import XSConfiguration, XSPluginItem, XSParamList, XSParamItem
+from XSDataCommon import XSConfiguration
+from EDStartupProfiler import EDStartupProfiler
 
 def bestType(a):
     """
@@ -96,30 +97,31 @@ class EDConfiguration(EDLogging):
             self.WARNING("Trying to add configuration file but file %s doesn't exist!" % _strFileName)
         else:
             if not strFileName in self._dictConfigurationFiles:
-                self.DEBUG("EDConfiguration.addConfigurationFile: Parsing file %s" % strFileName)
-                strConfiguration = EDUtilsFile.readFileAndParseVariables(strFileName)
-                if strFileName.endswith(".xml"):
-                    xsConfiguration = XSConfiguration.parseString(strConfiguration)
-                    if xsConfiguration is not None :
-                        dictConfig = {"__extend__":[]}
-                        for other in xsConfiguration.XSImportConfiguration:
-                            if other.directory not in [None, "None"]:
-                                dictConfig["__extend__"].append(os.path.join(other.directory, other.name))
-                            else:
-                                dictConfig["__extend__"].append(other.name)
-
-                        xsPluginList = xsConfiguration.getXSPluginList()
-                        if xsPluginList is not None:
-                            for pluginItem in xsPluginList.getXSPluginItem():
-                                plugin_conf = {}
-                                plugin_name = pluginItem.name
-                                paramList = pluginItem.getXSParamList()
-                                if paramList:
-                                    for paramItem in paramList.getXSParamItem():
-                                        plugin_conf[paramItem.name] = bestType(paramItem.value)
-                                dictConfig[plugin_name] = plugin_conf
-                else:  # JSON mode
-                    dictConfig = json.loads(strConfiguration)
+                self.DEBUG("EDConfiguration.addConfigurationFile: Parsing file %s", strFileName)
+                with EDStartupProfiler.timer("Parsing of configuration files"):
+                    strConfiguration = EDUtilsFile.readFileAndParseVariables(strFileName)
+                    if strFileName.endswith(".xml"):
+                        xsConfiguration = XSConfiguration.parseString(strConfiguration)
+                        if xsConfiguration is not None :
+                            dictConfig = {"__extend__":[]}
+                            for other in xsConfiguration.XSImportConfiguration:
+                                if other.directory not in [None, "None"]:
+                                    dictConfig["__extend__"].append(os.path.join(other.directory, other.name))
+                                else:
+                                    dictConfig["__extend__"].append(other.name)
+
+                            xsPluginList = xsConfiguration.getXSPluginList()
+                            if xsPluginList is not None:
+                                for pluginItem in xsPluginList.getXSPluginItem():
+                                    plugin_conf = {}
+                                    plugin_name = pluginItem.name
+                                    paramList = pluginItem.getXSParamList()
+                                    if paramList:
+                                        for paramItem in paramList.getXSParamItem():
+                                            plugin_conf[paramItem.name] = bestType(paramItem.value)
+                                    dictConfig[plugin_name] = plugin_conf
+                    else:  # JSON mode
+                        dictConfig = json.loads(strConfiguration)
                 # Make sure we are thread safe when manipulating the cache
                 with self.locked():
                     self._dictConfigurationFiles[strFileName] = dictConfig
@@ -0,0 +1,118 @@
+# coding: utf8
+#
+#    Project: The EDNA Kernel
+#             http://www.edna-site.org
+#
+#    Copyright (C) European Synchrotron Radiation Facility, Grenoble, France
+#
+#    Principal author:       Olof Svensson (svensson@esrf.fr)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    and the GNU Lesser General Public License  along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import with_statement
+
+__authors__ = ["Olof Svensson"]
+__contact__ = "svensson@esrf.fr"
+__license__ = "LGPLv3+"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+
+"""
+Process-wide background writer for the dataInput and dataOutput files of the
+plugins.
+
+The plugins submit the path of the file and a function returning its content
+(e.g. the marshal method of a copy of the data object). A single background
+thread serialises the data and writes the files, so the plugins don't spend
+time on these debug files in their execution thread. The queue is bounded:
+if the writer falls behind, submit blocks until there is room in the queue.
+The pending files are written when the process exits, and flush can be
+called to wait for all submitted files to be written.
+"""
+
+import atexit
+import threading
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from EDThreading import Semaphore
+from EDVerbose import EDVerbose
+from EDUtilsFile import EDUtilsFile
+
+
+class EDDataFileWriter(object):
+    """
+    Static class writing files in a background thread.
+    """
+
+    iMaxQueueSize = 1000
+
+    _semaphore = Semaphore()
+    _queue = None
+    _thread = None
+
+
+    @classmethod
+    def submit(cls, _strPath, _oContent):
+        """
+        Queues a file to be written.
+        @param _strPath: path to the file
+        @param _oContent: function without arguments returning the content of the file (string or bytes)
+        """
+        if cls._thread is None:
+            with cls._semaphore:
+                cls.__startThread()
+        cls._queue.put((_strPath, _oContent))
+
+
+    @classmethod
+    def flush(cls):
+        """
+        Waits until all the submitted files have been written
+        """
+        if cls._queue is not None:
+            cls._queue.join()
+
+
+    @classmethod
+    def getNumberOfPendingFiles(cls):
+        if cls._queue is None:
+            return 0
+        return cls._queue.unfinished_tasks
+
+
+    @classmethod
+    def __startThread(cls):
+        if cls._thread is None:
+            cls._queue = queue.Queue(cls.iMaxQueueSize)
+            thread = threading.Thread(target=cls.__run, name="EDDataFileWriter")
+            thread.daemon = True
+            thread.start()
+            atexit.register(cls.flush)
+            cls._thread = thread
+
+
+    @classmethod
+    def __run(cls):
+        while True:
+            (strPath, oContent) = cls._queue.get()
+            try:
+                EDUtilsFile.writeFile(strPath, oContent())
+            except Exception as error:
+                EDVerbose.ERROR("EDDataFileWriter: could not write %s: %s" % (strPath, error))
+            finally:
+                cls._queue.task_done()
@@ -0,0 +1,314 @@
+# coding: utf8
+#
+#    Project: The EDNA Kernel
+#             http://www.edna-site.org
+#
+#    Copyright (C) European Synchrotron Radiation Facility, Grenoble, France
+#
+#    Principal author:       Olof Svensson (svensson@esrf.fr)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    and the GNU Lesser General Public License  along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import with_statement
+
+__authors__ = ["Olof Svensson"]
+__contact__ = "svensson@esrf.fr"
+__license__ = "LGPLv3+"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+
+"""
+Process-wide executor used by EDAction for running the plugin workflow.
+
+Instead of starting one OS thread per action, EDAction.execute submits its
+workflow to a shared, bounded thread pool. A process pool is available as well
+for CPU intensive, picklable functions (e.g. image conversion).
+
+The executor can be configured, in order of precedence, by:
+ - calling EDExecutor.initialize(...) before the first action is executed
+ - the environment variables EDNA_EXECUTOR ("pool" or "thread"),
+   EDNA_EXECUTOR_MAX_WORKERS and EDNA_EXECUTOR_MAX_PROCESSES
+ - the parameters "mode", "maxWorkers" and "maxProcesses" of an "EDExecutor"
+   item in the site configuration file
+"""
+
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+
+from EDThreading import Semaphore
+from EDVerbose import EDVerbose
+from EDUtilsParallel import EDUtilsParallel
+
+
+class EDExecutorTask(object):
+    """
+    A unit of work submitted to the EDExecutor. The task can be run exactly
+    once, either by a worker of the pool or "inline" by a thread waiting for it
+    (see runInline). The outcome is available through the attribute future.
+    """
+
+    def __init__(self, _callable, *_args):
+        self.__callable = _callable
+        self.__args = _args
+        self.__lock = threading.Lock()
+        self.__bClaimed = False
+        self.future = Future()
+
+
+    def claim(self):
+        """
+        Reserves the task for the current thread.
+        @return: True if the caller is responsible for running the task
+        @rtype: boolean
+        """
+        with self.__lock:
+            if self.__bClaimed:
+                return False
+            self.__bClaimed = True
+        return self.future.set_running_or_notify_cancel()
+
+
+    def run(self):
+        """
+        Runs the task unless it has already been claimed by another thread.
+        """
+        if self.claim():
+            self.__execute()
+
+
+    def runInline(self):
+        """
+        Runs the task in the calling thread if no worker has picked it up yet.
+        This is used by threads waiting for a task that is still queued, so that
+        nested waits can never exhaust the pool.
+        @return: True if the task has been executed by the calling thread
+        @rtype: boolean
+        """
+        if self.claim():
+            self.__execute()
+            return True
+        return False
+
+
+    def __execute(self):
+        try:
+            oResult = self.__callable(*self.__args)
+        except BaseException as exception:
+            self.future.set_exception(exception)
+        else:
+            self.future.set_result(oResult)
+
+
+
+class EDExecutor(object):
+    """
+    Static class holding the shared thread pool and optional process pool.
+    """
+    MODE_POOL = "pool"
+    MODE_THREAD = "thread"
+    CONF_EXECUTOR = "EDExecutor"
+    CONF_MODE = "mode"
+    CONF_MAX_WORKERS = "maxWorkers"
+    CONF_MAX_PROCESSES = "maxProcesses"
+
+    _semaphore = Semaphore()
+    _strMode = None
+    _iMaxWorkers = None
+    _iMaxProcesses = None
+    _threadPool = None
+    _processPool = None
+    _threadLocal = threading.local()
+
+
+    @classmethod
+    def initialize(cls, _iMaxWorkers=None, _iMaxProcesses=None, _strMode=None):
+        """
+        Sets the executor parameters. Must be called before the pools are created,
+        otherwise the new values are only taken into account after a shutdown.
+        @param _iMaxWorkers: maximum number of threads of the thread pool
+        @type _iMaxWorkers: integer
+        @param _iMaxProcesses: maximum number of processes of the process pool
+        @type _iMaxProcesses: integer
+        @param _strMode: "pool" (bounded thread pool) or "thread" (one thread per action)
+        @type _strMode: string
+        """
+        with cls._semaphore:
+            if _iMaxWorkers is not None:
+                cls._iMaxWorkers = max(1, int(_iMaxWorkers))
+            if _iMaxProcesses is not None:
+                cls._iMaxProcesses = max(1, int(_iMaxProcesses))
+            if _strMode is not None:
+                cls._strMode = cls.__checkMode(_strMode)
+            if cls._threadPool is not None or cls._processPool is not None:
+                EDVerbose.WARNING("EDExecutor.initialize: pools already created, new parameters used after shutdown")
+
+
+    @classmethod
+    def __checkMode(cls, _strMode):
+        strMode = str(_strMode).lower()
+        if strMode not in [cls.MODE_POOL, cls.MODE_THREAD]:
+            EDVerbose.WARNING("EDExecutor: unknown mode '%s', using '%s'" % (_strMode, cls.MODE_POOL))
+            strMode = cls.MODE_POOL
+        return strMode
+
+
+    @classmethod
+    def __getParameter(cls, _strEnvironmentVariable, _strConfigurationName):
+        """
+        Returns the value of a parameter from the environment or from the
+        "EDExecutor" item of the configuration, None if not defined.
+        """
+        oValue = os.environ.get(_strEnvironmentVariable)
+        if oValue is None:
+            from EDConfigurationStatic import EDConfigurationStatic
+            oValue = EDConfigurationStatic[cls.CONF_EXECUTOR].get(_strConfigurationName)
+        return oValue
+
+
+    @classmethod
+    def getMode(cls):
+        if cls._strMode is None:
+            strMode = cls.__getParameter("EDNA_EXECUTOR", cls.CONF_MODE)
+            with cls._semaphore:
+                if cls._strMode is None:
+                    cls._strMode = cls.__checkMode(strMode or cls.MODE_POOL)
+        return cls._strMode
+
+
+    @classmethod
+    def getMaxWorkers(cls):
+        """
+        By default the thread pool is sized for I/O bound plugins: four times the
+        number of CPUs, but at least 16. CPU intensive exec plugins are further
+        limited by the EDUtilsParallel semaphore.
+        """
+        if cls._iMaxWorkers is None:
+            oValue = cls.__getParameter("EDNA_EXECUTOR_MAX_WORKERS", cls.CONF_MAX_WORKERS)
+            with cls._semaphore:
+                if cls._iMaxWorkers is None:
+                    if oValue is None:
+                        cls._iMaxWorkers = max(16, 4 * EDUtilsParallel.detectNumberOfCPUs())
+                    else:
+                        cls._iMaxWorkers = max(1, int(oValue))
+        return cls._iMaxWorkers
+
+
+    @classmethod
+    def getMaxProcesses(cls):
+        if cls._iMaxProcesses is None:
+            oValue = cls.__getParameter("EDNA_EXECUTOR_MAX_PROCESSES", cls.CONF_MAX_PROCESSES)
+            with cls._semaphore:
+                if cls._iMaxProcesses is None:
+                    if oValue is None:
+                        cls._iMaxProcesses = EDUtilsParallel.detectNumberOfCPUs()
+                    else:
+                        cls._iMaxProcesses = max(1, int(oValue))
+        return cls._iMaxProcesses
+
+
+    @classmethod
+    def getThreadPool(cls):
+        if cls._threadPool is None:
+            iMaxWorkers = cls.getMaxWorkers()
+            with cls._semaphore:
+                if cls._threadPool is None:
+                    EDVerbose.DEBUG("EDExecutor: creating thread pool with %d workers" % iMaxWorkers)
+                    cls._threadPool = ThreadPoolExecutor(max_workers=iMaxWorkers, thread_name_prefix="EDExecutor",
+                                                         initializer=cls.__initializeWorker)
+        return cls._threadPool
+
+
+    @classmethod
+    def __initializeWorker(cls):
+        cls._threadLocal.bIsWorker = True
+
+
+    @classmethod
+    def isWorkerThread(cls):
+        """
+        Returns True if the calling thread is a worker of the thread pool
+        """
+        return getattr(cls._threadLocal, "bIsWorker", False)
+
+
+    @classmethod
+    def getProcessPool(cls):
+        if cls._processPool is None:
+            iMaxProcesses = cls.getMaxProcesses()
+            with cls._semaphore:
+                if cls._processPool is None:
+                    EDVerbose.DEBUG("EDExecutor: creating process pool with %d processes" % iMaxProcesses)
+                    cls._processPool = ProcessPoolExecutor(max_workers=iMaxProcesses)
+        return cls._processPool
+
+
+    @classmethod
+    def submitTask(cls, _edExecutorTask, _strName=None):
+        """
+        Schedules a task, either on the shared thread pool or on a dedicated
+        thread depending on the executor mode.
+        @return: the future of the task
+        """
+        if cls.getMode() == cls.MODE_THREAD:
+            thread = threading.Thread(target=_edExecutorTask.run, name=_strName)
+            thread.start()
+        else:
+            cls.getThreadPool().submit(_edExecutorTask.run)
+        return _edExecutorTask.future
+
+
+    @classmethod
+    def submit(cls, _callable, *_args):
+        """
+        Executes _callable(*_args) asynchronously in the thread pool.
+        @return: a concurrent.futures.Future
+        """
+        return cls.submitTask(EDExecutorTask(_callable, *_args))
+
+
+    @classmethod
+    def submitProcess(cls, _callable, *_args):
+        """
+        Executes _callable(*_args) asynchronously in the process pool. The callable
+        and its arguments must be picklable (i.e. module level functions).
+        @return: a concurrent.futures.Future
+        """
+        return cls.getProcessPool().submit(_callable, *_args)
+
+
+    @classmethod
+    def shutdown(cls, _bWait=True):
+        """
+        Shuts down the pools, they will be re-created on demand.
+        """
+        with cls._semaphore:
+            threadPool, cls._threadPool = cls._threadPool, None
+            processPool, cls._processPool = cls._processPool, None
+        if threadPool is not None:
+            threadPool.shutdown(wait=_bWait)
+        if processPool is not None:
+            processPool.shutdown(wait=_bWait)
+
+
+    @classmethod
+    def uninitialize(cls):
+        """
+        For testing purpose: shuts down the pools and forgets the parameters
+        """
+        cls.shutdown()
+        with cls._semaphore:
+            cls._strMode = None
+            cls._iMaxWorkers = None
+            cls._iMaxProcesses = None
@@ -35,15 +35,13 @@ __license__ = "LGPLv3+"
 __copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
 __date__ = "20120213"
 
-import os, sys, hashlib
+import os, sys, json
 from EDThreading import Semaphore
 from EDLogging   import EDLogging
 from EDVerbose   import EDVerbose
 from EDUtilsPath import EDUtilsPath
 from EDModule    import EDModule
-from XSDataCommon import XSDataDictionary
-from XSDataCommon import XSDataKeyValuePair
-from XSDataCommon import XSDataString
+from EDStartupProfiler import EDStartupProfiler
 
 class EDFactoryPlugin(EDLogging):
     """
@@ -86,18 +84,20 @@ class EDFactoryPlugin(EDLogging):
     directory is added using a relative path from the plugin location: ../../../src
     The path to the src directory is only added if the src directory exists.
     
-    In order to improve speed, a cache of the modules and their location is saved to disk
-    the first time a module/plugin is located. The default location of this cache
-    file is in $EDNA_HOME, and the default name is ".XSDataDictionaryModule.xml".
+    In order to improve speed, an index of the directories searched (modification time, modules and
+    sub-directories) is saved to disk the first time a module/plugin is located. The default location
+    of this cache file is in the user temporary directory, see EDUtilsPath.getEdnaPluginCachePath.
      
-    If a cache files is present, and if a module/plugin cannot be loaded, the cache is
-    updated by searching all plugin root directories again.
+    If a cache files is present, and if a module/plugin cannot be found, the cache is
+    updated by listing again the directories which have been modified since they were indexed.
+    Modules which are still not found are not searched for again.
     
     If a directory contains the file ".ednaignore" in this directory and sub-directories are ignored.
     """
 
     # class  variables
     IGNORE_FILE = ".ednaignore"
+    INDEX_VERSION = 1
     _dictLoadedModules = {}
     __dictConfFiles = {None:None}
     __dictProjectRootDir = {None:None}
@@ -112,6 +112,11 @@ class EDFactoryPlugin(EDLogging):
             if os.path.isdir(oneProjectDir):
                 self.__listPluginRootDirectory.append(os.path.abspath(oneProjectDir))
         self.__dictModuleLocation = None
+        # Index of the directories: path -> (mtime, list of modules, list of sub-directories, ignored)
+        self.__dictDirectory = {}
+        self.__setIgnoredDirectory = set()
+        self.__setMissingModule = set()
+        self.__setCheckedModule = set()
 
 
     def __initModuleDictionary(self):
@@ -121,63 +126,82 @@ class EDFactoryPlugin(EDLogging):
         the plugin root directories are searched and the dictionary is
         written to the cache file.
         """
-        if (os.path.exists(EDUtilsPath.getEdnaPluginCachePath())):
-            self.loadModuleDictionaryFromDisk(EDUtilsPath.getEdnaPluginCachePath())
-        else:
-            self.__searchRootDirectories()
-            self.saveModuleDictionaryToDisk(EDUtilsPath.getEdnaPluginCachePath())
+        with EDStartupProfiler.timer("Loading of plugin index"):
+            if (os.path.exists(EDUtilsPath.getEdnaPluginCachePath())):
+                self.loadModuleDictionaryFromDisk(EDUtilsPath.getEdnaPluginCachePath())
+            else:
+                self.__searchRootDirectories()
+                self.saveModuleDictionaryToDisk(EDUtilsPath.getEdnaPluginCachePath())
+
 
+    def __getRelativePath(self, _strPath):
+        """
+        Returns the path relative to $EDNA_HOME if the path is located in $EDNA_HOME
+        """
+        strEdnaHome = os.path.normpath(EDUtilsPath.EDNA_HOME)
+        if _strPath == strEdnaHome:
+            return "."
+        elif _strPath.startswith(strEdnaHome + os.sep):
+            return _strPath[len(strEdnaHome) + 1:]
+        return _strPath
 
 
     def saveModuleDictionaryToDisk(self, _strPath):
         """
-        This method saves the module dictionary to disk in form of XML.
+        This method saves the module index, i.e. the modification time, the modules and
+        the sub-directories of all the directories searched, to disk in form of JSON.
+        The paths located in $EDNA_HOME are saved relative to $EDNA_HOME.
         This method should be private but is kept public in order to be unit tested.
 
-        @param _strPath: Path to the module dictionary XML file
+        @param _strPath: Path to the module index file
         @type _strPath: python string
         """
-        xsDataDictionaryPlugin = XSDataDictionary()
-        strEdnaHome = EDUtilsPath.EDNA_HOME
-        for strModule in self.__dictModuleLocation:
-            xsDataKeyValuePair = XSDataKeyValuePair()
-            xsDataKeyValuePair.setKey(XSDataString(strModule))
-            strModuleLocation = self.__dictModuleLocation[ strModule ]
-            # Remove the path up to $EDNA_HOME
-            strModuleLocationStripped = strModuleLocation.replace(strEdnaHome, "")
-            if (strModuleLocationStripped.startswith("/") or  strModuleLocationStripped.startswith("\\")):
-                strModuleLocationStripped = strModuleLocationStripped[1:]
-            xsDataKeyValuePair.setValue(XSDataString(strModuleLocationStripped))
-            xsDataDictionaryPlugin.addKeyValuePair(xsDataKeyValuePair)
+        listDirectory = []
+        for strDirectory in self.__dictDirectory:
+            (fMtime, listModule, listSubDirectory, bIgnored) = self.__dictDirectory[strDirectory]
+            listDirectory.append([self.__getRelativePath(strDirectory), fMtime, listModule, listSubDirectory, bIgnored])
+        dictIndex = {"version": self.INDEX_VERSION,
+                     "rootDirectories": [self.__getRelativePath(strRoot) for strRoot in self.__listPluginRootDirectory],
+                     "directories": listDirectory}
+        strTmpPath = "%s.%d" % (_strPath, os.getpid())
         try:
-            xsDataDictionaryPlugin.exportToFile(_strPath)
+            with open(strTmpPath, "w") as pyFile:
+                json.dump(dictIndex, pyFile, separators=(",", ":"))
+            # Atomic replacement, another process may read the index at the same time
+            os.rename(strTmpPath, _strPath)
         except Exception:
             self.warning("The module cache could not be written to disk.")
 
 
     def loadModuleDictionaryFromDisk(self, _strPath):
         """
-        Loads the cache from disk.
+        Loads the cache from disk. If the cache cannot be read, or if it has been written
+        by another version of EDFactoryPlugin, all plugin root directories are searched again.
 
-        @param _strPath: Path to the module dictionary XML file
+        @param _strPath: Path to the module index file
         @type _strPath: python string
         """
-        #strPath = None
         strEdnaHome = EDUtilsPath.EDNA_HOME
-        self.__dictModuleLocation = {}
         try:
-            xsDataDictionaryPlugin = XSDataDictionary.parseFile(_strPath)
-            for xsDataKeyValuePair in xsDataDictionaryPlugin.getKeyValuePair():
-                strModuleName = xsDataKeyValuePair.getKey().getValue()
-                strModuleLocationRelative = xsDataKeyValuePair.getValue().getValue()
-                strModuleLocationAbsolute = os.path.abspath(os.path.join(strEdnaHome, strModuleLocationRelative))
-                if not os.path.exists(strModuleLocationAbsolute):
-                    self.warning("Path loaded from disk does not exist: %s" % strModuleLocationAbsolute)
-                else:
-                    self.__dictModuleLocation[ strModuleName ] = strModuleLocationAbsolute
+            with open(_strPath) as pyFile:
+                dictIndex = json.load(pyFile)
+            if dictIndex.get("version") != self.INDEX_VERSION:
+                raise ValueError("unsupported version of the module cache: %s" % dictIndex.get("version"))
+            dictDirectory = {}
+            for (strDirectory, fMtime, listModule, listSubDirectory, bIgnored) in dictIndex["directories"]:
+                strDirectory = os.path.normpath(os.path.join(strEdnaHome, strDirectory))
+                dictDirectory[strDirectory] = (fMtime, listModule, listSubDirectory, bIgnored)
+            listRootDirectory = [os.path.normpath(os.path.join(strEdnaHome, strRoot)) for strRoot in dictIndex["rootDirectories"]]
+            self.__dictDirectory = dictDirectory
+            if listRootDirectory == self.__getRootDirectories():
+                self.__updateModuleDictionary()
+            elif self.__searchRootDirectories():
+                # Other plugin root directories than when the cache was written
+                self.saveModuleDictionaryToDisk(_strPath)
         except Exception as oExcpetionType:
             self.warning("Error when reading module cache from disk: %s" % str(oExcpetionType))
             self.warning("Forcing reload of module locations.")
+            self.__dictDirectory = {}
             self.__searchRootDirectories()
             self.saveModuleDictionaryToDisk(_strPath)
 
@@ -186,6 +210,11 @@ class EDFactoryPlugin(EDLogging):
         """
         This method returns the location of a module, e.g. XSDataCommon.
 
+        If the module is not in the index, or if its file has disappeared, the directories
+        which have been modified since the index was written are searched again. Modules
+        which are not found are remembered and not searched for again until the plugin
+        root directories change.
+
         @param _strModuleName: Name of the module
         @type _strModuleName: python string
 
@@ -197,37 +226,55 @@ class EDFactoryPlugin(EDLogging):
             with self.locked():
                 if self.__dictModuleLocation is None:
                     self.__initModuleDictionary()
-        if (_strModuleName in self.__dictModuleLocation):
-            strModuleLocation = self.__dictModuleLocation[ _strModuleName ]
-            strDirectoryIgnored = self.checkDirectoriesForIgnoreFile(strModuleLocation)
-            if strDirectoryIgnored:
-                self.warning("Module location %s ignored because directory %s contains %s" % (strModuleLocation, strDirectoryIgnored, self.IGNORE_FILE))
-                self.__searchRootDirectories()
-                self.saveModuleDictionaryToDisk(EDUtilsPath.getEdnaPluginCachePath())
-                strModuleLocation = None
-        else:
-            with self.locked():
-                # The module was not found - force reloading of all plugins
-                self.warning("Module %s not found, forcing reloading of all modules..." % _strModuleName)
-                self.__searchRootDirectories()
-                # Save the new dictionary in any case - even if the plugin might not be found.
-                self.saveModuleDictionaryToDisk(EDUtilsPath.getEdnaPluginCachePath())
-                if (_strModuleName in self.__dictModuleLocation.keys()):
-                    strModuleLocation = self.__dictModuleLocation[ _strModuleName ]
-                    # Fix for bug #395 - update the saved cache
-                    self.DEBUG("EDFactoryPlugin.loadModule: Updating the module cache file %s" % EDUtilsPath.getEdnaPluginCachePath())
+        strModuleLocation = self.__dictModuleLocation.get(_strModuleName)
+        if strModuleLocation is not None:
+            if _strModuleName not in self.__setCheckedModule:
+                if os.path.exists(os.path.join(strModuleLocation, _strModuleName + ".py")):
+                    self.__setCheckedModule.add(_strModuleName)
                 else:
-                    self.DEBUG("EDFactoryPlugin.loadModule: module %s not found after forced reload of all modules." % _strModuleName)
+                    self.warning("Module %s not found in %s, updating the module cache..." % (_strModuleName, strModuleLocation))
+                    strModuleLocation = self.__updateModuleLocation(_strModuleName)
+        elif _strModuleName not in self.__setMissingModule:
+            self.warning("Module %s not found, updating the module cache..." % _strModuleName)
+            strModuleLocation = self.__updateModuleLocation(_strModuleName)
+        return strModuleLocation
+
+
+    def __updateModuleLocation(self, _strModuleName):
+        """
+        Searches the modified directories and returns the new location of the module
+        """
+        strModuleLocation = None
+        with self.locked(), EDStartupProfiler.timer("Update of plugin index"):
+            if self.__searchRootDirectories():
+                self.DEBUG("EDFactoryPlugin.loadModule: Updating the module cache file %s", EDUtilsPath.getEdnaPluginCachePath())
+                self.saveModuleDictionaryToDisk(EDUtilsPath.getEdnaPluginCachePath())
+            strModuleLocation = self.__dictModuleLocation.get(_strModuleName)
+            if strModuleLocation is None:
+                self.DEBUG("EDFactoryPlugin.loadModule: module %s not found after update of the module cache.", _strModuleName)
+                self.__setMissingModule.add(_strModuleName)
+            else:
+                self.__setCheckedModule.add(_strModuleName)
         return strModuleLocation
 
 
     def checkDirectoriesForIgnoreFile(self, _strDirectory):
-        # Check that this directory and all directories above till $EDNA_HOME should not be ignored
+        """
+        Returns the first directory containing the ignore file, starting with
+        the given directory and moving up to $EDNA_HOME, or None.
+        The directories searched by the factory are checked using the index,
+        the file system is only accessed for the directories above the plugin
+        root directories.
+        """
         strDirectoryIgnored = None
         bContinueSearching = True
         strCurrentDirectory = _strDirectory
         while bContinueSearching:
-            if os.path.exists(os.path.join(strCurrentDirectory, self.IGNORE_FILE)):
+            if strCurrentDirectory in self.__dictDirectory:
+                bIgnored = strCurrentDirectory in self.__setIgnoredDirectory
+            else:
+                bIgnored = os.path.exists(os.path.join(strCurrentDirectory, self.IGNORE_FILE))
+            if bIgnored:
                 strDirectoryIgnored = strCurrentDirectory
                 bContinueSearching = False
             # Move up a directory
@@ -258,42 +305,32 @@ class EDFactoryPlugin(EDLogging):
         return bValue
 
 
-    def __addPluginLocation(self, _strPluginRootDirectory, _strDirectoryVisit, _listDirectory):
+    def __addPluginLocation(self, _dictModuleLocation, _strDirectoryVisit, _listModule):
         """
-        This method is called by the python walk command in the addPluginRootDirectory method.
-        
-        It checks all the file names in the _listDirectory list if they corresponds to plugins or modules
-        using the method "isPlugin". If the file name corresponds to a plugin or module, the location of the
-        plugin or module is added to the self.__dictModuleLocation.        
+        This method checks all the module names in the _listModule list and adds the
+        location of the modules to the _dictModuleLocation. A RuntimeError is raised
+        if a plugin or module with a name starting with "EDPlugin" or "XSData" is found
+        in several directories.
 
-        @param _strPluginRootDirectory: Name of the root directory
-        @type _strPluginRootDirectory: python string
+        @param _dictModuleLocation: Dictionary module name -> module location
+        @type _dictModuleLocation: python dict
 
         @param _strDirectoryVisit: Name of the directory currently visited
         @type _strDirectoryVisit: python string
 
-        @param _listDirectory: List of directory entries
-        @type _listDirectory: python list
-        """
-        if (self.__dictModuleLocation is None):
-            self.__dictModuleLocation = {}
-        strDirectoryIgnored = self.checkDirectoriesForIgnoreFile(_strDirectoryVisit)
-        if strDirectoryIgnored:
-            self.DEBUG("Directory %s ignored because directory %s contains %s" % (_strDirectoryVisit, strDirectoryIgnored, self.IGNORE_FILE))
-        else:
-            for strFileName in _listDirectory:
-                if strFileName.endswith(".py"):
-                    # Strip off the ".py" exctension
-                    strPluginName = strFileName[:-3]
-                    if (strPluginName in self.__dictModuleLocation.keys() and self.isPlugin(strFileName)):
-                        lstError = ["EDFactoryPlugin: Found multiple plugins/modules with the same name!",
-                                    "Plugin/module already loaded: %s, location: %s" % (strPluginName, self.__dictModuleLocation[ strPluginName ]),
-                                    "Duplicate plugin/module definition in : %s" % _strDirectoryVisit]
-                        strError = os.linesep.join(lstError)
-                        self.error(strError)
-                        raise RuntimeError(strError)
-                    else:
-                        self.__dictModuleLocation[ strPluginName ] = _strDirectoryVisit
+        @param _listModule: List of module names (file names without the ".py" extension)
+        @type _listModule: python list
+        """
+        for strPluginName in _listModule:
+            if (strPluginName in _dictModuleLocation and self.isPlugin(strPluginName + ".py")):
+                lstError = ["EDFactoryPlugin: Found multiple plugins/modules with the same name!",
+                            "Plugin/module already loaded: %s, location: %s" % (strPluginName, _dictModuleLocation[ strPluginName ]),
+                            "Duplicate plugin/module definition in : %s" % _strDirectoryVisit]
+                strError = os.linesep.join(lstError)
+                self.error(strError)
+                raise RuntimeError(strError)
+            else:
+                _dictModuleLocation[ strPluginName ] = _strDirectoryVisit
 
 
     def addPluginRootDirectory(self, _strPluginRootDirectory):
@@ -306,16 +343,105 @@ class EDFactoryPlugin(EDLogging):
         """
         with self.locked():
             self.__listPluginRootDirectory.append(_strPluginRootDirectory)
+            self.__setMissingModule = set()
+
+
+    def __getRootDirectories(self):
+        return [os.path.normpath(os.path.abspath(strRoot)) for strRoot in self.__listPluginRootDirectory]
+
+
+    def __updateModuleDictionary(self):
+        """
+        Builds the module dictionary and the set of ignored directories from the directory index
+        """
+        dictModuleLocation = {}
+        setIgnoredDirectory = set()
+        for strDirectory in self.__dictDirectory:
+            (fMtime, listModule, listSubDirectory, bIgnored) = self.__dictDirectory[strDirectory]
+            if bIgnored:
+                setIgnoredDirectory.add(strDirectory)
+            else:
+                self.__addPluginLocation(dictModuleLocation, strDirectory, listModule)
+        self.__setIgnoredDirectory = setIgnoredDirectory
+        self.__dictModuleLocation = dictModuleLocation
 
 
     def __searchRootDirectories(self):
         """
         This method loops through all the root directories and recursively searchs for modules/plugins.
+        Only the directories which are not in the index, or which have been modified since they were
+        indexed, are listed; for the other directories the content is taken from the index.
+        Directories containing the ignore file, and their sub-directories, are not searched.
+
+        @return: True if the index has changed
+        @type: boolean
         """
-        self.__dictModuleLocation = {}
-        for strPluginRootDirectory in self.__listPluginRootDirectory:
-            for root, dirs, files in os.walk(strPluginRootDirectory):
-                self.__addPluginLocation(strPluginRootDirectory, root, files)
+        dictDirectoryOld = self.__dictDirectory
+        dictDirectory = {}
+        iNumberOfListedDirectories = 0
+        for strPluginRootDirectory in self.__getRootDirectories():
+            strDirectoryIgnored = None
+            if strPluginRootDirectory != EDUtilsPath.EDNA_HOME:
+                strDirectoryIgnored = self.checkDirectoriesForIgnoreFile(os.path.dirname(strPluginRootDirectory))
+            if strDirectoryIgnored:
+                self.DEBUG("Directory %s ignored because directory %s contains %s", strPluginRootDirectory, strDirectoryIgnored, self.IGNORE_FILE)
+                continue
+            listDirectory = [strPluginRootDirectory]
+            while listDirectory:
+                strDirectory = listDirectory.pop()
+                if strDirectory in dictDirectory:
+                    continue
+                try:
+                    fMtime = os.stat(strDirectory).st_mtime
+                except OSError:
+                    continue
+                tupleEntry = dictDirectoryOld.get(strDirectory)
+                if tupleEntry is None or tupleEntry[0] != fMtime:
+                    tupleEntry = self.__listDirectory(strDirectory, fMtime)
+                    iNumberOfListedDirectories += 1
+                dictDirectory[strDirectory] = tupleEntry
+                (fMtime, listModule, listSubDirectory, bIgnored) = tupleEntry
+                if bIgnored:
+                    self.DEBUG("Directory %s ignored because it contains %s", strDirectory, self.IGNORE_FILE)
+                else:
+                    # Reversed in order to visit the sub-directories in the listed order
+                    listDirectory.extend(os.path.join(strDirectory, strSubDirectory) for strSubDirectory in reversed(listSubDirectory))
+        bChanged = (iNumberOfListedDirectories > 0) or (len(dictDirectory) != len(dictDirectoryOld))
+        self.DEBUG("EDFactoryPlugin: %d directories indexed, %d listed", len(dictDirectory), iNumberOfListedDirectories)
+        self.__dictDirectory = dictDirectory
+        self.__updateModuleDictionary()
+        return bChanged
+
+
+    def __listDirectory(self, _strDirectory, _fMtime):
+        """
+        Lists a directory and returns its entry in the directory index
+        """
+        listModule = []
+        listSubDirectory = []
+        bIgnored = False
+        try:
+            if hasattr(os, "scandir"):
+                listEntry = [(pyDirEntry.name, pyDirEntry.is_dir(), pyDirEntry.is_symlink()) \
+                             for pyDirEntry in os.scandir(_strDirectory)]
+            else:
+                # Python 2
+                listEntry = []
+                for strName in os.listdir(_strDirectory):
+                    strPath = os.path.join(_strDirectory, strName)
+                    listEntry.append((strName, os.path.isdir(strPath), os.path.islink(strPath)))
+            for (strName, bIsDirectory, bIsLink) in listEntry:
+                if bIsDirectory:
+                    # Like os.walk, don't follow symbolic links to directories
+                    if not bIsLink:
+                        listSubDirectory.append(strName)
+                elif strName == self.IGNORE_FILE:
+                    bIgnored = True
+                elif strName.endswith(".py"):
+                    listModule.append(strName[:-3])
+        except OSError as error:
+            self.DEBUG("EDFactoryPlugin: cannot list directory %s: %s", _strDirectory, error)
+        return (_fMtime, listModule, listSubDirectory, bIgnored)
 
 
     def loadPlugin(self, _strPluginName):
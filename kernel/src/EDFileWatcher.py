@@ -0,0 +1,382 @@
+# coding: utf8
+#
+#    Project: The EDNA Kernel
+#             http://www.edna-site.org
+#
+#    Copyright (C) European Synchrotron Radiation Facility, Grenoble, France
+#
+#    Principal author:       Olof Svensson (svensson@esrf.fr)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    and the GNU Lesser General Public License  along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import with_statement
+
+__authors__ = ["Olof Svensson"]
+__contact__ = "svensson@esrf.fr"
+__license__ = "LGPLv3+"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+
+"""
+Process-wide file arrival watcher.
+
+Plugins register expectations (path and optional minimum size) and are woken up
+as soon as the file is complete. A single background thread serves all the
+expectations: on Linux it listens to inotify events on the parent directories,
+and in all cases it scans the directories with pending expectations once per
+scan interval (inotify does not see files written by other NFS clients). Each
+scan is a single os.scandir (os.listdir on Python 2) per directory, whatever the
+number of expected files.
+
+Set the environment variable EDNA_FILE_WATCHER=poll to disable inotify.
+"""
+
+import os
+import sys
+import time
+import select
+import struct
+import threading
+
+from EDThreading import Semaphore
+from EDVerbose import EDVerbose
+
+
+class EDFileWatcherExpectation(object):
+    """
+    An expected file. The attribute size contains the last observed size
+    of the file (None if the file has not been seen).
+    """
+
+    def __init__(self, _strPath, _iMinSize=None):
+        self.path = os.path.abspath(_strPath)
+        self.directory, self.name = os.path.split(self.path)
+        self.minSize = _iMinSize
+        self.size = None
+        self.event = threading.Event()
+
+
+    def update(self, _iSize):
+        """
+        Records the observed size and returns True if the file is complete, i.e.
+        it exists and (if a min size is given) it is larger than the min size.
+        """
+        self.size = _iSize
+        if self.minSize is None:
+            return True
+        return _iSize > self.minSize
+
+
+    def isComplete(self):
+        return self.event.is_set()
+
+
+    def wait(self, _fTimeOut=None):
+        """
+        Waits for the file to be complete
+        @return: True if the file is complete, False in case of time out
+        """
+        return self.event.wait(_fTimeOut)
+
+
+
+class EDFileWatcher(object):
+    """
+    Static class watching for files to appear on disk.
+    """
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    INOTIFY_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+    INOTIFY_EVENT = "iIII"
+
+    _semaphore = Semaphore()
+    _fScanInterval = 1.0
+    _bUseInotify = os.environ.get("EDNA_FILE_WATCHER", "inotify").lower() != "poll"
+    # Pending expectations: { directory: { file name: [ expectations ] } }
+    _dictPending = {}
+    _eventPending = threading.Event()
+    _thread = None
+    _libc = None
+    _iInotifyFd = None
+    _dictWatchDescriptor = {}
+    _dictDirectoryWatch = {}
+
+
+    @classmethod
+    def setScanInterval(cls, _fScanInterval):
+        cls._fScanInterval = float(_fScanInterval)
+
+
+    @classmethod
+    def setUseInotify(cls, _bUseInotify):
+        """
+        Enables or disables inotify. Must be called before any file is expected.
+        """
+        cls._bUseInotify = bool(_bUseInotify)
+
+
+    @classmethod
+    def isUsingInotify(cls):
+        return cls._iInotifyFd is not None
+
+
+    @classmethod
+    def expect(cls, _strPath, _iMinSize=None):
+        """
+        Registers an expected file.
+        @param _strPath: path to the expected file
+        @param _iMinSize: the file is complete only if its size is larger than this value
+        @return: the expectation, on which the caller can wait
+        @rtype: EDFileWatcherExpectation
+        """
+        edExpectation = EDFileWatcherExpectation(_strPath, _iMinSize)
+        with cls._semaphore:
+            cls.__startThread()
+            dictName = cls._dictPending.setdefault(edExpectation.directory, {})
+            dictName.setdefault(edExpectation.name, []).append(edExpectation)
+            # The watch is added before checking the file so that no event is lost
+            cls.__addWatch(edExpectation.directory)
+            cls._eventPending.set()
+        try:
+            iSize = os.stat(edExpectation.path).st_size
+        except OSError:
+            pass
+        else:
+            cls.__notify(edExpectation.directory, edExpectation.name, iSize)
+        return edExpectation
+
+
+    @classmethod
+    def cancel(cls, _edExpectation):
+        """
+        Removes an expectation, e.g. after a time out.
+        """
+        with cls._semaphore:
+            dictName = cls._dictPending.get(_edExpectation.directory, {})
+            listExpectation = dictName.get(_edExpectation.name, [])
+            if _edExpectation in listExpectation:
+                listExpectation.remove(_edExpectation)
+            if listExpectation == [] and _edExpectation.name in dictName:
+                del dictName[_edExpectation.name]
+            if dictName == {} and _edExpectation.directory in cls._dictPending:
+                del cls._dictPending[_edExpectation.directory]
+                cls.__removeWatch(_edExpectation.directory)
+
+
+    @classmethod
+    def waitFile(cls, _strPath, _iMinSize=None, _fTimeOut=None):
+        """
+        Waits for a file to be complete.
+        @return: the expectation, its method isComplete returns False in case of time out
+        @rtype: EDFileWatcherExpectation
+        """
+        edExpectation = cls.expect(_strPath, _iMinSize)
+        if not edExpectation.wait(_fTimeOut):
+            cls.cancel(edExpectation)
+        return edExpectation
+
+
+    @classmethod
+    def waitFiles(cls, _listPath, _iMinSize=None, _fTimeOut=None):
+        """
+        Waits for a list of files, all expectations are registered at once.
+        @return: the list of expectations
+        """
+        listExpectation = [cls.expect(strPath, _iMinSize) for strPath in _listPath]
+        fTimeEnd = None
+        if _fTimeOut is not None:
+            fTimeEnd = time.time() + _fTimeOut
+        for edExpectation in listExpectation:
+            fTimeOut = None
+            if fTimeEnd is not None:
+                fTimeOut = max(0.0, fTimeEnd - time.time())
+            if not edExpectation.wait(fTimeOut):
+                cls.cancel(edExpectation)
+        return listExpectation
+
+
+    @classmethod
+    def __notify(cls, _strDirectory, _strName, _iSize):
+        """
+        Updates the expectations for a file with its observed size and wakes up
+        the complete ones.
+        """
+        listComplete = []
+        with cls._semaphore:
+            dictName = cls._dictPending.get(_strDirectory)
+            if dictName is None or _strName not in dictName:
+                return
+            listExpectation = dictName[_strName]
+            for edExpectation in list(listExpectation):
+                if edExpectation.update(_iSize):
+                    listExpectation.remove(edExpectation)
+                    listComplete.append(edExpectation)
+            if listExpectation == []:
+                del dictName[_strName]
+            if dictName == {}:
+                del cls._dictPending[_strDirectory]
+                cls.__removeWatch(_strDirectory)
+        for edExpectation in listComplete:
+            edExpectation.event.set()
+
+
+    @classmethod
+    def __startThread(cls):
+        if cls._thread is None:
+            if cls._bUseInotify:
+                cls.__initInotify()
+            cls._thread = threading.Thread(target=cls.__run, name="EDFileWatcher")
+            cls._thread.daemon = True
+            cls._thread.start()
+
+
+    @classmethod
+    def __initInotify(cls):
+        if not sys.platform.startswith("linux"):
+            return
+        try:
+            import ctypes
+            import ctypes.util
+            cls._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            iFd = cls._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except Exception as error:
+            EDVerbose.DEBUG("EDFileWatcher: inotify not available: %s" % error)
+            return
+        if iFd >= 0:
+            cls._iInotifyFd = iFd
+        else:
+            EDVerbose.DEBUG("EDFileWatcher: inotify_init1 failed, using directory scans only")
+
+
+    @classmethod
+    def __addWatch(cls, _strDirectory):
+        if cls._iInotifyFd is not None and _strDirectory not in cls._dictDirectoryWatch:
+            iWd = cls._libc.inotify_add_watch(cls._iInotifyFd, _strDirectory.encode(sys.getfilesystemencoding()),
+                                              cls.INOTIFY_MASK)
+            # If the directory doesn't exist yet it's handled by the scans
+            if iWd >= 0:
+                cls._dictDirectoryWatch[_strDirectory] = iWd
+                cls._dictWatchDescriptor[iWd] = _strDirectory
+
+
+    @classmethod
+    def __removeWatch(cls, _strDirectory):
+        iWd = cls._dictDirectoryWatch.pop(_strDirectory, None)
+        if iWd is not None:
+            cls._dictWatchDescriptor.pop(iWd, None)
+            cls._libc.inotify_rm_watch(cls._iInotifyFd, iWd)
+
+
+    @classmethod
+    def __readInotifyEvents(cls):
+        """
+        Reads the pending inotify events and notifies the corresponding expectations
+        @return: True if the event queue has overflown and a full scan is needed
+        """
+        bOverflow = False
+        try:
+            pyBuffer = os.read(cls._iInotifyFd, 65536)
+        except OSError:
+            return bOverflow
+        iSizeEvent = struct.calcsize(cls.INOTIFY_EVENT)
+        iOffset = 0
+        listEvent = []
+        while iOffset + iSizeEvent <= len(pyBuffer):
+            iWd, iMask, iCookie, iLength = struct.unpack_from(cls.INOTIFY_EVENT, pyBuffer, iOffset)
+            strName = pyBuffer[iOffset + iSizeEvent: iOffset + iSizeEvent + iLength].rstrip(b"\0")
+            iOffset += iSizeEvent + iLength
+            if iMask & cls.IN_Q_OVERFLOW:
+                bOverflow = True
+            elif iMask & cls.IN_IGNORED:
+                with cls._semaphore:
+                    strDirectory = cls._dictWatchDescriptor.pop(iWd, None)
+                    if strDirectory is not None:
+                        cls._dictDirectoryWatch.pop(strDirectory, None)
+            else:
+                strDirectory = cls._dictWatchDescriptor.get(iWd)
+                if strDirectory is not None:
+                    listEvent.append((strDirectory, os.fsdecode(strName)))
+        for strDirectory, strName in listEvent:
+            try:
+                iSize = os.stat(os.path.join(strDirectory, strName)).st_size
+            except OSError:
+                continue
+            cls.__notify(strDirectory, strName, iSize)
+        return bOverflow
+
+
+    @classmethod
+    def scan(cls):
+        """
+        Scans all directories with pending expectations: one os.scandir (os.listdir
+        on Python 2) per directory.
+        """
+        with cls._semaphore:
+            dictPending = dict((strDirectory, set(dictName.keys())) for (strDirectory, dictName) in cls._dictPending.items())
+        for strDirectory, setName in dictPending.items():
+            try:
+                # Forcing NFS attribute cache refresh (patch from Sebastien 2018/02/09)
+                iFd = os.open(strDirectory, os.O_DIRECTORY)
+                try:
+                    os.fstat(iFd)
+                finally:
+                    os.close(iFd)
+                listFound = []
+                if hasattr(os, "scandir"):
+                    with os.scandir(strDirectory) as iterator:
+                        for entry in iterator:
+                            if entry.name in setName:
+                                listFound.append((entry.name, entry.stat().st_size))
+                else:
+                    # Python 2
+                    for strName in os.listdir(strDirectory):
+                        if strName in setName:
+                            listFound.append((strName, os.stat(os.path.join(strDirectory, strName)).st_size))
+            except OSError:
+                # Directory doesn't exist (yet)
+                continue
+            with cls._semaphore:
+                if strDirectory in cls._dictPending:
+                    cls.__addWatch(strDirectory)
+            for strName, iSize in listFound:
+                cls.__notify(strDirectory, strName, iSize)
+
+
+    @classmethod
+    def __run(cls):
+        fTimeLastScan = 0.0
+        while True:
+            with cls._semaphore:
+                if cls._dictPending == {}:
+                    cls._eventPending.clear()
+            cls._eventPending.wait()
+            fTimeOut = max(0.0, fTimeLastScan + cls._fScanInterval - time.time())
+            bScan = False
+            try:
+                if cls._iInotifyFd is not None:
+                    listReady = select.select([cls._iInotifyFd], [], [], fTimeOut)[0]
+                    if listReady:
+                        bScan = cls.__readInotifyEvents()
+                else:
+                    time.sleep(fTimeOut)
+                if bScan or time.time() - fTimeLastScan >= cls._fScanInterval:
+                    cls.scan()
+                    fTimeLastScan = time.time()
+            except Exception as error:
+                EDVerbose.WARNING("EDFileWatcher: error when watching files: %s" % error)
+                time.sleep(cls._fScanInterval)
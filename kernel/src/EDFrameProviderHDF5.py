@@ -0,0 +1,368 @@
+# coding: utf8
+#
+#    Project: The EDNA Kernel
+#             http://www.edna-site.org
+#
+#    Copyright (C) European Synchrotron Radiation Facility, Grenoble, France
+#
+#    Principal author:       Olof Svensson (svensson@esrf.fr)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    and the GNU Lesser General Public License  along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import with_statement
+
+__authors__ = ["Olof Svensson"]
+__contact__ = "svensson@esrf.fr"
+__license__ = "LGPLv3+"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+
+"""
+Direct access to the frames of Eiger HDF5 data sets.
+
+A frame is addressed by its master file and its frame number (starting at 1).
+The image paths used in EDNA for Eiger data (e.g. prefix_0042.h5) are resolved
+to a (master file, frame number) reference with getFrameReference.
+
+The master files are kept open (least recently used first out), uncompressed
+contiguous data sets are memory-mapped and compressed (chunked) data sets are
+read one chunk at a time into a cache of recently used chunks (at most
+iMaxCachedBytes), so that consecutive frames of the same chunk are only
+decompressed once. The lock is only held for the bookkeeping of the caches:
+the chunks are read and decompressed without it, and a chunk being read by
+one thread is waited for by the others. The returned frames are read-only
+numpy arrays.
+"""
+
+import os
+import re
+import threading
+import collections
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import h5py
+except ImportError:
+    h5py = None
+
+try:
+    # Registers the bitshuffle / LZ4 HDF5 filters used by the Eiger detectors
+    import hdf5plugin
+except ImportError:
+    hdf5plugin = None
+
+from EDThreading import Semaphore
+from EDVerbose import EDVerbose
+from EDUtilsImage import EDUtilsImage
+
+
+class EDFrameProviderHDF5(object):
+    """
+    Static class providing the frames and the metadata of Eiger master files
+    """
+    _semaphore = Semaphore()
+    _dictMasterFile = collections.OrderedDict()
+    _dictChunk = collections.OrderedDict()
+    _dictChunkLoading = {}
+    _iCachedBytes = 0
+    iMaxOpenFiles = 16
+    iMaxCachedBytes = 512 * 1024 * 1024
+
+
+    @staticmethod
+    def isAvailable():
+        return numpy is not None and h5py is not None
+
+
+    @staticmethod
+    def isHDF5(_strPath):
+        return _strPath is not None and _strPath.endswith(".h5")
+
+
+    @staticmethod
+    def getFrameReference(_strImagePath, _iHdf5ImageNumber=None):
+        """
+        Returns the (master file, frame number) for an Eiger image path.
+        Master files are returned as they are (frame 1). For the other paths
+        (prefix_NNNN.h5) the master file is prefix_H_master.h5, where H is
+        _iHdf5ImageNumber or, if not given, the highest number not larger than
+        the image number of the existing master files. If no such master file
+        exists prefix_master.h5 is used.
+        """
+        if _strImagePath.endswith("_master.h5"):
+            return (_strImagePath, 1)
+        strDirectory = os.path.dirname(_strImagePath)
+        strPrefix = EDUtilsImage.getPrefix(_strImagePath)
+        iImageNumber = EDUtilsImage.getImageNumber(_strImagePath)
+        iHdf5ImageNumber = _iHdf5ImageNumber
+        if iHdf5ImageNumber is None:
+            pyRegexp = re.compile(re.escape(strPrefix) + r"_([0-9]+)_master\.h5$")
+            try:
+                listFileName = os.listdir(strDirectory or os.curdir)
+            except OSError:
+                listFileName = []
+            for strFileName in listFileName:
+                pyMatch = pyRegexp.match(strFileName)
+                if pyMatch is not None:
+                    iNumber = int(pyMatch.group(1))
+                    if iNumber <= iImageNumber and (iHdf5ImageNumber is None or iNumber > iHdf5ImageNumber):
+                        iHdf5ImageNumber = iNumber
+        if iHdf5ImageNumber is None:
+            return (os.path.join(strDirectory, strPrefix + "_master.h5"), iImageNumber)
+        strMasterFile = os.path.join(strDirectory, "{0}_{1}_master.h5".format(strPrefix, iHdf5ImageNumber))
+        return (strMasterFile, iImageNumber - iHdf5ImageNumber + 1)
+
+
+    @staticmethod
+    def _readValue(_h5File, _strPath, _default=None):
+        if _strPath not in _h5File:
+            return _default
+        value = _h5File[_strPath][()]
+        if isinstance(value, bytes):
+            value = value.decode("utf-8", "replace")
+        elif isinstance(value, numpy.ndarray) and value.size == 1:
+            value = value.ravel()[0]
+        return value
+
+
+    @classmethod
+    def _readMetadata(cls, _h5File):
+        strDetector = "/entry/instrument/detector/"
+        readValue = cls._readValue
+        dictMetadata = {
+            "description": readValue(_h5File, strDetector + "description", "Dectris Eiger"),
+            "serialNumber": readValue(_h5File, strDetector + "detector_number", ""),
+            "pixelSizeX": float(readValue(_h5File, strDetector + "x_pixel_size", 75e-6)),
+            "pixelSizeY": float(readValue(_h5File, strDetector + "y_pixel_size", 75e-6)),
+            "sensorMaterial": readValue(_h5File, strDetector + "sensor_material", "Silicon"),
+            "sensorThickness": float(readValue(_h5File, strDetector + "sensor_thickness", 450e-6)),
+            "exposureTime": float(readValue(_h5File, strDetector + "count_time", 0.0)),
+            "exposurePeriod": float(readValue(_h5File, strDetector + "frame_time", 0.0)),
+            "countCutoff": int(readValue(_h5File, strDetector + "detectorSpecific/countrate_correction_count_cutoff", 0)),
+            "numberPixelX": int(readValue(_h5File, strDetector + "detectorSpecific/x_pixels_in_detector", 0)),
+            "numberPixelY": int(readValue(_h5File, strDetector + "detectorSpecific/y_pixels_in_detector", 0)),
+            "distance": float(readValue(_h5File, strDetector + "detector_distance", 0.0)),
+            "beamX": float(readValue(_h5File, strDetector + "beam_center_x", 0.0)),
+            "beamY": float(readValue(_h5File, strDetector + "beam_center_y", 0.0)),
+            "date": readValue(_h5File, strDetector + "detectorSpecific/data_collection_date", ""),
+            "wavelength": float(readValue(_h5File, "/entry/instrument/beam/incident_wavelength", 0.0)),
+            "angleIncrement": float(readValue(_h5File, "/entry/sample/goniometer/omega_range_average", 0.0)),
+            "listAngle": []
+        }
+        if "/entry/sample/goniometer/omega" in _h5File:
+            dictMetadata["listAngle"] = [float(fAngle) for fAngle in numpy.ravel(_h5File["/entry/sample/goniometer/omega"][()])]
+        return dictMetadata
+
+
+    @staticmethod
+    def _listDataSet(_h5File):
+        """
+        Returns a list of (first frame number, last frame number, data set name)
+        of the data sets linked from a master file
+        """
+        listResult = []
+        iNextFrame = 1
+        for strName in sorted(_h5File["/entry/data"].keys()):
+            if not strName.startswith("data_"):
+                continue
+            try:
+                h5DataSet = _h5File["/entry/data"][strName]
+            except KeyError:
+                # Data file not (yet) written
+                break
+            iLow = int(h5DataSet.attrs.get("image_nr_low", iNextFrame))
+            iHigh = int(h5DataSet.attrs.get("image_nr_high", iLow + h5DataSet.shape[0] - 1))
+            listResult.append((iLow, iHigh, strName))
+            iNextFrame = iHigh + 1
+        return listResult
+
+
+    @classmethod
+    def _getMasterFile(cls, _strMasterFile):
+        """
+        Returns the cache entry of a master file, must be called with the semaphore
+        """
+        tupleKey = None
+        try:
+            pyStat = os.stat(_strMasterFile)
+            tupleKey = (pyStat.st_mtime, pyStat.st_size)
+        except OSError:
+            pass
+        dictEntry = cls._dictMasterFile.get(_strMasterFile)
+        if dictEntry is not None and dictEntry["key"] == tupleKey:
+            cls._dictMasterFile.move_to_end(_strMasterFile)
+            return dictEntry
+        if dictEntry is not None:
+            cls._closeMasterFile(_strMasterFile)
+        EDVerbose.DEBUG("EDFrameProviderHDF5: opening %s" % _strMasterFile)
+        h5File = h5py.File(_strMasterFile, "r")
+        dictEntry = {
+            "key": tupleKey,
+            "file": h5File,
+            "metadata": cls._readMetadata(h5File),
+            "dataSet": cls._listDataSet(h5File),
+            "memmap": {},
+            "readers": 0,
+            "closed": False
+        }
+        if dictEntry["metadata"]["numberPixelX"] == 0 and len(dictEntry["dataSet"]) > 0:
+            # Detector size from the frame shape
+            tupleShape = h5File["/entry/data"][dictEntry["dataSet"][0][2]].shape
+            dictEntry["metadata"]["numberPixelY"], dictEntry["metadata"]["numberPixelX"] = tupleShape[1:3]
+        cls._dictMasterFile[_strMasterFile] = dictEntry
+        while len(cls._dictMasterFile) > cls.iMaxOpenFiles:
+            cls._closeMasterFile(next(iter(cls._dictMasterFile)))
+        return dictEntry
+
+
+    @classmethod
+    def _closeMasterFile(cls, _strMasterFile):
+        dictEntry = cls._dictMasterFile.pop(_strMasterFile)
+        for tupleChunkKey in [tupleKey for tupleKey in cls._dictChunk if tupleKey[0] == _strMasterFile]:
+            cls._iCachedBytes -= cls._dictChunk.pop(tupleChunkKey).nbytes
+        dictEntry["closed"] = True
+        if dictEntry["readers"] == 0:
+            cls._closeFile(_strMasterFile, dictEntry)
+
+
+    @staticmethod
+    def _closeFile(_strMasterFile, _dictEntry):
+        # Closed when no chunk is being read from it any more
+        try:
+            _dictEntry["file"].close()
+        except Exception as error:
+            EDVerbose.DEBUG("EDFrameProviderHDF5: error when closing %s: %s" % (_strMasterFile, error))
+
+
+    @classmethod
+    def _findDataSet(cls, _strMasterFile, _dictEntry, _iFrameNumber):
+        for bRefresh in [False, True]:
+            if bRefresh:
+                # The data file might have been written after the master file was opened
+                _dictEntry["dataSet"] = cls._listDataSet(_dictEntry["file"])
+            for (iLow, iHigh, strName) in _dictEntry["dataSet"]:
+                if iLow <= _iFrameNumber <= iHigh:
+                    return (_dictEntry["file"]["/entry/data"][strName], _iFrameNumber - iLow)
+        raise IndexError("Frame %d not found in %s" % (_iFrameNumber, _strMasterFile))
+
+
+    @classmethod
+    def getMetadata(cls, _strMasterFile):
+        """
+        Returns a dictionary with the experimental metadata of a master file
+        """
+        with cls._semaphore:
+            return dict(cls._getMasterFile(_strMasterFile)["metadata"])
+
+
+    @classmethod
+    def getNumberOfFrames(cls, _strMasterFile):
+        with cls._semaphore:
+            dictEntry = cls._getMasterFile(_strMasterFile)
+            dictEntry["dataSet"] = cls._listDataSet(dictEntry["file"])
+            return sum([iHigh - iLow + 1 for (iLow, iHigh, strName) in dictEntry["dataSet"]])
+
+
+    @classmethod
+    def getFrame(cls, _strMasterFile, _iFrameNumber):
+        """
+        Returns frame _iFrameNumber (starting at 1) of a master file as a
+        read-only numpy array
+        """
+        while True:
+            with cls._semaphore:
+                dictEntry = cls._getMasterFile(_strMasterFile)
+                h5DataSet, iIndex = cls._findDataSet(_strMasterFile, dictEntry, _iFrameNumber)
+                strName = h5DataSet.name
+                if h5DataSet.chunks is None and h5DataSet.compression is None:
+                    # Contiguous data: memory-map the data file
+                    arrayMemmap = dictEntry["memmap"].get(strName)
+                    if arrayMemmap is None:
+                        iOffset = h5DataSet.id.get_offset()
+                        if iOffset is not None:
+                            arrayMemmap = numpy.memmap(h5DataSet.file.filename, dtype=h5DataSet.dtype, mode="r",
+                                                       offset=iOffset, shape=h5DataSet.shape)
+                            dictEntry["memmap"][strName] = arrayMemmap
+                    if arrayMemmap is not None:
+                        return arrayMemmap[iIndex]
+                iChunkDepth = h5DataSet.chunks[0] if h5DataSet.chunks is not None else 1
+                iChunkStart = iIndex - iIndex % iChunkDepth
+                tupleChunkKey = (_strMasterFile, strName, iChunkStart)
+                arrayChunk = cls._dictChunk.get(tupleChunkKey)
+                if arrayChunk is not None:
+                    cls._dictChunk.move_to_end(tupleChunkKey)
+                    return arrayChunk[iIndex - iChunkStart]
+                eventLoading = cls._dictChunkLoading.get(tupleChunkKey)
+                if eventLoading is None:
+                    # This thread reads the chunk, the file is kept open until it's read
+                    eventLoading = threading.Event()
+                    cls._dictChunkLoading[tupleChunkKey] = eventLoading
+                    dictEntry["readers"] += 1
+                    break
+            # The chunk is being read by another thread
+            eventLoading.wait()
+        arrayChunk = None
+        try:
+            iChunkEnd = min(iChunkStart + iChunkDepth, h5DataSet.shape[0])
+            arrayChunk = numpy.empty((iChunkEnd - iChunkStart,) + h5DataSet.shape[1:], dtype=h5DataSet.dtype)
+            h5DataSet.read_direct(arrayChunk, numpy.s_[iChunkStart:iChunkEnd])
+            arrayChunk.setflags(write=False)
+        finally:
+            with cls._semaphore:
+                del cls._dictChunkLoading[tupleChunkKey]
+                dictEntry["readers"] -= 1
+                if dictEntry["closed"]:
+                    if dictEntry["readers"] == 0:
+                        cls._closeFile(_strMasterFile, dictEntry)
+                elif arrayChunk is not None and arrayChunk.nbytes <= cls.iMaxCachedBytes:
+                    cls._dictChunk[tupleChunkKey] = arrayChunk
+                    cls._iCachedBytes += arrayChunk.nbytes
+                    while cls._iCachedBytes > cls.iMaxCachedBytes:
+                        cls._iCachedBytes -= cls._dictChunk.popitem(last=False)[1].nbytes
+            eventLoading.set()
+        return arrayChunk[iIndex - iChunkStart]
+
+
+    @classmethod
+    def getImage(cls, _strImagePath, _iHdf5ImageNumber=None):
+        """
+        Returns the frame of an Eiger image path (see getFrameReference)
+        """
+        strMasterFile, iFrameNumber = cls.getFrameReference(_strImagePath, _iHdf5ImageNumber)
+        return cls.getFrame(strMasterFile, iFrameNumber)
+
+
+    @classmethod
+    def clearCache(cls):
+        with cls._semaphore:
+            for strMasterFile in list(cls._dictMasterFile):
+                cls._closeMasterFile(strMasterFile)
+
+
+    @classmethod
+    def _resetAfterFork(cls):
+        # The open files are not shared with forked processes
+        cls._semaphore = Semaphore()
+        cls._dictMasterFile = collections.OrderedDict()
+        cls._dictChunk = collections.OrderedDict()
+        cls._dictChunkLoading = {}
+        cls._iCachedBytes = 0
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=EDFrameProviderHDF5._resetAfterFork)
@@ -64,11 +64,13 @@ class EDLogFile(object):
             if (self.__pyStrLogFileName is None):
                 self.__pyStrLogFileName = "EDNA_%s.log" % time.strftime("%Y%m%d-%H%M%S", time.localtime(time.time()))
             self.__pyFileLog = open(self.__pyStrLogFileName, "w")
-            for pyStrLogMessage in self.__pyListLogCache:
-                self.write(pyStrLogMessage)
+            for (pyStrLogMessage, fTime) in self.__pyListLogCache:
+                self.write(pyStrLogMessage, fTime)
+            self.__pyListLogCache = []
+            self.flush()
 
 
-    def write(self, _pyStrLogMessage):
+    def write(self, _pyStrLogMessage, _fTime=None):
         """
         This method writes a message to the log file. If the log file name is not set
         messages are cached up to the limit __iMaxLogCache defined in the constructor.
@@ -80,17 +82,30 @@ class EDLogFile(object):
         are issued before the name of the log file has been determined by the EDNA
         application.
         
+        The file is not flushed after each message, see flush.
+        
         @param _pyStrLogMessage: a log message
         @type _pyStrLogMessage: python string
+        @param _fTime: time of the message (default: now)
+        @type _fTime: float
         """
         if (self.__bIsLogFileOn):
+            if _fTime is None:
+                _fTime = time.time()
             if (self.__pyFileLog is None):
-                self.__pyListLogCache.append(_pyStrLogMessage)
+                self.__pyListLogCache.append((_pyStrLogMessage, _fTime))
                 if (len(self.__pyListLogCache) > self.__iMaxLogCache):
                     self.__createLogFile()
             else:
-                self.__pyFileLog.write(time.strftime("%Y%m%d-%H%M%S", time.localtime(time.time())) + _pyStrLogMessage)
-                self.__pyFileLog.flush()
+                self.__pyFileLog.write(time.strftime("%Y%m%d-%H%M%S", time.localtime(_fTime)) + _pyStrLogMessage)
+
+
+    def flush(self):
+        """
+        Flushes the log file (if open)
+        """
+        if self.__pyFileLog is not None:
+            self.__pyFileLog.flush()
 
 
     def getLogFileName(self):
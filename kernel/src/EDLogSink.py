@@ -0,0 +1,186 @@
+# coding: utf8
+#
+#    Project: The EDNA Kernel
+#             http://www.edna-site.org
+#
+#    Copyright (C) European Synchrotron Radiation Facility, Grenoble, France
+#
+#    Principal author:       Olof Svensson (svensson@esrf.fr)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    and the GNU Lesser General Public License  along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import with_statement
+
+__authors__ = ["Olof Svensson"]
+__contact__ = "svensson@esrf.fr"
+__license__ = "LGPLv3+"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+
+"""
+Process-wide sink for the log messages of EDVerbose / EDLoggingVerbose.
+
+The log methods only put a record (time, thread, source object, prefix,
+message and message arguments) in a queue. A single background thread
+formats the messages, writes them to standard output / error and to the
+log file, and flushes the streams when the queue is empty, so the threads
+issuing log messages don't wait for each other or for the file system.
+
+The queue is bounded: if the writer falls behind, the log methods block
+until there is room in the queue. Pending messages are written when the
+process exits. In a child process (e.g. a worker of the EDExecutor process
+pool) the messages are written directly.
+"""
+
+import os
+import sys
+import time
+import atexit
+import threading
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from EDThreading import Semaphore
+from EDLogFile import EDLogFile
+
+
+class EDLogSink(object):
+    """
+    Static class writing the log records in a background thread.
+    """
+
+    STREAM_NONE = 0
+    STREAM_STDOUT = 1
+    STREAM_STDERR = 2
+
+    iMaxQueueSize = 100000
+
+    _semaphore = Semaphore()
+    _semaphoreFile = Semaphore()
+    _edLogFile = EDLogFile()
+    _queue = None
+    _thread = None
+    _iPid = None
+
+
+    @classmethod
+    def write(cls, _iStream, _strPrefix, _strMessage, _tupleArgs=None, _oSource=None):
+        """
+        Queues a log record.
+        @param _iStream: STREAM_STDOUT or STREAM_STDERR for messages written on screen, STREAM_NONE for the log file only
+        @param _strPrefix: prefix of the message, e.g. "  [DEBUG]: "
+        @param _strMessage: the message, formatted with _tupleArgs (if not empty) when written
+        @param _oSource: the object logging the message (an EDObject) or None
+        """
+        tupleRecord = (time.time(), threading.current_thread().name, _oSource,
+                       _iStream, _strPrefix, _strMessage, _tupleArgs)
+        if cls._iPid != os.getpid():
+            with cls._semaphore:
+                cls.__startThread()
+        if cls._thread is None:
+            # Child process of the process which started the writer thread
+            with cls._semaphoreFile:
+                cls.__writeRecord(tupleRecord)
+                cls.__flushStreams()
+        else:
+            cls._queue.put(tupleRecord)
+
+
+    @classmethod
+    def flush(cls):
+        """
+        Waits until all the queued records have been written
+        """
+        if cls._thread is not None and cls._iPid == os.getpid():
+            cls._queue.join()
+
+
+    @classmethod
+    def getLogFileName(cls):
+        return cls._edLogFile.getLogFileName()
+
+
+    @classmethod
+    def setLogFileName(cls, _strLogFileName):
+        with cls._semaphoreFile:
+            cls._edLogFile.setLogFileName(_strLogFileName)
+
+
+    @classmethod
+    def setLogFileOff(cls):
+        with cls._semaphoreFile:
+            cls._edLogFile.setLogFileOff()
+
+
+    @classmethod
+    def __startThread(cls):
+        if cls._iPid is None:
+            cls._queue = queue.Queue(cls.iMaxQueueSize)
+            thread = threading.Thread(target=cls.__run, name="EDLogSink")
+            thread.daemon = True
+            thread.start()
+            atexit.register(cls.flush)
+            cls._thread = thread
+            cls._iPid = os.getpid()
+        elif cls._iPid != os.getpid():
+            cls._thread = None
+            cls._iPid = os.getpid()
+
+
+    @classmethod
+    def __run(cls):
+        while True:
+            tupleRecord = cls._queue.get()
+            try:
+                with cls._semaphoreFile:
+                    cls.__writeRecord(tupleRecord)
+                    if cls._queue.empty():
+                        cls.__flushStreams()
+            except Exception:
+                pass
+            finally:
+                cls._queue.task_done()
+
+
+    @classmethod
+    def __writeRecord(cls, _tupleRecord):
+        (fTime, strThreadName, oSource, iStream, strPrefix, strMessage, tupleArgs) = _tupleRecord
+        if tupleArgs:
+            try:
+                strMessage = strMessage % tupleArgs
+            except Exception:
+                strMessage = "%s %r" % (strMessage, tupleArgs)
+        strText = "%s%s%s" % (strPrefix, strMessage, os.linesep)
+        if iStream == cls.STREAM_STDOUT:
+            sys.stdout.write(strText)
+        elif iStream == cls.STREAM_STDERR:
+            sys.stderr.write(strText)
+        if oSource is None:
+            strContext = " [%s]" % strThreadName
+        else:
+            strContext = " [%s %s-%08d]" % (strThreadName, oSource.getClassName(), oSource.getId())
+        cls._edLogFile.write(strContext + strText, fTime)
+
+
+    @classmethod
+    def __flushStreams(cls):
+        for pyStream in (sys.stdout, sys.stderr):
+            try:
+                pyStream.flush()
+            except Exception:
+                pass
+        cls._edLogFile.flush()
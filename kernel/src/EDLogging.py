@@ -44,6 +44,10 @@ from EDLoggingPyLogging import EDLoggingPyLogging
 class EDLogging(EDObject):
     """
     This class loads one of the EDNA loggers: EDLoggingVerbose, EDLoggingClass
+    
+    The messages are tagged with the object issuing them. All message methods
+    accept optional arguments for formatting the message (with the % operator)
+    only if it's actually written, e.g. self.DEBUG("Processing image %s", strPath).
     """
 
 
@@ -115,26 +119,26 @@ class EDLogging(EDObject):
         return self.edLogging.isVerboseDebug()
 
 
-    def log(self, _strMessage=""):
+    def log(self, _strMessage="", *_args):
         """
         This method writes a message only to the log file.
         
         @param _strMessage: The string to be written to the log file
         @type _strMessage: python string
         """
-        self.edLogging.log(_strMessage)
+        self.edLogging.logMessage("log", self, _strMessage, _args)
 
-    def screen(self, _strMessage=""):
+    def screen(self, _strMessage="", *_args):
         """
         This method writes a message to standard output and to the log file.
         
         @param _strMessage: The string to be written to the log file
         @type _strMessage: python string
         """
-        self.edLogging.screen(_strMessage)
+        self.edLogging.logMessage("screen", self, _strMessage, _args)
 
 
-    def DEBUG(self, _strDebugMessage=""):
+    def DEBUG(self, _strDebugMessage="", *_args):
         """
         This method writes a debug message to standard output and to the log file
         if debugging is enabled. The message will be written with the prefix [DEBUG]
@@ -142,10 +146,11 @@ class EDLogging(EDObject):
         @param _strDebugMessage: The debug message to be written to standard output and log file
         @type _strDebugMessage: python string
         """
-        self.edLogging.DEBUG(_strDebugMessage)
+        if self.edLogging.isVerboseDebug():
+            self.edLogging.logMessage("DEBUG", self, _strDebugMessage, _args)
 
 
-    def unitTest(self, _strMessage=""):
+    def unitTest(self, _strMessage="", *_args):
         """
         This method is meant to be used by the testing framework. The message will be written 
         to standard output and the log file with the prefix [UnitTest]
@@ -153,58 +158,58 @@ class EDLogging(EDObject):
         @param _strMessage: The message to be written to standard output and log file
         @type _strMessage: python string
         """
-        self.edLogging.unitTest(_strMessage)
+        self.edLogging.logMessage("unitTest", self, _strMessage, _args)
 
 
-    def ERROR(self, _strMessage=""):
+    def ERROR(self, _strMessage="", *_args):
         """
         This method writes a message to standard error and the log file with the prefix [ERROR].
         
         @param _strMessage: The error message to be written to standard output and log file
         @type _strMessage: python string
         """
-        self.edLogging.ERROR(_strMessage)
+        self.edLogging.logMessage("ERROR", self, _strMessage, _args)
 
 
-    def error(self, _strMessage=""):
+    def error(self, _strMessage="", *_args):
         """
         This method writes a message to standard error and the log file with the prefix [ERROR].
         
         @param _strMessage: The error message to be written to standard output and log file
         @type _strMessage: python string
         """
-        self.edLogging.error(_strMessage)
+        self.edLogging.logMessage("ERROR", self, _strMessage, _args)
 
 
-    def WARNING(self, _strMessage=""):
+    def WARNING(self, _strMessage="", *_args):
         """
         This method writes a warning message to standard output and the log file with the prefix [Warning].
         
         @param _strMessage: The error message to be written to standard output and log file
         @type _strMessage: python string
         """
-        self.edLogging.WARNING(_strMessage)
+        self.edLogging.logMessage("WARNING", self, _strMessage, _args)
 
 
 
-    def warning(self, _strMessage=""):
+    def warning(self, _strMessage="", *_args):
         """
         This method writes a warning message to standard output and the log file with the prefix [Warning].
         
         @param _strMessage: The error message to be written to standard output and log file
         @type _strMessage: python string
         """
-        self.edLogging.warning(_strMessage)
+        self.edLogging.logMessage("WARNING", self, _strMessage, _args)
 
 
-    def ASSERT(self, _strMessage):
+    def ASSERT(self, _strMessage, *_args):
         """
         This method writes an assert message to standard output and the log file with the prefix [ASSERT].
         
         @param _strMessage: The error message to be written to standard output and log file
         @type _strMessage: python string
         """
-        self.edLogging.ASSERT(_strMessage)
+        self.edLogging.logMessage("ASSERT", self, _strMessage, _args)
 
     def writeErrorTrace(self, _strPrefix="  "):
         """
@@ -214,7 +219,7 @@ class EDLogging(EDObject):
         @param _strPrefix: A prefix which can be customized, e.g. the testing framework uses '  [UnitTest]'
         @type _strPrefix: python string
         """
-        self.edLogging.writeErrorTrace(_strPrefix)
+        self.edLogging.writeErrorTrace(_strPrefix, self)
 
 
     def getLogFileName(self):
@@ -241,3 +246,9 @@ class EDLogging(EDObject):
         """
         self.edLogging.setLogFileOff()
 
+
+    def flush(self):
+        """
+        Waits until all the messages have been written
+        """
+        self.edLogging.flush()
@@ -144,27 +144,34 @@ class EDLoggingPyLogging(EDObject):
         return self.__bIsVerboseDebug
 
 
-    def log(self, _strMessage=""):
+    def logMessage(self, _strLevel, _oSource, _strMessage, _tupleArgs=None):
+        """
+        Logs a message with the method named _strLevel, e.g. "DEBUG" (the source object is not used)
+        """
+        getattr(self, _strLevel)(_strMessage, *(_tupleArgs or ()))
+
+
+    def log(self, _strMessage="", *_args):
         """
         This method writes a message only to the log file.
         
         @param _strMessage: The string to be written to the log file
         @type _strMessage: python string
         """
-        self.screen(_strMessage)
+        self.screen(_strMessage, *_args)
 
 
-    def screen(self, _strMessage=""):
+    def screen(self, _strMessage="", *_args):
         """
         This method writes a message to standard output and to the log file.
         
         @param _strMessage: The string to be written to the log file
         @type _strMessage: python string
         """
-        self.logger.info(_strMessage)
+        self.logger.info(_strMessage, *_args)
 
 
-    def DEBUG(self, _strDebugMessage=""):
+    def DEBUG(self, _strDebugMessage="", *_args):
         """
         This method writes a debug message to standard output and to the log file
         if debugging is enabled. The message will be written with the prefix [DEBUG]
@@ -172,10 +179,10 @@ class EDLoggingPyLogging(EDObject):
         @param _strDebugMessage: The debug message to be written to standard output and log file
         @type _strDebugMessage: python string
         """
-        self.logger.debug(_strDebugMessage)
+        self.logger.debug(_strDebugMessage, *_args)
 
 
-    def unitTest(self, _strMessage=""):
+    def unitTest(self, _strMessage="", *_args):
         """
         This method is meant to be used by the testing framework. The message will be written 
         to standard output and the log file with the prefix [UnitTest]
@@ -184,60 +191,60 @@ class EDLoggingPyLogging(EDObject):
         @type _strMessage: python string
         """
 #        self.logger.log(EDLoggingPyLogging.UNIT_TEST_LEVEL, _strMessage)
-        self.logger.info(_strMessage)
+        self.logger.info(_strMessage, *_args)
 
 
-    def ERROR(self, _strMessage=""):
+    def ERROR(self, _strMessage="", *_args):
         """
         This method writes a message to standard error and the log file with the prefix [ERROR].
         
         @param _strMessage: The error message to be written to standard output and log file
         @type _strMessage: python string
         """
-        self.logger.error(_strMessage)
+        self.logger.error(_strMessage, *_args)
 
 
-    def error(self, _strMessage=""):
+    def error(self, _strMessage="", *_args):
         """
         This method writes a message to standard error and the log file with the prefix [ERROR].
         
         @param _strMessage: The error message to be written to standard output and log file
         @type _strMessage: python string
         """
-        self.ERROR(_strMessage)
+        self.ERROR(_strMessage, *_args)
 
 
-    def WARNING(self, _strMessage=""):
+    def WARNING(self, _strMessage="", *_args):
         """
         This method writes a warning message to standard output and the log file with the prefix [Warning].
         
         @param _strMessage: The error message to be written to standard output and log file
         @type _strMessage: python string
         """
-        self.logger.warning(_strMessage)
+        self.logger.warning(_strMessage, *_args)
 
 
-    def warning(self, _strMessage=""):
+    def warning(self, _strMessage="", *_args):
         """
         This method writes a warning message to standard output and the log file with the prefix [Warning].
         
         @param _strMessage: The error message to be written to standard output and log file
         @type _strMessage: python string
         """
-        self.WARNING(_strMessage)
+        self.WARNING(_strMessage, *_args)
 
 
-    def ASSERT(self, _strMessage):
+    def ASSERT(self, _strMessage, *_args):
         """
         This method writes an assert message to standard output and the log file with the prefix [ASSERT].
         
         @param _strMessage: The error message to be written to standard output and log file
         @type _strMessage: python string
         """
-        self.logger.log(EDLoggingPyLogging.ASSERT_LEVEL, _strMessage)
+        self.logger.log(EDLoggingPyLogging.ASSERT_LEVEL, _strMessage, *_args)
 
 
-    def writeErrorTrace(self, _strPrefix="  "):
+    def writeErrorTrace(self, _strPrefix="  ", _oSource=None):
         """
         This method writes an error trace to standard output and the log file. The error trace has
         the same formatting as normal Python error traces.
@@ -302,3 +309,10 @@ class EDLoggingPyLogging(EDObject):
             self.logger.removeHandler(self.debug_hdlr)
         self.__bIsLogFile = False
 
+
+
+    def flush(self):
+        """
+        The messages are written synchronously by the logging handlers
+        """
+        pass
@@ -33,22 +33,34 @@ __copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
 __date__ = "2011-07-29"
 
 import os, sys, traceback
-from EDLogFile import EDLogFile
-from EDThreading import Semaphore
+from EDLogSink import EDLogSink
 
 
 class EDLoggingVerbose(object):
     """
     This class in the same as EDVerbose however it's not static.
+    
+    The messages are written by the process-wide EDLogSink. All message
+    methods accept optional arguments: the message is then formatted with
+    them (using the % operator) only if it's actually written, e.g.
+    DEBUG("Processing image %s", strPath).
     """
 
+    DICT_LEVEL = {
+        "log": (EDLogSink.STREAM_NONE, "  "),
+        "screen": (EDLogSink.STREAM_STDOUT, "  "),
+        "DEBUG": (EDLogSink.STREAM_STDOUT, "  [DEBUG]: "),
+        "unitTest": (EDLogSink.STREAM_STDOUT, "  [UnitTest]: "),
+        "ERROR": (EDLogSink.STREAM_STDERR, "  [ERROR]: "),
+        "WARNING": (EDLogSink.STREAM_STDOUT, "  [Warning]: "),
+        "ASSERT": (EDLogSink.STREAM_STDOUT, "  [ASSERT]:   "),
+        }
+
     def __init__(self):
         object.__init__(self)
-        self.__pySemaphoreWrite = Semaphore()
         self.__bIsVerbose = True
         self.__bIsVerboseDebug = False
         self.__bIsTest = False
-        self.__edLogFile = EDLogFile()
 
 
     def setLogLevel(self, _logLevel):
@@ -109,54 +121,48 @@ class EDLoggingVerbose(object):
         return self.__bIsVerboseDebug
 
 
-    def __writeStdout(self, _strMessage=""):
-        """
-        A private thread safe method for writing a string to standard output and to log file
-        
-        @param _strMessage: The string to be written to standard output
-        @type _strMessage: python string
-        """
-        with self.__pySemaphoreWrite:
-            if (self.__bIsVerbose or self.__bIsVerboseDebug):
-                sys.stdout.write(_strMessage)
-            self.__edLogFile.write(_strMessage)
-
-
-    def __writeStderr(self, _strMessage=""):
+    def logMessage(self, _strLevel, _oSource, _strMessage, _tupleArgs=None):
         """
-        A private thread safe method for writing a string to standard error and to log file
+        Queues a message in the log sink.
         
-        @param _strMessage: The string to be written to standard error
-        @type _strMessage: python string
+        @param _strLevel: name of the message method, e.g. "DEBUG" or "screen"
+        @param _oSource: the object issuing the message or None
+        @param _strMessage: the message
+        @param _tupleArgs: optional arguments for formatting the message 
         """
-        with self.__pySemaphoreWrite:
-            if (self.__bIsVerbose or self.__bIsVerboseDebug):
-                sys.stderr.write(_strMessage)
-            self.__edLogFile.write(_strMessage)
+        if _strLevel == "DEBUG":
+            if not self.__bIsVerboseDebug:
+                return
+        elif _strLevel == "ASSERT":
+            if not self.__bIsTest:
+                _strLevel = "log"
+        (iStream, strPrefix) = self.DICT_LEVEL[_strLevel]
+        if not (self.__bIsVerbose or self.__bIsVerboseDebug) and iStream == EDLogSink.STREAM_STDOUT:
+            iStream = EDLogSink.STREAM_NONE
+        EDLogSink.write(iStream, strPrefix, _strMessage, _tupleArgs, _oSource)
 
 
-    def log(self, _strMessage=""):
+    def log(self, _strMessage="", *_args):
         """
         This method writes a message only to the log file.
         
         @param _strMessage: The string to be written to the log file
         @type _strMessage: python string
         """
-        with self.__pySemaphoreWrite:
-            self.__edLogFile.write("  %s%s" % (_strMessage, os.linesep))
+        self.logMessage("log", None, _strMessage, _args)
 
 
-    def screen(self, _strMessage=""):
+    def screen(self, _strMessage="", *_args):
         """
         This method writes a message to standard output and to the log file.
         
         @param _strMessage: The string to be written to the log file
         @type _strMessage: python string
         """
-        self.__writeStdout("  %s%s" % (_strMessage, os.linesep))
+        self.logMessage("screen", None, _strMessage, _args)
 
 
-    def DEBUG(self, _strDebugMessage=""):
+    def DEBUG(self, _strDebugMessage="", *_args):
         """
         This method writes a debug message to standard output and to the log file
         if debugging is enabled. The message will be written with the prefix [DEBUG]
@@ -165,10 +171,10 @@ class EDLoggingVerbose(object):
         @type _strDebugMessage: python string
         """
         if (self.__bIsVerboseDebug):
-            self.__writeStdout("  [DEBUG]: %s%s" % (_strDebugMessage, os.linesep))
+            self.logMessage("DEBUG", None, _strDebugMessage, _args)
 
 
-    def unitTest(self, _strMessage=""):
+    def unitTest(self, _strMessage="", *_args):
         """
         This method is meant to be used by the testing framework. The message will be written 
         to standard output and the log file with the prefix [UnitTest]
@@ -176,63 +182,60 @@ class EDLoggingVerbose(object):
         @param _strMessage: The message to be written to standard output and log file
         @type _strMessage: python string
         """
-        self.__writeStdout("  [UnitTest]: %s%s" % (_strMessage, os.linesep))
+        self.logMessage("unitTest", None, _strMessage, _args)
 
 
-    def ERROR(self, _strMessage=""):
+    def ERROR(self, _strMessage="", *_args):
         """
         This method writes a message to standard error and the log file with the prefix [ERROR].
         
         @param _strMessage: The error message to be written to standard output and log file
         @type _strMessage: python string
         """
-        self.__writeStderr("  [ERROR]: %s%s" % (_strMessage, os.linesep))
+        self.logMessage("ERROR", None, _strMessage, _args)
 
 
-    def error(self, _strMessage=""):
+    def error(self, _strMessage="", *_args):
         """
         This method writes a message to standard error and the log file with the prefix [ERROR].
         
         @param _strMessage: The error message to be written to standard output and log file
         @type _strMessage: python string
         """
-        self.ERROR(_strMessage)
+        self.logMessage("ERROR", None, _strMessage, _args)
 
 
-    def WARNING(self, _strMessage=""):
+    def WARNING(self, _strMessage="", *_args):
         """
         This method writes a warning message to standard output and the log file with the prefix [Warning].
         
         @param _strMessage: The error message to be written to standard output and log file
         @type _strMessage: python string
         """
-        self.__writeStdout("  [Warning]: %s%s" % (_strMessage, os.linesep))
+        self.logMessage("WARNING", None, _strMessage, _args)
 
 
-    def warning(self, _strMessage=""):
+    def warning(self, _strMessage="", *_args):
         """
         This method writes a warning message to standard output and the log file with the prefix [Warning].
         
         @param _strMessage: The error message to be written to standard output and log file
         @type _strMessage: python string
         """
-        self.WARNING(_strMessage)
+        self.logMessage("WARNING", None, _strMessage, _args)
 
 
-    def ASSERT(self, _strMessage):
+    def ASSERT(self, _strMessage, *_args):
         """
         This method writes an assert message to standard output and the log file with the prefix [ASSERT].
         
         @param _strMessage: The error message to be written to standard output and log file
         @type _strMessage: python string
         """
-        if self.__bIsTest:
-            self.screen("[ASSERT]:   %s" % _strMessage)
-        else:
-            self.log("[ASSERT]:   %s" % _strMessage)
+        self.logMessage("ASSERT", None, _strMessage, _args)
 
 
-    def writeErrorTrace(self, _strPrefix="  "):
+    def writeErrorTrace(self, _strPrefix="  ", _oSource=None):
         """
         This method writes an error trace to standard output and the log file. The error trace has
         the same formatting as normal Python error traces.
@@ -242,15 +245,16 @@ class EDLoggingVerbose(object):
         """
         (exc_type, exc_value, exc_traceback) = sys.exc_info()
         pyListTrace = traceback.extract_tb(exc_traceback)
-        self.__writeStderr("%s Traceback (most recent call last): %s" % (_strPrefix, os.linesep))
+        listLine = ["%s Traceback (most recent call last): " % _strPrefix]
         for pyListLine in pyListTrace:
-            self.__writeStderr("%s  File \"%s\", line %d, in %s%s" % (_strPrefix, pyListLine[0],
-                                                                                        pyListLine[1],
-                                                                                        pyListLine[2],
-                                                                                        os.linesep))
-            self.__writeStderr("%s    %s%s" % (_strPrefix, pyListLine[3], os.linesep))
+            listLine.append("%s  File \"%s\", line %d, in %s" % (_strPrefix, pyListLine[0],
+                                                                   pyListLine[1],
+                                                                   pyListLine[2]))
+            listLine.append("%s    %s" % (_strPrefix, pyListLine[3]))
         strErrorMessage = traceback.format_exception_only(exc_type, exc_value)[0][:-1]
-        self.__writeStderr(_strPrefix + strErrorMessage + os.linesep)
+        listLine.append(_strPrefix + strErrorMessage)
+        iStream = EDLogSink.STREAM_STDERR if (self.__bIsVerbose or self.__bIsVerboseDebug) else EDLogSink.STREAM_NONE
+        EDLogSink.write(iStream, "", os.linesep.join(listLine), None, _oSource)
 
 
     def getLogFileName(self):
@@ -258,7 +262,7 @@ class EDLoggingVerbose(object):
         @return: the path to the current log file.
         @type: string
         """
-        return self.__edLogFile.getLogFileName()
+        return EDLogSink.getLogFileName()
 
 
     def setLogFileName(self, _strLogFileName):
@@ -268,14 +272,21 @@ class EDLoggingVerbose(object):
         @param _strLogFileName: A file name for the log file.
         @type _strLogFileName: python string
         """
-        self.__edLogFile.setLogFileName(_strLogFileName)
+        EDLogSink.setLogFileName(_strLogFileName)
 
 
     def setLogFileOff(self):
         """
         This method truns off output to the log file.
         """
-        self.__edLogFile.setLogFileOff()
+        EDLogSink.setLogFileOff()
+
+
+    def flush(self):
+        """
+        Waits until all the messages have been written
+        """
+        EDLogSink.flush()
 
 
     def __call__(self):
@@ -40,6 +40,7 @@ __copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
 
 
 import time
+import itertools
 from EDThreading import Semaphore
 
 class EDObject(object):
@@ -48,25 +49,48 @@ class EDObject(object):
     It offers some synchronization and locking capabilities to make the code thread safe.
     """
     __semaphoreId = Semaphore()
-    __iId_class = 0
 
     def __init__(self):
         """
         Constructor of the main pure virtual class.
         This constructor implements:
-        - the creation of the semaphore
-        - definition of timer object (uninitialized as potentially not used)
+        - the attribution of the id (unique for each class)
+        - definition of the semaphore and timer object (uninitialized as potentially not used)
         """
         object.__init__(self)
-        with self.__class__.__semaphoreId:
-            self.__class__.__iId_class += 1
-            self.__iId = self.__class__.__iId_class
-        self.__semaphore = Semaphore()
+        # Each class has its own id counter, next() on it is atomic so no lock is needed
+        iterId = self.__class__.__dict__.get("_EDObject__iterId")
+        if iterId is None:
+            iterId = self.__createIdCounter()
+        self.__iId = next(iterId)
+        self.__semaphore = None
         self.__fTimeInit = None
         self.__fTimeEnd = None
         self.__classname = None
 
 
+    def __createIdCounter(self):
+        with EDObject.__semaphoreId:
+            iterId = self.__class__.__dict__.get("_EDObject__iterId")
+            if iterId is None:
+                iterId = itertools.count(1)
+                setattr(self.__class__, "_EDObject__iterId", iterId)
+        return iterId
+
+
+    def __getSemaphore(self):
+        """
+        Returns the semaphore of the object, created the first time it's needed
+        """
+        semaphore = self.__semaphore
+        if semaphore is None:
+            with EDObject.__semaphoreId:
+                if self.__semaphore is None:
+                    self.__semaphore = Semaphore()
+                semaphore = self.__semaphore
+        return semaphore
+
+
     def getId(self):
         return self.__iId
 
@@ -86,18 +110,18 @@ class EDObject(object):
         This method makes the code threadsafe till the method synchronizeOff
         is called.
         """
-        self.__semaphore.acquire()
+        self.__getSemaphore().acquire()
 
 
     def synchronizeOff(self):
         """
         This method must be used in together with the method synchronizeOn().
         """
-        self.__semaphore.release()
+        self.__getSemaphore().release()
 
 
     def locked(self):
-        return self.__semaphore
+        return self.__getSemaphore()
 
 
     def setTimeInit(self):
@@ -31,6 +31,7 @@ __license__ = "LGPLv3+"
 __copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
 
 import os
+import random
 import tempfile
 import stat
 import sys
@@ -45,7 +46,11 @@ from EDConfigurationStatic import EDConfigurationStatic
 from EDUtilsFile           import EDUtilsFile
 from EDStatus              import EDStatus
 from EDAction              import EDAction
+from EDThreading           import Semaphore
+from EDDataFileWriter      import EDDataFileWriter
 from XSDataCommon          import XSDataResult
+from XSDataCommon          import copyObject
+from XSDataCommon          import BINARY_MAGIC
 
 
 class EDPlugin(EDAction):
@@ -70,6 +75,21 @@ class EDPlugin(EDAction):
     CONF_WRITE_XML_INPUT_OUTPUT = "writeXMLInputOutput"
     CONF_WRITE_XML_OUTPUT = "writeXMLOutput"
     CONF_WRITE_XML_INPUT = "writeXMLInput"
+    CONF_DATA_FORMAT = "dataFormat"
+    CONF_PLUGIN = "EDPlugin"
+    DATA_FORMAT_XML = "xml"
+    DATA_FORMAT_JSON = "json"
+    DATA_FORMAT_BINARY = "binary"
+    DICT_DATA_FORMAT_EXTENSION = { DATA_FORMAT_XML: ".xml", DATA_FORMAT_JSON: ".json", DATA_FORMAT_BINARY: ".bin" }
+    CONF_DATA_FILE_POLICY = "dataFilePolicy"
+    CONF_DATA_FILE_SAMPLING = "dataFileSampling"
+    DATA_FILE_POLICY_ALWAYS = "always"
+    DATA_FILE_POLICY_ON_FAILURE = "onFailure"
+    DATA_FILE_POLICY_SAMPLED = "sampled"
+    DATA_FILE_POLICY_NEVER = "never"
+    LIST_DATA_FILE_POLICY = [ DATA_FILE_POLICY_ALWAYS, DATA_FILE_POLICY_ON_FAILURE, DATA_FILE_POLICY_SAMPLED, DATA_FILE_POLICY_NEVER ]
+    CONF_WORKING_DIRECTORY_REQUIRED = "workingDirectoryRequired"
+    __semaphoreWorkingDirectory = Semaphore()
 
     def __init__ (self):
         """
@@ -82,10 +102,13 @@ class EDPlugin(EDAction):
         self.__dictXSDataOutput = {}
         self.__strDefaultInputDataKey = "defaultInputData"
         self.__strDefaultOutputDataKey = "defaultOutputData"
-        self.__edSlotExportDataOutput = EDSlot()
+        self.__edSlotExportDataOutput = None
         self.__strBaseDirectory = None
         self.__strWorkingDirectory = None
+        self.__bWorkingDirectoryCreated = False
+        self.__isRequiredToHaveWorkingDirectory = True
         self.__strBaseName = None
+        self.__strCreatedBaseName = None
         self.__listExecutiveSummaryLines = []
         self.__strExecutiveSummarySeparator = "-" * 80
         self.__listErrorMessages = []
@@ -98,12 +121,15 @@ class EDPlugin(EDAction):
         self.strPathDataInput = None
         self.strPathDataOutput = None
         self.__bUseWarningInsteadOfError = False
+        self.__strDataFormat = None
+        self.__strDataFilePolicy = None
+        self.__bDataFileSampled = True
         self.__edConfiguration = EDConfigurationStatic()
 
 
     def preProcess(self, _edObject=None):
         """
-        Writes xml data input in the working dir (if required)
+        Writes xml data input in the working dir (if required by the data file policy)
         Connects a slot for generating the executive summary after the plugin execution
         Connects a slot for checking output data to the finally process
         Initialize the base directory
@@ -115,7 +141,7 @@ class EDPlugin(EDAction):
         self.connectPostProcess(self.exportDataOutput)
         if self.__bWriteDataXMLInputOutput:
             if self.__bWriteDataXMLInput:
-                self.connectPreProcess(self.writeDataInput)
+                self.connectPreProcess(self.dumpDataInput)
         self.connectPostProcess(self.generateExecutiveSummary)
         self.connectFinallyProcess(self.checkDataOutput)
         if (self.__strBaseName is None):
@@ -137,7 +163,7 @@ class EDPlugin(EDAction):
     def checkDataOutput(self, _edObject=None):
         """
         Checks if output data is available, if not issues a warning and sets an empty XSDataResult as output data
-        Writes xml data output in the working dir (if required)
+        Writes xml data output in the working dir (if required by the data file policy)
         """
         EDAction.finallyProcess(self, _edObject)
         if self.__dictXSDataOutput == {}:
@@ -146,8 +172,12 @@ class EDPlugin(EDAction):
             self.addWarningMessage(strWarningMessage)
             self.setDataOutput(XSDataResult())
         if self.__bWriteDataXMLInputOutput:
-            if self.__bWriteDataXMLOutput:
-                self.writeDataOutput()
+            # With the "onFailure" policy the input is only written once the plugin has failed
+            if self.__bWriteDataXMLInput and self.isFailure() and \
+                    self.getDataFilePolicy() == self.DATA_FILE_POLICY_ON_FAILURE:
+                self.writeDataInput(_bAsynchronous=True)
+            if self.__bWriteDataXMLOutput and self.isDataFileDumped():
+                self.writeDataOutput(_bAsynchronous=True)
 
 
     def synchronize(self):
@@ -186,14 +216,14 @@ class EDPlugin(EDAction):
         Should be overridden by the Final Plugin If needed
         This method should set its proper members attributes from a Plugin configuration Object
         """
-        self.DEBUG("EDPlugin.configure : plugin name = %s, EDNA_SITE = %s" % (self.getPluginName(), EDUtilsPath.EDNA_SITE))
+        self.DEBUG("EDPlugin.configure : plugin name = %s, EDNA_SITE = %s", self.getPluginName(), EDUtilsPath.EDNA_SITE)
 
         # set Timeout if different from default one
         if self.getTimeOut() == self.getDefaultTimeOut():
             # Try to get time out from plugin configuration
             iTimeOut = self.config.get(EDPlugin.CONF_TIME_OUT, None)
             if iTimeOut is not None:
-                self.DEBUG("EDPlugin.configure: Setting time out to %d s from plugin configuration." % iTimeOut)
+                self.DEBUG("EDPlugin.configure: Setting time out to %d s from plugin configuration.", iTimeOut)
                 self.setTimeOut(iTimeOut)
         else:
             self.DEBUG("EDPlugin.configure: timeout already set before plugin is configured.")
@@ -220,8 +250,8 @@ class EDPlugin(EDAction):
             self.setBaseDirectory(strBaseDirectory)
         else:
             self.DEBUG("EDPlugin.configure: Base directory already set before plugin is configured.")
-        # Working directory
-        strWorkingDirectory = self.getWorkingDirectory()
+        # Working directory (not created until it's used)
+        strWorkingDirectory = self.__strWorkingDirectory
         if (strWorkingDirectory is None):
             # Try to get working directory from plugin configuration
             strWorkingDirectory = self.config.get(EDPlugin.CONF_WORKING_DIR_LABEL, None)
@@ -237,6 +267,29 @@ class EDPlugin(EDAction):
         self.__bWriteDataXMLInputOutput = bool(self.config.get(self.CONF_WRITE_XML_INPUT_OUTPUT, True))
         self.__bWriteDataXMLOutput = bool(self.config.get(self.CONF_WRITE_XML_OUTPUT, True))
         self.__bWriteDataXMLInput = bool(self.config.get(self.CONF_WRITE_XML_INPUT, True))
+        bWorkingDirectoryRequired = self.config.get(self.CONF_WORKING_DIRECTORY_REQUIRED, None)
+        if bWorkingDirectoryRequired is not None:
+            self.setRequiredToHaveWorkingDirectory(bool(bWorkingDirectoryRequired))
+        # Format of the data input and output files, from the plugin configuration
+        # or else from the "EDPlugin" item of the configuration
+        if self.__strDataFormat is None:
+            strDataFormat = self.config.get(self.CONF_DATA_FORMAT, None)
+            if strDataFormat is None:
+                strDataFormat = self.__edConfiguration[self.CONF_PLUGIN].get(self.CONF_DATA_FORMAT, None)
+            if strDataFormat is not None:
+                self.setDataFormat(strDataFormat)
+        # Policy for writing the data input and output files, idem
+        if self.__strDataFilePolicy is None:
+            strDataFilePolicy = self.config.get(self.CONF_DATA_FILE_POLICY, None)
+            if strDataFilePolicy is None:
+                strDataFilePolicy = self.__edConfiguration[self.CONF_PLUGIN].get(self.CONF_DATA_FILE_POLICY, None)
+            if strDataFilePolicy is not None:
+                self.setDataFilePolicy(strDataFilePolicy)
+        if self.getDataFilePolicy() == self.DATA_FILE_POLICY_SAMPLED:
+            fSampling = self.config.get(self.CONF_DATA_FILE_SAMPLING, None)
+            if fSampling is None:
+                fSampling = self.__edConfiguration[self.CONF_PLUGIN].get(self.CONF_DATA_FILE_SAMPLING, 0.1)
+            self.__bDataFileSampled = (random.random() < float(fSampling))
 
 
     def execute(self, _edObject=None):
@@ -285,7 +338,14 @@ class EDPlugin(EDAction):
     def setDataInput(self, _oDataInput, _strDataInputKey=None):
         """
         Sets the plugin input data.
-        _oDataInput could be either an String XML or an XSData object.
+        _oDataInput could be either an XML or JSON string, bytes in the binary
+        format (see XSData.marshalBinary) or an XSData object.
+
+        XML strings are parsed with the streaming parser of the data bindings
+        (parseStringStream) if available. Contrary to parseString the parsed
+        object is not exported again, so elements missing in spite of their
+        minOccurs are not reported here: the plugins check their mandatory
+        input in checkParameters.
 
         The input data is stored in a dictionary with the key _strDataInputKey.
         If the key is not provided a default key is used.
@@ -313,11 +373,22 @@ class EDPlugin(EDAction):
         else:
             # Check the type
             xsDataInput = None
-            if isinstance(_oDataInput, (str, unicode)):
+            # Binary data first: on Python 2 bytes and str are the same type
+            if isinstance(_oDataInput, bytes) and (_oDataInput.startswith(BINARY_MAGIC) or bytes is not str):
+                self.DEBUG("EDPlugin.setDataInput: Input Data is binary ")
+                xsDataInput = self.getXSDataInputClass(strDataInputKey).parseBinary(_oDataInput)
+            elif isinstance(_oDataInput, (str, unicode)):
                 self.DEBUG("EDPlugin.setDataInput: Input Data is string ")
-                xsDataInput = self.getXSDataInputClass(strDataInputKey).parseString(_oDataInput)
+                xsDataInputClass = self.getXSDataInputClass(strDataInputKey)
+                if _oDataInput.lstrip().startswith("{"):
+                    xsDataInput = xsDataInputClass.parseJSON(_oDataInput)
+                # Use the streaming parser of the data bindings if available
+                elif hasattr(xsDataInputClass, "parseStringStream"):
+                    xsDataInput = xsDataInputClass.parseStringStream(_oDataInput)
+                else:
+                    xsDataInput = xsDataInputClass.parseString(_oDataInput)
             elif (isinstance(_oDataInput, self.getXSDataInputClass(strDataInputKey))):
-                self.DEBUG("EDPlugin.setDataInput: Input Data is of type " + str(_oDataInput.__class__))
+                self.DEBUG("EDPlugin.setDataInput: Input Data is of type %s", _oDataInput.__class__)
                 xsDataInput = _oDataInput
             else:
                 strErrorMessage = "ERROR: %s.setDataInput, wrong data type %r for data input key: %s, expected XML string or %r" % \
@@ -462,7 +533,8 @@ class EDPlugin(EDAction):
         Exports the Plugin Output Data to slot
         """
         self.DEBUG("EDPlugin.exportDataOutput")
-        self.__edSlotExportDataOutput.call(self.__dictXSDataOutput)
+        if self.__edSlotExportDataOutput is not None:
+            self.__edSlotExportDataOutput.call(self.__dictXSDataOutput)
 
 
     def connectExportDataOutput(self, _oMethod):
@@ -471,6 +543,8 @@ class EDPlugin(EDAction):
         """
         self.synchronizeOn()
         if (_oMethod != None):
+            if self.__edSlotExportDataOutput is None:
+                self.__edSlotExportDataOutput = EDSlot()
             self.__edSlotExportDataOutput.connect(_oMethod)
         self.synchronizeOff()
 
@@ -500,7 +574,7 @@ class EDPlugin(EDAction):
         """
         Adds a warning message to the warning messages list
         """
-        self.DEBUG("EDPlugin.addWarningMessage : " + _strWarningMessage)
+        self.DEBUG("EDPlugin.addWarningMessage : %s", _strWarningMessage)
         self.__listWarningMessages.append(_strWarningMessage)
 
 
@@ -511,41 +585,137 @@ class EDPlugin(EDAction):
         return self.__listWarningMessages
 
 
-    def writeDataInput(self, _edObject=None):
+    def writeDataInput(self, _edObject=None, _bAsynchronous=False):
         """
-        Writes the input data object(s) into a working dir xml file 
+        Writes the input data object(s) into a working dir xml (or json / bin) file.
+        If _bAsynchronous is True a copy of the data is written by the EDDataFileWriter thread.
         """
         self.DEBUG("EDPlugin.writeDataInput")
         strBasename = os.path.join(self.getWorkingDirectory(), self.compactPluginName(self.getPluginName()))
+        strExtension = self.DICT_DATA_FORMAT_EXTENSION[self.getDataFormat()]
         for strKey in self.__dictXSDataInput.keys():
             if (strKey == self.__strDefaultInputDataKey):  # "Old" style
                 xsDataInput = self.__dictXSDataInput[ self.__strDefaultInputDataKey ]
-                self.strPathDataInput = strBasename + "_dataInput.xml"
-                EDUtilsFile.writeFile(self.strPathDataInput, xsDataInput.marshal())
+                self.strPathDataInput = strBasename + "_dataInput" + strExtension
+                self.__writeDataFile(self.strPathDataInput, xsDataInput, _bAsynchronous)
             else:  # We have a list of objects
                 listXSDataInput = self.__dictXSDataInput[ strKey ]
                 for iIndex, xsDataInput in enumerate(listXSDataInput):
-                    strPathDataInput = "%s_%s_%d_dataInput.xml" % (strBasename, strKey, iIndex)
-                    EDUtilsFile.writeFile(strPathDataInput, xsDataInput.marshal())
+                    strPathDataInput = "%s_%s_%d_dataInput%s" % (strBasename, strKey, iIndex, strExtension)
+                    self.__writeDataFile(strPathDataInput, xsDataInput, _bAsynchronous)
 
 
-    def writeDataOutput(self, _edObject=None):
+    def writeDataOutput(self, _edObject=None, _bAsynchronous=False):
         """
-        Writes the output data object(s) into a working dir xml file 
+        Writes the output data object(s) into a working dir xml (or json / bin) file.
+        If _bAsynchronous is True a copy of the data is written by the EDDataFileWriter thread.
         """
         self.DEBUG("EDPlugin.writeDataOutput")
+        strExtension = self.DICT_DATA_FORMAT_EXTENSION[self.getDataFormat()]
         for strKey in self.__dictXSDataOutput.keys():
             if (strKey == self.__strDefaultOutputDataKey):  # "Old" style
                 xsDataOutput = self.__dictXSDataOutput[ self.__strDefaultOutputDataKey ]
                 if (xsDataOutput is not None):
-                    self.strPathDataOutput = os.path.join(self.getWorkingDirectory(), self.compactPluginName(self.getPluginName()) + "_dataOutput.xml")
-                    EDUtilsFile.writeFile(self.strPathDataOutput, xsDataOutput.marshal())
+                    self.strPathDataOutput = os.path.join(self.getWorkingDirectory(), self.compactPluginName(self.getPluginName()) + "_dataOutput" + strExtension)
+                    self.__writeDataFile(self.strPathDataOutput, xsDataOutput, _bAsynchronous)
             else:
                 listXSDataOutput = self.__dictXSDataOutput[ strKey ]
                 for iIndex, xsDataOutput in enumerate(listXSDataOutput):
                     if (xsDataOutput is not None):
-                        strPathDataOutput = os.path.join(self.getWorkingDirectory(), self.compactPluginName(self.getPluginName()) + "_" + strKey + "_%d_dataOutput.xml" % iIndex)
-                        EDUtilsFile.writeFile(strPathDataOutput, xsDataOutput.marshal())
+                        strPathDataOutput = os.path.join(self.getWorkingDirectory(), self.compactPluginName(self.getPluginName()) + "_" + strKey + "_%d_dataOutput%s" % (iIndex, strExtension))
+                        self.__writeDataFile(strPathDataOutput, xsDataOutput, _bAsynchronous)
+
+
+    def __writeDataFile(self, _strPath, _xsData, _bAsynchronous):
+        if _bAsynchronous:
+            # The plugin may modify the data object once it's queued, so a copy is written
+            xsDataCopy = copyObject(_xsData)
+            EDDataFileWriter.submit(_strPath, lambda: self.marshalData(xsDataCopy))
+        else:
+            EDUtilsFile.writeFile(_strPath, self.marshalData(_xsData))
+
+
+    def dumpDataInput(self, _edObject=None):
+        """
+        Slot writing asynchronously the input data object(s) if required by the data file policy
+        """
+        if self.isDataFileDumped():
+            self.writeDataInput(_bAsynchronous=True)
+
+
+    def isDataFileDumped(self):
+        """
+        Returns True if the data input / output files are to be written according to the data file policy:
+        always, only if the plugin has failed, for a sampled fraction of the plugins or never.
+        Plugins not requiring a working directory don't write these files.
+        """
+        if not self.__isRequiredToHaveWorkingDirectory:
+            return False
+        strDataFilePolicy = self.getDataFilePolicy()
+        if strDataFilePolicy == self.DATA_FILE_POLICY_ALWAYS:
+            return True
+        elif strDataFilePolicy == self.DATA_FILE_POLICY_ON_FAILURE:
+            return self.isFailure()
+        elif strDataFilePolicy == self.DATA_FILE_POLICY_SAMPLED:
+            return self.__bDataFileSampled
+        return False
+
+
+    def getDataFilePolicy(self):
+        """
+        Returns the policy for writing the data input and output files:
+        "always" (default), "onFailure", "sampled" or "never"
+        """
+        if self.__strDataFilePolicy is None:
+            return self.DATA_FILE_POLICY_ALWAYS
+        return self.__strDataFilePolicy
+
+
+    def setDataFilePolicy(self, _strDataFilePolicy, _fSampling=None):
+        """
+        Sets the policy for writing the data input and output files: "always", "onFailure", "sampled" or "never".
+        For the "sampled" policy _fSampling is the probability that the files of the plugin are written.
+        """
+        strDataFilePolicy = str(_strDataFilePolicy)
+        if strDataFilePolicy not in self.LIST_DATA_FILE_POLICY:
+            self.warning("EDPlugin.setDataFilePolicy: unknown data file policy '%s', using '%s'" % (_strDataFilePolicy, self.DATA_FILE_POLICY_ALWAYS))
+            strDataFilePolicy = self.DATA_FILE_POLICY_ALWAYS
+        self.__strDataFilePolicy = strDataFilePolicy
+        if _fSampling is not None:
+            self.__bDataFileSampled = (random.random() < float(_fSampling))
+
+
+    def marshalData(self, _xsData):
+        """
+        Returns the data object serialised in the data format of the plugin:
+        an XML or JSON string or bytes in the binary format.
+        """
+        strDataFormat = self.getDataFormat()
+        if strDataFormat == self.DATA_FORMAT_JSON:
+            return _xsData.marshalJSON()
+        elif strDataFormat == self.DATA_FORMAT_BINARY:
+            return _xsData.marshalBinary()
+        return _xsData.marshal()
+
+
+    def getDataFormat(self):
+        """
+        Returns the format of the data input and output files: "xml" (default), "json" or "binary"
+        """
+        if self.__strDataFormat is None:
+            return self.DATA_FORMAT_XML
+        return self.__strDataFormat
+
+
+    def setDataFormat(self, _strDataFormat):
+        """
+        Sets the format of the data input and output files: "xml", "json" or "binary"
+        """
+        strDataFormat = str(_strDataFormat).lower()
+        if strDataFormat not in self.DICT_DATA_FORMAT_EXTENSION:
+            self.warning("EDPlugin.setDataFormat: unknown data format '%s', using '%s'" % (_strDataFormat, self.DATA_FORMAT_XML))
+            strDataFormat = self.DATA_FORMAT_XML
+        self.__strDataFormat = strDataFormat
 
 
     def getBaseName(self):
@@ -559,37 +729,23 @@ class EDPlugin(EDAction):
 
     def setBaseName(self, _strBaseName):
         """
-        Sets the plugin base name
+        Sets the plugin base name. The directory baseDirectory/baseName will be used
+        as working directory, it's created the first time it's used.
         """
         self.__strBaseName = self.compactPluginName(_strBaseName)
         self.setName(self.__strBaseName)
-        # Create the directory baseDirectory/baseName which will be used as working directory
-        strWorkingDirPath = os.path.join(self.getBaseDirectory(), self.__strBaseName)
-        if not os.path.isdir(strWorkingDirPath):
-            os.mkdir(strWorkingDirPath)
-        self.setWorkingDirectory(strWorkingDirPath)
+        self.setWorkingDirectory(os.path.join(self.getBaseDirectory(), self.__strBaseName))
 
 
     def createBaseName(self):
         """
         Generates the plugin base name: (<prefix>-<object ID>)
+        If a directory with this name already exists when the working directory
+        is created an alternative name is used, see getWorkingDirectory.
         """
-        # First try to use global instance ID from EDObject
+        # Use global instance ID from EDObject
         strBaseName = "%s-%08d" % (self.compactPluginName(self.getPluginName()), self.getId())
-        strBaseDir = os.path.join(self.getBaseDirectory(), strBaseName)
-        # Try to create the directory...
-        try:
-            os.mkdir(strBaseDir)
-        except Exception as strErrorDetail:
-            self.error("EDPlugin.createBaseName: Could not create base directory %s because of %s" % (strBaseDir, strErrorDetail))
-            self.warning("EDPlugin.createBaseName: Trying to create alternative base directory...")
-            self.writeErrorTrace()
-            strTempDir = tempfile.mkdtemp(prefix=strBaseName, dir=self.getBaseDirectory())
-            os.chmod(strTempDir, stat.S_IRUSR | stat.S_IWUSR | stat.S_IXUSR | stat.S_IRGRP | stat.S_IXGRP | stat.S_IROTH | stat.S_IXOTH)
-            strBaseName = os.path.split(strTempDir)[1]
-            strBaseDir = os.path.join(self.getBaseDirectory(), strBaseName)
-            self.warning("EDPlugin.createBaseName: Alternative base directory created: %s" % strBaseDir)
-        self.DEBUG("EDPlugin.createBaseName : Directory created = " + strBaseDir)
+        self.__strCreatedBaseName = strBaseName
         return strBaseName
 
 
@@ -612,12 +768,10 @@ class EDPlugin(EDAction):
 
     def setBaseDirectory(self, _strBaseDirectory):
         """
-        Sets the plugin base directory
+        Sets the plugin base directory. If it doesn't yet exist it's created
+        together with the working directory.
         """
-        self.DEBUG("EDPlugin.setBaseDirectory : " + _strBaseDirectory)
-        if (not os.path.isdir(_strBaseDirectory)):
-            self.DEBUG("EDPlugin.setBaseDirectory: base directory %s does dot yet exist! Creating it." % _strBaseDirectory)
-            os.mkdir(_strBaseDirectory)
+        self.DEBUG("EDPlugin.setBaseDirectory : %s", _strBaseDirectory)
         self.__strBaseDirectory = _strBaseDirectory
 
 
@@ -625,7 +779,7 @@ class EDPlugin(EDAction):
         """
         Returns the plugin base directory
         """
-        self.DEBUG("EDPlugin.getBaseDirectory : %s" % self.__strBaseDirectory)
+        self.DEBUG("EDPlugin.getBaseDirectory : %s", self.__strBaseDirectory)
         if (self.__strBaseDirectory is None):
             self.__strBaseDirectory = os.getcwd()
         return self.__strBaseDirectory
@@ -633,24 +787,57 @@ class EDPlugin(EDAction):
 
     def setWorkingDirectory(self, _strWorkingDirectory):
         """
-        Sets the plugin working directory
+        Sets the plugin working directory. The directory is created the first
+        time it's retrieved with getWorkingDirectory.
         """
-        self.DEBUG("EDPlugin.setWorkingDirectory : " + _strWorkingDirectory)
+        self.DEBUG("EDPlugin.setWorkingDirectory : %s", _strWorkingDirectory)
         self.__strWorkingDirectory = _strWorkingDirectory
-        if not os.path.isdir(_strWorkingDirectory):
-            self.DEBUG("EDPlugin.setWorkingDirectory, creating working directory %s." % _strWorkingDirectory)
-            os.mkdir(self.__strWorkingDirectory)
+        self.__bWorkingDirectoryCreated = False
 
 
     def getWorkingDirectory(self):
         """
-        Returns the plugin base directory
-        """
-        self.DEBUG("EDPlugin.getWorkingDirectory : %s" % self.__strWorkingDirectory)
-        returnValue = None
-        if (self.__strWorkingDirectory is not None):
-            returnValue = self.__strWorkingDirectory
-        return returnValue
+        Returns the plugin working directory, which is created if it doesn't yet exist
+        """
+        self.DEBUG("EDPlugin.getWorkingDirectory : %s", self.__strWorkingDirectory)
+        if (self.__strWorkingDirectory is not None) and not self.__bWorkingDirectoryCreated:
+            with EDPlugin.__semaphoreWorkingDirectory:
+                if not self.__bWorkingDirectoryCreated:
+                    self.__createWorkingDirectory()
+        return self.__strWorkingDirectory
+
+
+    def __createWorkingDirectory(self):
+        strWorkingDirectory = self.__strWorkingDirectory
+        strBaseDirectory, strBaseName = os.path.split(strWorkingDirectory)
+        if strBaseName != self.__strCreatedBaseName:
+            # Explicit name: an existing directory is reused
+            if not os.path.isdir(strWorkingDirectory):
+                self.DEBUG("EDPlugin.getWorkingDirectory, creating working directory %s.", strWorkingDirectory)
+                try:
+                    os.makedirs(strWorkingDirectory)
+                except OSError:
+                    if not os.path.isdir(strWorkingDirectory):
+                        raise
+        else:
+            # Generated name: the directory must be new
+            if not os.path.isdir(strBaseDirectory):
+                os.makedirs(strBaseDirectory)
+            try:
+                os.mkdir(strWorkingDirectory)
+                self.DEBUG("EDPlugin.getWorkingDirectory : Directory created = %s", strWorkingDirectory)
+            except Exception as strErrorDetail:
+                self.error("EDPlugin.getWorkingDirectory: Could not create working directory %s because of %s" % (strWorkingDirectory, strErrorDetail))
+                self.warning("EDPlugin.getWorkingDirectory: Trying to create alternative working directory...")
+                self.writeErrorTrace()
+                strWorkingDirectory = tempfile.mkdtemp(prefix=strBaseName, dir=strBaseDirectory)
+                os.chmod(strWorkingDirectory, stat.S_IRUSR | stat.S_IWUSR | stat.S_IXUSR | stat.S_IRGRP | stat.S_IXGRP | stat.S_IROTH | stat.S_IXOTH)
+                self.warning("EDPlugin.getWorkingDirectory: Alternative working directory created: %s" % strWorkingDirectory)
+                if self.__strBaseName == strBaseName:
+                    self.__strBaseName = os.path.basename(strWorkingDirectory)
+                    self.setName(self.__strBaseName)
+                self.__strWorkingDirectory = strWorkingDirectory
+        self.__bWorkingDirectoryCreated = True
 
 
     def checkMandatoryParameters(self, _xsData, _strParamName):
@@ -680,7 +867,7 @@ class EDPlugin(EDAction):
         """
         Add a line to the executive summary string.
         """
-        self.DEBUG("EDPlugin.addExecutiveSummaryLine : %r" % _strExecutiveSummaryLine)
+        self.DEBUG("EDPlugin.addExecutiveSummaryLine : %r", _strExecutiveSummaryLine)
         strExecutiveSummaryLine = _strExecutiveSummaryLine
         if (not strExecutiveSummaryLine == ""):
             if (strExecutiveSummaryLine[-1] == "\n"):
@@ -719,7 +906,7 @@ class EDPlugin(EDAction):
             self.screen(line)
 
     def verboseDebug(self, _strMessage):
-        self.DEBUG(self.getPluginName() + " : " + _strMessage)
+        self.DEBUG("%s : %s", self.getPluginName(), _strMessage)
 
 
     def getPluginName(self):
@@ -768,6 +955,23 @@ class EDPlugin(EDAction):
         self.__isRequiredToHaveConfiguration = _bValue
 
 
+    def isRequiredToHaveWorkingDirectory(self):
+        """
+        Returns True if the plugin needs a working directory, i.e. if the data
+        input and output files are written
+        """
+        return self.__isRequiredToHaveWorkingDirectory
+
+
+    def setRequiredToHaveWorkingDirectory(self, _bValue=True):
+        """
+        Pure Python plugins not writing any files can set this to False:
+        the data input and output files are then not written and, unless the
+        plugin calls getWorkingDirectory, no working directory is created.
+        """
+        self.__isRequiredToHaveWorkingDirectory = _bValue
+
+
     def setWriteXMLInputOutput(self, _bValue=True):
         """
         Sets or unsets the plugin to write XML input and output files.
@@ -801,18 +1005,18 @@ class EDPlugin(EDAction):
         """
         self.__bUseWarningInsteadOfError = _bValue
 
-    def error(self, _strErrorMessage):
+    def error(self, _strErrorMessage, *_args):
         """
         Overloaded from EDLogging. If self.__bUseWarningInsteadOfError is True
         a warning message is issued instead of an error message.
         """
         if self.__bUseWarningInsteadOfError:
-            self.warning(_strErrorMessage)
+            self.warning(_strErrorMessage, *_args)
         else:
-            EDAction.error(self, _strErrorMessage)
+            EDAction.error(self, _strErrorMessage, *_args)
 
-    def ERROR(self, _strErrorMessage):
+    def ERROR(self, _strErrorMessage, *_args):
         """
         Uses the overloaded self.error method above.
         """
-        self.error(_strErrorMessage)
+        self.error(_strErrorMessage, *_args)
@@ -33,7 +33,7 @@ __license__ = "LGPLv3+"
 __copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
 
 
-import os, time, gc
+import os, gc
 
 from EDVerbose import EDVerbose
 from EDPlugin import EDPlugin
@@ -69,6 +69,7 @@ class EDPluginControl(EDPlugin):
         self.__edActionCluster = None
         self.__iClusterSize = None
         self.__listOfLoadedPlugins = []
+        self.__setUsedBaseName = set()
 
 
     def configure(self):
@@ -84,11 +85,11 @@ class EDPluginControl(EDPlugin):
                 strControlledPluginName = self.config.get(strControlledPlugin)
                 if strControlledPluginName != None:
                     self.setControlledPluginName(strControlledPlugin, strControlledPluginName)
-                    self.DEBUG("EDPluginControl.configure: setting controlled plugin %s to specific plugin %s" % (strControlledPlugin, strControlledPluginName))
+                    self.DEBUG("EDPluginControl.configure: setting controlled plugin %s to specific plugin %s", strControlledPlugin, strControlledPluginName)
         strClusterSize = self.config.get("clusterSize", None)
         if strClusterSize is not None:
             self.__iClusterSize = int(strClusterSize)
-            self.DEBUG("EDPluginControl.configure: setting cluster size to %d" % self.__iClusterSize)
+            self.DEBUG("EDPluginControl.configure: setting cluster size to %d", self.__iClusterSize)
 
 
     def emptyListOfLoadedPlugin(self):
@@ -113,21 +114,25 @@ class EDPluginControl(EDPlugin):
         if _plugin in self.__listOfLoadedPlugins:
             with self.locked():
                 self.__listOfLoadedPlugins.remove(_plugin)
-            self.DEBUG("EDPluginControl.removeLoadedPlugin: Caught, removed %s unreferenced objects. currently there are %i plugins" % (gc.get_count(), len(self.__listOfLoadedPlugins)))
+            self.DEBUG("EDPluginControl.removeLoadedPlugin: Caught, removed %s unreferenced objects. currently there are %i plugins", gc.get_count(), len(self.__listOfLoadedPlugins))
             gc.collect()
         else:
-            self.DEBUG("EDPluginControl.removeLoadedPlugin: Missed. currently there are %i plugins" % len(self.__listOfLoadedPlugins))
+            self.DEBUG("EDPluginControl.removeLoadedPlugin: Missed. currently there are %i plugins", len(self.__listOfLoadedPlugins))
 
 
     def synchronizePlugins(self):
+        """
+        Synchronizes all executed plugins loaded by this control plugin, including
+        plugins loaded while waiting (e.g. from success or failure methods).
+        """
         self.DEBUG("EDPluginControl.synchronizePlugins")
         bSynchronized = False
         while not bSynchronized:
-            listPluginOrig = self.__listOfLoadedPlugins[:]
+            with self.locked():
+                listPluginOrig = self.__listOfLoadedPlugins[:]
             for edPlugin in listPluginOrig:
-                if edPlugin.isStarted() and (not edPlugin.isEnded()):
+                if edPlugin.isRunning():
                     edPlugin.synchronize()
-            time.sleep(0.01)
             with self.locked():
                 bSynchronized = (self.__listOfLoadedPlugins == listPluginOrig)
 
@@ -183,17 +188,23 @@ class EDPluginControl(EDPlugin):
         else:
             self.__listOfLoadedPlugins.append(edPlugin)
         edPlugin.setBaseDirectory(self.getWorkingDirectory())
+        # The used base names are recorded in their compact form, a plugin loaded
+        # without base name never gets the working directory of another plugin
         if (_strBaseName is None):
-            # Check if base name exists. Not thread safe so please set explicitly
-            # _strBaseName for multi-threaded code
             strRenamedPlugin = self.compactPluginName(strPluginName)
-            strNewWorkingDirectory = os.path.join(self.getWorkingDirectory(), strRenamedPlugin)
-            if (os.path.exists(strNewWorkingDirectory)):
-                edPlugin.setBaseName(edPlugin.createBaseName())
-            else:
-                edPlugin.setBaseName(strRenamedPlugin)
         else:
+            strRenamedPlugin = self.compactPluginName(_strBaseName)
+        with self.locked():
+            bUsed = strRenamedPlugin in self.__setUsedBaseName
+            self.__setUsedBaseName.add(strRenamedPlugin)
+        if (_strBaseName is not None):
+            if bUsed:
+                self.warning("EDPluginControl.loadPlugin: base name %s already used" % _strBaseName)
             edPlugin.setBaseName(_strBaseName)
+        elif bUsed:
+            edPlugin.setBaseName(edPlugin.createBaseName())
+        else:
+            edPlugin.setBaseName(strRenamedPlugin)
         return edPlugin
 
 
@@ -0,0 +1,233 @@
+# coding: utf8
+#
+#    Project: The EDNA Kernel
+#             http://www.edna-site.org
+#
+#    Copyright (C) European Synchrotron Radiation Facility, Grenoble, France
+#
+#    Principal author:       Olof Svensson (svensson@esrf.fr)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    and the GNU Lesser General Public License  along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+from __future__ import with_statement
+
+__authors__ = ["Olof Svensson"]
+__contact__ = "svensson@esrf.fr"
+__license__ = "LGPLv3+"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+
+"""
+Start-up profiling of EDNA applications, e.g. "edna-plugin-launcher --profile-startup".
+
+When started, the import of every module by the main thread is timed (total
+time and time spent in the module itself, excluding the modules it imports)
+and the modules compiled from source because no up-to-date byte code was
+found are recorded. The kernel times the start-up phases (e.g. the parsing
+of the configuration files and the loading of the plugin index) with the
+"timer" method, which does nothing unless the profiler has been started.
+
+This module only depends on the python standard library so that it can be
+imported before any other EDNA module.
+"""
+
+import os
+import sys
+import time
+import threading
+
+try:
+    import builtins
+except ImportError:
+    import __builtin__ as builtins
+
+
+class EDStartupTimer(object):
+    """
+    Context manager adding the time spent in its block to a start-up phase
+    """
+
+    def __init__(self, _strPhase=None):
+        self.__strPhase = _strPhase
+        self.__fTimeStart = None
+
+    def __enter__(self):
+        if self.__strPhase is not None:
+            self.__fTimeStart = time.time()
+        return self
+
+    def __exit__(self, _type, _value, _traceback):
+        if self.__strPhase is not None:
+            EDStartupProfiler.addPhaseTime(self.__strPhase, time.time() - self.__fTimeStart)
+        return False
+
+
+
+class EDStartupProfiler(object):
+    """
+    Static class collecting the import and phase times of the application start-up.
+    """
+
+    iNumberOfModulesReported = 20
+
+    _fTimeStart = None
+    _fTimeExecution = None
+    _fTimeStop = None
+    _iThreadId = None
+    _pyImportOriginal = None
+    _listImport = []
+    _listStack = []
+    _dictPhase = {}
+    _listPhase = []
+    _edStartupTimerNull = EDStartupTimer()
+
+
+    @classmethod
+    def start(cls):
+        """
+        Starts the profiling: from now on the imports of the calling thread are timed
+        """
+        if cls._fTimeStart is None:
+            cls._fTimeStart = time.time()
+            cls._iThreadId = threading.current_thread().ident
+            cls._pyImportOriginal = builtins.__import__
+            builtins.__import__ = cls.__import
+
+
+    @classmethod
+    def markExecution(cls):
+        """
+        Marks the end of the start-up, i.e. the start of the execution of the plugin.
+        The imports and phases during the execution are still timed.
+        """
+        if cls.isActive() and cls._fTimeExecution is None:
+            cls._fTimeExecution = time.time()
+
+
+    @classmethod
+    def stop(cls):
+        """
+        Stops the profiling: the imports are no longer timed
+        """
+        if cls.isActive():
+            cls._fTimeStop = time.time()
+            builtins.__import__ = cls._pyImportOriginal
+
+
+    @classmethod
+    def isActive(cls):
+        return cls._fTimeStart is not None and cls._fTimeStop is None
+
+
+    @classmethod
+    def timer(cls, _strPhase):
+        """
+        Returns a context manager timing a start-up phase, e.g.
+        "with EDStartupProfiler.timer("configuration"): ..."
+        """
+        if cls.isActive():
+            return EDStartupTimer(_strPhase)
+        return cls._edStartupTimerNull
+
+
+    @classmethod
+    def addPhaseTime(cls, _strPhase, _fTime):
+        if _strPhase not in cls._dictPhase:
+            cls._listPhase.append(_strPhase)
+            cls._dictPhase[_strPhase] = 0.0
+        cls._dictPhase[_strPhase] += _fTime
+
+
+    @classmethod
+    def getPhaseTime(cls, _strPhase):
+        return cls._dictPhase.get(_strPhase)
+
+
+    @classmethod
+    def getImports(cls):
+        """
+        Returns a list of (module name, total time, own time, compiled from source) in order of import
+        """
+        return list(cls._listImport)
+
+
+    @classmethod
+    def __import(cls, name, globals=None, locals=None, fromlist=(), level=0):
+        # Same signature as the built-in __import__, which may be called with keyword arguments
+        if level != 0 or name in sys.modules or threading.current_thread().ident != cls._iThreadId:
+            return cls._pyImportOriginal(name, globals, locals, fromlist, level)
+        listFrame = [0.0]
+        cls._listStack.append(listFrame)
+        fTimeStart = time.time()
+        try:
+            return cls._pyImportOriginal(name, globals, locals, fromlist, level)
+        finally:
+            fTime = time.time() - fTimeStart
+            cls._listStack.pop()
+            if cls._listStack:
+                cls._listStack[-1][0] += fTime
+            cls._listImport.append((name, fTime, fTime - listFrame[0], cls.__isCompiledFromSource(name)))
+
+
+    @classmethod
+    def __isCompiledFromSource(cls, _strName):
+        """
+        Returns True if the module has no byte code file, or if the byte code file is older than the source
+        """
+        bSource = False
+        pyModule = sys.modules.get(_strName)
+        pySpec = getattr(pyModule, "__spec__", None)
+        if pySpec is not None and pySpec.cached is not None and str(pySpec.origin).endswith(".py"):
+            try:
+                bSource = os.stat(pySpec.cached).st_mtime < os.stat(pySpec.origin).st_mtime
+            except OSError:
+                bSource = True
+        return bSource
+
+
+    @classmethod
+    def report(cls):
+        """
+        Writes the start-up profile on screen and in the log file
+        """
+        if cls._fTimeStart is None:
+            return
+        cls.stop()
+        from EDVerbose import EDVerbose
+        # The report has been asked for, it's written even if the verbose mode is off
+        EDVerbose.setVerboseOn()
+        listImport = cls.getImports()
+        fTimeImport = sum([tupleImport[2] for tupleImport in listImport])
+        listSource = [tupleImport[0] for tupleImport in listImport if tupleImport[3]]
+        EDVerbose.screen("")
+        EDVerbose.screen("Start-up profile")
+        if cls._fTimeExecution is not None:
+            EDVerbose.screen("%-40s : %8.3f [s]" % ("Start-up time", cls._fTimeExecution - cls._fTimeStart))
+        EDVerbose.screen("%-40s : %8.3f [s]" % ("Total time", cls._fTimeStop - cls._fTimeStart))
+        EDVerbose.screen("%-40s : %8.3f [s] (%d modules)" % ("Import of modules", fTimeImport, len(listImport)))
+        for strPhase in cls._listPhase:
+            EDVerbose.screen("%-40s : %8.3f [s]" % (strPhase, cls._dictPhase[strPhase]))
+        EDVerbose.screen("")
+        EDVerbose.screen("%-40s   %8s   %8s" % ("Slowest imports", "own [s]", "total [s]"))
+        listImport.sort(key=lambda tupleImport: tupleImport[2], reverse=True)
+        for (strName, fTime, fTimeOwn, bSource) in listImport[:cls.iNumberOfModulesReported]:
+            strSource = ""
+            if bSource:
+                strSource = " (compiled from source)"
+            EDVerbose.screen("%-40s   %8.3f   %8.3f%s" % (strName, fTimeOwn, fTime, strSource))
+        if listSource:
+            EDVerbose.screen("")
+            EDVerbose.screen("%d modules were compiled from source because no up-to-date byte code was found." % len(listSource))
+            EDVerbose.screen("If the EDNA installation is not writable, set PYTHONPYCACHEPREFIX to a writable directory.")
+        EDVerbose.screen("")
@@ -79,7 +79,7 @@ class EDUtilsFile(object):
     def writeFile(_strFileName, _strContent):
         """
         Writes a string to a file. If the string is not already in unicode
-        format it will be converted to unicode.
+        format it will be converted to unicode, bytes are written as they are.
         @param _strFileName: Path to file, will be created if not existing
         @param _strContent: String content to be written to the file
         """
@@ -90,6 +90,8 @@ class EDUtilsFile(object):
                         myFile.write(_strContent)
                     else:
                         myFile.write(unicode(_strContent, errors='ignore'))
+                elif isinstance(_strContent, bytes):
+                    myFile.write(_strContent)
                 else:
                     myFile.write(bytes(_strContent, 'UTF-8'))
                 myFile.flush()
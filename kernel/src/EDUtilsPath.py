@@ -311,7 +311,7 @@ class EDUtilsPath:
                 strTempFileDir = EDUtilsPath.getEdnaUserTempFolder()
                 # We create a hash of the path in order to be able to reference several different EDNA_HOME 
                 # caches in the same directory
-                strCacheFileName = hashlib.sha1(os.getenv('EDNA_HOME').encode('utf-8')).hexdigest() + ".xml"
+                strCacheFileName = hashlib.sha1(os.getenv('EDNA_HOME').encode('utf-8')).hexdigest() + ".json"
                 cls._EDNA_PLUGINCACHE = os.path.abspath(os.path.join(strTempFileDir, strCacheFileName))
             EDVerbose.DEBUG("EDFactoryPlugin: Path to plugin cache: %s" % cls._EDNA_PLUGINCACHE)
         return cls._EDNA_PLUGINCACHE
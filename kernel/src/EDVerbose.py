@@ -46,7 +46,8 @@ class EDVerbose(object):
     
     All methods are thread safe.
     """
-    __edLogging = EDLogging()
+    # The messages are written by the logging backend (without source object)
+    __edLogging = EDLogging().edLogging
 
 
     def setTestOn():
@@ -108,29 +109,29 @@ class EDVerbose(object):
     isVerboseDebug = staticmethod(isVerboseDebug)
 
 
-    def log(_strMessage=""):
+    def log(_strMessage="", *_args):
         """
         This method writes a message only to the log file.
         
         @param _strMessage: The string to be written to the log file
         @type _strMessage: python string
         """
-        EDVerbose.__edLogging.log(_strMessage)
+        EDVerbose.__edLogging.log(_strMessage, *_args)
     log = staticmethod(log)
 
 
-    def screen(_strMessage=""):
+    def screen(_strMessage="", *_args):
         """
         This method writes a message to standard output and to the log file.
         
         @param _strMessage: The string to be written to the log file
         @type _strMessage: python string
         """
-        EDVerbose.__edLogging.screen(_strMessage)
+        EDVerbose.__edLogging.screen(_strMessage, *_args)
     screen = staticmethod(screen)
 
 
-    def DEBUG(_strDebugMessage=""):
+    def DEBUG(_strDebugMessage="", *_args):
         """
         This method writes a debug message to standard output and to the log file
         if debugging is enabled. The message will be written with the prefix [DEBUG]
@@ -138,11 +139,11 @@ class EDVerbose(object):
         @param _strDebugMessage: The debug message to be written to standard output and log file
         @type _strDebugMessage: python string
         """
-        EDVerbose.__edLogging.DEBUG(_strDebugMessage)
+        EDVerbose.__edLogging.DEBUG(_strDebugMessage, *_args)
     DEBUG = staticmethod(DEBUG)
 
 
-    def unitTest(_strMessage=""):
+    def unitTest(_strMessage="", *_args):
         """
         This method is meant to be used by the testing framework. The message will be written 
         to standard output and the log file with the prefix [UnitTest]
@@ -150,62 +151,62 @@ class EDVerbose(object):
         @param _strMessage: The message to be written to standard output and log file
         @type _strMessage: python string
         """
-        EDVerbose.__edLogging.unitTest(_strMessage)
+        EDVerbose.__edLogging.unitTest(_strMessage, *_args)
     unitTest = staticmethod(unitTest)
 
 
-    def ERROR(_strMessage=""):
+    def ERROR(_strMessage="", *_args):
         """
         This method writes a message to standard error and the log file with the prefix [ERROR].
         
         @param _strMessage: The error message to be written to standard output and log file
         @type _strMessage: python string
         """
-        EDVerbose.__edLogging.ERROR(_strMessage)
+        EDVerbose.__edLogging.ERROR(_strMessage, *_args)
     ERROR = staticmethod(ERROR)
 
 
-    def error(_strMessage=""):
+    def error(_strMessage="", *_args):
         """
         This method writes a message to standard error and the log file with the prefix [ERROR].
         
         @param _strMessage: The error message to be written to standard output and log file
         @type _strMessage: python string
         """
-        EDVerbose.__edLogging.error(_strMessage)
+        EDVerbose.__edLogging.error(_strMessage, *_args)
     error = staticmethod(error)
 
 
-    def WARNING(_strMessage=""):
+    def WARNING(_strMessage="", *_args):
         """
         This method writes a warning message to standard output and the log file with the prefix [Warning].
         
         @param _strMessage: The error message to be written to standard output and log file
         @type _strMessage: python string
         """
-        EDVerbose.__edLogging.WARNING(_strMessage)
+        EDVerbose.__edLogging.WARNING(_strMessage, *_args)
     WARNING = staticmethod(WARNING)
 
 
-    def warning(_strMessage=""):
+    def warning(_strMessage="", *_args):
         """
         This method writes a warning message to standard output and the log file with the prefix [Warning].
         
         @param _strMessage: The error message to be written to standard output and log file
         @type _strMessage: python string
         """
-        EDVerbose.__edLogging.warning(_strMessage)
+        EDVerbose.__edLogging.warning(_strMessage, *_args)
     warning = staticmethod(warning)
 
 
-    def ASSERT(_strMessage):
+    def ASSERT(_strMessage, *_args):
         """
         This method writes an assert message to standard output and the log file with the prefix [ASSERT].
         
         @param _strMessage: The error message to be written to standard output and log file
         @type _strMessage: python string
         """
-        EDVerbose.__edLogging.ASSERT(_strMessage)
+        EDVerbose.__edLogging.ASSERT(_strMessage, *_args)
     ASSERT = staticmethod(ASSERT)
 
 
@@ -247,3 +248,11 @@ class EDVerbose(object):
         """
         EDVerbose.__edLogging.setLogFileOff()
     setLogFileOff = staticmethod(setLogFileOff)
+
+
+    def flush():
+        """
+        Waits until all the messages have been written
+        """
+        EDVerbose.__edLogging.flush()
+    flush = staticmethod(flush)
@@ -5,8 +5,13 @@
 #
 
 import os, sys
+from io import BytesIO
 from xml.dom import minidom
 from xml.dom import Node
+from xml.etree import ElementTree
+from copy import deepcopy
+from json import dumps as jsonDumps, loads as jsonLoads
+from struct import Struct
 
 
 
@@ -34,6 +39,449 @@ def warnEmptyAttribute(_strName, _strTypeName):
     #if not _strTypeName in ["float", "double", "string", "boolean", "integer"]:
     #    print("Warning! Non-optional attribute %s of type %s is None!" % (_strName, _strTypeName))
 
+#
+# Streaming parse support: the generated build methods only use a small part
+# of the DOM API, which is provided by light-weight views of ElementTree
+# elements. The children of the root element are built and discarded one by
+# one while the document is parsed, so no DOM is ever created.
+#
+
+class XSDataStreamText(object):
+    __slots__ = ("nodeValue",)
+    nodeType = Node.TEXT_NODE
+    nodeName = "#text"
+    childNodes = ()
+    firstChild = None
+    def __init__(self, nodeValue):
+        self.nodeValue = nodeValue
+
+
+class XSDataStreamAttribute(object):
+    __slots__ = ("value",)
+    def __init__(self, value):
+        self.value = value
+
+
+class XSDataStreamAttributes(object):
+    __slots__ = ("_attrib",)
+    def __init__(self, attrib):
+        self._attrib = attrib
+    def get(self, name, default=None):
+        if name in self._attrib:
+            return XSDataStreamAttribute(self._attrib[name])
+        return default
+
+
+class XSDataStreamNode(object):
+    __slots__ = ("_element", "nodeName")
+    nodeType = Node.ELEMENT_NODE
+    nodeValue = None
+    def __init__(self, element):
+        self._element = element
+        tag = element.tag
+        if tag[0] == "{":
+            tag = tag[tag.index("}") + 1:]
+        self.nodeName = tag
+    def getChildNodes(self):
+        # Whitespace between elements is skipped, the generated bindings
+        # have no mixed content
+        element = self._element
+        if len(element) == 0:
+            if element.text is None:
+                return []
+            return [XSDataStreamText(element.text)]
+        listNode = []
+        if element.text is not None and not element.text.isspace():
+            listNode.append(XSDataStreamText(element.text))
+        for child in element:
+            listNode.append(XSDataStreamNode(child))
+            if child.tail is not None and not child.tail.isspace():
+                listNode.append(XSDataStreamText(child.tail))
+        return listNode
+    childNodes = property(getChildNodes)
+    def getFirstChild(self):
+        element = self._element
+        if element.text is not None:
+            return XSDataStreamText(element.text)
+        elif len(element) > 0:
+            return XSDataStreamNode(element[0])
+        return None
+    firstChild = property(getFirstChild)
+    def getAttributes(self):
+        return XSDataStreamAttributes(self._element.attrib)
+    attributes = property(getAttributes)
+    def toxml(self):
+        return ElementTree.tostring(self._element).decode("utf-8")
+
+
+# Builds rootObj from ElementTree "start" and "end" events. Each child of the
+# root element is built as soon as it is complete and then removed from the
+# partial tree.
+def buildFromEvents(rootObj, iterEvents):
+    depth = 0
+    elementRoot = None
+    elementPrevious = None
+    for (event, element) in iterEvents:
+        if event == "start":
+            depth += 1
+            if depth == 1:
+                elementRoot = element
+                if hasattr(rootObj, "buildAttributes"):
+                    rootObj.buildAttributes(XSDataStreamAttributes(element.attrib))
+            continue
+        depth -= 1
+        if depth == 1:
+            if elementPrevious is None:
+                text = elementRoot.text
+            else:
+                text = elementPrevious.tail
+                elementRoot.remove(elementPrevious)
+            if text is not None and not text.isspace():
+                rootObj.buildChildren(XSDataStreamText(text), "#text")
+            node = XSDataStreamNode(element)
+            rootObj.buildChildren(node, node.nodeName.split(':')[-1])
+            elementPrevious = element
+        elif depth == 0:
+            if elementPrevious is None:
+                # No element children, build the root element as a whole
+                rootObj.build(XSDataStreamNode(element))
+            elif elementPrevious.tail is not None and not elementPrevious.tail.isspace():
+                rootObj.buildChildren(XSDataStreamText(elementPrevious.tail), "#text")
+    return rootObj
+
+
+def iterStringEvents(inString, chunkSize=65536):
+    if not hasattr(ElementTree, "XMLPullParser"):
+        # Python 2 has no pull parser, the string is parsed as a file
+        if isinstance(inString, unicode):
+            inString = inString.encode("utf-8")
+        for event in ElementTree.iterparse(BytesIO(inString), events=("start", "end")):
+            yield event
+        return
+    parser = ElementTree.XMLPullParser(events=("start", "end"))
+    for index in range(0, len(inString), chunkSize):
+        parser.feed(inString[index:index + chunkSize])
+        for event in parser.read_events():
+            yield event
+    parser.close()
+    for event in parser.read_events():
+        yield event
+
+
+# Contrary to parseString the objects are not exported afterwards to check
+# the minOccurs, the values are checked while the objects are built.
+def parseStringStream(inString, rootObj):
+    return buildFromEvents(rootObj, iterStringEvents(inString))
+
+
+def parseFileStream(inFilePath, rootObj):
+    return buildFromEvents(rootObj, ElementTree.iterparse(inFilePath, events=("start", "end")))
+
+
+#
+# Copy and conversion support: objects are copied structurally, and converted
+# to another class by building an instance of that class from a light-weight
+# view of the object, without writing and parsing XML.
+#
+
+# Names of the slots of a class and its base classes, classes generated
+# with __slots__ have no instance dictionary
+dictSlotNames = {}
+slotUnset = object()
+
+def getSlotNames(cls):
+    listSlotNames = dictSlotNames.get(cls)
+    if listSlotNames is None:
+        listSlotNames = []
+        for clsBase in reversed(cls.__mro__):
+            for name in clsBase.__dict__.get("__slots__", ()):
+                if name not in listSlotNames and name not in ("__dict__", "__weakref__"):
+                    listSlotNames.append(name)
+        dictSlotNames[cls] = listSlotNames
+    return listSlotNames
+
+
+def iterAttributes(obj):
+    for name in getSlotNames(obj.__class__):
+        value = getattr(obj, name, slotUnset)
+        if value is not slotUnset:
+            yield (name, value)
+    dictObj = getattr(obj, "__dict__", None)
+    if dictObj is not None:
+        for item in dictObj.items():
+            yield item
+
+
+def isDataObject(value):
+    return hasattr(value, "__dict__") or hasattr(value.__class__, "__slots__")
+
+
+tupleValueClass = (str, int, float, bool)
+
+def copyValue(value):
+    if value is None or value.__class__ in tupleValueClass:
+        return value
+    elif value.__class__ is list:
+        return [copyValue(item) for item in value]
+    elif id(value) in setInternedObjectId:
+        # Interned objects cannot be modified and can therefore be shared
+        return value
+    elif isDataObject(value):
+        return copyObject(value)
+    return deepcopy(value)
+
+
+def copyObject(obj):
+    objCopy = obj.__class__.__new__(obj.__class__)
+    for key, value in iterAttributes(obj):
+        setattr(objCopy, key, copyValue(value))
+    return objCopy
+
+
+#
+# Interning of the simple value objects (XSDataBoolean, XSDataDouble,
+# XSDataFloat, XSDataInteger and XSDataString): XSDataInteger.intern(0)
+# always returns the same instance, which cannot be modified.
+#
+
+iMaxInternedObjects = 4096
+dictInternedObject = {}
+setInternedObjectId = set()
+
+def internValue(cls, value):
+    if "intern" not in cls.__dict__:
+        # Only the simple value classes themselves, not their subclasses
+        return cls(value)
+    key = (cls, value.__class__, value)
+    obj = dictInternedObject.get(key)
+    if obj is None:
+        obj = cls(value)
+        if value == value and len(dictInternedObject) < iMaxInternedObjects:
+            dictInternedObject[key] = obj
+            setInternedObjectId.add(id(obj))
+    return obj
+
+
+def checkNotInterned(obj):
+    if id(obj) in setInternedObjectId:
+        strMessage = "ERROR! Interned %s objects cannot be modified, use copy() for a modifiable instance" % obj.__class__.__name__
+        raise BaseException(strMessage)
+
+
+def valueToText(value):
+    if value is True:
+        return "true"
+    elif value is False:
+        return "false"
+    elif value.__class__ is float:
+        return repr(value)
+    return unicode(value)
+
+
+class XSDataObjectNode(object):
+    __slots__ = ("_obj", "nodeName")
+    nodeType = Node.ELEMENT_NODE
+    nodeValue = None
+    def __init__(self, obj, nodeName):
+        self._obj = obj
+        self.nodeName = nodeName
+    def getChildNodes(self):
+        obj = self._obj
+        if obj.__class__ is dict:
+            iterItems = obj.items()
+        elif obj.__class__ in tupleValueClass or not isDataObject(obj):
+            return [XSDataStreamText(valueToText(obj))]
+        else:
+            iterItems = iterAttributes(obj)
+        listNode = []
+        for key, value in iterItems:
+            if value is None or callable(value):
+                continue
+            if key[0] == "_":
+                key = key[1:]
+            if value.__class__ is list:
+                for item in value:
+                    listNode.append(XSDataObjectNode(item, key))
+            else:
+                listNode.append(XSDataObjectNode(value, key))
+        return listNode
+    childNodes = property(getChildNodes)
+    def getFirstChild(self):
+        obj = self._obj
+        if obj.__class__ in tupleValueClass:
+            return XSDataStreamText(valueToText(obj))
+        listNode = self.getChildNodes()
+        if len(listNode) > 0:
+            return listNode[0]
+        return None
+    firstChild = property(getFirstChild)
+    def getAttributes(self):
+        return XSDataStreamAttributes({})
+    attributes = property(getAttributes)
+    def toxml(self):
+        return unicode("<%s>%r</%s>" % (self.nodeName, self._obj, self.nodeName))
+
+
+def convertObject(obj, targetClass):
+    rootObj = targetClass()
+    rootObj.build(XSDataObjectNode(obj, targetClass.__name__))
+    return rootObj
+
+
+#
+# Compact serialisation: an object is exported as a tree of dictionaries,
+# lists and values, i.e. the XML elements without the mark-up, which is
+# written as JSON or in a binary format. The objects are built
+# from the tree by the generated build methods, as when parsing XML.
+#
+
+def exportToTree(obj):
+    if not isDataObject(obj):
+        return obj
+    dictTree = {}
+    for key, value in iterAttributes(obj):
+        if value is None or callable(value):
+            continue
+        if key[0] == "_":
+            key = key[1:]
+        if value.__class__ is list:
+            if len(value) > 0:
+                dictTree[key] = [exportToTree(item) for item in value]
+        else:
+            dictTree[key] = exportToTree(value)
+    return dictTree
+
+
+def buildFromTree(rootObj, dictRoot):
+    # The tree has one item, the name of the root element
+    for (name, tree) in dictRoot.items():
+        rootObj.build(XSDataObjectNode(tree, name))
+    return rootObj
+
+
+def marshalJSON(obj, name):
+    return jsonDumps({name: exportToTree(obj)}, separators=(",", ":"))
+
+
+def parseJSON(inString, rootObj):
+    return buildFromTree(rootObj, jsonLoads(inString))
+
+
+#
+# Binary format (version 1): a header, BINARY_MAGIC followed by the version
+# (uint16), then the tree. Each item of the tree starts with a one byte tag,
+# the numbers are little endian:
+#   "N" None, "T" true, "F" false,
+#   "i" integer (int64), "d" double (float64),
+#   "s" string (uint32 length in bytes, UTF-8),
+#   "l" list (uint32 number of items, items),
+#   "m" dictionary (uint32 number of items, keys as strings without tag, items).
+# Other values (e.g. integers not fitting in 64 bits) are written as strings,
+# as they would be in XML.
+#
+
+BINARY_MAGIC = b"XSDB"
+BINARY_VERSION = 1
+structBinaryHeader = Struct("<4sH")
+structUInt32 = Struct("<I")
+structInt64 = Struct("<q")
+structFloat64 = Struct("<d")
+
+
+def writeBinaryString(value, listBytes):
+    bytesValue = value.encode("utf-8")
+    listBytes.append(structUInt32.pack(len(bytesValue)))
+    listBytes.append(bytesValue)
+
+
+def writeBinaryTree(value, listBytes):
+    valueClass = value.__class__
+    if value is None:
+        listBytes.append(b"N")
+    elif value is True:
+        listBytes.append(b"T")
+    elif value is False:
+        listBytes.append(b"F")
+    elif valueClass is dict:
+        listBytes.append(b"m")
+        listBytes.append(structUInt32.pack(len(value)))
+        for key, item in value.items():
+            writeBinaryString(key, listBytes)
+            writeBinaryTree(item, listBytes)
+    elif valueClass is list:
+        listBytes.append(b"l")
+        listBytes.append(structUInt32.pack(len(value)))
+        for item in value:
+            writeBinaryTree(item, listBytes)
+    elif isinstance(value, float):
+        listBytes.append(b"d")
+        listBytes.append(structFloat64.pack(value))
+    elif isinstance(value, int) and -2 ** 63 <= value < 2 ** 63:
+        listBytes.append(b"i")
+        listBytes.append(structInt64.pack(value))
+    else:
+        listBytes.append(b"s")
+        writeBinaryString(valueToText(value), listBytes)
+
+
+def readBinaryString(inBytes, offset):
+    length = structUInt32.unpack_from(inBytes, offset)[0]
+    offset += structUInt32.size
+    return inBytes[offset:offset + length].decode("utf-8"), offset + length
+
+
+def readBinaryTree(inBytes, offset):
+    tag = inBytes[offset:offset + 1]
+    offset += 1
+    if tag == b"m":
+        length = structUInt32.unpack_from(inBytes, offset)[0]
+        offset += structUInt32.size
+        dictTree = {}
+        for index in range(length):
+            key, offset = readBinaryString(inBytes, offset)
+            dictTree[key], offset = readBinaryTree(inBytes, offset)
+        return dictTree, offset
+    elif tag == b"l":
+        length = structUInt32.unpack_from(inBytes, offset)[0]
+        offset += structUInt32.size
+        listTree = []
+        for index in range(length):
+            item, offset = readBinaryTree(inBytes, offset)
+            listTree.append(item)
+        return listTree, offset
+    elif tag == b"s":
+        return readBinaryString(inBytes, offset)
+    elif tag == b"d":
+        return structFloat64.unpack_from(inBytes, offset)[0], offset + structFloat64.size
+    elif tag == b"i":
+        return structInt64.unpack_from(inBytes, offset)[0], offset + structInt64.size
+    elif tag == b"N":
+        return None, offset
+    elif tag == b"T":
+        return True, offset
+    elif tag == b"F":
+        return False, offset
+    raise ValueError("XSData binary format: unknown tag " + repr(tag))
+
+
+def marshalBinary(obj, name):
+    listBytes = [structBinaryHeader.pack(BINARY_MAGIC, BINARY_VERSION)]
+    writeBinaryTree({name: exportToTree(obj)}, listBytes)
+    return b"".join(listBytes)
+
+
+def parseBinary(inBytes, rootObj):
+    if len(inBytes) < structBinaryHeader.size:
+        raise ValueError("XSData binary format: data too short")
+    magic, version = structBinaryHeader.unpack_from(inBytes, 0)
+    if magic != BINARY_MAGIC:
+        raise ValueError("XSData binary format: wrong header " + repr(magic))
+    if version > BINARY_VERSION:
+        raise ValueError("XSData binary format: unsupported version " + str(version))
+    dictRoot, offset = readBinaryTree(inBytes, structBinaryHeader.size)
+    return buildFromTree(rootObj, dictRoot)
+
+
 class MixedContainer(object):
     # Constants for category:
     CategoryNone = 0
@@ -88,6 +536,7 @@ class MixedContainer(object):
 
 
 class XSData(object):
+    __slots__ = ()
     def __init__(self):
         pass
     def copyViaDict(self):
@@ -95,7 +544,7 @@ class XSData(object):
 
     def exportToDict(self):
         dictOut = {"__XSDataName" : str(self.__class__).split("'")[1]}
-        for key, val in self.__dict__.items():
+        for key, val in iterAttributes(self):
             if callable(val):
                 pass
             elif str(val.__class__).split("'")[1].startswith("XSData"):
@@ -125,11 +574,11 @@ class XSData(object):
         if xsd is not None:
             for key, val in inDict.items():
                 if isinstance(val, list):
-                    xsd.__dict__[key] = [ XSData.importFromDict(i) for i in val]
+                    setattr(xsd, key, [ XSData.importFromDict(i) for i in val])
                 elif isinstance(val, dict):
-                    xsd.__dict__[key] = XSData.importFromDict(val)
+                    setattr(xsd, key, XSData.importFromDict(val))
                 else:
-                    xsd.__dict__[key] = val
+                    setattr(xsd, key, val)
         return xsd
     importFromDict = staticmethod(importFromDict)    
     def export(self, outfile, level, name_='XSData'):
@@ -166,7 +615,7 @@ class XSData(object):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSData.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -187,10 +636,34 @@ class XSData(object):
         rootObj.build(rootNode)
         return rootObj
     parseFile = staticmethod( parseFile )
+    #Class methods for parsing a string or a file without building a DOM
+    def parseStringStream( cls, _inString ):
+        return parseStringStream(_inString, cls())
+    parseStringStream = classmethod( parseStringStream )
+    def parseFileStream( cls, _inFilePath ):
+        return parseFileStream(_inFilePath, cls())
+    parseFileStream = classmethod( parseFileStream )
+    #Class method for converting an object of a structurally identical class
+    def convertFrom( cls, _xsDataObject ):
+        return convertObject(_xsDataObject, cls)
+    convertFrom = classmethod( convertFrom )
+    #Methods for marshalling an object in the compact JSON and binary formats
+    def marshalJSON( self ):
+        return marshalJSON(self, self.__class__.__name__)
+    def marshalBinary( self ):
+        return marshalBinary(self, self.__class__.__name__)
+    #Class methods for parsing the compact JSON and binary formats
+    def parseJSON( cls, _inString ):
+        return parseJSON(_inString, cls())
+    parseJSON = classmethod( parseJSON )
+    def parseBinary( cls, _inBytes ):
+        return parseBinary(_inBytes, cls())
+    parseBinary = classmethod( parseBinary )
 # end class XSData
 
 
 class XSDataDictionary(object):
+    __slots__ = ("_keyValuePair",)
     def __init__(self, keyValuePair=None):
         if keyValuePair is None:
             self._keyValuePair = []
@@ -272,7 +745,7 @@ class XSDataDictionary(object):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataDictionary.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -297,6 +770,7 @@ class XSDataDictionary(object):
 
 
 class XSDataRange(object):
+    __slots__ = ("_begin", "_end")
     def __init__(self, end=None, begin=None):
         if begin is None:
             self._begin = None
@@ -385,7 +859,7 @@ class XSDataRange(object):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataRange.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -410,6 +884,7 @@ class XSDataRange(object):
 
 
 class XSImportConfiguration(object):
+    __slots__ = ("_directory", "_name")
     def __init__(self, name=None, directory=None):
         self._directory = str(directory)
         self._name = str(name)
@@ -480,7 +955,7 @@ class XSImportConfiguration(object):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSImportConfiguration.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -505,6 +980,7 @@ class XSImportConfiguration(object):
 
 
 class XSConfiguration(object):
+    __slots__ = ("_XSImportConfiguration", "_XSPluginList")
     def __init__(self, XSPluginList=None, XSImportConfiguration=None):
         if XSImportConfiguration is None:
             self._XSImportConfiguration = []
@@ -612,7 +1088,7 @@ class XSConfiguration(object):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSConfiguration.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -638,6 +1114,7 @@ class XSConfiguration(object):
 
 class XSDataExecutionInfo(object):
     """This class contains details of the execution of a particular plugin."""
+    __slots__ = ("_baseDirectory", "_configuration", "_executionTime", "_pluginName", "_startOfExecution", "_systeminfo", "_workingDirectory")
     def __init__(self, workingDirectory=None, systeminfo=None, startOfExecution=None, pluginName=None, executionTime=None, configuration=None, baseDirectory=None):
         if baseDirectory is None:
             self._baseDirectory = None
@@ -868,7 +1345,7 @@ class XSDataExecutionInfo(object):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataExecutionInfo.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -893,6 +1370,7 @@ class XSDataExecutionInfo(object):
 
 
 class XSDataKeyValuePair(object):
+    __slots__ = ("_key", "_value")
     def __init__(self, value=None, key=None):
         if key is None:
             self._key = None
@@ -983,7 +1461,7 @@ class XSDataKeyValuePair(object):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataKeyValuePair.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -1008,6 +1486,7 @@ class XSDataKeyValuePair(object):
 
 
 class XSParamItem(object):
+    __slots__ = ("_name", "_value")
     def __init__(self, value=None, name=None):
         self._name = str(name)
         self._value = str(value)
@@ -1080,7 +1559,7 @@ class XSParamItem(object):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSParamItem.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -1105,6 +1584,7 @@ class XSParamItem(object):
 
 
 class XSParamList(object):
+    __slots__ = ("_XSParamItem",)
     def __init__(self, XSParamItem=None):
         if XSParamItem is None:
             self._XSParamItem = []
@@ -1188,7 +1668,7 @@ class XSParamList(object):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSParamList.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -1213,6 +1693,7 @@ class XSParamList(object):
 
 
 class XSPluginItem(object):
+    __slots__ = ("_XSParamList", "_name")
     def __init__(self, name=None, XSParamList=None):
         if XSParamList is None:
             self._XSParamList = None
@@ -1292,7 +1773,7 @@ class XSPluginItem(object):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSPluginItem.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -1317,6 +1798,7 @@ class XSPluginItem(object):
 
 
 class XSPluginList(object):
+    __slots__ = ("_XSPluginItem",)
     def __init__(self, XSPluginItem=None):
         if XSPluginItem is None:
             self._XSPluginItem = []
@@ -1400,7 +1882,7 @@ class XSPluginList(object):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSPluginList.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -1426,15 +1908,23 @@ class XSPluginList(object):
 
 class XSDataBoolean(XSData):
     """These simple objects that use built-in types are basically aimed to be used by the rest of the data model objects."""
+    __slots__ = ("_value",)
     def __init__(self, value=None):
         XSData.__init__(self, )
         self._value = bool(value)
     # Methods and properties for the 'value' attribute
     def getValue(self): return self._value
     def setValue(self, value):
+        checkNotInterned(self)
         self._value = bool(value)
-    def delValue(self): self._value = None
+    def delValue(self):
+        checkNotInterned(self)
+        self._value = None
     value = property(getValue, setValue, delValue, "Property for value")
+    #Class method returning a shared instance which cannot be modified
+    def intern( cls, value ):
+        return internValue(cls, value)
+    intern = classmethod( intern )
     def export(self, outfile, level, name_='XSDataBoolean'):
         showIndent(outfile, level)
         outfile.write(unicode('<%s>\n' % name_))
@@ -1488,7 +1978,7 @@ class XSDataBoolean(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataBoolean.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -1514,6 +2004,7 @@ class XSDataBoolean(XSData):
 
 class XSDataDouble(XSData):
     """These simple objects that use built-in types are basically aimed to be used by the rest of the data model objects."""
+    __slots__ = ("_value",)
     def __init__(self, value=None):
         XSData.__init__(self, )
         if value is None:
@@ -1523,12 +2014,19 @@ class XSDataDouble(XSData):
     # Methods and properties for the 'value' attribute
     def getValue(self): return self._value
     def setValue(self, value):
+        checkNotInterned(self)
         if value is None:
             self._value = None
         else:
             self._value = float(value)
-    def delValue(self): self._value = None
+    def delValue(self):
+        checkNotInterned(self)
+        self._value = None
     value = property(getValue, setValue, delValue, "Property for value")
+    #Class method returning a shared instance which cannot be modified
+    def intern( cls, value ):
+        return internValue(cls, value)
+    intern = classmethod( intern )
     def export(self, outfile, level, name_='XSDataDouble'):
         showIndent(outfile, level)
         outfile.write(unicode('<%s>\n' % name_))
@@ -1577,7 +2075,7 @@ class XSDataDouble(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataDouble.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -1603,6 +2101,7 @@ class XSDataDouble(XSData):
 
 class XSDataFile(XSData):
     """These objects use the simple objects described above to create useful structures for the rest for the data model."""
+    __slots__ = ("_path",)
     def __init__(self, path=None):
         XSData.__init__(self, )
         if path is None:
@@ -1667,7 +2166,7 @@ class XSDataFile(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataFile.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -1693,6 +2192,7 @@ class XSDataFile(XSData):
 
 class XSDataFloat(XSData):
     """These simple objects that use built-in types are basically aimed to be used by the rest of the data model objects."""
+    __slots__ = ("_value",)
     def __init__(self, value=None):
         XSData.__init__(self, )
         if value is None:
@@ -1702,12 +2202,19 @@ class XSDataFloat(XSData):
     # Methods and properties for the 'value' attribute
     def getValue(self): return self._value
     def setValue(self, value):
+        checkNotInterned(self)
         if value is None:
             self._value = None
         else:
             self._value = float(value)
-    def delValue(self): self._value = None
+    def delValue(self):
+        checkNotInterned(self)
+        self._value = None
     value = property(getValue, setValue, delValue, "Property for value")
+    #Class method returning a shared instance which cannot be modified
+    def intern( cls, value ):
+        return internValue(cls, value)
+    intern = classmethod( intern )
     def export(self, outfile, level, name_='XSDataFloat'):
         showIndent(outfile, level)
         outfile.write(unicode('<%s>\n' % name_))
@@ -1756,7 +2263,7 @@ class XSDataFloat(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataFloat.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -1782,6 +2289,7 @@ class XSDataFloat(XSData):
 
 class XSDataInput(XSData):
     """All plugin input and result classes should be derived from these two classes."""
+    __slots__ = ("_configuration",)
     def __init__(self, configuration=None):
         XSData.__init__(self, )
         if configuration is None:
@@ -1844,7 +2352,7 @@ class XSDataInput(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataInput.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -1870,6 +2378,7 @@ class XSDataInput(XSData):
 
 class XSDataInteger(XSData):
     """These simple objects that use built-in types are basically aimed to be used by the rest of the data model objects."""
+    __slots__ = ("_value",)
     def __init__(self, value=None):
         XSData.__init__(self, )
         if value is None:
@@ -1879,12 +2388,19 @@ class XSDataInteger(XSData):
     # Methods and properties for the 'value' attribute
     def getValue(self): return self._value
     def setValue(self, value):
+        checkNotInterned(self)
         if value is None:
             self._value = None
         else:
             self._value = int(value)
-    def delValue(self): self._value = None
+    def delValue(self):
+        checkNotInterned(self)
+        self._value = None
     value = property(getValue, setValue, delValue, "Property for value")
+    #Class method returning a shared instance which cannot be modified
+    def intern( cls, value ):
+        return internValue(cls, value)
+    intern = classmethod( intern )
     def export(self, outfile, level, name_='XSDataInteger'):
         showIndent(outfile, level)
         outfile.write(unicode('<%s>\n' % name_))
@@ -1933,7 +2449,7 @@ class XSDataInteger(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataInteger.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -1959,6 +2475,7 @@ class XSDataInteger(XSData):
 
 class XSDataMatrixDouble(XSData):
     """These are compound object used for linear algebra operations."""
+    __slots__ = ("_m11", "_m12", "_m13", "_m21", "_m22", "_m23", "_m31", "_m32", "_m33")
     def __init__(self, m33=None, m32=None, m31=None, m23=None, m22=None, m21=None, m13=None, m12=None, m11=None):
         XSData.__init__(self, )
         if m11 is None:
@@ -2238,7 +2755,7 @@ class XSDataMatrixDouble(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataMatrixDouble.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -2264,6 +2781,7 @@ class XSDataMatrixDouble(XSData):
 
 class XSDataMatrixInteger(XSData):
     """These are compound object used for linear algebra operations."""
+    __slots__ = ("_m11", "_m12", "_m13", "_m21", "_m22", "_m23", "_m31", "_m32", "_m33")
     def __init__(self, m33=None, m32=None, m31=None, m23=None, m22=None, m21=None, m13=None, m12=None, m11=None):
         XSData.__init__(self, )
         if m11 is None:
@@ -2543,7 +3061,7 @@ class XSDataMatrixInteger(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataMatrixInteger.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -2569,6 +3087,7 @@ class XSDataMatrixInteger(XSData):
 
 class XSDataResult(XSData):
     """All plugin input and result classes should be derived from these two classes."""
+    __slots__ = ("_status",)
     def __init__(self, status=None):
         XSData.__init__(self, )
         if status is None:
@@ -2631,7 +3150,7 @@ class XSDataResult(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataResult.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -2657,6 +3176,7 @@ class XSDataResult(XSData):
 
 class XSDataRotation(XSData):
     """These are compound object used for linear algebra operations."""
+    __slots__ = ("_q0", "_q1", "_q2", "_q3")
     def __init__(self, q3=None, q2=None, q1=None, q0=None):
         XSData.__init__(self, )
         if q0 is None:
@@ -2801,7 +3321,7 @@ class XSDataRotation(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataRotation.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -2827,6 +3347,7 @@ class XSDataRotation(XSData):
 
 class XSDataSize(XSData):
     """These objects use the simple objects described above to create useful structures for the rest for the data model."""
+    __slots__ = ("_x", "_y", "_z")
     def __init__(self, z=None, y=None, x=None):
         XSData.__init__(self, )
         if x is None:
@@ -2947,7 +3468,7 @@ class XSDataSize(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataSize.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -2973,15 +3494,23 @@ class XSDataSize(XSData):
 
 class XSDataString(XSData):
     """These simple objects that use built-in types are basically aimed to be used by the rest of the data model objects."""
+    __slots__ = ("_value",)
     def __init__(self, value=None):
         XSData.__init__(self, )
         self._value = str(value)
     # Methods and properties for the 'value' attribute
     def getValue(self): return self._value
     def setValue(self, value):
+        checkNotInterned(self)
         self._value = str(value)
-    def delValue(self): self._value = None
+    def delValue(self):
+        checkNotInterned(self)
+        self._value = None
     value = property(getValue, setValue, delValue, "Property for value")
+    #Class method returning a shared instance which cannot be modified
+    def intern( cls, value ):
+        return internValue(cls, value)
+    intern = classmethod( intern )
     def export(self, outfile, level, name_='XSDataString'):
         showIndent(outfile, level)
         outfile.write(unicode('<%s>\n' % name_))
@@ -3028,7 +3557,7 @@ class XSDataString(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataString.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -3054,6 +3583,7 @@ class XSDataString(XSData):
 
 class XSDataMessage(XSData):
     """This message class is used (amongst other messages) for warning and error messages."""
+    __slots__ = ("_debuginfo", "_level", "_text", "_type")
     def __init__(self, type=None, text=None, level=None, debuginfo=None):
         XSData.__init__(self, )
         if debuginfo is None:
@@ -3202,7 +3732,7 @@ class XSDataMessage(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataMessage.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -3228,6 +3758,7 @@ class XSDataMessage(XSData):
 
 class XSDataStatus(XSData):
     """This class contains all data related to the execution of a plugin."""
+    __slots__ = ("_executionInfo", "_executiveSummary", "_isSuccess", "_message")
     def __init__(self, message=None, isSuccess=None, executiveSummary=None, executionInfo=None):
         XSData.__init__(self, )
         if executionInfo is None:
@@ -3370,7 +3901,7 @@ class XSDataStatus(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataStatus.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -3396,6 +3927,7 @@ class XSDataStatus(XSData):
 
 class XSDataSysteminfo(XSData):
     """This class contains information about the system executing the plugin."""
+    __slots__ = ("_compiler", "_hostIP", "_hostName", "_operatingSystem", "_operatingSystemType", "_userName", "_virtualMachine")
     def __init__(self, virtualMachine=None, userName=None, operatingSystemType=None, operatingSystem=None, hostName=None, hostIP=None, compiler=None):
         XSData.__init__(self, )
         if compiler is None:
@@ -3628,7 +4160,7 @@ class XSDataSysteminfo(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataSysteminfo.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -3654,6 +4186,7 @@ class XSDataSysteminfo(XSData):
 
 class XSDataVectorDouble(XSData):
     """These are compound object used for linear algebra operations."""
+    __slots__ = ("_v1", "_v2", "_v3")
     def __init__(self, v3=None, v2=None, v1=None):
         XSData.__init__(self, )
         if v1 is None:
@@ -3771,7 +4304,7 @@ class XSDataVectorDouble(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataVectorDouble.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -3797,6 +4330,7 @@ class XSDataVectorDouble(XSData):
 
 class XSDataVectorInteger(XSData):
     """These are compound object used for linear algebra operations."""
+    __slots__ = ("_v1", "_v2", "_v3")
     def __init__(self, v3=None, v2=None, v1=None):
         XSData.__init__(self, )
         if v1 is None:
@@ -3914,7 +4448,7 @@ class XSDataVectorInteger(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataVectorInteger.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -3940,6 +4474,7 @@ class XSDataVectorInteger(XSData):
 
 class XSDataDate(XSDataString):
     """These simple objects that use built-in types are basically aimed to be used by the rest of the data model objects."""
+    __slots__ = ()
     def __init__(self, value=None):
         XSDataString.__init__(self, value)
     def export(self, outfile, level, name_='XSDataDate'):
@@ -3977,7 +4512,7 @@ class XSDataDate(XSDataString):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataDate.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -4002,6 +4537,7 @@ class XSDataDate(XSDataString):
 
 
 class XSDataDoubleWithUnit(XSDataDouble):
+    __slots__ = ("_error", "_unit")
     def __init__(self, value=None, unit=None, error=None):
         XSDataDouble.__init__(self, value)
         if error is None:
@@ -4090,7 +4626,7 @@ class XSDataDoubleWithUnit(XSDataDouble):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataDoubleWithUnit.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -4116,6 +4652,7 @@ class XSDataDoubleWithUnit(XSDataDouble):
 
 class XSDataImage(XSDataFile):
     """These objects use the simple objects described above to create useful structures for the rest for the data model."""
+    __slots__ = ("_date", "_number")
     def __init__(self, path=None, number=None, date=None):
         XSDataFile.__init__(self, path)
         if date is None:
@@ -4204,7 +4741,7 @@ class XSDataImage(XSDataFile):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataImage.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -4230,6 +4767,7 @@ class XSDataImage(XSDataFile):
 
 class XSDataMatrix(XSDataMatrixDouble):
     """XSDataMatrix is deprecated and should be replaced with XSDataMatrixDouble."""
+    __slots__ = ()
     def __init__(self, m33=None, m32=None, m31=None, m23=None, m22=None, m21=None, m13=None, m12=None, m11=None):
         XSDataMatrixDouble.__init__(self, m33, m32, m31, m23, m22, m21, m13, m12, m11)
     def export(self, outfile, level, name_='XSDataMatrix'):
@@ -4267,7 +4805,7 @@ class XSDataMatrix(XSDataMatrixDouble):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataMatrix.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -4294,6 +4832,7 @@ class XSDataMatrix(XSDataMatrixDouble):
 class XSDataUnitVector(XSDataVectorDouble):
     """<<Invariant>>
 {abs(v1**2.0 + v3**2.0-1.0) < epsilon}"""
+    __slots__ = ()
     def __init__(self, v3=None, v2=None, v1=None):
         XSDataVectorDouble.__init__(self, v3, v2, v1)
     def export(self, outfile, level, name_='XSDataUnitVector'):
@@ -4331,7 +4870,7 @@ class XSDataUnitVector(XSDataVectorDouble):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataUnitVector.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -4357,6 +4896,7 @@ class XSDataUnitVector(XSDataVectorDouble):
 
 class XSDataAbsorbedDoseRate(XSDataDoubleWithUnit):
     """These simple objects that use built-in types are basically aimed to be used by the rest of the data model objects."""
+    __slots__ = ()
     def __init__(self, value=None, unit=None, error=None):
         XSDataDoubleWithUnit.__init__(self, value, unit, error)
     def export(self, outfile, level, name_='XSDataAbsorbedDoseRate'):
@@ -4394,7 +4934,7 @@ class XSDataAbsorbedDoseRate(XSDataDoubleWithUnit):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataAbsorbedDoseRate.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -4420,6 +4960,7 @@ class XSDataAbsorbedDoseRate(XSDataDoubleWithUnit):
 
 class XSDataAngularSpeed(XSDataDoubleWithUnit):
     """These simple objects that use built-in types are basically aimed to be used by the rest of the data model objects."""
+    __slots__ = ()
     def __init__(self, value=None, unit=None, error=None):
         XSDataDoubleWithUnit.__init__(self, value, unit, error)
     def export(self, outfile, level, name_='XSDataAngularSpeed'):
@@ -4457,7 +4998,7 @@ class XSDataAngularSpeed(XSDataDoubleWithUnit):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataAngularSpeed.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -4483,6 +5024,7 @@ class XSDataAngularSpeed(XSDataDoubleWithUnit):
 
 class XSDataDisplacement(XSDataDoubleWithUnit):
     """These simple objects that use built-in types are basically aimed to be used by the rest of the data model objects."""
+    __slots__ = ()
     def __init__(self, value=None, unit=None, error=None):
         XSDataDoubleWithUnit.__init__(self, value, unit, error)
     def export(self, outfile, level, name_='XSDataDisplacement'):
@@ -4520,7 +5062,7 @@ class XSDataDisplacement(XSDataDoubleWithUnit):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataDisplacement.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -4546,6 +5088,7 @@ class XSDataDisplacement(XSDataDoubleWithUnit):
 
 class XSDataFlux(XSDataDoubleWithUnit):
     """These simple objects that use built-in types are basically aimed to be used by the rest of the data model objects."""
+    __slots__ = ()
     def __init__(self, value=None, unit=None, error=None):
         XSDataDoubleWithUnit.__init__(self, value, unit, error)
     def export(self, outfile, level, name_='XSDataFlux'):
@@ -4583,7 +5126,7 @@ class XSDataFlux(XSDataDoubleWithUnit):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataFlux.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -4609,6 +5152,7 @@ class XSDataFlux(XSDataDoubleWithUnit):
 
 class XSDataLength(XSDataDoubleWithUnit):
     """These simple objects that use built-in types are basically aimed to be used by the rest of the data model objects."""
+    __slots__ = ()
     def __init__(self, value=None, unit=None, error=None):
         XSDataDoubleWithUnit.__init__(self, value, unit, error)
     def export(self, outfile, level, name_='XSDataLength'):
@@ -4646,7 +5190,7 @@ class XSDataLength(XSDataDoubleWithUnit):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataLength.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -4672,6 +5216,7 @@ class XSDataLength(XSDataDoubleWithUnit):
 
 class XSDataSpeed(XSDataDoubleWithUnit):
     """These simple objects that use built-in types are basically aimed to be used by the rest of the data model objects."""
+    __slots__ = ()
     def __init__(self, value=None, unit=None, error=None):
         XSDataDoubleWithUnit.__init__(self, value, unit, error)
     def export(self, outfile, level, name_='XSDataSpeed'):
@@ -4709,7 +5254,7 @@ class XSDataSpeed(XSDataDoubleWithUnit):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataSpeed.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -4735,6 +5280,7 @@ class XSDataSpeed(XSDataDoubleWithUnit):
 
 class XSDataTime(XSDataDoubleWithUnit):
     """These simple objects that use built-in types are basically aimed to be used by the rest of the data model objects."""
+    __slots__ = ()
     def __init__(self, value=None, unit=None, error=None):
         XSDataDoubleWithUnit.__init__(self, value, unit, error)
     def export(self, outfile, level, name_='XSDataTime'):
@@ -4772,7 +5318,7 @@ class XSDataTime(XSDataDoubleWithUnit):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataTime.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -4798,6 +5344,7 @@ class XSDataTime(XSDataDoubleWithUnit):
 
 class XSDataWavelength(XSDataDoubleWithUnit):
     """These simple objects that use built-in types are basically aimed to be used by the rest of the data model objects."""
+    __slots__ = ()
     def __init__(self, value=None, unit=None, error=None):
         XSDataDoubleWithUnit.__init__(self, value, unit, error)
     def export(self, outfile, level, name_='XSDataWavelength'):
@@ -4835,7 +5382,7 @@ class XSDataWavelength(XSDataDoubleWithUnit):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataWavelength.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -4860,6 +5407,7 @@ class XSDataWavelength(XSDataDoubleWithUnit):
 
 
 class XSDataAngle(XSDataDisplacement):
+    __slots__ = ()
     def __init__(self, value=None, unit=None, error=None):
         XSDataDisplacement.__init__(self, value, unit, error)
     def export(self, outfile, level, name_='XSDataAngle'):
@@ -4897,7 +5445,7 @@ class XSDataAngle(XSDataDisplacement):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataAngle.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -4922,6 +5470,7 @@ class XSDataAngle(XSDataDisplacement):
 
 
 class XSDataLinearDisplacement(XSDataDisplacement):
+    __slots__ = ()
     def __init__(self, value=None, unit=None, error=None):
         XSDataDisplacement.__init__(self, value, unit, error)
     def export(self, outfile, level, name_='XSDataLinearDisplacement'):
@@ -4959,7 +5508,7 @@ class XSDataLinearDisplacement(XSDataDisplacement):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataLinearDisplacement.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
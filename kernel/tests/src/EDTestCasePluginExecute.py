@@ -42,6 +42,7 @@ from EDTestCasePlugin                    import EDTestCasePlugin
 from EDFactoryPluginStatic               import EDFactoryPluginStatic
 from EDUtilsFile                         import EDUtilsFile
 from EDUtilsParallel                     import EDUtilsParallel
+from EDDataFileWriter                    import EDDataFileWriter
 
 class EDTestCasePluginExecute(EDTestCasePlugin):
     """
@@ -212,6 +213,8 @@ class EDTestCasePluginExecute(EDTestCasePlugin):
         """
         EDVerbose.DEBUG("EDTestCasePluginExecute: Executing " + self.getPluginName())
         self._edPlugin.executeSynchronous()
+        # The data input / output files are written in the background
+        EDDataFileWriter.flush()
         # Check that the plugin didn't end in failure
         EDAssert.equal(self._bAcceptPluginFailure , self._edPlugin.isFailure(), \
                        "Plugin failure assert: should be %r, was %r" % (self._bAcceptPluginFailure , self._edPlugin.isFailure()))
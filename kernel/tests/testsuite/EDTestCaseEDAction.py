@@ -0,0 +1,106 @@
+#
+#    Project: The EDNA Kernel
+#             http://www.edna-site.org
+#
+#    Copyright (C) European Synchrotron Radiation Facility, Grenoble, France
+#
+#    Principal authors: Olof Svensson (svensson@esrf.fr)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    and the GNU Lesser General Public License  along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+
+__author__ = "Olof Svensson"
+__contact__ = "svensson@esrf.fr"
+__license__ = "LGPLv3+"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+
+import time
+import threading
+
+from EDAction import EDAction
+from EDAssert import EDAssert
+from EDTestCase import EDTestCase
+
+
+class EDActionSleep(EDAction):
+
+    def __init__(self, _fSleepTime=0.0):
+        EDAction.__init__(self)
+        self.fSleepTime = _fSleepTime
+
+    def process(self, _edAction=None):
+        time.sleep(self.fSleepTime)
+
+
+class EDTestCaseEDAction(EDTestCase):
+    """
+    Test case for the start and completion notification of EDAction.
+    """
+
+    def testSynchronizeLatency(self):
+        """
+        Synchronizing short actions must not add polling latency
+        """
+        fTimeStart = time.time()
+        listAction = []
+        for i in range(20):
+            edAction = EDActionSleep()
+            edAction.execute()
+            edAction.synchronize()
+            listAction.append(edAction)
+        self.screen("20 short actions executed and synchronized in %.3f s" % (time.time() - fTimeStart))
+        EDAssert.equal(20, len([edAction for edAction in listAction if edAction.isEnded()]), "All actions ended")
+
+
+    def testSynchronizeBeforeExecute(self):
+        """
+        synchronize called before execute waits for the action to be executed
+        """
+        edAction = EDActionSleep()
+        timer = threading.Timer(0.2, edAction.execute)
+        timer.start()
+        fTimeStart = time.time()
+        edAction.synchronize()
+        self.screen("Action executed after 0.2 s synchronized after %.3f s" % (time.time() - fTimeStart))
+        EDAssert.equal(True, edAction.isEnded(), "Action ended")
+
+
+    def testWaitAnyWaitAll(self):
+        """
+        waitAny returns the first finished action, waitAll waits for all of them
+        """
+        edActionSlow = EDActionSleep(1.0)
+        edActionFast = EDActionSleep(0.1)
+        listAction = [edActionSlow, edActionFast]
+        for edAction in listAction:
+            edAction.execute()
+        edActionFirst = EDAction.waitAny(listAction, 5)
+        EDAssert.equal(True, edActionFirst is edActionFast, "waitAny returned the fast action")
+        EDAssert.equal(False, EDAction.waitAll(listAction, 0.01), "waitAll timed out")
+        EDAssert.equal(True, EDAction.waitAll(listAction, 5), "waitAll returned after all actions ended")
+        EDAssert.equal(True, edActionSlow.isEnded(), "Slow action ended")
+
+
+    def process(self):
+        self.addTestMethod(self.testSynchronizeLatency)
+        self.addTestMethod(self.testSynchronizeBeforeExecute)
+        self.addTestMethod(self.testWaitAnyWaitAll)
+
+
+
+if __name__ == '__main__':
+
+    edTestCaseEDAction = EDTestCaseEDAction("EDTestCaseEDAction")
+    edTestCaseEDAction.execute()
@@ -0,0 +1,170 @@
+#
+#    Project: The EDNA Kernel
+#             http://www.edna-site.org
+#
+#    Copyright (C) European Synchrotron Radiation Facility, Grenoble, France
+#
+#    Principal authors: Olof Svensson (svensson@esrf.fr)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    and the GNU Lesser General Public License  along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+
+__author__ = "Olof Svensson"
+__contact__ = "svensson@esrf.fr"
+__license__ = "LGPLv3+"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+
+import os
+import threading
+
+from EDAction import EDAction
+from EDExecutor import EDExecutor
+from EDAssert import EDAssert
+from EDTestCase import EDTestCase
+
+
+class EDActionRecordThread(EDAction):
+
+    def __init__(self):
+        EDAction.__init__(self)
+        self.strThreadName = None
+
+    def process(self, _edAction=None):
+        self.strThreadName = threading.current_thread().name
+
+
+class EDActionBlocking(EDAction):
+    """
+    Action waiting for an event
+    """
+
+    def __init__(self):
+        EDAction.__init__(self)
+        self.event = threading.Event()
+
+    def process(self, _edAction=None):
+        self.event.wait(20)
+
+
+
+class EDActionNested(EDAction):
+    """
+    Action executing and waiting for a child action
+    """
+
+    def __init__(self):
+        EDAction.__init__(self)
+        self.edActionChild = EDActionRecordThread()
+
+    def process(self, _edAction=None):
+        self.edActionChild.execute()
+        self.edActionChild.synchronize()
+        if self.edActionChild.isFailure():
+            self.setFailure()
+
+
+class EDTestCaseEDExecutor(EDTestCase):
+    """
+    Test case for the EDExecutor used by EDAction.
+    """
+
+    def testManyActionsBoundedThreads(self):
+        """
+        Executes more actions than workers in the pool and checks that
+        they are all run by a bounded set of threads.
+        """
+        EDExecutor.uninitialize()
+        EDExecutor.initialize(_iMaxWorkers=4, _strMode=EDExecutor.MODE_POOL)
+        try:
+            listAction = []
+            for i in range(200):
+                edAction = EDActionRecordThread()
+                edAction.execute()
+                listAction.append(edAction)
+            setThreadName = set()
+            for edAction in listAction:
+                edAction.synchronize()
+                setThreadName.add(edAction.strThreadName)
+            EDAssert.equal(True, all(edAction.isEnded() for edAction in listAction), "All actions ended")
+            EDAssert.lowerThan(len(setThreadName), 6, "At most 4 workers + caller thread used")
+        finally:
+            EDExecutor.uninitialize()
+
+
+    def testNestedActionsSingleWorker(self):
+        """
+        A pool of size one must not dead-lock when an action waits for a child action.
+        """
+        EDExecutor.uninitialize()
+        EDExecutor.initialize(_iMaxWorkers=1, _strMode=EDExecutor.MODE_POOL)
+        try:
+            listAction = []
+            for i in range(10):
+                edAction = EDActionNested()
+                edAction.setTimeOut(20)
+                edAction.execute()
+                listAction.append(edAction)
+            for edAction in listAction:
+                edAction.synchronize()
+            EDAssert.equal(False, any(edAction.isTimeOut() for edAction in listAction), "No time out")
+            EDAssert.equal(True, all(edAction.edActionChild.isEnded() for edAction in listAction), "All child actions ended")
+        finally:
+            EDExecutor.uninitialize()
+
+
+    def testJoinTimeOut(self):
+        """
+        A thread which is not a worker doesn't run a queued action inline when
+        waiting with a time out, the time out is kept
+        """
+        EDExecutor.uninitialize()
+        EDExecutor.initialize(_iMaxWorkers=1, _strMode=EDExecutor.MODE_POOL)
+        try:
+            edActionBlocking = EDActionBlocking()
+            edActionBlocking.execute()
+            edAction = EDActionRecordThread()
+            edAction.execute()
+            edAction.join(0.2)
+            EDAssert.equal(None, edAction.strThreadName, "Queued action not run by the waiting thread")
+            EDAssert.equal(False, EDExecutor.isWorkerThread(), "Waiting thread is not a worker")
+            edActionBlocking.event.set()
+            edAction.synchronize()
+            EDAssert.equal(True, edAction.strThreadName.startswith("EDExecutor"), "Action run by the worker")
+        finally:
+            EDExecutor.uninitialize()
+
+
+    def testSubmit(self):
+        """
+        Generic callables submitted to the executor
+        """
+        future = EDExecutor.submit(pow, 2, 10)
+        EDAssert.equal(1024, future.result(10), "Thread pool result")
+        future = EDExecutor.submitProcess(os.getpid)
+        EDAssert.equal(True, future.result(60) != os.getpid(), "Process pool result from another process")
+
+
+    def process(self):
+        self.addTestMethod(self.testManyActionsBoundedThreads)
+        self.addTestMethod(self.testNestedActionsSingleWorker)
+        self.addTestMethod(self.testJoinTimeOut)
+        self.addTestMethod(self.testSubmit)
+
+
+
+if __name__ == '__main__':
+
+    edTestCaseEDExecutor = EDTestCaseEDExecutor("EDTestCaseEDExecutor")
+    edTestCaseEDExecutor.execute()
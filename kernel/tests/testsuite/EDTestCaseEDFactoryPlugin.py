@@ -30,6 +30,10 @@ __contact__ = "svensson@esrf.fr"
 __license__ = "LGPLv3+"
 __copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
 
+import os
+import shutil
+import tempfile
+
 from EDTestCase import EDTestCase
 from EDAssert import EDAssert
 from EDFactoryPlugin import EDFactoryPlugin
@@ -79,6 +83,39 @@ class EDTestCaseEDFactoryPlugin(EDTestCase):
         edFactoryPlugin.loadModuleDictionaryFromDisk("testDictionary.xml")
 
 
+    def testIncrementalRescan(self):
+        """
+        Modules added after the index was written are found, modules in ignored directories
+        are not, and the index written to disk can be reused by another factory
+        """
+        strRoot = tempfile.mkdtemp(prefix="EDFactoryPlugin-")
+        strPluginDir = os.path.join(strRoot, "plugins", "EDPluginTestRescan-v1.0", "plugins")
+        os.makedirs(strPluginDir)
+        open(os.path.join(strPluginDir, "EDPluginTestRescanFirst.py"), "w").close()
+        edFactoryPlugin = EDFactoryPlugin()
+        edFactoryPlugin.addPluginRootDirectory(strRoot)
+        EDAssert.equal(strPluginDir, edFactoryPlugin.getModuleLocation("EDPluginTestRescanFirst"), "Module in new root directory")
+        EDAssert.equal(None, edFactoryPlugin.getModuleLocation("EDPluginTestRescanSecond"), "Missing module")
+        open(os.path.join(strPluginDir, "EDPluginTestRescanSecond.py"), "w").close()
+        EDAssert.equal(None, edFactoryPlugin.getModuleLocation("EDPluginTestRescanSecond"), "Missing module is cached")
+        edFactoryPlugin.addPluginRootDirectory(os.path.join(strRoot, "plugins"))
+        EDAssert.equal(strPluginDir, edFactoryPlugin.getModuleLocation("EDPluginTestRescanSecond"), "Module added after indexing")
+        strIgnoredDir = os.path.join(strRoot, "ignored")
+        os.makedirs(os.path.join(strIgnoredDir, "src"))
+        open(os.path.join(strIgnoredDir, EDFactoryPlugin.IGNORE_FILE), "w").close()
+        open(os.path.join(strIgnoredDir, "src", "XSDataTestRescanIgnored.py"), "w").close()
+        EDAssert.equal(None, edFactoryPlugin.getModuleLocation("XSDataTestRescanIgnored"), "Module in ignored directory")
+        EDAssert.equal(strIgnoredDir, edFactoryPlugin.checkDirectoriesForIgnoreFile(os.path.join(strIgnoredDir, "src")), "Ignored directory")
+        strIndexPath = os.path.join(strRoot, "index.json")
+        edFactoryPlugin.saveModuleDictionaryToDisk(strIndexPath)
+        edFactoryPlugin2 = EDFactoryPlugin()
+        edFactoryPlugin2.addPluginRootDirectory(strRoot)
+        edFactoryPlugin2.addPluginRootDirectory(os.path.join(strRoot, "plugins"))
+        edFactoryPlugin2.loadModuleDictionaryFromDisk(strIndexPath)
+        EDAssert.equal(strPluginDir, edFactoryPlugin2.getModuleLocation("EDPluginTestRescanSecond"), "Module location from index")
+        shutil.rmtree(strRoot)
+
+
 
 
 
@@ -91,6 +128,7 @@ class EDTestCaseEDFactoryPlugin(EDTestCase):
         self.addTestMethod(self.testLoadPlugin)
         self.addTestMethod(self.testSaveModuleDictionaryToDisk)
         self.addTestMethod(self.testLoadModuleDictionaryFromDisk)
+        self.addTestMethod(self.testIncrementalRescan)
 
 
 
@@ -0,0 +1,116 @@
+#
+#    Project: The EDNA Kernel
+#             http://www.edna-site.org
+#
+#    Copyright (C) European Synchrotron Radiation Facility, Grenoble, France
+#
+#    Principal authors: Olof Svensson (svensson@esrf.fr)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    and the GNU Lesser General Public License  along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+
+__author__ = "Olof Svensson"
+__contact__ = "svensson@esrf.fr"
+__license__ = "LGPLv3+"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+
+import os
+import time
+import shutil
+import tempfile
+import threading
+
+from EDAssert import EDAssert
+from EDTestCase import EDTestCase
+from EDFileWatcher import EDFileWatcher
+
+
+class EDTestCaseEDFileWatcher(EDTestCase):
+    """
+    Test case for the shared file arrival watcher.
+    """
+
+    def preProcess(self):
+        EDTestCase.preProcess(self)
+        self.strTestDirectory = tempfile.mkdtemp(prefix="EDTestCaseEDFileWatcher-")
+
+
+    def postProcess(self):
+        EDTestCase.postProcess(self)
+        shutil.rmtree(self.strTestDirectory, ignore_errors=True)
+
+
+    def writeFile(self, _strPath, _iSize):
+        with open(_strPath, "wb") as f:
+            f.write(b"\0" * _iSize)
+
+
+    def testExistingFile(self):
+        strPath = os.path.join(self.strTestDirectory, "existing.cbf")
+        self.writeFile(strPath, 10)
+        edExpectation = EDFileWatcher.waitFile(strPath, None, 5)
+        EDAssert.equal(True, edExpectation.isComplete(), "Existing file is complete")
+        EDAssert.equal(10, edExpectation.size, "Size of existing file")
+
+
+    def testManyFilesWrittenLater(self):
+        """
+        Many files are expected at once and written after a delay
+        """
+        listPath = [os.path.join(self.strTestDirectory, "image_%04d.cbf" % i) for i in range(1, 101)]
+        def writeAll():
+            for strPath in listPath:
+                self.writeFile(strPath, 200)
+        timer = threading.Timer(0.2, writeAll)
+        timer.start()
+        fTimeStart = time.time()
+        listExpectation = EDFileWatcher.waitFiles(listPath, 100, 10)
+        fTimeElapsed = time.time() - fTimeStart
+        iComplete = len([edExpectation for edExpectation in listExpectation if edExpectation.isComplete()])
+        self.screen("100 files written after 0.2 s detected after %.3f s" % fTimeElapsed)
+        EDAssert.equal(100, iComplete, "All files are complete")
+
+
+    def testSizeAndTimeOut(self):
+        """
+        A file smaller than the expected size times out, a later subdirectory is found by the scans
+        """
+        strPath = os.path.join(self.strTestDirectory, "small.cbf")
+        self.writeFile(strPath, 10)
+        edExpectation = EDFileWatcher.waitFile(strPath, 100, 0.5)
+        EDAssert.equal(False, edExpectation.isComplete(), "Too small file is not complete")
+        EDAssert.equal(10, edExpectation.size, "Last observed size")
+        strSubDirectory = os.path.join(self.strTestDirectory, "sub")
+        strPath = os.path.join(strSubDirectory, "late.cbf")
+        def writeLater():
+            os.mkdir(strSubDirectory)
+            self.writeFile(strPath, 200)
+        timer = threading.Timer(0.2, writeLater)
+        timer.start()
+        edExpectation = EDFileWatcher.waitFile(strPath, 100, 10)
+        EDAssert.equal(True, edExpectation.isComplete(), "File in a new directory is complete")
+
+
+    def process(self):
+        self.addTestMethod(self.testExistingFile)
+        self.addTestMethod(self.testManyFilesWrittenLater)
+        self.addTestMethod(self.testSizeAndTimeOut)
+
+
+
+if __name__ == '__main__':
+
+    edTestCaseEDFileWatcher = EDTestCaseEDFileWatcher("EDTestCaseEDFileWatcher")
+    edTestCaseEDFileWatcher.execute()
@@ -0,0 +1,142 @@
+#
+#    Project: The EDNA Kernel
+#             http://www.edna-site.org
+#
+#    Copyright (C) European Synchrotron Radiation Facility, Grenoble, France
+#
+#    Principal authors: Olof Svensson (svensson@esrf.fr)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    and the GNU Lesser General Public License  along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+
+__author__ = "Olof Svensson"
+__contact__ = "svensson@esrf.fr"
+__license__ = "LGPLv3+"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+
+import os
+import shutil
+import tempfile
+
+from EDAssert import EDAssert
+from EDTestCase import EDTestCase
+from EDFrameProviderHDF5 import EDFrameProviderHDF5
+
+
+class EDTestCaseEDFrameProviderHDF5(EDTestCase):
+    """
+    Test case for the direct access to Eiger HDF5 frames.
+    """
+
+    def preProcess(self):
+        EDTestCase.preProcess(self)
+        self.strTestDirectory = tempfile.mkdtemp(prefix="EDTestCaseEDFrameProviderHDF5-")
+
+
+    def postProcess(self):
+        EDTestCase.postProcess(self)
+        EDFrameProviderHDF5.clearCache()
+        shutil.rmtree(self.strTestDirectory, ignore_errors=True)
+
+
+    def testFrameReference(self):
+        """
+        Image paths are resolved to the closest master file not after the image
+        """
+        for iNumber in [1, 11]:
+            open(os.path.join(self.strTestDirectory, "mesh_%d_master.h5" % iNumber), "w").close()
+        strMasterFile1 = os.path.join(self.strTestDirectory, "mesh_1_master.h5")
+        strMasterFile11 = os.path.join(self.strTestDirectory, "mesh_11_master.h5")
+        EDAssert.equal((strMasterFile1, 5), EDFrameProviderHDF5.getFrameReference(
+            os.path.join(self.strTestDirectory, "mesh_0005.h5")), "Image in first master file")
+        EDAssert.equal((strMasterFile11, 3), EDFrameProviderHDF5.getFrameReference(
+            os.path.join(self.strTestDirectory, "mesh_0013.h5")), "Image in second master file")
+        EDAssert.equal((strMasterFile1, 13), EDFrameProviderHDF5.getFrameReference(
+            os.path.join(self.strTestDirectory, "mesh_0013.h5"), 1), "Given HDF5 image number")
+        EDAssert.equal((strMasterFile11, 1), EDFrameProviderHDF5.getFrameReference(strMasterFile11), "Master file")
+        EDAssert.equal((os.path.join(self.strTestDirectory, "line_master.h5"), 7), EDFrameProviderHDF5.getFrameReference(
+            os.path.join(self.strTestDirectory, "line_0007.h5")), "No numbered master file")
+
+
+    def testGetFrame(self):
+        """
+        Frames of chunked and contiguous data sets
+        """
+        import numpy
+        import h5py
+        arrayData = numpy.arange(5 * 30 * 40, dtype=numpy.uint32).reshape(5, 30, 40)
+        for (strName, tupleChunk) in [("chunked", (1, 30, 40)), ("contiguous", None)]:
+            strDataFile = os.path.join(self.strTestDirectory, "%s_1_data_000001.h5" % strName)
+            with h5py.File(strDataFile, "w") as h5File:
+                h5DataSet = h5File.create_dataset("/entry/data/data", data=arrayData, chunks=tupleChunk)
+                h5DataSet.attrs["image_nr_low"] = 1
+                h5DataSet.attrs["image_nr_high"] = 5
+            strMasterFile = os.path.join(self.strTestDirectory, "%s_1_master.h5" % strName)
+            with h5py.File(strMasterFile, "w") as h5File:
+                h5File["/entry/data/data_000001"] = h5py.ExternalLink(os.path.basename(strDataFile), "/entry/data/data")
+                h5File["/entry/instrument/detector/beam_center_x"] = 12.5
+            EDAssert.equal(5, EDFrameProviderHDF5.getNumberOfFrames(strMasterFile), "Number of frames %s" % strName)
+            EDAssert.equal(12.5, EDFrameProviderHDF5.getMetadata(strMasterFile)["beamX"], "Metadata %s" % strName)
+            for iFrameNumber in [3, 1, 5]:
+                arrayFrame = EDFrameProviderHDF5.getImage(os.path.join(self.strTestDirectory, "%s_%04d.h5" % (strName, iFrameNumber)))
+                EDAssert.equal(True, bool((arrayFrame == arrayData[iFrameNumber - 1]).all()), "Frame %d %s" % (iFrameNumber, strName))
+
+
+    def testChunkCache(self):
+        """
+        The chunk cache is bounded in bytes, frames read concurrently are correct
+        """
+        import numpy
+        import h5py
+        import threading
+        arrayData = numpy.arange(8 * 30 * 40, dtype=numpy.uint32).reshape(8, 30, 40)
+        strDataFile = os.path.join(self.strTestDirectory, "cache_1_data_000001.h5")
+        with h5py.File(strDataFile, "w") as h5File:
+            h5File.create_dataset("/entry/data/data", data=arrayData, chunks=(1, 30, 40), compression="gzip")
+        strMasterFile = os.path.join(self.strTestDirectory, "cache_1_master.h5")
+        with h5py.File(strMasterFile, "w") as h5File:
+            h5File["/entry/data/data_000001"] = h5py.ExternalLink(os.path.basename(strDataFile), "/entry/data/data")
+        iMaxCachedBytes = EDFrameProviderHDF5.iMaxCachedBytes
+        EDFrameProviderHDF5.iMaxCachedBytes = 3 * arrayData[0].nbytes
+        try:
+            listError = []
+            def readFrames():
+                for iFrameNumber in range(1, 9):
+                    if not (EDFrameProviderHDF5.getFrame(strMasterFile, iFrameNumber) == arrayData[iFrameNumber - 1]).all():
+                        listError.append(iFrameNumber)
+            listThread = [threading.Thread(target=readFrames) for iThread in range(4)]
+            for thread in listThread:
+                thread.start()
+            for thread in listThread:
+                thread.join()
+            EDAssert.equal([], listError, "Frames read concurrently")
+            EDAssert.equal(3 * arrayData[0].nbytes, EDFrameProviderHDF5._iCachedBytes, "Cached bytes")
+            EDAssert.equal(3, len(EDFrameProviderHDF5._dictChunk), "Number of cached chunks")
+        finally:
+            EDFrameProviderHDF5.iMaxCachedBytes = iMaxCachedBytes
+
+
+    def process(self):
+        self.addTestMethod(self.testFrameReference)
+        if EDFrameProviderHDF5.isAvailable():
+            self.addTestMethod(self.testGetFrame)
+            self.addTestMethod(self.testChunkCache)
+
+
+
+if __name__ == '__main__':
+
+    edTestCaseEDFrameProviderHDF5 = EDTestCaseEDFrameProviderHDF5("EDTestCaseEDFrameProviderHDF5")
+    edTestCaseEDFrameProviderHDF5.execute()
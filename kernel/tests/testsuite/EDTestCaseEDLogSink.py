@@ -0,0 +1,99 @@
+#
+#    Project: The EDNA Kernel
+#             http://www.edna-site.org
+#
+#    Copyright (C) European Synchrotron Radiation Facility, Grenoble, France
+#
+#    Principal authors: Olof Svensson (svensson@esrf.fr)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    and the GNU Lesser General Public License  along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+
+__author__ = "Olof Svensson"
+__contact__ = "svensson@esrf.fr"
+__license__ = "LGPLv3+"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+
+import threading
+
+from EDAssert import EDAssert
+from EDTestCase import EDTestCase
+from EDVerbose import EDVerbose
+from EDPlugin import EDPlugin
+from EDLogSink import EDLogSink
+
+
+class EDTestCaseEDLogSink(EDTestCase):
+    """
+    Test case for the process-wide log sink.
+    """
+
+    class CountStr(object):
+        iCount = 0
+        def __str__(self):
+            EDTestCaseEDLogSink.CountStr.iCount += 1
+            return "CountStr"
+
+
+    def testLazyFormatting(self):
+        bIsVerboseDebug = EDVerbose.isVerboseDebug()
+        EDVerbose.setVerboseDebugOff()
+        edPlugin = EDPlugin()
+        oCountStr = EDTestCaseEDLogSink.CountStr()
+        for iIndex in range(1000):
+            edPlugin.DEBUG("Message %d %s", iIndex, oCountStr)
+            EDVerbose.DEBUG("Message %d %s", iIndex, oCountStr)
+        EDLogSink.flush()
+        EDAssert.equal(0, EDTestCaseEDLogSink.CountStr.iCount, "Debug messages not formatted if debug is off")
+        EDVerbose.log("Message %s", oCountStr)
+        EDLogSink.flush()
+        EDAssert.equal(1, EDTestCaseEDLogSink.CountStr.iCount, "Message formatted once written")
+        EDVerbose.log("Message without arguments: 100%")
+        if bIsVerboseDebug:
+            EDVerbose.setVerboseDebugOn()
+
+
+    def testRecords(self):
+        edPlugin = EDPlugin()
+        listThread = []
+        for iThread in range(4):
+            thread = threading.Thread(target=edPlugin.log, name="EDTestCaseEDLogSink-%d" % iThread,
+                                      args=("testRecords message from thread %d", iThread))
+            listThread.append(thread)
+            thread.start()
+        for thread in listThread:
+            thread.join()
+        EDVerbose.flush()
+        EDAssert.equal(0, EDLogSink._queue.unfinished_tasks, "No pending records after flush")
+        strLogFileName = EDVerbose.getLogFileName()
+        if strLogFileName is not None:
+            with open(strLogFileName) as f:
+                listLine = [strLine for strLine in f.readlines() if "testRecords message" in strLine]
+            EDAssert.equal(4, len(listLine), "All messages in the log file")
+            strSource = "EDPlugin-%08d]" % edPlugin.getId()
+            for strLine in listLine:
+                EDAssert.equal(True, "[EDTestCaseEDLogSink-" in strLine and strSource in strLine, "Thread and source in %s" % strLine.strip())
+
+
+    def process(self):
+        self.addTestMethod(self.testLazyFormatting)
+        self.addTestMethod(self.testRecords)
+
+
+
+if __name__ == '__main__':
+
+    edTestCaseEDLogSink = EDTestCaseEDLogSink("EDTestCaseEDLogSink")
+    edTestCaseEDLogSink.execute()
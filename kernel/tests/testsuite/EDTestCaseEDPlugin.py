@@ -33,9 +33,12 @@ __license__ = "LGPLv3+"
 __copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
 
 import os
+import time
 from EDAssert   import EDAssert
 from EDPlugin   import EDPlugin
+from EDPluginControl import EDPluginControl
 from EDTestCase import EDTestCase
+from EDDataFileWriter import EDDataFileWriter
 
 from XSDataCommon import XSDataString
 from XSDataCommon import XSDataResult
@@ -192,6 +195,74 @@ class EDTestCaseEDPlugin(EDTestCase):
         EDAssert.equal(True, os.path.exists(os.path.join(edPlugin.getWorkingDirectory(), "_testData_1_dataOutput.xml")), "Test 3: several Outputs with the same name, XML Output, 2")
 
 
+    def testDataFormat(self):
+        # Test 1: JSON data input and output files
+        edPlugin = EDPlugin()
+        edPlugin.setDataFormat("json")
+        edPlugin.configure()
+        edPlugin.setXSDataInputClass(XSDataString)
+        xsDataStringTest = XSDataString("Test")
+        edPlugin.setDataInput(xsDataStringTest)
+        edPlugin.setDataOutput(xsDataStringTest)
+        edPlugin.writeDataInput()
+        edPlugin.writeDataOutput()
+        strPath = os.path.join(edPlugin.getWorkingDirectory(), "_dataInput.json")
+        EDAssert.equal(True, os.path.exists(strPath), "Test 1: default input with JSON")
+        with open(strPath) as f:
+            EDAssert.equal(xsDataStringTest.marshal(), XSDataString.parseJSON(f.read()).marshal(), "Test 1: JSON input file")
+        EDAssert.equal(True, os.path.exists(os.path.join(edPlugin.getWorkingDirectory(), "_dataOutput.json")), "Test 1: default output with JSON")
+        # Test 2: binary data output file
+        edPlugin = EDPlugin()
+        edPlugin.setDataFormat("binary")
+        edPlugin.configure()
+        edPlugin.setDataOutput(xsDataStringTest, "testData")
+        edPlugin.writeDataOutput()
+        strPath = os.path.join(edPlugin.getWorkingDirectory(), "_testData_0_dataOutput.bin")
+        with open(strPath, "rb") as f:
+            EDAssert.equal(xsDataStringTest.marshal(), XSDataString.parseBinary(f.read()).marshal(), "Test 2: binary output file")
+        # Test 3: data input in JSON and binary format
+        edPlugin = EDPlugin()
+        edPlugin.setXSDataInputClass(XSDataString)
+        edPlugin.dataInput = xsDataStringTest.marshalJSON()
+        EDAssert.equal(xsDataStringTest.marshal(), edPlugin.dataInput.marshal(), "Test 3: data input in JSON")
+        edPlugin.dataInput = xsDataStringTest.marshalBinary()
+        EDAssert.equal(xsDataStringTest.marshal(), edPlugin.dataInput.marshal(), "Test 3: data input in binary format")
+        # Test 4: unknown format
+        edPlugin = EDPlugin()
+        edPlugin.setDataFormat("yaml")
+        EDAssert.equal("xml", edPlugin.getDataFormat(), "Test 4: unknown format")
+
+
+    def testDataFilePolicy(self):
+        # Test 1: asynchronous writing of a copy of the data
+        edPlugin = EDPlugin()
+        edPlugin.configure()
+        EDAssert.equal("always", edPlugin.getDataFilePolicy(), "Test 1: default policy")
+        xsDataStringTest = XSDataString("Test")
+        edPlugin.setDataOutput(xsDataStringTest)
+        edPlugin.writeDataOutput(_bAsynchronous=True)
+        xsDataStringTest.value = "Modified"
+        EDDataFileWriter.flush()
+        strPath = os.path.join(edPlugin.getWorkingDirectory(), "_dataOutput.xml")
+        with open(strPath) as f:
+            EDAssert.equal("Test", XSDataString.parseString(f.read()).value, "Test 1: snapshot of the output written")
+        EDAssert.equal(0, EDDataFileWriter.getNumberOfPendingFiles(), "Test 1: no pending files")
+        # Test 2: policies
+        edPlugin = EDPlugin()
+        edPlugin.setDataFilePolicy("never")
+        EDAssert.equal(False, edPlugin.isDataFileDumped(), "Test 2: never")
+        edPlugin.setDataFilePolicy("onFailure")
+        EDAssert.equal(False, edPlugin.isDataFileDumped(), "Test 2: on failure, success")
+        edPlugin.setFailure()
+        EDAssert.equal(True, edPlugin.isDataFileDumped(), "Test 2: on failure, failure")
+        edPlugin.setDataFilePolicy("sampled", 0.0)
+        EDAssert.equal(False, edPlugin.isDataFileDumped(), "Test 2: sampled, 0%")
+        edPlugin.setDataFilePolicy("sampled", 1.0)
+        EDAssert.equal(True, edPlugin.isDataFileDumped(), "Test 2: sampled, 100%")
+        edPlugin.setDataFilePolicy("sometimes")
+        EDAssert.equal("always", edPlugin.getDataFilePolicy(), "Test 2: unknown policy")
+
+
     def testDataInputOutputProperties(self):
         # Test dataInput property with XSDataObject
         edPlugin = EDPlugin()
@@ -244,6 +315,51 @@ class EDTestCaseEDPlugin(EDTestCase):
         EDAssert.equal(True, os.path.exists(strWorkingDir), "Test 1 : naming of working directory")
 
 
+    def testLazyWorkingDirectory(self):
+        # Test 1 : the working directory is created when it's used
+        edPlugin = EDPlugin()
+        edPlugin.setBaseName(edPlugin.createBaseName())
+        edPlugin.configure()
+        strWorkingDir = os.path.join(edPlugin.getBaseDirectory(), edPlugin.getBaseName())
+        EDAssert.equal(False, os.path.exists(strWorkingDir), "Test 1 : working directory not yet created")
+        EDAssert.equal(strWorkingDir, edPlugin.getWorkingDirectory(), "Test 1 : working directory path")
+        EDAssert.equal(True, os.path.isdir(strWorkingDir), "Test 1 : working directory created")
+        # Test 2 : an existing directory with a generated name is not reused
+        edPlugin2 = EDPlugin()
+        edPlugin2.setBaseName(edPlugin2.createBaseName())
+        strWorkingDir = os.path.join(edPlugin2.getBaseDirectory(), edPlugin2.getBaseName())
+        os.mkdir(strWorkingDir)
+        EDAssert.equal(True, edPlugin2.getWorkingDirectory() != strWorkingDir, "Test 2 : alternative working directory")
+        EDAssert.equal(True, os.path.isdir(edPlugin2.getWorkingDirectory()), "Test 2 : alternative working directory created")
+        # Test 3 : plugin without working directory
+        edPlugin = EDPlugin()
+        edPlugin.setRequiredToHaveWorkingDirectory(False)
+        edPlugin.setBaseName(edPlugin.createBaseName())
+        EDAssert.equal(False, edPlugin.isDataFileDumped(), "Test 3 : no data files")
+        # Test 4 : an explicit base name is used as given, a plugin loaded without base name
+        # doesn't get the same working directory
+        edPluginControl = EDPluginControl()
+        edPluginControl.setBaseName(edPluginControl.createBaseName())
+        edPluginTest1 = edPluginControl.loadPlugin("EDPluginTestPluginFactory", "EDPluginTestPluginFactory")
+        edPluginTest2 = edPluginControl.loadPlugin("EDPluginTestPluginFactory")
+        edPluginTest3 = edPluginControl.loadPlugin("EDPluginTestPluginFactory", "EDPluginTestPluginFactory")
+        EDAssert.equal("TestPluginFactory", edPluginTest1.getBaseName(), "Test 4 : explicit base name")
+        EDAssert.equal(True, edPluginTest1.getWorkingDirectory() != edPluginTest2.getWorkingDirectory(), "Test 4 : distinct working directories")
+        EDAssert.equal("TestPluginFactory", edPluginTest3.getBaseName(), "Test 4 : explicit base name used again as given")
+
+
+    def testInstantiationBenchmark(self):
+        """
+        Number of plugins constructed per second
+        """
+        iNumberOfPlugins = 10000
+        fTimeStart = time.time()
+        listPlugin = [EDPlugin() for iIndex in range(iNumberOfPlugins)]
+        fTime = time.time() - fTimeStart
+        self.screen("Constructed %d plugins in %.3f s: %.0f plugins per second" % (iNumberOfPlugins, fTime, iNumberOfPlugins / fTime))
+        EDAssert.equal(iNumberOfPlugins, len(set([edPlugin.getId() for edPlugin in listPlugin])), "Unique plugin ids")
+
+
     def testWithSingleThread(self):
         edPlugin = EDPlugin()
         with edPlugin.locked():
@@ -257,10 +373,14 @@ class EDTestCaseEDPlugin(EDTestCase):
         self.addTestMethod(self.testSetDataOutput)
         self.addTestMethod(self.testWriteDataInput)
         self.addTestMethod(self.testWriteDataOutput)
+        self.addTestMethod(self.testDataFormat)
+        self.addTestMethod(self.testDataFilePolicy)
         self.addTestMethod(self.testDataInputOutputProperties)
         self.addTestMethod(self.testWarningIfNoOutputData)
         self.addTestMethod(self.testCreateBaseName)
+        self.addTestMethod(self.testLazyWorkingDirectory)
         self.addTestMethod(self.testWithSingleThread)
+        self.addTestMethod(self.testInstantiationBenchmark)
 
 
 
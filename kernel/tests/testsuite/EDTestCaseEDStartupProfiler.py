@@ -0,0 +1,70 @@
+#
+#    Project: The EDNA Kernel
+#             http://www.edna-site.org
+#
+#    Copyright (C) European Synchrotron Radiation Facility, Grenoble, France
+#
+#    Principal authors: Olof Svensson (svensson@esrf.fr)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    and the GNU Lesser General Public License  along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+
+__author__ = "Olof Svensson"
+__authors__ = ["Olof Svensson"]
+__contact__ = "svensson@esrf.fr"
+__license__ = "LGPLv3+"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+
+import sys
+
+from EDAssert import EDAssert
+from EDTestCase import EDTestCase
+from EDStartupProfiler import EDStartupProfiler
+
+
+class EDTestCaseEDStartupProfiler(EDTestCase):
+    """
+    Test case for the start-up profiler.
+    """
+
+    def testProfile(self):
+        EDAssert.equal(False, EDStartupProfiler.isActive(), "Profiler not active by default")
+        with EDStartupProfiler.timer("Test phase"):
+            pass
+        EDAssert.equal(None, EDStartupProfiler.getPhaseTime("Test phase"), "Phase not timed if not active")
+        # A module of the standard library not imported by the kernel
+        sys.modules.pop("colorsys", None)
+        EDStartupProfiler.start()
+        try:
+            with EDStartupProfiler.timer("Test phase"):
+                import colorsys
+            EDStartupProfiler.markExecution()
+        finally:
+            EDStartupProfiler.stop()
+        EDAssert.equal(False, EDStartupProfiler.isActive(), "Profiler stopped")
+        listName = [tupleImport[0] for tupleImport in EDStartupProfiler.getImports()]
+        EDAssert.equal(True, "colorsys" in listName, "Import timed")
+        EDAssert.equal(True, EDStartupProfiler.getPhaseTime("Test phase") > 0, "Phase timed")
+
+
+    def process(self):
+        self.addTestMethod(self.testProfile)
+
+
+
+if __name__ == '__main__':
+
+    edTestCaseEDStartupProfiler = EDTestCaseEDStartupProfiler("EDTestCaseEDStartupProfiler")
+    edTestCaseEDStartupProfiler.execute()
@@ -0,0 +1,165 @@
+#
+#    Project: The EDNA Kernel
+#             http://www.edna-site.org
+#
+#    Copyright (C) European Synchrotron Radiation Facility, Grenoble, France
+#
+#    Principal authors: Olof Svensson (svensson@esrf.fr)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    and the GNU Lesser General Public License  along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+
+__author__ = "Olof Svensson"
+__contact__ = "svensson@esrf.fr"
+__license__ = "LGPLv3+"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+
+import os
+import shutil
+import tempfile
+
+try:
+    import tracemalloc
+except ImportError:
+    # Python 2
+    tracemalloc = None
+
+from EDAssert import EDAssert
+from EDTestCase import EDTestCase
+
+from XSDataCommon import XSData
+from XSDataCommon import XSDataDouble
+from XSDataCommon import XSDataImage
+from XSDataCommon import XSDataLength
+from XSDataCommon import XSDataString
+from XSDataCommon import XSDataTime
+from XSDataCommon import XSDataInteger
+from XSDataCommon import XSDataMessage
+from XSDataCommon import XSDataStatus
+from XSDataCommon import XSDataExecutionInfo
+from XSDataCommon import XSDataVectorDouble
+
+
+class EDTestCaseXSDataCommon(EDTestCase):
+    """
+    Test case for the streaming parse path, the compact formats, the slots
+    and the interned objects of the data bindings
+    """
+
+    def createStatus(self):
+        xsDataMessage = XSDataMessage()
+        xsDataMessage.type = XSDataString("warning")
+        xsDataMessage.level = XSDataString("   ")
+        xsDataMessage.text = XSDataString("Message 1: \"text\"")
+        xsDataExecutionInfo = XSDataExecutionInfo()
+        xsDataExecutionInfo.pluginName = XSDataString("EDPluginTestPluginFactory")
+        return XSDataStatus(message=xsDataMessage, executionInfo=xsDataExecutionInfo)
+
+
+    def testParseStringStream(self):
+        xsDataImage = XSDataImage(path=XSDataString("/data/id30a1/ref-test_1_0001.cbf"), number=XSDataInteger(1))
+        strXML = xsDataImage.marshal()
+        EDAssert.equal(strXML, XSDataImage.parseStringStream(strXML).marshal(), "Image")
+        strXML = self.createStatus().marshal()
+        xsDataStatus = XSDataStatus.parseStringStream(strXML)
+        EDAssert.equal(strXML, xsDataStatus.marshal(), "Status with nested objects")
+        EDAssert.equal("   ", xsDataStatus.message.level.value, "Whitespace string value")
+        strXML = "<ns:XSDataVectorDouble xmlns:ns='http://www.edna-site.org'>" + \
+                 "<ns:v1>1.0</ns:v1><ns:v2>2.0</ns:v2><ns:v3>3.0</ns:v3></ns:XSDataVectorDouble>"
+        EDAssert.equal(XSDataVectorDouble.parseString(strXML).marshal(),
+                       XSDataVectorDouble.parseStringStream(strXML).marshal(), "Name spaces")
+        xsDataString = XSDataString.parseStringStream("<XSDataString><value>a</value></XSDataString>")
+        EDAssert.equal(True, isinstance(xsDataString, XSDataString), "Class of root object")
+
+
+    def testParseFileStream(self):
+        strDirectory = tempfile.mkdtemp(prefix="EDTestCaseXSDataCommon-")
+        try:
+            strPath = os.path.join(strDirectory, "XSDataStatus.xml")
+            xsDataStatus = self.createStatus()
+            xsDataStatus.exportToFile(strPath)
+            EDAssert.equal(xsDataStatus.marshal(), XSDataStatus.parseFileStream(strPath).marshal(), "Parse file")
+        finally:
+            shutil.rmtree(strDirectory)
+
+
+    def testCompactFormats(self):
+        xsDataStatus = self.createStatus()
+        xsDataStatus.executionInfo.executionTime = XSDataTime(0.1 + 0.2)
+        strJSON = xsDataStatus.marshalJSON()
+        EDAssert.equal(xsDataStatus.marshal(), XSDataStatus.parseJSON(strJSON).marshal(), "JSON")
+        EDAssert.equal(0.1 + 0.2, XSDataStatus.parseJSON(strJSON).executionInfo.executionTime.value, "Double value in JSON")
+        pyBinary = xsDataStatus.marshalBinary()
+        EDAssert.equal(xsDataStatus.marshal(), XSDataStatus.parseBinary(pyBinary).marshal(), "Binary")
+        EDAssert.lowerThan(len(pyBinary), len(xsDataStatus.marshal()), "Binary format smaller than XML")
+        EDAssert.equal(b"XSDB", pyBinary[0:4], "Binary format header")
+        try:
+            XSDataStatus.parseBinary(b"XSDB\x02\x00" + pyBinary[6:])
+            EDAssert.equal(True, False, "Binary format of a newer version rejected")
+        except ValueError:
+            pass
+        xsDataInteger = XSDataInteger(2 ** 70)
+        EDAssert.equal(2 ** 70, XSDataInteger.parseBinary(xsDataInteger.marshalBinary()).value, "Large integer in binary format")
+        xsDataVectorDouble = XSDataVectorDouble(1.0, 2.0, 3.0)
+        EDAssert.equal(xsDataVectorDouble.marshal(), XSDataVectorDouble.parseJSON(xsDataVectorDouble.marshalJSON()).marshal(), "Vector")
+
+
+    def testSlots(self):
+        xsDataImage = XSDataImage(path=XSDataString("/data/id30a1/ref-test_1_0001.cbf"), number=XSDataInteger(1))
+        EDAssert.equal(False, hasattr(xsDataImage, "__dict__"), "No instance dictionary")
+        EDAssert.equal(xsDataImage.marshal(), xsDataImage.copy().marshal(), "Copy")
+        EDAssert.equal(xsDataImage.marshal(), XSData.importFromDict(xsDataImage.exportToDict()).marshal(), "Dictionary")
+        if tracemalloc is None:
+            self.screen("tracemalloc not available, memory per XSDataDouble object not measured")
+            return
+        tracemalloc.start()
+        iSizeStart = tracemalloc.get_traced_memory()[0]
+        listDouble = [XSDataDouble(iIndex) for iIndex in range(10000)]
+        iSize = tracemalloc.get_traced_memory()[0] - iSizeStart
+        tracemalloc.stop()
+        self.screen("Memory for 10000 XSDataDouble objects: %d bytes" % iSize)
+        EDAssert.lowerThan(iSize, 10000 * 100, "Memory per XSDataDouble object")
+
+
+    def testIntern(self):
+        xsDataInteger = XSDataInteger.intern(0)
+        EDAssert.equal(True, xsDataInteger is XSDataInteger.intern(0), "Same instance")
+        EDAssert.equal(False, XSDataDouble.intern(0.0) is XSDataInteger.intern(0), "Instance per class")
+        EDAssert.equal(False, XSDataLength.intern(1.0) is XSDataLength.intern(1.0), "Subclasses not interned")
+        bModified = True
+        try:
+            xsDataInteger.value = 1
+        except BaseException:
+            bModified = False
+        EDAssert.equal(False, bModified, "Interned object cannot be modified")
+        EDAssert.equal(0, xsDataInteger.value, "Value of interned object")
+        xsDataCopy = xsDataInteger.copy()
+        xsDataCopy.value = 1
+        EDAssert.equal(1, xsDataCopy.value, "Copy can be modified")
+
+
+    def process(self):
+        self.addTestMethod(self.testParseStringStream)
+        self.addTestMethod(self.testParseFileStream)
+        self.addTestMethod(self.testCompactFormats)
+        self.addTestMethod(self.testSlots)
+        self.addTestMethod(self.testIntern)
+
+
+
+if __name__ == '__main__':
+
+    edTestCaseXSDataCommon = EDTestCaseXSDataCommon("EDTestCaseXSDataCommon")
+    edTestCaseXSDataCommon.execute()
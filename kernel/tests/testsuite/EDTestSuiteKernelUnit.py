@@ -38,6 +38,7 @@ class EDTestSuiteKernelUnit(EDTestSuite):
 
 
     def process(self):
+        self.addTestCaseFromName("EDTestCaseEDAction")
         self.addTestCaseFromName("EDTestCaseEDActionCluster")
         self.addTestCaseFromName("EDTestCaseEDConfiguration")
         self.addTestCaseFromName("EDTestCaseEDPlugin")
@@ -52,6 +53,12 @@ class EDTestSuiteKernelUnit(EDTestSuite):
         self.addTestCaseFromName("EDTestCaseEDFactoryPlugin")
         self.addTestCaseFromName("EDTestCaseEDFactoryPluginTest")
         self.addTestCaseFromName("EDTestCaseEDStatus")
+        self.addTestCaseFromName("EDTestCaseEDExecutor")
+        self.addTestCaseFromName("EDTestCaseEDFileWatcher")
+        self.addTestCaseFromName("EDTestCaseEDLogSink")
+        self.addTestCaseFromName("EDTestCaseEDStartupProfiler")
+        self.addTestCaseFromName("EDTestCaseEDFrameProviderHDF5")
+        self.addTestCaseFromName("EDTestCaseXSDataCommon")
 
 
 if __name__ == '__main__':
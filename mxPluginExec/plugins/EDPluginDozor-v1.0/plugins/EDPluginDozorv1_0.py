@@ -27,7 +27,6 @@ __copyright__ = "ESRF"
 
 import os
 import time
-import shlex
 import distro
 import pprint
 import matplotlib
@@ -42,10 +41,12 @@ from EDUtilsFile import EDUtilsFile
 EDFactoryPluginStatic.loadModule("markupv1_10")
 import markupv1_10
 
+EDFactoryPluginStatic.loadModule("EDHandlerDozorv1_0")
+from EDHandlerDozorv1_0 import EDHandlerDozorv1_0
+
 from XSDataCommon import XSDataDouble
 from XSDataCommon import XSDataString
 from XSDataCommon import XSDataFile
-from XSDataCommon import XSDataAngle
 
 from XSDataDnaTables import dna_tables
 
@@ -55,11 +56,13 @@ from XSDataCommon import XSDataString
 
 from XSDataDozorv1_0 import XSDataInputDozor
 from XSDataDozorv1_0 import XSDataResultDozor
-from XSDataDozorv1_0 import XSDataImageDozor
 
 class EDPluginDozorv1_0(EDPluginExecProcessScript):
     """
-    This plugin runs the Dozor program written by Sasha Popov
+    This plugin runs the Dozor program written by Sasha Popov.
+
+    The results are kept in a EDDozorResultTable (attribute dozorResultTable),
+    the XSDataResultDozor data output is only created from it when first used.
     """
 
 
@@ -100,6 +103,10 @@ class EDPluginDozorv1_0(EDPluginExecProcessScript):
         self.iyMaxEiger16m = 2312
         # Bad zones
         self.strBad_zona = None
+        self.dozorResultTable = None
+        self.xsDataPlotmtvFile = None
+        self.listXSDataPngPlots = []
+        self.bCreateDataOutput = False
 
     def checkParameters(self):
         """
@@ -151,8 +158,32 @@ class EDPluginDozorv1_0(EDPluginExecProcessScript):
     def postProcess(self, _edObject=None):
         EDPluginExecProcessScript.postProcess(self)
         self.DEBUG("EDPluginDozorv1_0.postProcess")
-        self.dataOutput = self.parseOutput(os.path.join(self.getWorkingDirectory(),
-                                                        self.getScriptLogFileName()))
+        self.parseResultTable(os.path.join(self.getWorkingDirectory(), self.getScriptLogFileName()))
+        self.bCreateDataOutput = True
+
+
+    def getDataOutput(self, _strDataOutputKey=None):
+        """
+        Returns the data output, created from the results table when first asked for
+        """
+        if self.bCreateDataOutput:
+            with self.locked():
+                if self.bCreateDataOutput:
+                    EDPluginExecProcessScript.setDataOutput(self, self.createDataOutput())
+                    self.bCreateDataOutput = False
+        return EDPluginExecProcessScript.getDataOutput(self, _strDataOutputKey)
+
+
+    def setDataOutput(self, _xsDataOutput, _strDataOutputKey=None):
+        self.bCreateDataOutput = False
+        EDPluginExecProcessScript.setDataOutput(self, _xsDataOutput, _strDataOutputKey)
+
+    dataOutput = property(getDataOutput, setDataOutput, EDPluginExecProcessScript.delDataOutput, "Property for dataOutput")
+
+
+    def writeDataOutput(self, _edObject=None, _bAsynchronous=False):
+        self.getDataOutput()
+        EDPluginExecProcessScript.writeDataOutput(self, _edObject, _bAsynchronous)
 
 
 
@@ -224,6 +255,11 @@ class EDPluginDozorv1_0(EDPluginExecProcessScript):
                 self.iyMax = self.iyMaxEiger16m
         else:
             raise RuntimeError("Detector type not recognised: {0}".format(_xsDataInputDozor.detectorType.value))
+        if _xsDataInputDozor.nameTemplateImage.value.endswith(".h5"):
+            # HDF5 data read directly by dozor
+            if _library_h5 is None:
+                raise RuntimeError("No dozor HDF5 library configured for {0}".format(_xsDataInputDozor.nameTemplateImage.value))
+            library = _library_h5
         if _xsDataInputDozor is not None:
             self.setProcessInfo("name template: %s, first image no: %d, no images: %d" % (
                 os.path.basename(_xsDataInputDozor.nameTemplateImage.value),
@@ -280,69 +316,34 @@ class EDPluginDozorv1_0(EDPluginExecProcessScript):
         """
         This method parses the output of dozor
         """
-        xsDataResultDozor = XSDataResultDozor()
-        strOutput = EDUtilsFile.readFile(_strFileName)
-        # Skip the four first lines
-        listOutput = strOutput.split("\n")[6:]
-        strWorkingDir = os.path.dirname(_strFileName)
+        self.parseResultTable(_strFileName)
+        return self.createDataOutput()
 
-        for strLine in listOutput:
-            # Remove "|"
-            listLine = shlex.split(strLine.replace("|", " "))
-            if len(listLine) > 0 and listLine[0].isdigit():
-                xsDataImageDozor = XSDataImageDozor()
-                imageNumber = int(listLine[0])
-                angle = self.startingAngle + (imageNumber - self.firstImageNumber) * (self.oscillationRange - self.overlap) + self.oscillationRange / 2.0
-                xsDataImageDozor.number = XSDataInteger(imageNumber)
-                xsDataImageDozor.angle = XSDataAngle(angle)
-
-                xsDataImageDozor.spotsNumOf = XSDataInteger(0)
-                xsDataImageDozor.spotsIntAver = XSDataDouble(0)
-                xsDataImageDozor.spotsResolution = XSDataDouble(0)
-                xsDataImageDozor.mainScore = XSDataDouble(0)
-                xsDataImageDozor.spotScore = XSDataDouble(0)
-                xsDataImageDozor.visibleResolution = XSDataDouble(40)
-                try:
-                    if listLine[5].startswith("-") or len(listLine) < 11:
-                        xsDataImageDozor.spotsNumOf = XSDataInteger(listLine[1])
-                        xsDataImageDozor.spotsIntAver = self.parseDouble(listLine[2])
-                        xsDataImageDozor.spotsRfactor = self.parseDouble(listLine[3])
-                        xsDataImageDozor.spotsResolution = self.parseDouble(listLine[4])
-                        xsDataImageDozor.mainScore = self.parseDouble(listLine[8])
-                        xsDataImageDozor.spotScore = self.parseDouble(listLine[9])
-                        xsDataImageDozor.visibleResolution = self.parseDouble(listLine[10])
-                    else:
-                        xsDataImageDozor.spotsNumOf = XSDataInteger(listLine[1])
-                        xsDataImageDozor.spotsIntAver = self.parseDouble(listLine[2])
-                        xsDataImageDozor.spotsRfactor = self.parseDouble(listLine[3])
-                        xsDataImageDozor.spotsResolution = self.parseDouble(listLine[4])
-                        xsDataImageDozor.powderWilsonScale = self.parseDouble(listLine[5])
-                        xsDataImageDozor.powderWilsonBfactor = self.parseDouble(listLine[6])
-                        xsDataImageDozor.powderWilsonResolution = self.parseDouble(listLine[7])
-                        xsDataImageDozor.powderWilsonCorrelation = self.parseDouble(listLine[8])
-                        xsDataImageDozor.powderWilsonRfactor = self.parseDouble(listLine[9])
-                        xsDataImageDozor.mainScore = self.parseDouble(listLine[10])
-                        xsDataImageDozor.spotScore = self.parseDouble(listLine[11])
-                        xsDataImageDozor.visibleResolution = self.parseDouble(listLine[12])
-                except:
-                    pass
-                # Dozor spot file
-                if strWorkingDir is not None:
-                    strSpotFile = os.path.join(strWorkingDir, "%05d.spot" % xsDataImageDozor.number.value)
-                    if os.path.exists(strSpotFile):
-                        xsDataImageDozor.spotFile = XSDataFile(XSDataString(strSpotFile))
-#                #print xsDataImageDozor.marshal()
-                xsDataResultDozor.addImageDozor(xsDataImageDozor)
-            elif strLine.startswith("h"):
-                xsDataResultDozor.halfDoseTime = XSDataDouble(strLine.split("=")[1].split()[0])
 
+    def parseResultTable(self, _strFileName):
+        """
+        Reads the results table of dozor and creates the plots of the radiation damage, if any
+        """
+        strOutput = EDUtilsFile.readFile(_strFileName)
+        strWorkingDir = os.path.dirname(_strFileName)
+        self.dozorResultTable = EDHandlerDozorv1_0.parseOutput(strOutput, self.startingAngle, self.firstImageNumber,
+                                                               self.oscillationRange, self.overlap, strWorkingDir)
         # Check if mtv plot file exists
         mtvFileName = "dozor_rd.mtv"
         mtvFilePath = os.path.join(strWorkingDir, mtvFileName)
         if os.path.exists(mtvFilePath):
-            xsDataResultDozor.plotmtvFile = XSDataFile(XSDataString(mtvFilePath))
-            xsDataResultDozor.pngPlots = self.generatePngPlots(mtvFilePath, strWorkingDir)
+            self.xsDataPlotmtvFile = XSDataFile(XSDataString(mtvFilePath))
+            self.listXSDataPngPlots = self.generatePngPlots(mtvFilePath, strWorkingDir)
+        return self.dozorResultTable
+
 
+    def createDataOutput(self):
+        """
+        Creates the XSDataResultDozor from the results table
+        """
+        xsDataResultDozor = self.dozorResultTable.createResult()
+        xsDataResultDozor.plotmtvFile = self.xsDataPlotmtvFile
+        xsDataResultDozor.pngPlots = self.listXSDataPngPlots
         return xsDataResultDozor
 
     def parseDouble(self, _strValue):
@@ -31,6 +31,9 @@ __date__ = "20131129"
 __status__ = "beta"
 
 import os
+import time
+import shlex
+import shutil
 import tempfile
 
 from EDAssert                        import EDAssert
@@ -40,9 +43,12 @@ from EDUtilsFile import EDUtilsFile
 from XSDataCommon import XSDataFile
 from XSDataCommon import XSDataString
 from XSDataCommon import XSDataDouble
+from XSDataCommon import XSDataInteger
+from XSDataCommon import XSDataAngle
 
 from XSDataDozorv1_0 import XSDataInputDozor
 from XSDataDozorv1_0 import XSDataResultDozor
+from XSDataDozorv1_0 import XSDataImageDozor
 
 class EDTestCasePluginUnitDozorv1_0(EDTestCasePluginUnit):
 
@@ -58,15 +64,115 @@ class EDTestCasePluginUnitDozorv1_0(EDTestCasePluginUnit):
         strCommandText = edPlugin.generateCommands(xsDataInput)
         print(strCommandText)
 
-    def test_parseOutput(self):
-        edPlugin = self.getPlugin()
+    def parseOutputReference(self, _edPlugin, _strFileName):
+        """
+        Former implementation of EDPluginDozorv1_0.parseOutput (without the plots),
+        used as reference
+        """
+        listXSDataImageDozor = []
+        strOutput = EDUtilsFile.readFile(_strFileName)
+        strWorkingDir = os.path.dirname(_strFileName)
+        for strLine in strOutput.split("\n")[6:]:
+            listLine = shlex.split(strLine.replace("|", " "))
+            if len(listLine) > 0 and listLine[0].isdigit():
+                xsDataImageDozor = XSDataImageDozor()
+                imageNumber = int(listLine[0])
+                angle = _edPlugin.startingAngle + (imageNumber - _edPlugin.firstImageNumber) * \
+                    (_edPlugin.oscillationRange - _edPlugin.overlap) + _edPlugin.oscillationRange / 2.0
+                xsDataImageDozor.number = XSDataInteger(imageNumber)
+                xsDataImageDozor.angle = XSDataAngle(angle)
+                xsDataImageDozor.spotsNumOf = XSDataInteger.intern(0)
+                xsDataImageDozor.spotsIntAver = XSDataDouble.intern(0.0)
+                xsDataImageDozor.spotsResolution = XSDataDouble.intern(0.0)
+                xsDataImageDozor.mainScore = XSDataDouble.intern(0.0)
+                xsDataImageDozor.spotScore = XSDataDouble.intern(0.0)
+                xsDataImageDozor.visibleResolution = XSDataDouble.intern(40.0)
+                try:
+                    if listLine[5].startswith("-") or len(listLine) < 11:
+                        xsDataImageDozor.spotsNumOf = XSDataInteger(listLine[1])
+                        xsDataImageDozor.spotsIntAver = _edPlugin.parseDouble(listLine[2])
+                        xsDataImageDozor.spotsRfactor = _edPlugin.parseDouble(listLine[3])
+                        xsDataImageDozor.spotsResolution = _edPlugin.parseDouble(listLine[4])
+                        xsDataImageDozor.mainScore = _edPlugin.parseDouble(listLine[8])
+                        xsDataImageDozor.spotScore = _edPlugin.parseDouble(listLine[9])
+                        xsDataImageDozor.visibleResolution = _edPlugin.parseDouble(listLine[10])
+                    else:
+                        xsDataImageDozor.spotsNumOf = XSDataInteger(listLine[1])
+                        xsDataImageDozor.spotsIntAver = _edPlugin.parseDouble(listLine[2])
+                        xsDataImageDozor.spotsRfactor = _edPlugin.parseDouble(listLine[3])
+                        xsDataImageDozor.spotsResolution = _edPlugin.parseDouble(listLine[4])
+                        xsDataImageDozor.powderWilsonScale = _edPlugin.parseDouble(listLine[5])
+                        xsDataImageDozor.powderWilsonBfactor = _edPlugin.parseDouble(listLine[6])
+                        xsDataImageDozor.powderWilsonResolution = _edPlugin.parseDouble(listLine[7])
+                        xsDataImageDozor.powderWilsonCorrelation = _edPlugin.parseDouble(listLine[8])
+                        xsDataImageDozor.powderWilsonRfactor = _edPlugin.parseDouble(listLine[9])
+                        xsDataImageDozor.mainScore = _edPlugin.parseDouble(listLine[10])
+                        xsDataImageDozor.spotScore = _edPlugin.parseDouble(listLine[11])
+                        xsDataImageDozor.visibleResolution = _edPlugin.parseDouble(listLine[12])
+                except:
+                    pass
+                strSpotFile = os.path.join(strWorkingDir, "%05d.spot" % xsDataImageDozor.number.value)
+                if os.path.exists(strSpotFile):
+                    xsDataImageDozor.spotFile = XSDataFile(XSDataString(strSpotFile))
+                listXSDataImageDozor.append(xsDataImageDozor)
+        return listXSDataImageDozor
+
+    def getPlugin(self):
+        edPlugin = EDTestCasePluginUnit.getPlugin(self)
         edPlugin.startingAngle = 10.0
         edPlugin.firstImageNumber = 1
         edPlugin.oscillationRange = 0.1
         edPlugin.overlap = 0.0
-        xsDataResult = edPlugin.parseOutput(os.path.join(self.strDataPath, "Dozor_00002.log"))
+        return edPlugin
+
+    def test_parseOutput(self):
+        # The logs are parsed in a temporary directory, the plugin writes its plots next to the log
+        strDirectory = tempfile.mkdtemp(prefix="EDTestCasePluginUnitDozorv1_0_")
+        edPlugin = self.getPlugin()
+        strPath = os.path.join(strDirectory, "Dozorv1_0-138.log")
+        shutil.copy(os.path.join(self.strDataPath, "Dozorv1_0-138.log"), strPath)
+        xsDataResult = edPlugin.parseOutput(strPath)
         EDAssert.equal(100, len(xsDataResult.imageDozor), "Result from 100 images")
         EDAssert.equal(True, xsDataResult.halfDoseTime is not None, "Half dose time v1.3.8")
+        # Same results as the former parser, for all versions of dozor
+        for strLogFile in ["Dozorv1_0-138.log", "dozorHalfDoseTime.log", "Dozor_v20141203.log", "dozor.log", "dozor_no_results.log"]:
+            strPath = os.path.join(strDirectory, strLogFile)
+            shutil.copy(os.path.join(self.strDataPath, strLogFile), strPath)
+            listReference = [xsDataImageDozor.marshal() for xsDataImageDozor in self.parseOutputReference(edPlugin, strPath)]
+            listResult = [xsDataImageDozor.marshal() for xsDataImageDozor in edPlugin.parseOutput(strPath).imageDozor]
+            EDAssert.equal(listReference, listResult, "Same results as the former parser for %s" % strLogFile)
+        shutil.rmtree(strDirectory)
+
+    def test_parseOutputBenchmark(self):
+        """
+        Parsing of the output of dozor for 1k, 10k and 100k images, made from the rows of a recorded output
+        """
+        edPlugin = self.getPlugin()
+        listLine = EDUtilsFile.readFile(os.path.join(self.strDataPath, "Dozorv1_0-138.log")).split("\n")
+        listHeader = listLine[:6]
+        listRow = [strLine for strLine in listLine[6:] if strLine[:6].strip().isdigit()]
+        strDirectory = tempfile.mkdtemp(prefix="EDTestCasePluginUnitDozorv1_0_")
+        for iNumberOfImages in [1000, 10000, 100000]:
+            listOutput = list(listHeader)
+            for iIndex in range(iNumberOfImages):
+                strRow = listRow[iIndex % len(listRow)]
+                listOutput.append("%6d%s" % (iIndex + 1, strRow[6:]))
+            strPath = os.path.join(strDirectory, "dozor_%d.log" % iNumberOfImages)
+            EDUtilsFile.writeFile(strPath, "\n".join(listOutput) + "\n")
+            fTimeStart = time.time()
+            listReference = self.parseOutputReference(edPlugin, strPath)
+            fTimeReference = time.time() - fTimeStart
+            fTimeStart = time.time()
+            edDozorResultTable = edPlugin.parseResultTable(strPath)
+            fTimeTable = time.time() - fTimeStart
+            fTimeStart = time.time()
+            xsDataResult = edPlugin.createDataOutput()
+            fTimeXSData = time.time() - fTimeStart
+            self.screen("%6d images: former parser %.3f s, results table %.3f s, XSData objects %.3f s" % \
+                        (iNumberOfImages, fTimeReference, fTimeTable, fTimeXSData))
+            EDAssert.equal(iNumberOfImages, len(edDozorResultTable), "Number of images")
+            EDAssert.equal(listReference[-1].marshal(), xsDataResult.imageDozor[-1].marshal(), "Last image")
+        shutil.rmtree(strDirectory)
 
     def test_parseDouble(self):
         edPlugin = self.getPlugin()
@@ -80,9 +186,11 @@ class EDTestCasePluginUnitDozorv1_0(EDTestCasePluginUnit):
         listXSFile = edPlugin.generatePngPlots(plotmtvFile, tmpDir)
         for xsFile in listXSFile:
             print(xsFile.marshal())
+        shutil.rmtree(tmpDir)
 
     def process(self):
         self.addTestMethod(self.test_generateCommands)
         self.addTestMethod(self.test_parseOutput)
+        self.addTestMethod(self.test_parseOutputBenchmark)
         self.addTestMethod(self.test_parseDouble)
         self.addTestMethod(self.test_generatePngPlots)
@@ -36,8 +36,6 @@ from EDFactoryPluginStatic import EDFactoryPluginStatic
 
 from EDPluginISPyBv1_4 import EDPluginISPyBv1_4
 
-from suds.client import Client
-from suds.transport.http import HttpAuthenticated
 from suds.sax.date import DateTime
 
 from XSDataCommon import XSDataString
@@ -73,10 +71,7 @@ class EDPluginISPyBGetPdbFilePathv1_4(EDPluginISPyBv1_4):
         """
         EDPluginISPyBv1_4.process(self)
         self.DEBUG("EDPluginISPyBGetPdbFilePathv1_4.process")
-        httpAuthenticatedToolsForCollectionWebService = HttpAuthenticated(username=self.strUserName, password=self.strPassWord)
-        clientToolsForCollectionWebService = Client(self.strToolsForCollectionWebServiceWsdl,
-                                                    transport=httpAuthenticatedToolsForCollectionWebService,
-                                                    cache=None)
+        clientToolsForCollectionWebService = self.getClient(self.strToolsForCollectionWebServiceWsdl)
         # Loop over all positions
         xsDataInputISPyBGetPdbFilePath = self.getDataInput()
         iDataCollectionId = self.getXSValue(xsDataInputISPyBGetPdbFilePath.dataCollectionId)
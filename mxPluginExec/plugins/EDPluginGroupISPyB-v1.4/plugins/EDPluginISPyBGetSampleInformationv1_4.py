@@ -36,8 +36,6 @@ from EDFactoryPluginStatic import EDFactoryPluginStatic
 
 from EDPluginISPyBv1_4 import EDPluginISPyBv1_4
 
-from suds.client import Client
-from suds.transport.http import HttpAuthenticated
 from suds.sax.date import DateTime
 
 from XSDataCommon import XSDataInteger
@@ -80,10 +78,7 @@ class EDPluginISPyBGetSampleInformationv1_4(EDPluginISPyBv1_4):
         self.DEBUG("EDPluginISPyBGetSampleInformationv1_4.process")
         # First get the image ID
         xsDataInputGetSampleInformation = self.getDataInput()
-        httpAuthenticatedToolsForCollectionWebService = HttpAuthenticated(username=self.strUserName, password=self.strPassWord)
-        clientToolsForBLSampleWebServiceWsdl = Client(self.strToolsForBLSampleWebServiceWsdl,
-                                                      transport=httpAuthenticatedToolsForCollectionWebService,
-                                                      cache=None)
+        clientToolsForBLSampleWebServiceWsdl = self.getClient(self.strToolsForBLSampleWebServiceWsdl)
         iSampleId = self.getXSValue(xsDataInputGetSampleInformation.sampleId)
         sampleInfo = clientToolsForBLSampleWebServiceWsdl.service.getSampleInformation(iSampleId)
         self.DEBUG("Sample info from ISPyB: %r" % sampleInfo)
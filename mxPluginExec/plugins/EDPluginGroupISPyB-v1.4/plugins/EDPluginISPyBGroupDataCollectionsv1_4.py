@@ -36,8 +36,6 @@ from EDFactoryPluginStatic import EDFactoryPluginStatic
 
 from EDPluginISPyBv1_4 import EDPluginISPyBv1_4
 
-from suds.client import Client
-from suds.transport.http import HttpAuthenticated
 from suds.sax.date import DateTime
 
 from XSDataCommon import XSDataInteger
@@ -81,10 +79,7 @@ class EDPluginISPyBGroupDataCollectionsv1_4(EDPluginISPyBv1_4):
             strFilePath = xsDataStringFilePath.value
             arrayOfFileLocation.append(os.path.dirname(strFilePath))
             arrayOfFileName.append(os.path.basename(strFilePath))
-        httpAuthenticatedToolsForCollectionWebService = HttpAuthenticated(username=self.strUserName, password=self.strPassWord)
-        clientToolsForCollectionWebService = Client(self.strToolsForCollectionWebServiceWsdl,
-                                                    transport=httpAuthenticatedToolsForCollectionWebService,
-                                                    cache=None)
+        clientToolsForCollectionWebService = self.getClient(self.strToolsForCollectionWebServiceWsdl)
         self.listDataCollectionIds = clientToolsForCollectionWebService.service.groupDataCollections(\
                 dataCollectionGroupId=self.getXSValue(xsDataInput.dataCollectionGroupId), \
                 arrayOfFileLocation=arrayOfFileLocation, \
@@ -36,8 +36,6 @@ from EDFactoryPluginStatic import EDFactoryPluginStatic
 
 from EDPluginISPyBv1_4 import EDPluginISPyBv1_4
 
-from suds.client import Client
-from suds.transport.http import HttpAuthenticated
 from suds.sax.date import DateTime
 
 from XSDataCommon import XSDataInteger
@@ -77,10 +75,7 @@ class EDPluginISPyBSetDataCollectionPositionv1_4(EDPluginISPyBv1_4):
         strImagePath = self.dataInput.fileName.path.value
         xsDataStartPosition = self.dataInput.startPosition
         xsDataEndPosition = self.dataInput.endPosition
-        httpAuthenticatedToolsForCollectionWebService = HttpAuthenticated(username=self.strUserName, password=self.strPassWord)
-        clientToolsForCollectionWebService = Client(self.strToolsForCollectionWebServiceWsdl,
-                                                    transport=httpAuthenticatedToolsForCollectionWebService,
-                                                    cache=None)
+        clientToolsForCollectionWebService = self.getClient(self.strToolsForCollectionWebServiceWsdl)
         startMotorPosition3VO = self.createMotorPosition3VO(clientToolsForCollectionWebService, xsDataStartPosition)
         if xsDataEndPosition is not None:
             endMotorPosition3VO = self.createMotorPosition3VO(clientToolsForCollectionWebService, xsDataEndPosition)
@@ -37,8 +37,6 @@ from EDFactoryPluginStatic import EDFactoryPluginStatic
 
 from EDPluginISPyBv1_4 import EDPluginISPyBv1_4
 
-from suds.client import Client
-from suds.transport.http import HttpAuthenticated
 from suds.sax.date import DateTime
 
 from XSDataCommon import XSDataInteger
@@ -75,10 +73,7 @@ class EDPluginISPyBStoreAutoProcProgramAttachmentv1_4(EDPluginISPyBv1_4):
         EDPluginISPyBv1_4.process(self)
         self.DEBUG("EDPluginISPyBStoreAutoProcProgramAttachmentv1_4.process")
         xsDataInputStoreAutoProcProgramAttachment = self.getDataInput()
-        httpAuthenticatedToolsForAutoprocessingWebService = HttpAuthenticated(username=self.strUserName, password=self.strPassWord)
-        clientToolsForAutoprocessingWebService = Client(self.strToolsForAutoprocessingWebServiceWsdl,
-                                                        transport=httpAuthenticatedToolsForAutoprocessingWebService,
-                                                        cache=None)
+        clientToolsForAutoprocessingWebService = self.getClient(self.strToolsForAutoprocessingWebServiceWsdl)
         # AutoProcProgramAttachment
         listAutoProcProgramAttachment = xsDataInputStoreAutoProcProgramAttachment.getAutoProcProgramAttachment()
         for xsDataAutoProcProgramAttachment in listAutoProcProgramAttachment:
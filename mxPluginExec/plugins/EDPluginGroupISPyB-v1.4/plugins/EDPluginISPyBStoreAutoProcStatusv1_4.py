@@ -36,8 +36,6 @@ from EDFactoryPluginStatic import EDFactoryPluginStatic
 
 from EDPluginISPyBv1_4 import EDPluginISPyBv1_4
 
-from suds.client import Client
-from suds.transport.https import HttpAuthenticated
 from suds.sax.date import DateTime
 
 from XSDataISPyBv1_4 import XSDataInputStoreAutoProcStatus
@@ -76,10 +74,7 @@ class EDPluginISPyBStoreAutoProcStatusv1_4(EDPluginISPyBv1_4):
         EDPluginISPyBv1_4.process(self)
         iDataCollectionId = None
         self.DEBUG("EDPluginISPyBStoreAutoProcStatusv1_4.process")
-        httpAuthenticatedToolsForAutoprocessingWebService = HttpAuthenticated(username=self.strUserName, password=self.strPassWord)
-        clientToolsForAutoprocessingWebService = Client(self.strToolsForAutoprocessingWebServiceWsdl,
-                                                        transport=httpAuthenticatedToolsForAutoprocessingWebService,
-                                                        cache=None)
+        clientToolsForAutoprocessingWebService = self.getClient(self.strToolsForAutoprocessingWebServiceWsdl)
         xsDataInputStoreAutoProcStatus = self.getDataInput()
         if xsDataInputStoreAutoProcStatus.dataCollectionId is not None:
             iDataCollectionId = xsDataInputStoreAutoProcStatus.dataCollectionId
@@ -37,8 +37,6 @@ from EDFactoryPluginStatic import EDFactoryPluginStatic
 
 from EDPluginISPyBv1_4 import EDPluginISPyBv1_4
 
-from suds.client import Client
-from suds.transport.http import HttpAuthenticated
 from suds.sax.date import DateTime
 
 from XSDataCommon import XSDataInteger
@@ -85,10 +83,7 @@ class EDPluginISPyBStoreAutoProcv1_4(EDPluginISPyBv1_4):
         self.DEBUG("EDPluginISPyBStoreAutoProcv1_4.process")
         xsDataInputStoreAutoProc = self.getDataInput()
         xsDataAutoProcContainer = xsDataInputStoreAutoProc.getAutoProcContainer()
-        httpAuthenticatedToolsForAutoprocessingWebService = HttpAuthenticated(username=self.strUserName, password=self.strPassWord)
-        clientToolsForAutoprocessingWebService = Client(self.strToolsForAutoprocessingWebServiceWsdl,
-                                                        transport=httpAuthenticatedToolsForAutoprocessingWebService,
-                                                        cache=None)
+        clientToolsForAutoprocessingWebService = self.getClient(self.strToolsForAutoprocessingWebServiceWsdl)
         xsDataAutoProcScalingContainer = xsDataAutoProcContainer.getAutoProcScalingContainer()
         xsDataAutoProcProgram = xsDataAutoProcContainer.getAutoProcProgramContainer().getAutoProcProgram()
         # AutoProcProgram
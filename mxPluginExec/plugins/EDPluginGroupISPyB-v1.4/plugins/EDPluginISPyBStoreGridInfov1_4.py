@@ -36,8 +36,6 @@ from EDFactoryPluginStatic import EDFactoryPluginStatic
 
 from EDPluginISPyBv1_4 import EDPluginISPyBv1_4
 
-from suds.client import Client
-from suds.transport.http import HttpAuthenticated
 from suds.sax.date import DateTime
 
 from XSDataCommon import XSDataInteger
@@ -76,10 +74,7 @@ class EDPluginISPyBStoreGridInfov1_4(EDPluginISPyBv1_4):
         # First get the image ID
         xsDataInputGridInfo = self.getDataInput()
 
-        httpAuthenticatedToolsForCollectionWebService = HttpAuthenticated(username=self.strUserName, password=self.strPassWord)
-        clientToolsForCollectionWebService = Client(self.strToolsForCollectionWebServiceWsdl,
-                                                    transport=httpAuthenticatedToolsForCollectionWebService,
-                                                    cache=None)
+        clientToolsForCollectionWebService = self.getClient(self.strToolsForCollectionWebServiceWsdl)
         gridInfoWS3VO = clientToolsForCollectionWebService.factory.create('gridInfoWS3VO')
         gridInfoWS3VO.gridInfoId = self.getXSValue(xsDataInputGridInfo.gridInfoId)
         gridInfoWS3VO.workflowMeshId = self.getXSValue(xsDataInputGridInfo.workflowMeshId)
@@ -39,7 +39,6 @@ EDFactoryPluginStatic.loadModule("EDInstallJurkoSuds94664ddd46a6")
 
 from EDPluginISPyBv1_4 import EDPluginISPyBv1_4
 
-from suds.client import Client
 from suds.transport.https import HttpAuthenticated
 from suds.sax.date import DateTime
 
@@ -92,10 +91,7 @@ class EDPluginISPyBStoreImageQualityIndicatorsv1_4(EDPluginISPyBv1_4):
         strPathToImage = xsDataImageQualityIndicators.getImage().getPath().getValue()
         strDirName = os.path.dirname(strPathToImage)
         strFileName = os.path.basename(strPathToImage)
-        httpAuthenticatedToolsForAutoprocessingWebService = HttpAuthenticated(username=self.strUserName, password=self.strPassWord)
-        clientToolsForAutoprocessingWebService = Client(self.strToolsForAutoprocessingWebServiceWsdl,
-                                                        transport=httpAuthenticatedToolsForAutoprocessingWebService,
-                                                        cache=None)
+        clientToolsForAutoprocessingWebService = self.getClient(self.strToolsForAutoprocessingWebServiceWsdl, HttpAuthenticated)
         iImageId = 0
         iAutoProcProgramId = self.iAutoProcProgramId
         iSpotTotal = self.getXSValue(xsDataImageQualityIndicators.spotTotal)
@@ -37,8 +37,6 @@ from EDFactoryPluginStatic import EDFactoryPluginStatic
 
 from EDPluginISPyBv1_4 import EDPluginISPyBv1_4
 
-from suds.client import Client
-from suds.transport.http import HttpAuthenticated
 from suds.sax.date import DateTime
 
 from XSDataCommon import XSDataInteger
@@ -80,10 +78,7 @@ class EDPluginISPyBStoreListOfImageQualityIndicatorsv1_4(EDPluginISPyBv1_4):
         """
         EDPluginISPyBv1_4.process(self)
         self.DEBUG("EDPluginISPyBStoreListOfImageQualityIndicatorsv1_4.process")
-        httpAuthenticatedToolsForAutoprocessingWebService = HttpAuthenticated(username=self.strUserName, password=self.strPassWord)
-        clientToolsForAutoprocessingWebService = Client(self.strToolsForAutoprocessingWebServiceWsdl,
-                                                        transport=httpAuthenticatedToolsForAutoprocessingWebService,
-                                                        cache=None)
+        clientToolsForAutoprocessingWebService = self.getClient(self.strToolsForAutoprocessingWebServiceWsdl)
         # Loop over all input image quality indicators:
         listImageQualityIndicatorsForWS = []
         for xsDataImageQualityIndicators in self.dataInput.imageQualityIndicators:
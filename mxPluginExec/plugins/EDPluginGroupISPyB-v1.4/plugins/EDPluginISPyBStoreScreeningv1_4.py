@@ -37,8 +37,6 @@ from EDFactoryPluginStatic import EDFactoryPluginStatic
 
 from EDPluginISPyBv1_4 import EDPluginISPyBv1_4
 
-from suds.client import Client
-from suds.transport.http import HttpAuthenticated
 from suds.sax.date import DateTime
 
 from XSDataCommon import XSDataInteger
@@ -81,23 +79,14 @@ class EDPluginISPyBStoreScreeningv1_4(EDPluginISPyBv1_4):
         EDPluginISPyBv1_4.process(self)
         self.DEBUG("EDPluginISPyBStoreScreeningv1_4.process")
         xsDataInputISPyBStoreScreening = self.getDataInput()
-        httpAuthenticatedToolsForAutoprocessingWebService1 = HttpAuthenticated(username=self.strUserName, password=self.strPassWord)
-        clientToolsForBLSampleWebServiceWsdl = Client(self.strToolsForBLSampleWebServiceWsdl,
-                                                      transport=httpAuthenticatedToolsForAutoprocessingWebService1,
-                                                      cache=None)
-        httpAuthenticatedToolsForAutoprocessingWebService2 = HttpAuthenticated(username=self.strUserName, password=self.strPassWord)
-        clientToolsForScreeningEDNAWebServiceWsdl = Client(self.strToolsForScreeningEDNAWebServiceWsdl,
-                                                           transport=httpAuthenticatedToolsForAutoprocessingWebService2,
-                                                           cache=None)
+        clientToolsForBLSampleWebServiceWsdl = self.getClient(self.strToolsForBLSampleWebServiceWsdl)
+        clientToolsForScreeningEDNAWebServiceWsdl = self.getClient(self.strToolsForScreeningEDNAWebServiceWsdl)
         self.bContinue = True
         # Data collection Id
         if xsDataInputISPyBStoreScreening.screening.dataCollectionGroupId is None:
             xsDataISPyBImage = xsDataInputISPyBStoreScreening.image
             if xsDataISPyBImage is not None:
-                httpAuthenticatedToolsForAutoprocessingWebService3 = HttpAuthenticated(username=self.strUserName, password=self.strPassWord)
-                clientToolsForCollectionWebService = Client(self.strToolsForCollectionWebServiceWsdl,
-                                                            transport=httpAuthenticatedToolsForAutoprocessingWebService3,
-                                                            cache=None)
+                clientToolsForCollectionWebService = self.getClient(self.strToolsForCollectionWebServiceWsdl)
                 self.iDataCollectionGroupId = self.findDataCollectionFromFileLocationAndFileName(clientToolsForCollectionWebService, xsDataISPyBImage.fileLocation.value, xsDataISPyBImage.fileName.value)
                 if self.iDataCollectionGroupId is None:
                     self.ERROR("Couldn't obtain data collection id!")
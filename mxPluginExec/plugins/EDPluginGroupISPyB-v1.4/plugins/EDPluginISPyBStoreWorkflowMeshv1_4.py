@@ -36,8 +36,6 @@ from EDFactoryPluginStatic import EDFactoryPluginStatic
 
 from EDPluginISPyBv1_4 import EDPluginISPyBv1_4
 
-from suds.client import Client
-from suds.transport.http import HttpAuthenticated
 from suds.sax.date import DateTime
 
 from XSDataCommon import XSDataInteger
@@ -77,10 +75,7 @@ class EDPluginISPyBStoreWorkflowMeshv1_4(EDPluginISPyBv1_4):
         # First get the image ID
         xsDataInputWorkflowMesh = self.getDataInput()
 
-        httpAuthenticatedToolsForCollectionWebService = HttpAuthenticated(username=self.strUserName, password=self.strPassWord)
-        clientToolsForCollectionWebService = Client(self.strToolsForCollectionWebServiceWsdl,
-                                                    transport=httpAuthenticatedToolsForCollectionWebService,
-                                                    cache=None)
+        clientToolsForCollectionWebService = self.getClient(self.strToolsForCollectionWebServiceWsdl)
         workflowMeshWS3VO = clientToolsForCollectionWebService.factory.create('workflowMeshWS3VO')
         workflowMeshWS3VO.workflowId = self.getXSValue(xsDataInputWorkflowMesh.workflowId)
         workflowMeshWS3VO.bestPositionId = self.getXSValue(xsDataInputWorkflowMesh.bestPositionId)
@@ -37,8 +37,6 @@ from EDFactoryPluginStatic import EDFactoryPluginStatic
 
 from EDPluginISPyBv1_4 import EDPluginISPyBv1_4
 
-from suds.client import Client
-from suds.transport.http import HttpAuthenticated
 from suds.sax.date import DateTime
 
 from XSDataCommon import XSDataInteger
@@ -77,10 +75,7 @@ class EDPluginISPyBStoreWorkflowv1_4(EDPluginISPyBv1_4):
         # First get the image ID
         xsDataWorkflow = self.getDataInput().getWorkflow()
 
-        httpAuthenticatedToolsForCollectionWebService = HttpAuthenticated(username=self.strUserName, password=self.strPassWord)
-        clientToolsForCollectionWebService = Client(self.strToolsForCollectionWebServiceWsdl,
-                                                    transport=httpAuthenticatedToolsForCollectionWebService,
-                                                    cache=None)
+        clientToolsForCollectionWebService = self.getClient(self.strToolsForCollectionWebServiceWsdl)
         workflow3VO = clientToolsForCollectionWebService.factory.create('workflow3VO')
         workflow3VO.comments = self.getXSValue(xsDataWorkflow.comments)
         workflow3VO.logFilePath = self.getXSValue(xsDataWorkflow.logFilePath)
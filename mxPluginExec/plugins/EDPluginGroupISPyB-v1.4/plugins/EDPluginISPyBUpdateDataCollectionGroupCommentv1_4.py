@@ -36,8 +36,6 @@ from EDFactoryPluginStatic import EDFactoryPluginStatic
 
 from EDPluginISPyBv1_4 import EDPluginISPyBv1_4
 
-from suds.client import Client
-from suds.transport.http import HttpAuthenticated
 from suds.sax.date import DateTime
 
 from XSDataCommon import XSDataInteger
@@ -77,10 +75,7 @@ class EDPluginISPyBUpdateDataCollectionGroupCommentv1_4(EDPluginISPyBv1_4):
         xsDataInput = self.getDataInput()
         newComment = xsDataInput.newComment.value
 #        print xsDataInput.marshal()
-        httpAuthenticatedToolsForCollectionWebService = HttpAuthenticated(username=self.strUserName, password=self.strPassWord)
-        clientToolsForCollectionWebService = Client(self.strToolsForCollectionWebServiceWsdl,
-                                                    transport=httpAuthenticatedToolsForCollectionWebService,
-                                                    cache=None)
+        clientToolsForCollectionWebService = self.getClient(self.strToolsForCollectionWebServiceWsdl)
         if xsDataInput.dataCollectionId is None:
             self.ERROR("No input data collection id")
             self.setFailure()
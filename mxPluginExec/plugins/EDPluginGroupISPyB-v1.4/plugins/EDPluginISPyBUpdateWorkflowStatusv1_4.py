@@ -37,8 +37,6 @@ from EDFactoryPluginStatic import EDFactoryPluginStatic
 
 from EDPluginISPyBv1_4 import EDPluginISPyBv1_4
 
-from suds.client import Client
-from suds.transport.http import HttpAuthenticated
 from suds.sax.date import DateTime
 
 from XSDataCommon import XSDataInteger
@@ -78,10 +76,7 @@ class EDPluginISPyBUpdateWorkflowStatusv1_4(EDPluginISPyBv1_4):
         # Get the workflow ID and status
         iWorkflowId = self.dataInput.workflowId.value
         strStatus = self.dataInput.newStatus.value
-        httpAuthenticatedToolsForCollectionWebService = HttpAuthenticated(username=self.strUserName, password=self.strPassWord)
-        clientToolsForCollectionWebService = Client(self.strToolsForCollectionWebServiceWsdl,
-                                                    transport=httpAuthenticatedToolsForCollectionWebService,
-                                                    cache=None)
+        clientToolsForCollectionWebService = self.getClient(self.strToolsForCollectionWebServiceWsdl)
         self.iWorkflowId = clientToolsForCollectionWebService.service.updateWorkflowStatus(iWorkflowId, strStatus)
         self.DEBUG("EDPluginISPyBUpdateWorkflowStatusv1_4.process: WorkflowId=%d" % self.iWorkflowId)
 
@@ -32,8 +32,12 @@ __status__ = "production"
 
 import os
 import sys
+import copy
+import getpass
 import datetime
+import tempfile
 
+from EDThreading import Semaphore
 from EDPluginExec import EDPluginExec
 from EDFactoryPluginStatic import EDFactoryPluginStatic
 
@@ -46,6 +50,9 @@ else:
 
 
 from suds.client import Client
+from suds.client import ServiceSelector
+from suds.cache import ObjectCache
+from suds.options import Options
 from suds.transport.http import HttpAuthenticated
 from suds.sax.date import DateTime
 
@@ -53,10 +60,27 @@ from suds.sax.date import DateTime
 class EDPluginISPyBv1_4(EDPluginExec):
     """
     Abstract plugin for all ISPyBv1_4 plugins
+
+    The web service clients are taken from a process-wide pool keyed by
+    (WSDL URL, user name, pass word, transport class). The WSDL and its schemas are downloaded
+    and parsed only once per key: the parsed definitions are kept in memory
+    and pickled to a disk cache so that they survive between runs. New clients
+    are shallow clones of the parsed client, and idle clients are reused, so
+    a store or retrieve call only costs the SOAP round-trip.
     """
 
+    __semaphoreClientPool = Semaphore()
+    __dictSemaphoreWsdl = {}
+    __dictClientTemplate = {}
+    __dictIdleClient = {}
+    iMaxIdleClients = 8
+    iWsdlCacheDays = 1
+
     def __init__(self):
         EDPluginExec.__init__(self)
+        self.strWsdlCacheDirectory = None
+        self.iWsdlCacheDays = EDPluginISPyBv1_4.iWsdlCacheDays
+        self.__listCheckedOutClient = []
         self.strUserName = None
         self.strPassWord = None
         self.strToolsForCollectionWebServiceWsdl = None
@@ -98,6 +122,111 @@ class EDPluginISPyBv1_4(EDPluginExec):
         if _bRequireToolsForScreeningEDNAWebServiceWsdl and self.strToolsForScreeningEDNAWebServiceWsdl is None:
             self.ERROR("EDPluginISPyBStoreScreeningv1_4.configure: No toolsForScreeningEDNAWebServiceWsdl found in configuration!")
             self.setFailure()
+        self.strWsdlCacheDirectory = self.config.get("wsdlCacheDirectory")
+        self.iWsdlCacheDays = int(self.config.get("wsdlCacheDays", EDPluginISPyBv1_4.iWsdlCacheDays))
+
+
+    def finallyProcess(self, _edObject=None):
+        EDPluginExec.finallyProcess(self, _edObject)
+        self.releaseClients()
+
+
+    def getClient(self, _strWsdl, _transportClass=HttpAuthenticated):
+        """
+        Returns a web service client for the given WSDL checked out from the
+        process-wide pool. The client is returned to the pool in finallyProcess.
+        _transportClass is the suds transport, e.g. suds.transport.https.HttpAuthenticated
+        """
+        tupleKey = (_strWsdl, self.strUserName, self.strPassWord, _transportClass)
+        client = EDPluginISPyBv1_4.checkOutClient(tupleKey,
+                                                  _strCacheDirectory=self.strWsdlCacheDirectory,
+                                                  _iCacheDays=self.iWsdlCacheDays)
+        self.__listCheckedOutClient.append((tupleKey, client))
+        return client
+
+
+    def releaseClients(self):
+        """
+        Returns all the clients checked out by this plugin to the pool
+        """
+        while self.__listCheckedOutClient:
+            (tupleKey, client) = self.__listCheckedOutClient.pop()
+            EDPluginISPyBv1_4.checkInClient(tupleKey, client)
+
+
+    @classmethod
+    def getDefaultWsdlCacheDirectory(cls):
+        return os.path.join(tempfile.gettempdir(), "edna-wsdl-cache-%s" % getpass.getuser())
+
+
+    @classmethod
+    def createClient(cls, _tupleKey, _strCacheDirectory=None, _iCacheDays=None):
+        """
+        Creates a client by downloading and parsing the WSDL, or by loading
+        the parsed WSDL from the disk cache.
+        """
+        (strWsdl, strUserName, strPassWord, transportClass) = _tupleKey
+        if _strCacheDirectory is None:
+            _strCacheDirectory = cls.getDefaultWsdlCacheDirectory()
+        if _iCacheDays is None:
+            _iCacheDays = cls.iWsdlCacheDays
+        objectCache = ObjectCache(location=_strCacheDirectory, days=_iCacheDays)
+        transport = transportClass(username=strUserName, password=strPassWord)
+        return Client(strWsdl, transport=transport, cache=objectCache, cachingpolicy=1)
+
+
+    @classmethod
+    def checkOutClient(cls, _tupleKey, _strCacheDirectory=None, _iCacheDays=None):
+        """
+        Returns an idle client for the key, or a clone of the parsed client
+        which is created the first time the key is used.
+        """
+        with cls.__semaphoreClientPool:
+            listIdleClient = cls.__dictIdleClient.setdefault(_tupleKey, [])
+            if listIdleClient:
+                return listIdleClient.pop()
+            semaphoreWsdl = cls.__dictSemaphoreWsdl.setdefault(_tupleKey, Semaphore())
+        # Only one thread parses a given WSDL, the others wait for the result
+        with semaphoreWsdl:
+            clientTemplate = cls.__dictClientTemplate.get(_tupleKey)
+            if clientTemplate is None:
+                clientTemplate = cls.createClient(_tupleKey, _strCacheDirectory, _iCacheDays)
+                with cls.__semaphoreClientPool:
+                    cls.__dictClientTemplate[_tupleKey] = clientTemplate
+        return cls.cloneClient(_tupleKey, clientTemplate)
+
+
+    @classmethod
+    def cloneClient(cls, _tupleKey, _clientTemplate):
+        """
+        Returns a client sharing the parsed WSDL of the template client but with
+        its own options and transport. (Client.clone() deep copies the options,
+        which fails with Python 3.)
+        """
+        (strWsdl, strUserName, strPassWord, transportClass) = _tupleKey
+        client = copy.copy(_clientTemplate)
+        client.options = Options()
+        client.set_options(transport=transportClass(username=strUserName, password=strPassWord),
+                           cache=_clientTemplate.options.cache,
+                           cachingpolicy=1)
+        client.service = ServiceSelector(client, client.wsdl.services)
+        return client
+
+
+    @classmethod
+    def checkInClient(cls, _tupleKey, _client):
+        with cls.__semaphoreClientPool:
+            listIdleClient = cls.__dictIdleClient.setdefault(_tupleKey, [])
+            if len(listIdleClient) < cls.iMaxIdleClients:
+                listIdleClient.append(_client)
+
+
+    @classmethod
+    def clearClientPool(cls):
+        with cls.__semaphoreClientPool:
+            cls.__dictClientTemplate.clear()
+            cls.__dictIdleClient.clear()
+            cls.__dictSemaphoreWsdl.clear()
 
     def getValue(self, _oValue, _oDefaultValue=None):
         if _oValue is None:
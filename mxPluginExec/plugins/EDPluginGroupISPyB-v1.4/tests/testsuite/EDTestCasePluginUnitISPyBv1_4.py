@@ -0,0 +1,211 @@
+#
+#    Project: mxPluginExec
+#             http://www.edna-site.org
+#
+#    Copyright (C) European Synchrotron Radiation Facility
+#                            Grenoble, France
+#
+#    Principal authors:      Olof Svensson (svensson@esrf.fr)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    and the GNU Lesser General Public License  along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+__author__ = "Olof Svensson"
+__contact__ = "svensson@esrf.fr"
+__license__ = "LGPLv3+"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+
+
+import os
+import shutil
+import tempfile
+import threading
+import http.server
+
+from EDAssert import EDAssert
+from EDTestCasePluginUnit import EDTestCasePluginUnit
+
+
+STR_SOAP_RESPONSE = """<?xml version="1.0" encoding="UTF-8"?>
+<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">
+  <soap:Body>
+    <ns2:findDataCollectionResponse xmlns:ns2="http://ispyb.ejb3.webservices.collection">
+      <return>
+        <dataCollectionId>%d</dataCollectionId>
+        <imageDirectory>/data/visitor/mx415/id30a1</imageDirectory>
+        <imagePrefix>ref-testscale</imagePrefix>
+      </return>
+    </ns2:findDataCollectionResponse>
+  </soap:Body>
+</soap:Envelope>
+"""
+
+
+class LocalWebServiceHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Serves the stand-in WSDL from disk and answers all SOAP requests
+    """
+
+    def do_GET(self):
+        self.server.iNumberOfGet += 1
+        with open(self.server.strWsdlPath, "rb") as f:
+            pyBody = f.read()
+        pyBody = pyBody.replace(b"http://localhost:8080", ("http://localhost:%d" % self.server.server_port).encode())
+        self.send_response(200)
+        self.send_header("Content-Type", "text/xml")
+        self.send_header("Content-Length", str(len(pyBody)))
+        self.end_headers()
+        self.wfile.write(pyBody)
+
+    def do_POST(self):
+        self.server.iNumberOfPost += 1
+        self.rfile.read(int(self.headers["Content-Length"]))
+        pyBody = (STR_SOAP_RESPONSE % self.server.iNumberOfPost).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/xml; charset=utf-8")
+        self.send_header("Content-Length", str(len(pyBody)))
+        self.end_headers()
+        self.wfile.write(pyBody)
+
+    def log_message(self, *args):
+        pass
+
+
+
+class EDTestCasePluginUnitISPyBv1_4(EDTestCasePluginUnit):
+    """
+    Tests the process-wide web service client pool against a local stand-in WSDL
+    """
+
+    def __init__(self, _edStringTestName=None):
+        EDTestCasePluginUnit.__init__(self, "EDPluginISPyBv1_4")
+        self.strWsdlPath = os.path.join(self.getPluginTestsDataHome(), "ToolsForCollectionWebService_localStandIn.wsdl")
+
+
+    def preProcess(self):
+        EDTestCasePluginUnit.preProcess(self)
+        self.strCacheDirectory = tempfile.mkdtemp(prefix="EDTestCasePluginUnitISPyBv1_4-")
+
+
+    def postProcess(self):
+        EDTestCasePluginUnit.postProcess(self)
+        shutil.rmtree(self.strCacheDirectory, ignore_errors=True)
+
+
+    def createISPyBPlugin(self):
+        edPlugin = self.createPlugin()
+        edPlugin.strUserName = "user"
+        edPlugin.strPassWord = "password"
+        edPlugin.strWsdlCacheDirectory = self.strCacheDirectory
+        return edPlugin
+
+
+    def testClientPool(self):
+        """
+        Clients share the parsed WSDL and idle clients are reused
+        """
+        from EDPluginISPyBv1_4 import EDPluginISPyBv1_4
+        EDPluginISPyBv1_4.clearClientPool()
+        strWsdl = "file://" + self.strWsdlPath
+        edPlugin1 = self.createISPyBPlugin()
+        edPlugin2 = self.createISPyBPlugin()
+        client1 = edPlugin1.getClient(strWsdl)
+        client2 = edPlugin2.getClient(strWsdl)
+        EDAssert.equal(False, client1 is client2, "Checked out clients are distinct")
+        EDAssert.equal(True, client1.wsdl is client2.wsdl, "Parsed WSDL is shared")
+        EDAssert.equal(True, client1.options.transport is not client2.options.transport, "Transports are distinct")
+        edPlugin1.releaseClients()
+        client3 = edPlugin2.getClient(strWsdl)
+        EDAssert.equal(True, client1 is client3, "Idle client is reused")
+        edPlugin2.releaseClients()
+        # https transport, as used by EDPluginISPyBStoreImageQualityIndicatorsv1_4
+        from suds.transport import https
+        client4 = edPlugin2.getClient(strWsdl, https.HttpAuthenticated)
+        EDAssert.equal(https.HttpAuthenticated, client4.options.transport.__class__, "https transport")
+        EDAssert.equal(True, client4.wsdl is not client1.wsdl, "Not taken from the pool of the http clients")
+        edPlugin2.releaseClients()
+        client5 = edPlugin2.getClient(strWsdl, https.HttpAuthenticated)
+        EDAssert.equal(True, client4 is client5, "Idle https client is reused")
+        EDAssert.equal(False, client5 is edPlugin1.getClient(strWsdl), "https client not given for http")
+        edPlugin1.releaseClients()
+        edPlugin2.releaseClients()
+
+
+    def testDiskCache(self):
+        """
+        The parsed WSDL is loaded from the disk cache when the WSDL is no longer available
+        """
+        from EDPluginISPyBv1_4 import EDPluginISPyBv1_4
+        EDPluginISPyBv1_4.clearClientPool()
+        strWsdlPath = os.path.join(self.strCacheDirectory, "ToolsForCollectionWebService.wsdl")
+        shutil.copy(self.strWsdlPath, strWsdlPath)
+        edPlugin = self.createISPyBPlugin()
+        edPlugin.getClient("file://" + strWsdlPath)
+        edPlugin.releaseClients()
+        os.remove(strWsdlPath)
+        EDPluginISPyBv1_4.clearClientPool()
+        client = edPlugin.getClient("file://" + strWsdlPath)
+        EDAssert.equal(True, client.wsdl is not None, "WSDL loaded from the disk cache")
+        edPlugin.releaseClients()
+
+
+    def testSingleRoundTrip(self):
+        """
+        Concurrent calls against a local web service download the WSDL once
+        and only cost one SOAP request each
+        """
+        from EDPluginISPyBv1_4 import EDPluginISPyBv1_4
+        EDPluginISPyBv1_4.clearClientPool()
+        httpServer = http.server.ThreadingHTTPServer(("localhost", 0), LocalWebServiceHandler)
+        httpServer.strWsdlPath = self.strWsdlPath
+        httpServer.iNumberOfGet = 0
+        httpServer.iNumberOfPost = 0
+        threadServer = threading.Thread(target=httpServer.serve_forever)
+        threadServer.daemon = True
+        threadServer.start()
+        # Empty disk caches, so the WSDL has to be downloaded once
+        strWsdl = "http://localhost:%d/ToolsForCollectionWebService?wsdl" % httpServer.server_port
+        listResult = []
+        def call():
+            edPlugin = self.createISPyBPlugin()
+            edPlugin.strWsdlCacheDirectory = tempfile.mkdtemp(dir=self.strCacheDirectory)
+            for _ in range(5):
+                client = edPlugin.getClient(strWsdl)
+                listResult.append(client.service.findDataCollection(1).dataCollectionId)
+                edPlugin.releaseClients()
+        listThread = [threading.Thread(target=call) for _ in range(4)]
+        for thread in listThread:
+            thread.start()
+        for thread in listThread:
+            thread.join()
+        httpServer.shutdown()
+        httpServer.server_close()
+        EDAssert.equal(20, len(listResult), "Number of results")
+        EDAssert.equal(1, httpServer.iNumberOfGet, "WSDL downloaded once")
+        EDAssert.equal(20, httpServer.iNumberOfPost, "One SOAP request per call")
+
+
+    def process(self):
+        self.addTestMethod(self.testClientPool)
+        self.addTestMethod(self.testDiskCache)
+        self.addTestMethod(self.testSingleRoundTrip)
+
+
+
+if __name__ == '__main__':
+
+    edTestCasePluginUnitISPyBv1_4 = EDTestCasePluginUnitISPyBv1_4("EDTestCasePluginUnitISPyBv1_4")
+    edTestCasePluginUnitISPyBv1_4.execute()
@@ -26,10 +26,11 @@ __license__ = "GPLv3+"
 __copyright__ = "ESRF"
 
 import os
-import time
-import shutil
+import concurrent.futures
 
+from EDPluginExec import EDPluginExec
 from EDPluginExecProcessScript import EDPluginExecProcessScript
+from EDFileWatcher import EDFileWatcher
 from EDUtilsImage import EDUtilsImage
 from EDUtilsPath import EDUtilsPath
 
@@ -39,12 +40,26 @@ from XSDataCommon import XSDataFile
 from XSDataH5ToCBFv1_1 import XSDataInputH5ToCBF
 from XSDataH5ToCBFv1_1 import XSDataResultH5ToCBF
 
+from EDHandlerH5ToCBF import EDHandlerH5ToCBF
+
 class EDPluginH5ToCBFv1_1(EDPluginExecProcessScript):
     """
     This plugin runs the 'MOSFLM' converter (eiger2cbf or minicbf) 
     to create CBF files from Eiger HDF5 images. 
+
+    If the configuration parameter "converter" is "native" (the default if
+    h5py is available) the images are instead converted in-process by
+    EDHandlerH5ToCBF, and the CBF files are written directly with their
+    final names.
+
+    In range mode the CBF files are named prefix_######.cbf after the image
+    numbers, unless forcedOutputImageNumber is given: the files are then
+    named prefix_####.cbf starting at forcedOutputImageNumber.
     """
 
+    CONVERTER_NATIVE = "native"
+    CONVERTER_SCRIPT = "script"
+
 
     def __init__(self):
         EDPluginExecProcessScript.__init__(self)
@@ -52,7 +67,32 @@ class EDPluginH5ToCBFv1_1(EDPluginExecProcessScript):
         self.setDataOutput(XSDataResultH5ToCBF())
         self.CBFFile = None
         self.CBFFileTemplate = None
-        self.tmpCBFFile = None
+        self.masterFile = None
+        self.listConversion = []
+        self.listCBFFile = []
+        if EDHandlerH5ToCBF.isAvailable():
+            self.strConverter = self.CONVERTER_NATIVE
+        else:
+            self.strConverter = self.CONVERTER_SCRIPT
+        self.fTimeOutCBFFile = 60.0
+
+
+    def configure(self):
+        strConverter = self.config.get("converter", self.strConverter)
+        if strConverter == self.CONVERTER_NATIVE and not EDHandlerH5ToCBF.isAvailable():
+            self.warning("EDPluginH5ToCBFv1_1: h5py not available, using the converter script")
+            strConverter = self.CONVERTER_SCRIPT
+        self.strConverter = strConverter
+        if self.isNative():
+            # No converter script to configure
+            EDPluginExec.configure(self)
+        else:
+            EDPluginExecProcessScript.configure(self)
+        self.fTimeOutCBFFile = float(self.config.get("timeOutCBFFile", self.fTimeOutCBFFile))
+
+
+    def isNative(self):
+        return self.strConverter == self.CONVERTER_NATIVE
 
 
     def checkParameters(self):
@@ -65,22 +105,80 @@ class EDPluginH5ToCBFv1_1(EDPluginExecProcessScript):
 
 
     def preProcess(self, _edObject=None):
-        EDPluginExecProcessScript.preProcess(self)
+        if self.isNative():
+            EDPluginExec.preProcess(self)
+        else:
+            EDPluginExecProcessScript.preProcess(self)
         self.DEBUG("EDPluginH5ToCBFv1_1.preProcess")
         xsDataInputH5ToCBF = self.getDataInput()
-        self.setScriptCommandline(self.generateCommands(xsDataInputH5ToCBF))
+        strCommandLine = self.generateCommands(xsDataInputH5ToCBF)
+        if not self.isNative():
+            self.setScriptCommandline(strCommandLine)
 
 
 
     def process(self, _edObject=None):
-        EDPluginExecProcessScript.process(self)
+        if self.isNative():
+            EDPluginExec.process(self)
+            self.convert()
+        else:
+            EDPluginExecProcessScript.process(self)
         self.DEBUG("EDPluginH5ToCBFv1_1.process")
 
     def postProcess(self, _edObject=None):
-        EDPluginExecProcessScript.postProcess(self)
+        if self.isNative():
+            EDPluginExec.postProcess(self)
+        else:
+            EDPluginExecProcessScript.postProcess(self)
+            if not self.isFailure():
+                self.collectScriptOutput()
         self.DEBUG("EDPluginH5ToCBFv1_1.postProcess")
 
 
+    def convert(self):
+        """
+        Converts the frames in-process, the completion of each frame is reported
+        as soon as the block of frames it belongs to is written.
+        """
+        self.DEBUG("EDPluginH5ToCBFv1_1.convert")
+        listTask = EDHandlerH5ToCBF.submitConversion(self.masterFile, self.listConversion)
+        dictBlock = dict((future, listBlock) for (listBlock, future) in listTask)
+        for future in concurrent.futures.as_completed(dictBlock):
+            try:
+                listWritten = future.result()
+            except Exception as exception:
+                strErrorMessage = "Error when converting {0} frame(s) of {1}: {2}".format(
+                    len(dictBlock[future]), self.masterFile, exception)
+                self.error(strErrorMessage)
+                self.addErrorMessage(strErrorMessage)
+                self.setFailure()
+            else:
+                for strPath in listWritten:
+                    self.DEBUG("EDPluginH5ToCBFv1_1: CBF file written: {0}".format(strPath))
+                self.listCBFFile.extend(listWritten)
+
+
+    def collectScriptOutput(self):
+        """
+        Waits for the files written by the converter script and gives them
+        their final names (the script always numbers the files with 6 digits)
+        """
+        listScriptFile = []
+        for (iFrameNumber, strPath) in self.listConversion:
+            if self.CBFFileTemplate is not None and "######" not in self.CBFFileTemplate:
+                listScriptFile.append(self.CBFFileTemplate.replace("####", "{0:06d}".format(iFrameNumber)))
+            else:
+                listScriptFile.append(strPath)
+        listExpectation = EDFileWatcher.waitFiles(listScriptFile, None, self.fTimeOutCBFFile)
+        for (edExpectation, (iFrameNumber, strPath)) in zip(listExpectation, self.listConversion):
+            if not edExpectation.isComplete():
+                self.warning("EDPluginH5ToCBFv1_1: CBF file not found: {0}".format(edExpectation.path))
+                continue
+            if edExpectation.path != strPath:
+                os.rename(edExpectation.path, strPath)
+            self.listCBFFile.append(strPath)
+
+
 
     def finallyProcess(self, _edObject=None):
         EDPluginExecProcessScript.finallyProcess(self)
@@ -101,6 +199,7 @@ class EDPluginH5ToCBFv1_1(EDPluginExecProcessScript):
         hdf5File = _xsDataInputH5ToCBF.hdf5File.path.value
         directory = os.path.dirname(hdf5File)
         prefix = EDUtilsImage.getPrefix(hdf5File)
+        self.listConversion = []
 
         if _xsDataInputH5ToCBF.imageNumber is not None:
             imageNumber = _xsDataInputH5ToCBF.imageNumber.value
@@ -136,6 +235,7 @@ class EDPluginH5ToCBFv1_1(EDPluginExecProcessScript):
                 self.CBFFile = os.path.join(forcedOutputDirectory, CBFFileName)
 
             scriptCommandLine = "{0} {1} {2}".format(masterFile, imageNumberInHdf5File, self.CBFFile)
+            self.listConversion.append((imageNumberInHdf5File, self.CBFFile))
 
         elif _xsDataInputH5ToCBF.startImageNumber is not None and _xsDataInputH5ToCBF.endImageNumber is not None:
 
@@ -164,7 +264,17 @@ class EDPluginH5ToCBFv1_1(EDPluginExecProcessScript):
 
             scriptCommandLine = "{0} {1}:{2} {3}".format(masterFile, startImageNumber, endImageNumber, CBFFilePath)
 
-            self.CBFFileTemplate = CBFFilePath + "######.cbf"
+            if _xsDataInputH5ToCBF.forcedOutputImageNumber is None:
+                self.CBFFileTemplate = CBFFilePath + "######.cbf"
+                for imageNumber in range(startImageNumber, endImageNumber + 1):
+                    self.listConversion.append((imageNumber, CBFFilePath + "{0:06d}.cbf".format(imageNumber)))
+            else:
+                forcedOutputImageNumber = _xsDataInputH5ToCBF.forcedOutputImageNumber.value
+                self.CBFFileTemplate = CBFFilePath + "####.cbf"
+                for imageNumber in range(startImageNumber, endImageNumber + 1):
+                    outputImageNumber = forcedOutputImageNumber + imageNumber - startImageNumber
+                    self.listConversion.append((imageNumber, CBFFilePath + "{0:04d}.cbf".format(outputImageNumber)))
 
+        self.masterFile = masterFile
         return scriptCommandLine
 
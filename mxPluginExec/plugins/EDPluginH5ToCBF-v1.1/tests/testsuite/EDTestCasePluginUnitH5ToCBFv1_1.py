@@ -59,9 +59,18 @@ class EDTestCasePluginUnitH5ToCBFv1_1(EDTestCasePluginUnit):
         xsDataInputH5ToCBFWithRange = XSDataInputH5ToCBF.parseFile(self.strReferenceInputFileWithRange)
         strCommandLineWithRange = edPluginH5ToCBF.generateCommands(xsDataInputH5ToCBFWithRange)
         print(strCommandLineWithRange)
+        EDAssert.equal(100, len(edPluginH5ToCBF.listConversion), "Number of frames to convert")
 
 
+    def testCompressByteOffset(self):
+        import numpy
+        from EDHandlerH5ToCBF import compressByteOffset
+        arrayCompressed = compressByteOffset(numpy.array([[5, -1], [300, 70000]]))
+        listReference = [0x05, 0xfa, 0x80, 0x2d, 0x01, 0x80, 0x00, 0x80, 0x44, 0x10, 0x01, 0x00]
+        EDAssert.equal(listReference, [int(iByte) for iByte in arrayCompressed], "Byte offset compression")
+
 
 
     def process(self):
         self.addTestMethod(self.testGenerateCommands)
+        self.addTestMethod(self.testCompressByteOffset)
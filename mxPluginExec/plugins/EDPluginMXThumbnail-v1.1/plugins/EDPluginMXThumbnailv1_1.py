@@ -28,21 +28,12 @@ __date__ = "20120712"
 __status__ = "production"
 
 import os
-import numpy
-import fabio
-import scipy.ndimage
-try:
-    import Image
-    import ImageFile
-    import ImageOps
-except:
-    from PIL import Image
-    from PIL import ImageFile
-    from PIL import ImageOps
-    
+
 from EDPluginExec import EDPluginExec
-from EDUtilsFile import EDUtilsFile
-from EDUtilsPlatform import EDUtilsPlatform
+from EDFactoryPluginStatic import EDFactoryPluginStatic
+
+EDFactoryPluginStatic.loadModule("EDHandlerMXThumbnail")
+from EDHandlerMXThumbnail import EDHandlerMXThumbnail
 
 from XSDataCommon import XSDataString
 from XSDataCommon import XSDataFile
@@ -51,19 +42,24 @@ from XSDataMXThumbnailv1_1 import XSDataInputMXThumbnail
 from XSDataMXThumbnailv1_1 import XSDataResultMXThumbnail
 
 class EDPluginMXThumbnailv1_1(EDPluginExec):
-    
+    """
+    Creates a JPEG or PNG thumbnail of a diffraction image. Additional thumbnails
+    (e.g. of another size) can be requested with addThumbnail, they are made from
+    the same decoded frame.
+    """
 
     def __init__(self):
         EDPluginExec.__init__(self)
         self.setXSDataInputClass(XSDataInputMXThumbnail)
         self.setDataOutput(XSDataResultMXThumbnail())
-        self.minLevel = 0
-        self.maxLevel = 99.95 # %
-        self.dilatation = 4
+        self.minLevel = EDHandlerMXThumbnail.MIN_LEVEL
+        self.maxLevel = EDHandlerMXThumbnail.MAX_LEVEL # %
+        self.dilatation = EDHandlerMXThumbnail.DILATATION
         self.format = "jpg"
         self.width = 512
         self.height = 512
         self.output = None
+        self.listAdditionalThumbnail = []
 
 
     def checkParameters(self):
@@ -71,43 +67,38 @@ class EDPluginMXThumbnailv1_1(EDPluginExec):
         self.checkMandatoryParameters(self.dataInput, "Data Input is None")
         self.checkMandatoryParameters(self.dataInput.image, "Input image is None")
 
+
+    def addThumbnail(self, _iWidth, _iHeight, _strOutputPath, _strFormat=None):
+        """
+        Requests an additional thumbnail, made from the same frame as the thumbnail of the data input
+        """
+        self.listAdditionalThumbnail.append((_iWidth, _iHeight, _strOutputPath, _strFormat))
+
     
     def process(self, _edObject=None):
         EDPluginExec.process(self)
         imageFileName = os.path.basename(self.dataInput.image.path.value)
         # Default format
         strSuffix = "jpg"
-        strPILFormat = "JPEG"
         # Check if format is provided
         if self.dataInput.format is not None:
             strFormat = self.dataInput.format.value
             if strFormat.lower() == "png":
                 strSuffix = "png"
-                strPILFormat = "PNG"
-        # The following code has been adapted from EDPluginExecThumbnail written by J.Kieffer
-        fabioImage = fabio.openimage.openimage(self.dataInput.image.path.value)
-        numpyImage = fabioImage.data
-        dtype = numpyImage.dtype
-        sortedArray = numpyImage.flatten()
-        sortedArray.sort()
-        numpyImage = numpy.maximum(numpyImage, int(self.minLevel) * numpy.ones_like(numpyImage))
-        maxLevel = sortedArray[int(round(float(self.maxLevel) * sortedArray.size / 100.0))]
-        numpyImage = numpy.minimum(numpyImage, maxLevel * numpy.ones_like(numpyImage))
-        numpyImage = scipy.ndimage.morphology.grey_dilation(numpyImage, (self.dilatation, self.dilatation))
-        mumpyImageFloat = (numpyImage.astype(numpy.float32)) / float(maxLevel)
-        numpyImageInt = ( mumpyImageFloat * 255.0 ).astype(numpy.uint8)
-        pilOutputImage = ImageOps.invert(Image.fromarray(numpyImageInt, 'L'))
-        if self.dataInput.height is not None and self.dataInput.width is not None:
-            pilOutputImage = pilOutputImage.resize((self.dataInput.width.value, self.dataInput.height.value), Image.ANTIALIAS)
         if self.dataInput.outputPath is None:
             outputPath = os.path.join(self.getWorkingDirectory(), os.path.splitext(imageFileName)[0] + "." + strSuffix)
         else:
             outputPath = self.dataInput.outputPath.path.value
-        self.DEBUG("Output thumbnail path: %s" % outputPath)
-        self.width, self.height = pilOutputImage.size
-        if self.width * self.height > ImageFile.MAXBLOCK:
-            ImageFile.MAXBLOCK = self.width * self.height
-        pilOutputImage.save(outputPath, strPILFormat, quality=85, optimize=True)
+        self.DEBUG("Output thumbnail path: %s", outputPath)
+        iWidth = None
+        iHeight = None
+        if self.dataInput.height is not None and self.dataInput.width is not None:
+            iWidth = self.dataInput.width.value
+            iHeight = self.dataInput.height.value
+        # The frame is decoded once for all the thumbnails
+        numpyImage = EDHandlerMXThumbnail.readImage(self.dataInput.image.path.value)
+        listThumbnail = [(iWidth, iHeight, outputPath, strSuffix)] + self.listAdditionalThumbnail
+        listSize = EDHandlerMXThumbnail.createThumbnails(numpyImage, listThumbnail, self.minLevel,
+                                                         self.maxLevel, self.dilatation)
+        self.width, self.height = listSize[0]
         self.dataOutput.thumbnail = XSDataFile(XSDataString(outputPath))
-        
-        
\ No newline at end of file
@@ -0,0 +1,167 @@
+#
+#    Project: mxPluginExec
+#             http://www.edna-site.org
+#
+#    Copyright (C) 2011-2013 European Synchrotron Radiation Facility
+#                            Grenoble, France
+#
+#    Principal authors:      Olof Svensson (svensson@esrf.fr) 
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Lesser General Public License as published
+#    by the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Lesser General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    and the GNU Lesser General Public License  along with this program.  
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+__author__ = "Olof Svensson"
+__contact__ = "svensson@esrf.fr"
+__license__ = "LGPLv3+"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+
+import os
+import time
+import shutil
+import tempfile
+
+import numpy
+from PIL import Image
+
+from EDAssert import EDAssert
+from EDTestCasePluginUnit import EDTestCasePluginUnit
+from EDFactoryPluginStatic import EDFactoryPluginStatic
+
+EDFactoryPluginStatic.loadModule("EDHandlerMXThumbnail")
+from EDHandlerMXThumbnail import EDHandlerMXThumbnail
+
+
+class EDTestCasePluginUnitMXThumbnailv1_1(EDTestCasePluginUnit):
+    """
+    Unit tests and benchmark of the thumbnail engine used by EDPluginMXThumbnailv1_1
+    """
+
+    def __init__(self, _strTestName=None):
+        EDTestCasePluginUnit.__init__(self, "EDPluginMXThumbnailv1_1")
+
+
+    def getFrame(self, _iHeight, _iWidth, _strType, _iNumberOfSpots=200):
+        """
+        Synthetic diffraction frame: Poisson background and spots of 2x2 pixels
+        """
+        numpyRandom = numpy.random.RandomState(42)
+        numpyFrame = numpyRandom.poisson(2.0, (_iHeight, _iWidth)).astype(_strType)
+        numpyRows = numpyRandom.randint(0, _iHeight - 2, _iNumberOfSpots)
+        numpyColumns = numpyRandom.randint(0, _iWidth - 2, _iNumberOfSpots)
+        for iShift in range(2):
+            numpyFrame[numpyRows + iShift, numpyColumns] = 5000
+            numpyFrame[numpyRows + iShift, numpyColumns + 1] = 3000
+        return numpyFrame
+
+
+    def getBlockMean(self, _numpyImage, _iSize):
+        iRows = _numpyImage.shape[0] // _iSize * _iSize
+        iColumns = _numpyImage.shape[1] // _iSize * _iSize
+        return _numpyImage[:iRows, :iColumns].reshape(iRows // _iSize, _iSize, iColumns // _iSize, _iSize).mean(axis=(1, 3))
+
+
+    def createThumbnailsReference(self, _numpyImage, _strOutputPath, _strOutputPathThumb):
+        """
+        Former implementation: full sort for the maximum level, dilation of the full frame,
+        the small thumbnail made from the large one
+        """
+        sortedArray = _numpyImage.flatten()
+        sortedArray.sort()
+        numpyImage = numpy.maximum(_numpyImage, 0 * numpy.ones_like(_numpyImage))
+        maxLevel = sortedArray[int(round(99.95 * sortedArray.size / 100.0))]
+        numpyImage = numpy.minimum(numpyImage, maxLevel * numpy.ones_like(numpyImage))
+        try:
+            import scipy.ndimage
+            numpyImage = scipy.ndimage.grey_dilation(numpyImage, (4, 4))
+        except ImportError:
+            numpyImage = EDHandlerMXThumbnail.dilateImage(numpyImage, 4)
+        numpyImageInt = ((numpyImage.astype(numpy.float32)) / float(maxLevel) * 255.0).astype(numpy.uint8)
+        pilImage = Image.fromarray(255 - numpyImageInt, "L").resize((1024, 1024), Image.LANCZOS)
+        pilImage.save(_strOutputPath, "JPEG", quality=85, optimize=True)
+        pilImage = Image.open(_strOutputPath)
+        pilImage.thumbnail((256, 256), Image.LANCZOS)
+        pilImage.save(_strOutputPathThumb, "JPEG")
+
+
+    def testDilateImage(self):
+        numpyImage = numpy.random.RandomState(1).randint(0, 1000, (23, 17))
+        for iSize in [2, 3, 4]:
+            numpyDilated = EDHandlerMXThumbnail.dilateImage(numpyImage, iSize)
+            # Brute force, with the borders reflected
+            numpyPadded = numpy.pad(numpyImage, ((iSize // 2, iSize - iSize // 2 - 1),) * 2, mode="symmetric")
+            numpyReference = numpy.zeros_like(numpyImage)
+            for iRow in range(numpyImage.shape[0]):
+                for iColumn in range(numpyImage.shape[1]):
+                    numpyReference[iRow, iColumn] = numpyPadded[iRow:iRow + iSize, iColumn:iColumn + iSize].max()
+            EDAssert.equal(True, numpy.array_equal(numpyReference, numpyDilated), "Dilation %dx%d" % (iSize, iSize))
+
+
+    def testCreateThumbnails(self):
+        numpyFrame = self.getFrame(600, 500, "int32", 20)
+        strDirectory = tempfile.mkdtemp(prefix="EDTestCasePluginUnitMXThumbnailv1_1_")
+        listThumbnail = [(None, None, os.path.join(strDirectory, "full.png"), "png"),
+                         (256, 256, os.path.join(strDirectory, "image.jpeg"), "jpeg"),
+                         (64, 64, os.path.join(strDirectory, "image.thumb.png"), "png")]
+        listSize = EDHandlerMXThumbnail.createThumbnails(numpyFrame, listThumbnail)
+        EDAssert.equal([(500, 600), (256, 256), (64, 64)], listSize, "Thumbnail sizes")
+        for (iWidth, iHeight, strPath, strFormat) in listThumbnail:
+            pilImage = Image.open(strPath)
+            EDAssert.equal({"png": "PNG", "jpeg": "JPEG"}[strFormat], pilImage.format, "Format of %s" % os.path.basename(strPath))
+        # The spots remain visible (dark) in the smallest thumbnail
+        numpyThumb = numpy.asarray(Image.open(listThumbnail[2][2]))
+        EDAssert.lowerThan(10, numpy.sum(numpyThumb < 128), "Spots visible in the smallest thumbnail")
+        shutil.rmtree(strDirectory)
+
+
+    def testThumbnailBenchmark(self):
+        strDirectory = tempfile.mkdtemp(prefix="EDTestCasePluginUnitMXThumbnailv1_1_")
+        for (strDetector, iHeight, iWidth, strType) in [("Eiger 16M", 4371, 4150, "uint32"),
+                                                        ("Pilatus 6M", 2527, 2463, "int32")]:
+            numpyFrame = self.getFrame(iHeight, iWidth, strType)
+            fTimeStart = time.time()
+            self.createThumbnailsReference(numpyFrame, os.path.join(strDirectory, "reference.jpeg"),
+                                           os.path.join(strDirectory, "reference.thumb.jpeg"))
+            fTimeReference = time.time() - fTimeStart
+            fTimeStart = time.time()
+            EDHandlerMXThumbnail.createThumbnails(numpyFrame, [(1024, 1024, os.path.join(strDirectory, "image.jpeg"), "jpeg"),
+                                                               (256, 256, os.path.join(strDirectory, "image.thumb.jpeg"), "jpeg")])
+            fTime = time.time() - fTimeStart
+            self.screen("%s: former implementation %.3f s, thumbnail engine %.3f s" % (strDetector, fTimeReference, fTime))
+            # Same thumbnails as the former implementation: the pixels of the noise differ with
+            # the resampling, the means of blocks of 8x8 pixels are compared
+            for strName in ["image.jpeg", "image.thumb.jpeg"]:
+                numpyReference = numpy.asarray(Image.open(os.path.join(strDirectory, strName.replace("image", "reference"))), dtype=numpy.float64)
+                numpyThumbnail = numpy.asarray(Image.open(os.path.join(strDirectory, strName)), dtype=numpy.float64)
+                EDAssert.equal(numpyReference.shape, numpyThumbnail.shape, "Size of %s for %s" % (strName, strDetector))
+                numpyDifference = numpy.abs(self.getBlockMean(numpyThumbnail, 8) - self.getBlockMean(numpyReference, 8))
+                self.screen("%s %s: difference of the 8x8 block means %.2f (max %.2f) grey levels" % \
+                            (strDetector, strName, numpyDifference.mean(), numpyDifference.max()))
+                EDAssert.lowerThan(numpyDifference.mean(), 4.0, "Mean difference to the former %s for %s" % (strName, strDetector))
+                EDAssert.lowerThan(numpyDifference.max(), 16.0, "Max difference to the former %s for %s" % (strName, strDetector))
+        shutil.rmtree(strDirectory)
+
+
+    def process(self):
+        self.addTestMethod(self.testDilateImage)
+        self.addTestMethod(self.testCreateThumbnails)
+        self.addTestMethod(self.testThumbnailBenchmark)
+
+
+
+if __name__ == '__main__':
+
+    edTestCasePluginUnitMXThumbnailv1_1 = EDTestCasePluginUnitMXThumbnailv1_1("EDTestCasePluginUnitMXThumbnailv1_1")
+    edTestCasePluginUnitMXThumbnailv1_1.execute()
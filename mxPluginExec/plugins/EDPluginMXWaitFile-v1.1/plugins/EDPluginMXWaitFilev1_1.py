@@ -29,10 +29,9 @@ __license__ = "LGPLv3+"
 __copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
 __date__ = "20140623"
 
-import os, time
-
 from EDPlugin import EDPlugin
 from EDPluginExec import EDPluginExec
+from EDFileWatcher import EDFileWatcher
 
 from XSDataCommon import XSDataBoolean
 from XSDataCommon import XSDataInteger
@@ -43,11 +42,15 @@ from XSDataMXWaitFilev1_1 import XSDataResultMXWaitFile
 
 class EDPluginMXWaitFilev1_1(EDPluginExec):
     """
-    This plugin waits for a file to appear on disk
+    This plugin waits for a file to appear on disk. The waiting is done by the
+    process-wide EDFileWatcher, so many instances of this plugin share a single
+    watcher thread instead of each polling the file system.
     """
 
     def __init__(self):
         EDPluginExec.__init__(self)
+        # No files are written, so there is no need for a working directory
+        self.setRequiredToHaveWorkingDirectory(False)
         self.setXSDataInputClass(XSDataInputMXWaitFile)
         self.setDataOutput(XSDataResultMXWaitFile())
         self.expectedSize = None
@@ -61,7 +64,7 @@ class EDPluginMXWaitFilev1_1(EDPluginExec):
         if xsDataInputMXWaitFile.file is None:
             strError = "No expected file path in input!"
             self.ERROR(strError)
-            self.setFailure(true)
+            self.setFailure()
         else:
             self.strFilePath = xsDataInputMXWaitFile.file.path.value
             if xsDataInputMXWaitFile.size is not None:
@@ -83,60 +86,18 @@ class EDPluginMXWaitFilev1_1(EDPluginExec):
 
     def process(self, _edPlugin=None):
         EDPluginExec.process(self)
-        # Wait for file if it's not already on disk'
-        finalSize = None
-        hasTimedOut = False
-        shouldContinue = True
-        fileDir = os.path.dirname(self.strFilePath)
-        if os.path.exists(fileDir):
-            # Patch provided by Sebastien 2018/02/09 for forcing NFS cache:
-            self.DEBUG("NFS cache clear, doing os.fstat on directory {0}".format(fileDir))
-            d = os.open(fileDir, os.O_DIRECTORY)
-            statResult = os.fstat(d)
-            self.DEBUG("Results of os.fstat: {0}".format(statResult))
-        # Check if file is there
-        if os.path.exists(self.strFilePath):
-            fileSize = os.path.getsize(self.strFilePath)
-            if self.expectedSize is not None:
-                # Check size
-                if fileSize > self.expectedSize:
-                    shouldContinue = False
-            finalSize = fileSize
-        if shouldContinue:
+        # Wait for file if it's not already on disk
+        edExpectation = EDFileWatcher.expect(self.strFilePath, self.expectedSize)
+        if not edExpectation.isComplete():
             self.screen("Waiting %d seconds for file %s" % (self.timeOut, self.strFilePath))
-            #
-            timeStart = time.time()
-            while shouldContinue and not hasTimedOut:
-                # Sleep 1 s
-                time.sleep(1)
-                if os.path.exists(fileDir):
-                    # Patch provided by Sebastien 2018/02/09 for forcing NFS cache:
-                    self.DEBUG("NFS cache clear, doing os.fstat on directory {0}".format(fileDir))
-                    d = os.open(fileDir, os.O_DIRECTORY)
-                    statResult = os.fstat(d)
-                    self.DEBUG("Results of os.fstat: {0}".format(statResult))
-                # Try to execute a "ls" on the file directory - this sometimes speed up NFS
-                #if os.path.exists(fileDir):
-                #    os.system("ls %s > /dev/null" % fileDir)
-                timeElapsed = time.time() - timeStart
-                # Check if time out
-                if timeElapsed > self.timeOut:
-                    hasTimedOut = True
-                    strWarning = "Timeout while waiting for file %s" % self.strFilePath
-                    self.WARNING(strWarning)
-                    self.addWarningMessage(strWarning)
-                else:
-                    # Check if file is there
-                    if os.path.exists(self.strFilePath):
-                        fileSize = os.path.getsize(self.strFilePath)
-                        if self.expectedSize is not None:
-                            # Check that it has right size
-                            if fileSize > self.expectedSize:
-                                shouldContinue = False
-                        else:
-                            shouldContinue = False
-                        finalSize = fileSize
+            if not edExpectation.wait(self.timeOut):
+                EDFileWatcher.cancel(edExpectation)
+        hasTimedOut = not edExpectation.isComplete()
+        if hasTimedOut:
+            strWarning = "Timeout while waiting for file %s" % self.strFilePath
+            self.WARNING(strWarning)
+            self.addWarningMessage(strWarning)
         self.dataOutput.timedOut = XSDataBoolean(hasTimedOut)
-        if finalSize is not None:
-            self.dataOutput.finalSize = XSDataInteger(finalSize)
+        if edExpectation.size is not None:
+            self.dataOutput.finalSize = XSDataInteger(edExpectation.size)
 
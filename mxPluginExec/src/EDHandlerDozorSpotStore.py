@@ -0,0 +1,239 @@
+#
+#    Project: MX Plugin Exec
+#             http://www.edna-site.org
+#
+#    Copyright (C) European Synchrotron Radiation Facility
+#                            Grenoble, France
+#
+#    Principal authors:      Olof Svensson (svensson@esrf.fr)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+__authors__ = [ "Olof Svensson" ]
+__contact__ = "svensson@esrf.fr"
+__license__ = "GPLv3+"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+
+"""
+Binary store of the spot lists written by dozor (<image number>.spot).
+
+All the spot lists of a batch of images are written once in one file, and
+each spot list can then be read by its index in the batch without reading
+the rest of the file. The file contains (little endian):
+
+  - the header: "EDSPOTS1", the number of spot lists N (uint64)
+  - the image numbers (int64 x N)
+  - the number of columns of each spot list (int32 x N)
+  - the offsets of the spot lists in the values (int64 x N+1)
+  - the values of all the spot lists, row by row (float64)
+
+A missing spot file is stored as an empty spot list.
+
+The spot lists sent to mxCuBE and ISPyB keep the shape numpy.loadtxt gave
+them (dimensions of length one removed, see getLoadtxtShape).
+"""
+
+import os
+import struct
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from EDVerbose import EDVerbose
+
+
+class EDDozorSpotStore(object):
+    """
+    Reader of a spot store, the spot lists are read by index
+    """
+
+    def __init__(self, _strPath):
+        self.path = _strPath
+        with open(_strPath, "rb") as pyFile:
+            strMagic, iNumber = struct.unpack(EDHandlerDozorSpotStore.HEADER_FORMAT,
+                                              pyFile.read(EDHandlerDozorSpotStore.HEADER_SIZE))
+            if strMagic != EDHandlerDozorSpotStore.MAGIC:
+                raise ValueError("Not a dozor spot store: %s" % _strPath)
+            self.imageNumber = numpy.fromfile(pyFile, dtype="<i8", count=iNumber)
+            self.numberOfColumns = numpy.fromfile(pyFile, dtype="<i4", count=iNumber)
+            self.offset = numpy.fromfile(pyFile, dtype="<i8", count=iNumber + 1)
+        self.__iValueStart = EDHandlerDozorSpotStore.HEADER_SIZE + iNumber * (8 + 4) + (iNumber + 1) * 8
+
+
+    def __len__(self):
+        return self.imageNumber.shape[0]
+
+
+    def getIndex(self, _iImageNumber):
+        """
+        Returns the index of the spot list of an image, None if not in the store
+        """
+        arrayIndex = numpy.flatnonzero(self.imageNumber == _iImageNumber)
+        if arrayIndex.shape[0] == 0:
+            return None
+        return int(arrayIndex[0])
+
+
+    def getShape(self, _iIndex):
+        """
+        Returns the (number of spots, number of columns) of the spot list of the given index
+        """
+        iNumberOfColumns = max(1, int(self.numberOfColumns[_iIndex]))
+        iCount = int(self.offset[_iIndex + 1] - self.offset[_iIndex])
+        return (iCount // iNumberOfColumns, iNumberOfColumns)
+
+
+    def getLoadtxtShape(self, _iIndex):
+        """
+        Returns the shape of the spot list of the given index as a list, as
+        numpy.loadtxt returns it, see EDHandlerDozorSpotStore.getLoadtxtShape
+        """
+        return EDHandlerDozorSpotStore.getLoadtxtShape(self.getShape(_iIndex))
+
+
+    def getSpotList(self, _iIndex):
+        """
+        Returns the spot list of the given index as a (number of spots, number of columns) array
+        """
+        iStart = int(self.offset[_iIndex])
+        iCount = int(self.offset[_iIndex + 1]) - iStart
+        iNumberOfColumns = max(1, int(self.numberOfColumns[_iIndex]))
+        if iCount == 0:
+            return numpy.zeros((0, iNumberOfColumns), dtype=numpy.float64)
+        with open(self.path, "rb") as pyFile:
+            pyFile.seek(self.__iValueStart + iStart * 8)
+            arrayValue = numpy.fromfile(pyFile, dtype="<f8", count=iCount)
+        return arrayValue.astype(numpy.float64, copy=False).reshape(-1, iNumberOfColumns)
+
+
+
+class EDHandlerDozorSpotStore(object):
+    """
+    Static class writing and reading the binary spot stores
+    """
+
+    MAGIC = b"EDSPOTS1"
+    HEADER_FORMAT = "<8sQ"
+    HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+    NUMBER_OF_HEADER_LINES = 3
+
+
+    @classmethod
+    def readSpotFile(cls, _strPath):
+        """
+        Reads a spot file written by dozor (three header lines, then one spot
+        per line) and returns a (number of spots, number of columns) array
+        """
+        with open(_strPath) as pyFile:
+            listLine = pyFile.read().split("\n")[cls.NUMBER_OF_HEADER_LINES:]
+        listToken = []
+        iNumberOfColumns = None
+        for strLine in listLine:
+            listLineToken = strLine.split()
+            if len(listLineToken) > 0:
+                if iNumberOfColumns is None:
+                    iNumberOfColumns = len(listLineToken)
+                listToken.extend(listLineToken)
+        if iNumberOfColumns is None:
+            return numpy.zeros((0, 1), dtype=numpy.float64)
+        arrayValue = numpy.array(listToken, dtype=numpy.float64)
+        if arrayValue.shape[0] % iNumberOfColumns != 0:
+            raise ValueError("Rows of different lengths in spot file %s" % _strPath)
+        return arrayValue.reshape(-1, iNumberOfColumns)
+
+
+    @classmethod
+    def readSpotList(cls, _strPath):
+        """
+        Reads a spot file, numpy.loadtxt is used for unexpected contents (comments, ...)
+        @return: a (number of spots, number of columns) array, None if the file can't be read
+        """
+        arraySpotList = None
+        try:
+            arraySpotList = cls.readSpotFile(_strPath)
+        except ValueError:
+            try:
+                arraySpotList = numpy.loadtxt(_strPath, skiprows=cls.NUMBER_OF_HEADER_LINES, ndmin=2)
+            except ValueError as ex:
+                EDVerbose.WARNING("Cannot read spot file %s: %r" % (_strPath, ex))
+        return arraySpotList
+
+
+    @classmethod
+    def getLoadtxtShape(cls, _tupleShape):
+        """
+        Converts a (number of spots, number of columns) shape to the shape of
+        the array numpy.loadtxt returns for the spot file, i.e. without the
+        dimensions of length one: [number of spots, number of columns],
+        [number of columns] for one spot and [number of spots] for one column.
+        """
+        iNumberOfSpots, iNumberOfColumns = _tupleShape
+        if iNumberOfSpots == 0:
+            return [0]
+        elif iNumberOfSpots == 1:
+            return [iNumberOfColumns]
+        elif iNumberOfColumns == 1:
+            return [iNumberOfSpots]
+        return [iNumberOfSpots, iNumberOfColumns]
+
+
+    @classmethod
+    def writeStore(cls, _strPath, _listImageNumber, _listSpotList):
+        """
+        Writes the spot lists (arrays or None if missing) of the images in one store.
+        The file is written under a temporary name and renamed, a reader never
+        sees an incomplete store.
+        """
+        iNumber = len(_listImageNumber)
+        arrayNumberOfColumns = numpy.zeros(iNumber, dtype="<i4")
+        arrayOffset = numpy.zeros(iNumber + 1, dtype="<i8")
+        listValue = []
+        for (iIndex, arraySpotList) in enumerate(_listSpotList):
+            iSize = 0
+            if arraySpotList is not None:
+                arraySpotList = numpy.asarray(arraySpotList, dtype="<f8")
+                if arraySpotList.ndim == 1:
+                    arraySpotList = arraySpotList.reshape(1, -1)
+                arrayNumberOfColumns[iIndex] = arraySpotList.shape[1]
+                iSize = arraySpotList.size
+                listValue.append(arraySpotList.ravel())
+            arrayOffset[iIndex + 1] = arrayOffset[iIndex] + iSize
+        strPathTmp = _strPath + ".tmp"
+        with open(strPathTmp, "wb") as pyFile:
+            pyFile.write(struct.pack(cls.HEADER_FORMAT, cls.MAGIC, iNumber))
+            pyFile.write(numpy.asarray(_listImageNumber, dtype="<i8").tobytes())
+            pyFile.write(arrayNumberOfColumns.tobytes())
+            pyFile.write(arrayOffset.tobytes())
+            for arrayValue in listValue:
+                pyFile.write(arrayValue.tobytes())
+        os.replace(strPathTmp, _strPath)
+        return EDDozorSpotStore(_strPath)
+
+
+    @classmethod
+    def createStore(cls, _strPath, _listImageNumber, _listSpotFile):
+        """
+        Reads the spot files (paths or None) of a batch and writes them in one store
+        @return: the EDDozorSpotStore
+        """
+        listSpotList = []
+        for strSpotFile in _listSpotFile:
+            arraySpotList = None
+            if strSpotFile is not None and os.path.exists(strSpotFile):
+                arraySpotList = cls.readSpotList(strSpotFile)
+            listSpotList.append(arraySpotList)
+        return cls.writeStore(_strPath, _listImageNumber, listSpotList)
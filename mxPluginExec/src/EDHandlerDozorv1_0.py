@@ -0,0 +1,232 @@
+#
+#    Project: MX Plugin Exec
+#             http://www.edna-site.org
+#
+#    Copyright (C) European Synchrotron Radiation Facility
+#                            Grenoble, France
+#
+#    Principal authors:      Olof Svensson (svensson@esrf.fr)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+__authors__ = [ "Olof Svensson" ]
+__contact__ = "svensson@esrf.fr"
+__license__ = "GPLv3+"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+
+"""
+Parser of the results table written by dozor on standard output.
+
+The table is read in one pass: each row is split on white space and the rows
+with the same number of values (11 to 13 depending on the version of dozor)
+are converted together into a numpy array with one column per quantity,
+following the column order of the former parser. The other rows (dozor 1.0,
+"no results" rows, "****" overflows) are parsed one by one with the rules of
+the former parser.
+
+The XSDataImageDozor objects of an image are only created when asked for,
+the XSDataDouble objects of the resolution columns, which take few distinct
+values, are shared (XSDataDouble.intern).
+"""
+
+import os
+import numpy
+
+from EDVerbose import EDVerbose
+from EDFactoryPluginStatic import EDFactoryPluginStatic
+
+from XSDataCommon import XSDataAngle
+from XSDataCommon import XSDataDouble
+from XSDataCommon import XSDataFile
+from XSDataCommon import XSDataInteger
+from XSDataCommon import XSDataString
+
+EDFactoryPluginStatic.loadModule("XSDataDozorv1_0")
+from XSDataDozorv1_0 import XSDataImageDozor
+from XSDataDozorv1_0 import XSDataResultDozor
+
+
+class EDDozorResultTable(object):
+    """
+    The results of dozor, one row per image and one column per quantity
+    (numpy.nan if not available)
+    """
+
+    LIST_COLUMN = ["number", "spotsNumOf", "spotsIntAver", "spotsRfactor", "spotsResolution",
+                   "powderWilsonScale", "powderWilsonBfactor", "powderWilsonResolution",
+                   "powderWilsonCorrelation", "powderWilsonRfactor",
+                   "mainScore", "spotScore", "visibleResolution"]
+    LIST_INTERNED_COLUMN = ["spotsResolution", "powderWilsonResolution", "visibleResolution"]
+
+
+    def __init__(self, _arrayTable, _arrayAngle, _listSpotFile, _fHalfDoseTime=None):
+        self.table = _arrayTable
+        self.angle = _arrayAngle
+        self.spotFile = _listSpotFile
+        self.halfDoseTime = _fHalfDoseTime
+
+
+    def __len__(self):
+        return self.table.shape[0]
+
+
+    def getColumn(self, _strName):
+        return self.table[:, self.LIST_COLUMN.index(_strName)]
+
+
+    def getImageDozor(self, _iIndex):
+        """
+        Creates the XSDataImageDozor of the image of the given row
+        """
+        xsDataImageDozor = XSDataImageDozor()
+        listValue = self.table[_iIndex].tolist()
+        xsDataImageDozor.number = XSDataInteger(listValue[0])
+        xsDataImageDozor.angle = XSDataAngle(float(self.angle[_iIndex]))
+        if listValue[1] == listValue[1]:
+            xsDataImageDozor.spotsNumOf = XSDataInteger.intern(int(listValue[1]))
+        for iColumn in range(2, len(self.LIST_COLUMN)):
+            fValue = listValue[iColumn]
+            if fValue != fValue:
+                # NaN
+                continue
+            strName = self.LIST_COLUMN[iColumn]
+            if fValue == 0.0 or strName in self.LIST_INTERNED_COLUMN:
+                xsDataDouble = XSDataDouble.intern(fValue)
+            else:
+                xsDataDouble = XSDataDouble(fValue)
+            setattr(xsDataImageDozor, strName, xsDataDouble)
+        if self.spotFile[_iIndex] is not None:
+            xsDataImageDozor.spotFile = XSDataFile(XSDataString(self.spotFile[_iIndex]))
+        return xsDataImageDozor
+
+
+    def iterImageDozor(self):
+        for iIndex in range(len(self)):
+            yield self.getImageDozor(iIndex)
+
+
+    def createResult(self):
+        """
+        Creates a XSDataResultDozor with the XSDataImageDozor of all images
+        """
+        xsDataResultDozor = XSDataResultDozor()
+        xsDataResultDozor.imageDozor = list(self.iterImageDozor())
+        if self.halfDoseTime is not None:
+            xsDataResultDozor.halfDoseTime = XSDataDouble(self.halfDoseTime)
+        return xsDataResultDozor
+
+
+
+class EDHandlerDozorv1_0(object):
+    """
+    Static class parsing the output of dozor
+    """
+
+    NUMBER_OF_HEADER_LINES = 6
+    NUMBER_OF_COLUMNS = len(EDDozorResultTable.LIST_COLUMN)
+    MIN_NUMBER_OF_COLUMNS = 11
+    VISIBLE_RESOLUTION_DEFAULT = 40.0
+    # Values of the columns missing in a row
+    LIST_DEFAULT_VALUE = [float("nan"), 0.0, 0.0, float("nan"), 0.0,
+                          float("nan"), float("nan"), float("nan"), float("nan"), float("nan"),
+                          0.0, 0.0, VISIBLE_RESOLUTION_DEFAULT]
+
+
+    @classmethod
+    def parseOutput(cls, _strOutput, _fStartingAngle, _iFirstImageNumber, _fOscillationRange,
+                    _fOverlap=0.0, _strWorkingDir=None):
+        """
+        Parses the output of dozor.
+        @param _strWorkingDir: directory where dozor has written the spot files (<image number>.spot)
+        @return: a EDDozorResultTable
+        """
+        # Number of values -> (values, rows) of the rows converted together
+        dictRowGroup = {}
+        listRowOther = []
+        fHalfDoseTime = None
+        iRow = 0
+        for strLine in _strOutput.split("\n")[cls.NUMBER_OF_HEADER_LINES:]:
+            listLineToken = strLine.replace("|", " ").split()
+            if len(listLineToken) > 0 and listLineToken[0].isdigit():
+                iNumberOfTokens = len(listLineToken)
+                if cls.MIN_NUMBER_OF_COLUMNS <= iNumberOfTokens <= cls.NUMBER_OF_COLUMNS and \
+                        not listLineToken[5].startswith("-"):
+                    (listToken, listRow) = dictRowGroup.setdefault(iNumberOfTokens, ([], []))
+                    listToken.extend(listLineToken)
+                    listRow.append(iRow)
+                else:
+                    listRowOther.append((iRow, listLineToken))
+                iRow += 1
+            elif strLine.startswith("h"):
+                fHalfDoseTime = float(strLine.split("=")[1].split()[0])
+        arrayTable = numpy.empty((iRow, cls.NUMBER_OF_COLUMNS), dtype=numpy.float64)
+        arrayTable[:] = cls.LIST_DEFAULT_VALUE
+        for (iNumberOfTokens, (listToken, listRow)) in dictRowGroup.items():
+            try:
+                arrayTable[listRow, :iNumberOfTokens] = numpy.array(listToken, dtype=numpy.float64).reshape(-1, iNumberOfTokens)
+            except ValueError:
+                # Values which are not numbers (e.g. "****"), the rows are converted one by one
+                for (iIndex, iRowGroup) in enumerate(listRow):
+                    listLineToken = listToken[iIndex * iNumberOfTokens:(iIndex + 1) * iNumberOfTokens]
+                    try:
+                        arrayTable[iRowGroup, :iNumberOfTokens] = [float(strToken) for strToken in listLineToken]
+                    except ValueError:
+                        listRowOther.append((iRowGroup, listLineToken))
+        for (iRowOther, listLineToken) in listRowOther:
+            arrayTable[iRowOther] = cls.parseRow(listLineToken)
+        arrayNumber = arrayTable[:, 0]
+        arrayAngle = _fStartingAngle + (arrayNumber - _iFirstImageNumber) * (_fOscillationRange - _fOverlap) + _fOscillationRange / 2.0
+        # The spot files are looked for in one listing of the directory
+        listSpotFile = [None] * iRow
+        if _strWorkingDir is not None and os.path.isdir(_strWorkingDir):
+            setFileName = set(os.listdir(_strWorkingDir))
+            for iIndex, iNumber in enumerate(arrayNumber.astype(numpy.int64).tolist()):
+                strSpotFileName = "%05d.spot" % iNumber
+                if strSpotFileName in setFileName:
+                    listSpotFile[iIndex] = os.path.join(_strWorkingDir, strSpotFileName)
+        return EDDozorResultTable(arrayTable, arrayAngle, listSpotFile, fHalfDoseTime)
+
+
+    @classmethod
+    def parseRow(cls, _listToken):
+        """
+        Parses a row of the results table with the rules of the former parser:
+        older versions of dozor write fewer columns, and the rows of images
+        without results only have the spot columns.
+        """
+        listValue = list(cls.LIST_DEFAULT_VALUE)
+        listValue[0] = float(_listToken[0])
+        try:
+            if _listToken[5].startswith("-") or len(_listToken) < 11:
+                listTokenColumn = [(1, 1), (2, 2), (3, 3), (4, 4), (8, 10), (9, 11), (10, 12)]
+            else:
+                listTokenColumn = [(iColumn, iColumn) for iColumn in range(1, cls.NUMBER_OF_COLUMNS)]
+            for (iToken, iColumn) in listTokenColumn:
+                if iColumn == 1:
+                    listValue[1] = int(_listToken[1])
+                else:
+                    listValue[iColumn] = cls.parseDouble(_listToken[iToken])
+        except (IndexError, ValueError):
+            pass
+        return listValue
+
+
+    @staticmethod
+    def parseDouble(_strValue):
+        try:
+            return float(_strValue)
+        except ValueError as ex:
+            EDVerbose.WARNING("Error when trying to parse '%s': %r" % (_strValue, ex))
+        return float("nan")
@@ -0,0 +1,245 @@
+#
+#    Project: MX Plugin Exec
+#             http://www.edna-site.org
+#
+#    Copyright (C) European Synchrotron Radiation Facility
+#                            Grenoble, France
+#
+#    Principal authors:      Olof Svensson (svensson@esrf.fr)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+__authors__ = [ "Olof Svensson" ]
+__contact__ = "svensson@esrf.fr"
+__license__ = "GPLv3+"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+
+"""
+In-process conversion of Eiger HDF5 images to (mini) CBF files.
+
+The frames and the metadata are read with EDFrameProviderHDF5 directly from
+the data files linked from the master file. The frames are compressed with a
+vectorised numpy implementation of the CBF byte offset algorithm and written
+with a PILATUS-1.2 header built from the metadata of the master file, i.e. the
+same header fields as written by eiger2cbf.
+
+Each CBF file is written to a hidden temporary file in the destination
+directory and then renamed to its final name, so readers never see
+incomplete files. The conversion of a list of frames is split into blocks
+which are converted in parallel in the EDExecutor process pool.
+"""
+
+import os
+import base64
+import hashlib
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from EDVerbose import EDVerbose
+from EDExecutor import EDExecutor
+from EDFrameProviderHDF5 import EDFrameProviderHDF5
+
+
+CBF_BINARY_START = b"\x0c\x1a\x04\xd5"
+CBF_BINARY_PADDING = 4095
+
+
+def compressByteOffset(_arrayData):
+    """
+    Returns the CBF byte offset compressed data (numpy uint8 array) of an
+    integer image. Each pixel is stored as the difference to the previous
+    pixel, using 1, 2, 4 or 8 bytes preceded by the escape sequences
+    0x80 and 0x8000 / 0x80000000.
+    """
+    arrayValue = numpy.ascontiguousarray(_arrayData, dtype=numpy.int64).ravel()
+    arrayDelta = numpy.diff(arrayValue, prepend=numpy.int64(0))
+    arrayAbsDelta = numpy.abs(arrayDelta)
+    arraySize = numpy.full(arrayDelta.shape, 1, dtype=numpy.int64)
+    arraySize[arrayAbsDelta >= 0x80] = 3
+    arraySize[arrayAbsDelta >= 0x8000] = 7
+    arraySize[arrayAbsDelta >= 0x80000000] = 15
+    arrayOffset = numpy.cumsum(arraySize) - arraySize
+    arrayCompressed = numpy.zeros(int(arrayOffset[-1] + arraySize[-1]) if arraySize.size > 0 else 0,
+                                  dtype=numpy.uint8)
+    # Escape sequences and values for each element size
+    for iSize, listEscape, strType in [(1, [], "<i1"),
+                                       (3, [0x80], "<i2"),
+                                       (7, [0x80, 0x00, 0x80], "<i4"),
+                                       (15, [0x80, 0x00, 0x80, 0x00, 0x00, 0x00, 0x80], "<i8")]:
+        arrayIndex = numpy.nonzero(arraySize == iSize)[0]
+        if arrayIndex.size == 0:
+            continue
+        arrayPosition = arrayOffset[arrayIndex]
+        for iByte, iEscape in enumerate(listEscape):
+            arrayCompressed[arrayPosition + iByte] = iEscape
+        arrayBytes = arrayDelta[arrayIndex].astype(strType).view(numpy.uint8).reshape(arrayIndex.size, -1)
+        iStart = len(listEscape)
+        for iByte in range(arrayBytes.shape[1]):
+            arrayCompressed[arrayPosition + iStart + iByte] = arrayBytes[:, iByte]
+    return arrayCompressed
+
+
+def formatDate(_strDate):
+    """
+    Converts an ISO 8601 date (from the master file) to the CBF header format
+    """
+    strDate = _strDate.replace("-", "/", 2).replace("T", " ")
+    for strSeparator in ["+", "Z"]:
+        strDate = strDate.split(strSeparator)[0]
+    return strDate
+
+
+def createHeader(_dictMetadata, _iFrameNumber, _strDataName):
+    """
+    Returns the text part of a mini CBF file (PILATUS 1.2 header convention)
+    """
+    listAngle = _dictMetadata["listAngle"]
+    fAngleIncrement = _dictMetadata["angleIncrement"]
+    if _iFrameNumber - 1 < len(listAngle):
+        fStartAngle = listAngle[_iFrameNumber - 1]
+    elif len(listAngle) > 0:
+        fStartAngle = listAngle[0] + (_iFrameNumber - 1) * fAngleIncrement
+    else:
+        fStartAngle = (_iFrameNumber - 1) * fAngleIncrement
+    listLine = [
+        "###CBF: VERSION 1.5, CBFlib v0.7.8 - Eiger detectors",
+        "",
+        "data_%s" % _strDataName,
+        "",
+        "_array_data.header_convention \"PILATUS_1.2\"",
+        "_array_data.header_contents",
+        ";",
+        "# Detector: %s, S/N %s" % (_dictMetadata["description"], _dictMetadata["serialNumber"]),
+        "# %s" % formatDate(_dictMetadata["date"]),
+        "# Pixel_size %ge-6 m x %ge-6 m" % (_dictMetadata["pixelSizeX"] * 1e6, _dictMetadata["pixelSizeY"] * 1e6),
+        "# %s sensor, thickness %.6f m" % (_dictMetadata["sensorMaterial"], _dictMetadata["sensorThickness"]),
+        "# Exposure_time %.6f s" % _dictMetadata["exposureTime"],
+        "# Exposure_period %.6f s" % _dictMetadata["exposurePeriod"],
+        "# Count_cutoff %d counts" % _dictMetadata["countCutoff"],
+        "# Wavelength %.5f A" % _dictMetadata["wavelength"],
+        "# Detector_distance %.5f m" % _dictMetadata["distance"],
+        "# Beam_xy (%.2f, %.2f) pixels" % (_dictMetadata["beamX"], _dictMetadata["beamY"]),
+        "# Start_angle %.4f deg." % fStartAngle,
+        "# Angle_increment %.4f deg." % fAngleIncrement,
+        ";",
+        ""
+    ]
+    return "\r\n".join(listLine)
+
+
+def writeCBF(_strPath, _arrayFrame, _strHeader):
+    """
+    Writes a byte offset compressed CBF file. The file is written to a hidden
+    temporary file which is then renamed to _strPath.
+    """
+    iDimension2, iDimension1 = _arrayFrame.shape
+    arrayCompressed = compressByteOffset(_arrayFrame)
+    pyBinary = arrayCompressed.tobytes()
+    strMD5 = base64.b64encode(hashlib.md5(pyBinary).digest()).decode("ascii")
+    listLine = [
+        "_array_data.data",
+        ";",
+        "--CIF-BINARY-FORMAT-SECTION--",
+        "Content-Type: application/octet-stream;",
+        "     conversions=\"x-CBF_BYTE_OFFSET\"",
+        "Content-Transfer-Encoding: BINARY",
+        "X-Binary-Size: %d" % len(pyBinary),
+        "X-Binary-ID: 1",
+        "X-Binary-Element-Type: \"signed 32-bit integer\"",
+        "X-Binary-Element-Byte-Order: LITTLE_ENDIAN",
+        "Content-MD5: %s" % strMD5,
+        "X-Binary-Number-of-Elements: %d" % (iDimension1 * iDimension2),
+        "X-Binary-Size-Fastest-Dimension: %d" % iDimension1,
+        "X-Binary-Size-Second-Dimension: %d" % iDimension2,
+        "X-Binary-Size-Padding: %d" % CBF_BINARY_PADDING,
+        "",
+        ""
+    ]
+    strDirectory, strFileName = os.path.split(_strPath)
+    strTmpPath = os.path.join(strDirectory, ".%s.tmp" % strFileName)
+    with open(strTmpPath, "wb") as pyFile:
+        pyFile.write(_strHeader.encode("ISO-8859-1"))
+        pyFile.write("\r\n".join(listLine).encode("ascii"))
+        pyFile.write(CBF_BINARY_START)
+        pyFile.write(pyBinary)
+        pyFile.write(b"\0" * CBF_BINARY_PADDING)
+        pyFile.write(b"\r\n--CIF-BINARY-FORMAT-SECTION----\r\n;\r\n\r\n")
+    os.rename(strTmpPath, _strPath)
+
+
+def toSignedFrame(_arrayFrame):
+    """
+    Returns the frame as signed 32 bit integers, the masked pixels (maximum
+    value of the unsigned data type) are set to -1 as done by eiger2cbf.
+    """
+    if _arrayFrame.dtype == numpy.uint32:
+        return _arrayFrame.view(numpy.int32)
+    arrayFrame = _arrayFrame.astype(numpy.int32)
+    if _arrayFrame.dtype.kind == "u":
+        arrayFrame[_arrayFrame == numpy.iinfo(_arrayFrame.dtype).max] = -1
+    return arrayFrame
+
+
+def convertFrames(_strMasterFile, _listConversion):
+    """
+    Converts frames of a master file to CBF files. _listConversion is a list
+    of (frame number in the master file, path to CBF file). This function is
+    executed in the worker processes.
+    @return: the list of paths of the written CBF files
+    """
+    listWritten = []
+    dictMetadata = EDFrameProviderHDF5.getMetadata(_strMasterFile)
+    for (iFrameNumber, strPath) in _listConversion:
+        arrayFrame = EDFrameProviderHDF5.getFrame(_strMasterFile, iFrameNumber)
+        strDataName = os.path.splitext(os.path.basename(strPath))[0]
+        writeCBF(strPath, toSignedFrame(arrayFrame), createHeader(dictMetadata, iFrameNumber, strDataName))
+        listWritten.append(strPath)
+    return listWritten
+
+
+
+class EDHandlerH5ToCBF(object):
+    """
+    Schedules the conversion of Eiger HDF5 frames to CBF files
+    """
+
+    iMaxFramesPerTask = 10
+
+
+    @staticmethod
+    def isAvailable():
+        return EDFrameProviderHDF5.isAvailable()
+
+
+    @staticmethod
+    def submitConversion(_strMasterFile, _listConversion, _iMaxFramesPerTask=None):
+        """
+        Splits the list of (frame number, CBF path) in blocks which are converted
+        in the EDExecutor process pool.
+        @return: a list of (list of conversions, future) for the blocks
+        """
+        if _iMaxFramesPerTask is None:
+            _iMaxFramesPerTask = EDHandlerH5ToCBF.iMaxFramesPerTask
+        iNumberOfBlocks = max(1, min(EDExecutor.getMaxProcesses(), len(_listConversion)))
+        iFramesPerTask = max(1, min(_iMaxFramesPerTask, -(-len(_listConversion) // iNumberOfBlocks)))
+        listTask = []
+        for iStart in range(0, len(_listConversion), iFramesPerTask):
+            listBlock = list(_listConversion[iStart:iStart + iFramesPerTask])
+            EDVerbose.DEBUG("EDHandlerH5ToCBF: converting %d frame(s) from %s" % (len(listBlock), _strMasterFile))
+            listTask.append((listBlock, EDExecutor.submitProcess(convertFrames, _strMasterFile, listBlock)))
+        return listTask
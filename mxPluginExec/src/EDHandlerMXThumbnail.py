@@ -0,0 +1,184 @@
+#
+#    Project: MX Plugin Exec
+#             http://www.edna-site.org
+#
+#    Copyright (C) European Synchrotron Radiation Facility
+#                            Grenoble, France
+#
+#    Principal authors:      Olof Svensson (svensson@esrf.fr)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+__authors__ = [ "Olof Svensson" ]
+__contact__ = "svensson@esrf.fr"
+__license__ = "GPLv3+"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+
+"""
+Thumbnail images (JPEG or PNG) of diffraction images.
+
+The frame is decoded once and all the requested thumbnails are made from it.
+The image is clipped to [minLevel, maxLevel], where maxLevel is a percentile
+of the pixel values found with numpy.partition, dilated so that the spots
+remain visible, scaled to 8 bits and inverted (black spots on white).
+
+The clipping, the dilation and the scaling commute with taking the maximum
+of blocks of pixels, so each thumbnail is first reduced from the raw frame
+by the largest integer factor, not larger than the dilation, which keeps it
+larger than the thumbnail, taking the maximum of each block. The rest of the
+dilation (if any) and the scaling are done on the reduced image, which PIL
+resizes to the size of the thumbnail. The thumbnails of the same frame share
+the reduced image.
+"""
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    from PIL import Image
+    from PIL import ImageFile
+except ImportError:
+    Image = None
+    ImageFile = None
+
+from EDFrameProviderHDF5 import EDFrameProviderHDF5
+
+
+class EDHandlerMXThumbnail(object):
+    """
+    Static class creating thumbnail images of diffraction images
+    """
+
+    DICT_PIL_FORMAT = {"jpg": "JPEG", "jpeg": "JPEG", "png": "PNG"}
+    MIN_LEVEL = 0
+    MAX_LEVEL = 99.95 # %
+    DILATATION = 4
+    JPEG_QUALITY = 85
+
+
+    @staticmethod
+    def readImage(_strImagePath):
+        """
+        Returns the frame of a diffraction image (CBF, MarCCD, ADSC, ... or Eiger HDF5) as a numpy array
+        """
+        if EDFrameProviderHDF5.isHDF5(_strImagePath):
+            # Eiger HDF5 image: the frame is read directly from the data file
+            return EDFrameProviderHDF5.getImage(_strImagePath)
+        import fabio
+        return fabio.openimage.openimage(_strImagePath).data
+
+
+    @staticmethod
+    def getMaxLevel(_numpyImage, _fPercentile=MAX_LEVEL):
+        """
+        Returns the pixel value at the given percentile (0-100) of the image
+        """
+        numpyFlat = _numpyImage.ravel()
+        iIndex = min(int(round(float(_fPercentile) * numpyFlat.size / 100.0)), numpyFlat.size - 1)
+        return numpy.partition(numpyFlat, iIndex)[iIndex]
+
+
+    @staticmethod
+    def reduceImage(_numpyImage, _iFactor):
+        """
+        Returns the maximum of each block of _iFactor x _iFactor pixels. The last
+        rows and columns which don't fill a block are left out.
+        """
+        if _iFactor <= 1:
+            return _numpyImage
+        iRows = _numpyImage.shape[0] // _iFactor * _iFactor
+        iColumns = _numpyImage.shape[1] // _iFactor * _iFactor
+        # Element-wise maximum of strided slices, much faster than max() over a short axis.
+        # Rows first, the first reduction reads the whole frame.
+        numpyRows = numpy.array(_numpyImage[0:iRows:_iFactor])
+        for iShift in range(1, _iFactor):
+            numpy.maximum(numpyRows, _numpyImage[iShift:iRows:_iFactor], out=numpyRows)
+        numpyReduced = numpy.array(numpyRows[:, 0:iColumns:_iFactor])
+        for iShift in range(1, _iFactor):
+            numpy.maximum(numpyReduced, numpyRows[:, iShift:iColumns:_iFactor], out=numpyReduced)
+        return numpyReduced
+
+
+    @staticmethod
+    def dilateImage(_numpyImage, _iSize):
+        """
+        Grey dilation with a flat _iSize x _iSize square, reflecting the image at
+        the borders (same result as scipy.ndimage.grey_dilation)
+        """
+        if _iSize <= 1:
+            return _numpyImage
+        iBefore = _iSize // 2
+        iAfter = _iSize - iBefore - 1
+        numpyPadded = numpy.pad(_numpyImage, ((iBefore, iAfter), (iBefore, iAfter)), mode="symmetric")
+        iRows, iColumns = _numpyImage.shape
+        # The square is separable: maximum over the rows, then over the columns
+        numpyRows = numpyPadded[0:iRows]
+        for iShift in range(1, _iSize):
+            numpyRows = numpy.maximum(numpyRows, numpyPadded[iShift:iShift + iRows])
+        numpyDilated = numpyRows[:, 0:iColumns]
+        for iShift in range(1, _iSize):
+            numpyDilated = numpy.maximum(numpyDilated, numpyRows[:, iShift:iShift + iColumns])
+        return numpyDilated
+
+
+    @classmethod
+    def createThumbnails(cls, _numpyImage, _listThumbnail, _fMinLevel=MIN_LEVEL, _fMaxLevel=MAX_LEVEL, _iDilatation=DILATATION):
+        """
+        Creates thumbnail images from a frame.
+
+        @param _numpyImage: the frame, or the path to the diffraction image
+        @param _listThumbnail: list of (width, height, output path, format) of the thumbnails;
+                               if width and height are None the thumbnail has the size of the frame,
+                               the format is "jpg" (default if None) or "png"
+        @return: list of the (width, height) of the thumbnails
+        """
+        if not hasattr(_numpyImage, "shape"):
+            _numpyImage = cls.readImage(_numpyImage)
+        iImageHeight, iImageWidth = _numpyImage.shape
+        fMaxLevel = float(cls.getMaxLevel(_numpyImage, _fMaxLevel))
+        if fMaxLevel <= 0:
+            fMaxLevel = 1.0
+        listSize = []
+        dictReducedImage = {}
+        for (iWidth, iHeight, strOutputPath, strFormat) in _listThumbnail:
+            if iWidth is None or iHeight is None:
+                iFactor = 1
+            else:
+                # Not reduced by more than the dilation, smaller thumbnails are resampled
+                # by PIL as with the former implementation (dilation, then resampling)
+                iFactor = max(1, min(iImageWidth // iWidth, iImageHeight // iHeight, _iDilatation))
+            if iFactor not in dictReducedImage:
+                numpyReduced = cls.reduceImage(_numpyImage, iFactor)
+                # The block maximum already covers the dilation of the full resolution frame
+                # if the block is at least as large as the dilation square
+                if iFactor < _iDilatation:
+                    numpyReduced = cls.dilateImage(numpyReduced, -(-_iDilatation // iFactor))
+                numpyReduced = numpy.clip(numpyReduced.astype(numpy.float32), _fMinLevel, fMaxLevel)
+                numpyInt = 255 - (numpyReduced * (255.0 / fMaxLevel)).astype(numpy.uint8)
+                dictReducedImage[iFactor] = Image.fromarray(numpyInt, "L")
+            pilImage = dictReducedImage[iFactor]
+            if iWidth is not None and iHeight is not None and pilImage.size != (iWidth, iHeight):
+                pilImage = pilImage.resize((iWidth, iHeight), Image.LANCZOS)
+            strPILFormat = cls.DICT_PIL_FORMAT.get((strFormat or "jpg").lower(), "JPEG")
+            if pilImage.size[0] * pilImage.size[1] > ImageFile.MAXBLOCK:
+                ImageFile.MAXBLOCK = pilImage.size[0] * pilImage.size[1]
+            if strPILFormat == "JPEG":
+                pilImage.save(strOutputPath, strPILFormat, quality=cls.JPEG_QUALITY, optimize=True)
+            else:
+                pilImage.save(strOutputPath, strPILFormat, optimize=True)
+            listSize.append(pilImage.size)
+        return listSize
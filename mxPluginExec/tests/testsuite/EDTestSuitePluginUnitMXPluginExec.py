@@ -45,6 +45,7 @@ class EDTestSuitePluginUnitMXPluginExec(EDTestSuite):
         self.addTestSuiteFromName("EDTestSuitePluginUnitXDSv1_0")
         self.addTestSuiteFromName("EDTestSuitePluginUnitXDSv1_1")
         self.addTestCaseFromName("EDTestCasePluginUnitFbestv1_0")
+        self.addTestCaseFromName("EDTestCasePluginUnitMXThumbnailv1_1")
 
 
 
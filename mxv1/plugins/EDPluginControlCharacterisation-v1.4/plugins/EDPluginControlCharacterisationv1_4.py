@@ -40,16 +40,10 @@ except:
     EDNA2_THUMBNAILS = False
 
 
-try:
-    from xmlrpclib import ServerProxy
-    from xmlrpclib import Transport
-except:
-    from xmlrpc.client import ServerProxy
-    from xmlrpc.client import Transport
-
 from EDVerbose import EDVerbose
 from EDPluginControl import EDPluginControl
 from EDFactoryPluginStatic import EDFactoryPluginStatic
+from EDMXCuBENotifier import EDMXCuBENotifier
 
 from XSDataCommon import XSDataString
 from XSDataCommon import XSDataInteger
@@ -73,21 +67,6 @@ EDFactoryPluginStatic.loadModule("XSDataMXThumbnailv1_1")
 from XSDataMXThumbnailv1_1 import XSDataInputMXThumbnail
 
 
-class TokenTransport(Transport):
-
-    def __init__(self, token, use_datetime=0):
-        Transport.__init__(self, use_datetime=use_datetime)
-        self.token = token
-
-    def send_content(self, connection, request_body):
-        connection.putheader("Content-Type", "text/xml")
-        connection.putheader("Content-Length", str(len(request_body)))
-        connection.putheader("Token", self.token)
-        connection.endheaders()
-        if request_body:
-            connection.send(request_body)
-
-
 class EDPluginControlCharacterisationv1_4(EDPluginControl):
     """
     [To be replaced with a description of EDPluginControlTemplatev10]
@@ -125,7 +104,7 @@ class EDPluginControlCharacterisationv1_4(EDPluginControl):
         self._iNoReferenceImages = None
         self._iNoImagesWithDozorScore = None
         self._strMxCuBE_URI = None
-        self._oServerProxy = None
+        self._strToken = None
         self._runKappa = False
         self._bDoOnlyMoslmfIndexing = False
 
@@ -269,15 +248,9 @@ class EDPluginControlCharacterisationv1_4(EDPluginControl):
                 self._xsDataResultCharacterisation.setDataCollection(XSDataCollection.parseString(self._xsDataCollection.marshal()))
 
             if xsDataInputCharacterisation.token is not None:
-                strToken = xsDataInputCharacterisation.token.value
-            else:
-                strToken = None
+                self._strToken = xsDataInputCharacterisation.token.value
             if self._strMxCuBE_URI is not None:
                 self.DEBUG("Enabling sending messages to mxCuBE via URI {0}".format(self._strMxCuBE_URI))
-                if strToken is None:
-                    self._oServerProxy = ServerProxy(self._strMxCuBE_URI)
-                else:
-                    self._oServerProxy = ServerProxy(self._strMxCuBE_URI, transport=TokenTransport(strToken))
 
 
     def process(self, _edObject=None):
@@ -800,9 +773,6 @@ class EDPluginControlCharacterisationv1_4(EDPluginControl):
         # Only for mxCuBE
         if self._strMxCuBE_URI is not None:
             self.DEBUG("Sending message to mxCuBE: {0}".format(_strMessage))
-            try:
-                for strMessage in _strMessage.split("\n"):
-                    if strMessage != "":
-                        self._oServerProxy.log_message("Characterisation: " + strMessage, level)
-            except:
-                self.DEBUG("Sending message to mxCuBE failed!")
+            for strMessage in _strMessage.split("\n"):
+                if strMessage != "":
+                    EDMXCuBENotifier.logMessage(self._strMxCuBE_URI, "Characterisation: " + strMessage, level, self._strToken)
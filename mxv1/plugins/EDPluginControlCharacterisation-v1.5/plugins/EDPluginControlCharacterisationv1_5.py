@@ -51,6 +51,7 @@ except:
 from EDVerbose import EDVerbose
 from EDPluginControl import EDPluginControl
 from EDFactoryPluginStatic import EDFactoryPluginStatic
+from EDMXCuBENotifier import EDMXCuBENotifier
 
 from XSDataCommon import XSDataDouble
 from XSDataCommon import XSDataString
@@ -143,6 +144,7 @@ class EDPluginControlCharacterisationv1_5(EDPluginControl):
         self._fAverageDozorScore = None
         self._strMxCuBE_URI = None
         self._oServerProxy = None
+        self._strToken = None
         self._runKappa = False
         self._bDoOnlyMoslmfIndexing = False
         self._fThresholdMosflmIndexing = None
@@ -197,6 +199,7 @@ class EDPluginControlCharacterisationv1_5(EDPluginControl):
             strToken = xsDataInputCharacterisation.token.value
         else:
             strToken = None
+        self._strToken = strToken
 
         if xsDataInputCharacterisation.currentResolution is not None:
             self._fCurrentResolution = xsDataInputCharacterisation.currentResolution.value
@@ -205,6 +208,7 @@ class EDPluginControlCharacterisationv1_5(EDPluginControl):
 
         if self._strMxCuBE_URI is not None:
             self.DEBUG("Enabling sending messages to mxCuBE via URI {0}".format(self._strMxCuBE_URI))
+            # Only used for reading the resolution, the messages are sent by the EDMXCuBENotifier
             if strToken is None:
                 self._oServerProxy = ServerProxy(self._strMxCuBE_URI)
             else:
@@ -1103,12 +1107,9 @@ class EDPluginControlCharacterisationv1_5(EDPluginControl):
             self.screen(_strMessage)
         if self._strMxCuBE_URI is not None:
             self.DEBUG("Sending message to mxCuBE: {0}".format(_strMessage))
-            try:
-                for strMessage in _strMessage.split("\n"):
-                    if strMessage != "":
-                        self._oServerProxy.log_message("Characterisation: " + strMessage, level)
-            except:
-                self.DEBUG("Sending message to mxCuBE failed!")
+            for strMessage in _strMessage.split("\n"):
+                if strMessage != "":
+                    EDMXCuBENotifier.logMessage(self._strMxCuBE_URI, "Characterisation: " + strMessage, level, self._strToken)
 
     def getResolutionFromMXCuBE(self):
         fCurrentResolution = None
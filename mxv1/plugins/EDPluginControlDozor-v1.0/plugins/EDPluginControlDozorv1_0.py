@@ -27,22 +27,25 @@ __copyright__ = "ESRF"
 
 import os
 import sys
-import numpy
+import collections
+import concurrent.futures
 import shutil
 import base64
 import tempfile
-try:
-    from xmlrpclib import ServerProxy
-except:
-    from xmlrpc.client import ServerProxy
-
 from EDPluginControl import EDPluginControl
 from EDUtilsImage import EDUtilsImage
 from EDUtilsPath import EDUtilsPath
 
 from EDHandlerESRFPyarchv1_0 import EDHandlerESRFPyarchv1_0
+from EDMXCuBENotifier import EDMXCuBENotifier
 from EDFactoryPlugin import edFactoryPlugin
 from EDUtilsParallel import EDUtilsParallel
+from EDExecutor import EDExecutor, EDExecutorTask
+from EDFrameProviderHDF5 import EDFrameProviderHDF5
+
+from EDFactoryPluginStatic import EDFactoryPluginStatic
+EDFactoryPluginStatic.loadModule("EDHandlerDozorSpotStore")
+from EDHandlerDozorSpotStore import EDHandlerDozorSpotStore
 
 from XSDataCommon import XSDataInteger
 from XSDataCommon import XSDataDouble
@@ -51,7 +54,6 @@ from XSDataCommon import XSDataFile
 from XSDataCommon import XSDataImage
 from XSDataCommon import XSDataAngle
 
-from EDFactoryPluginStatic import EDFactoryPluginStatic
 EDFactoryPluginStatic.loadModule("XSDataDozorv1_0")
 from XSDataDozorv1_0 import XSDataInputDozor
 
@@ -97,10 +99,18 @@ class EDPluginControlDozorv1_0(EDPluginControl):
         self.batchSize = None
         self.hdf5BatchSize = None
         self._strMxCuBE_URI = None
-        self._oServerProxy = None
         self.doRadiationDamage = False
         self.gnuplot = "gnuplot"
         self.doISPyBUpload = False
+        # Number of batches processed concurrently, 1 for sequential processing
+        self.pipelineDepth = 2
+        # Let dozor read the HDF5 files (requires the dozor HDF5 library)
+        self.readHdf5Directly = False
+        self.hdf5MasterFile = None
+        self.strSpotStoreFileName = "dozorSpots.bin"
+        # Send the spot lists base64 encoded to mxCuBE in addition to the spot store,
+        # to be set to False in the configuration once mxCuBE reads dozorSpotStore
+        self.inlineSpotList = True
 
 
     def checkParameters(self):
@@ -114,11 +124,13 @@ class EDPluginControlDozorv1_0(EDPluginControl):
         EDPluginControl.configure(self)
         self.batchSize = self.config.get("batchSize")
         self.hdf5BatchSize = self.config.get("hdf5BatchSize")
+        self.pipelineDepth = max(1, int(self.config.get("pipelineDepth", self.pipelineDepth)))
+        self.readHdf5Directly = self.config.get("readHdf5Directly", self.readHdf5Directly)
+        self.inlineSpotList = self.config.get("inlineSpotList", self.inlineSpotList)
 
         self._strMxCuBE_URI = self.config.get("mxCuBE_URI", None)
         if self._strMxCuBE_URI is not None:
             self.DEBUG("Enabling sending messages to mxCuBE via URI {0}".format(self._strMxCuBE_URI))
-            self._oServerProxy = ServerProxy(self._strMxCuBE_URI)
 
         self.gnuplot = self.config.get("gnuplot", self.gnuplot)
 
@@ -171,7 +183,14 @@ class EDPluginControlDozorv1_0(EDPluginControl):
         if self.dataInput.hdf5BatchSize is not None:
             self.hdf5BatchSize = self.dataInput.hdf5BatchSize.value
         listAllBatches = self.createListOfBatches(dictImage.keys(), batchSize)
-        if dictImage[listAllBatches[0][0]].path.value.endswith("h5"):
+        if dictImage[listAllBatches[0][0]].path.value.endswith("h5") and self.readHdf5Directly \
+                and not self.doRadiationDamage and not self.hasOverlap:
+            # The headers are read from the master file and dozor reads the frames
+            # directly from the data files, no conversion to CBF
+            startImage = min(dictImage.keys())
+            self.hdf5MasterFile = EDFrameProviderHDF5.getFrameReference(dictImage[startImage].path.value, 1)[0]
+            self.screen("Reading HDF5 data directly from {0}".format(self.hdf5MasterFile))
+        elif dictImage[listAllBatches[0][0]].path.value.endswith("h5"):
             # Convert HDF5 images to CBF
             self.screen("HDF5 converter batch size: {0}".format(self.batchSize))
             if self.doRadiationDamage:
@@ -180,106 +199,22 @@ class EDPluginControlDozorv1_0(EDPluginControl):
                 self.cbfTempDir = tempfile.mkdtemp(prefix="CbfTemp_")
             listHdf5Batches = self.createListOfBatches(dictImage.keys(), self.batchSize)
             dictImage, self.hasHdf5Prefix = self.convertToCBF(dictImage, listHdf5Batches, self.doRadiationDamage)
-        for listBatch in listAllBatches:
-            # Read the header from the first image in the batch
-            xsDataFile = dictImage[listBatch[0]]
-            edPluginControlReadImageHeader = self.loadPlugin(self.strEDPluginControlReadImageHeaderName)
-            xsDataInputReadImageHeader = XSDataInputReadImageHeader()
-            xsDataInputReadImageHeader.image = xsDataFile
-            edPluginControlReadImageHeader.dataInput = xsDataInputReadImageHeader
-            edPluginControlReadImageHeader.executeSynchronous()
-            subWedge = edPluginControlReadImageHeader.dataOutput.subWedge
-            xsDataInputDozor = XSDataInputDozor()
-            beam = subWedge.experimentalCondition.beam
-            detector = subWedge.experimentalCondition.detector
-            goniostat = subWedge.experimentalCondition.goniostat
-            xsDataInputDozor.detectorType = detector.type
-            xsDataInputDozor.exposureTime = XSDataDouble(beam.exposureTime.value)
-            xsDataInputDozor.spotSize = XSDataInteger(3)
-            xsDataInputDozor.detectorDistance = XSDataDouble(detector.distance.value)
-            xsDataInputDozor.wavelength = XSDataDouble(beam.wavelength.value)
-#            xsDataInputDozor.fractionPolatization : XSDataDouble optional
-            orgx = detector.beamPositionY.value / detector.pixelSizeY.value
-            orgy = detector.beamPositionX.value / detector.pixelSizeX.value
-            xsDataInputDozor.orgx = XSDataDouble(orgx)
-            xsDataInputDozor.orgy = XSDataDouble(orgy)
-            xsDataInputDozor.oscillationRange = XSDataDouble(goniostat.oscillationWidth.value)
-#            xsDataInputDozor.imageStep : XSDataDouble optional
-            xsDataInputDozor.startingAngle = XSDataDouble(goniostat.rotationAxisStart.value)
-            xsDataInputDozor.firstImageNumber = subWedge.image[0].number
-            xsDataInputDozor.numberImages = XSDataInteger(len(listBatch))
-            if self.hasOverlap:
-                xsDataInputDozor.overlap = XSDataAngle(self.overlap)
-            strFileName = subWedge.image[0].path.value
-            strPrefix = EDUtilsImage.getPrefix(strFileName)
-            strSuffix = EDUtilsImage.getSuffix(strFileName)
-            if EDUtilsPath.isEMBL():
-                strXDSTemplate = "%s_?????.%s" % (strPrefix, strSuffix)
-            elif self.hasHdf5Prefix and not self.hasOverlap:
-                strXDSTemplate = "%s_??????.%s" % (strPrefix, strSuffix)
-            else:
-                strXDSTemplate = "%s_????.%s" % (strPrefix, strSuffix)
-            xsDataInputDozor.nameTemplateImage = XSDataString(os.path.join(os.path.dirname(strFileName), strXDSTemplate))
-            xsDataInputDozor.wedgeNumber = self.dataInput.wedgeNumber
-            xsDataInputDozor.radiationDamage = self.dataInput.radiationDamage
-            edPluginDozor = self.loadPlugin(self.strEDPluginDozorName, "Dozor_%05d" % subWedge.image[0].number.value)
-            edPluginDozor.dataInput = xsDataInputDozor
-            edPluginDozor.execute()
-            edPluginDozor.synchronize()
-            indexImage = 0
-            imageDozorBatchList = []
-
-            for xsDataResultDozor in edPluginDozor.dataOutput.imageDozor:
-                xsDataControlImageDozor = XSDataControlImageDozor()
-                xsDataControlImageDozor.number = xsDataResultDozor.number
-                xsDataControlImageDozor.image = dictImage[listBatch[indexImage]]
-                xsDataControlImageDozor.spotsNumOf = xsDataResultDozor.spotsNumOf
-                xsDataControlImageDozor.spotsIntAver = xsDataResultDozor.spotsIntAver
-                xsDataControlImageDozor.spotsResolution = xsDataResultDozor.spotsResolution
-                xsDataControlImageDozor.powderWilsonScale = xsDataResultDozor.powderWilsonScale
-                xsDataControlImageDozor.powderWilsonBfactor = xsDataResultDozor.powderWilsonBfactor
-                xsDataControlImageDozor.powderWilsonResolution = xsDataResultDozor.powderWilsonResolution
-                xsDataControlImageDozor.powderWilsonCorrelation = xsDataResultDozor.powderWilsonCorrelation
-                xsDataControlImageDozor.powderWilsonRfactor = xsDataResultDozor.powderWilsonRfactor
-                xsDataControlImageDozor.mainScore = xsDataResultDozor.mainScore
-                xsDataControlImageDozor.spotScore = xsDataResultDozor.spotScore
-                xsDataControlImageDozor.visibleResolution = xsDataResultDozor.visibleResolution
-                xsDataControlImageDozor.spotFile = xsDataResultDozor.spotFile
-                xsDataControlImageDozor.angle = xsDataResultDozor.angle
-                xsDataResultControlDozor.addImageDozor(xsDataControlImageDozor)
-                if xsDataResultControlDozor.inputDozor is None:
-                    xsDataResultControlDozor.inputDozor = XSDataDozorInput().parseString(xsDataInputDozor.marshal())
-                indexImage += 1
-
-                dozorSpotListShape = []
-                dozorSpotList = []
-                spotFile = None
-                if xsDataControlImageDozor.spotFile is not None:
-                    spotFile = xsDataControlImageDozor.spotFile.path.value
-                    if os.path.exists(spotFile):
-                        numpyArray = numpy.loadtxt(spotFile, skiprows=3)
-                        dozorSpotList = base64.b64encode(numpyArray.tostring())
-                        dozorSpotListShape.append(numpyArray.shape[0])
-                        if len(numpyArray.shape) > 1:
-                            dozorSpotListShape.append(numpyArray.shape[1])
-
-                imageDozorDict = {"index": xsDataControlImageDozor.number.value,
-                                  "imageName": xsDataControlImageDozor.image.path.value,
-                                  "dozor_score": xsDataControlImageDozor.mainScore.value,
-                                  "dozorSpotsNumOf" : xsDataControlImageDozor.spotsNumOf.value,
-                                  "dozorSpotFile": spotFile,
-                                  "dozorSpotList" : dozorSpotList,
-                                  "dozorSpotListShape": dozorSpotListShape,
-                                  "dozorSpotsIntAver": xsDataControlImageDozor.spotsIntAver.value,
-                                  "dozorSpotsResolution": xsDataControlImageDozor.spotsResolution.value
-                                  }
-                imageDozorBatchList.append(imageDozorDict)
-
-            xsDataResultControlDozor.halfDoseTime = edPluginDozor.dataOutput.halfDoseTime
-            xsDataResultControlDozor.pngPlots = edPluginDozor.dataOutput.pngPlots
-
-            self.sendResultToMXCuBE(imageDozorBatchList)
-            self.sendMessageToMXCuBE("Batch processed")
+        # The batches are pipelined: header reading, Dozor and spot file loading of
+        # up to pipelineDepth batches overlap, the results are delivered in batch order.
+        self.screen("Dozor pipeline depth: {0}".format(self.pipelineDepth))
+        dequeTask = collections.deque()
+        try:
+            for listBatch in listAllBatches:
+                edExecutorTask = EDExecutorTask(self.processBatch, listBatch, dictImage)
+                EDExecutor.submitTask(edExecutorTask, "Dozor_%05d" % listBatch[0])
+                dequeTask.append(edExecutorTask)
+                if len(dequeTask) >= self.pipelineDepth:
+                    self.deliverBatch(dequeTask.popleft(), xsDataResultControlDozor)
+            while len(dequeTask) > 0:
+                self.deliverBatch(dequeTask.popleft(), xsDataResultControlDozor)
+        except Exception:
+            self.cancelBatches(dequeTask)
+            raise
         self.dataOutput = xsDataResultControlDozor
         if self.cbfTempDir is not None:
             if self.dataInput.keepCbfTmpDirectory is not None and self.dataInput.keepCbfTmpDirectory.value:
@@ -475,6 +410,158 @@ class EDPluginControlDozorv1_0(EDPluginControl):
         self.setStatusToMXCuBE("Success")
 
 
+    def processBatch(self, _listBatch, _dictImage):
+        """
+        Reads the header, runs Dozor and loads the spot files of one batch.
+        This method is executed in the EDExecutor, possibly concurrently for
+        successive batches.
+        """
+        # Read the header from the first image in the batch
+        xsDataFile = _dictImage[_listBatch[0]]
+        edPluginControlReadImageHeader = self.loadPlugin(self.strEDPluginControlReadImageHeaderName,
+                                                         "ReadImageHeader_%05d" % _listBatch[0])
+        xsDataInputReadImageHeader = XSDataInputReadImageHeader()
+        xsDataInputReadImageHeader.image = xsDataFile
+        edPluginControlReadImageHeader.dataInput = xsDataInputReadImageHeader
+        edPluginControlReadImageHeader.executeSynchronous()
+        subWedge = edPluginControlReadImageHeader.dataOutput.subWedge
+        xsDataInputDozor = XSDataInputDozor()
+        beam = subWedge.experimentalCondition.beam
+        detector = subWedge.experimentalCondition.detector
+        goniostat = subWedge.experimentalCondition.goniostat
+        xsDataInputDozor.detectorType = detector.type
+        xsDataInputDozor.exposureTime = XSDataDouble(beam.exposureTime.value)
+        xsDataInputDozor.spotSize = XSDataInteger(3)
+        xsDataInputDozor.detectorDistance = XSDataDouble(detector.distance.value)
+        xsDataInputDozor.wavelength = XSDataDouble(beam.wavelength.value)
+#        xsDataInputDozor.fractionPolatization : XSDataDouble optional
+        orgx = detector.beamPositionY.value / detector.pixelSizeY.value
+        orgy = detector.beamPositionX.value / detector.pixelSizeX.value
+        xsDataInputDozor.orgx = XSDataDouble(orgx)
+        xsDataInputDozor.orgy = XSDataDouble(orgy)
+        xsDataInputDozor.oscillationRange = XSDataDouble(goniostat.oscillationWidth.value)
+#        xsDataInputDozor.imageStep : XSDataDouble optional
+        xsDataInputDozor.startingAngle = XSDataDouble(goniostat.rotationAxisStart.value)
+        xsDataInputDozor.firstImageNumber = subWedge.image[0].number
+        xsDataInputDozor.numberImages = XSDataInteger(len(_listBatch))
+        if self.hasOverlap:
+            xsDataInputDozor.overlap = XSDataAngle(self.overlap)
+        strFileName = subWedge.image[0].path.value
+        strPrefix = EDUtilsImage.getPrefix(strFileName)
+        strSuffix = EDUtilsImage.getSuffix(strFileName)
+        if self.hdf5MasterFile is not None:
+            # Template of the data files of the master file, as used by the dozor HDF5 library
+            strXDSTemplate = os.path.basename(self.hdf5MasterFile).replace("master", "??????")
+        elif EDUtilsPath.isEMBL():
+            strXDSTemplate = "%s_?????.%s" % (strPrefix, strSuffix)
+        elif self.hasHdf5Prefix and not self.hasOverlap:
+            strXDSTemplate = "%s_??????.%s" % (strPrefix, strSuffix)
+        else:
+            strXDSTemplate = "%s_????.%s" % (strPrefix, strSuffix)
+        xsDataInputDozor.nameTemplateImage = XSDataString(os.path.join(os.path.dirname(strFileName), strXDSTemplate))
+        xsDataInputDozor.wedgeNumber = self.dataInput.wedgeNumber
+        xsDataInputDozor.radiationDamage = self.dataInput.radiationDamage
+        edPluginDozor = self.loadPlugin(self.strEDPluginDozorName, "Dozor_%05d" % subWedge.image[0].number.value)
+        edPluginDozor.dataInput = xsDataInputDozor
+        edPluginDozor.executeSynchronous()
+        indexImage = 0
+        listXSDataControlImageDozor = []
+        for xsDataResultDozor in edPluginDozor.dataOutput.imageDozor:
+            xsDataControlImageDozor = XSDataControlImageDozor()
+            xsDataControlImageDozor.number = xsDataResultDozor.number
+            xsDataControlImageDozor.image = _dictImage[_listBatch[indexImage]]
+            xsDataControlImageDozor.spotsNumOf = xsDataResultDozor.spotsNumOf
+            xsDataControlImageDozor.spotsIntAver = xsDataResultDozor.spotsIntAver
+            xsDataControlImageDozor.spotsResolution = xsDataResultDozor.spotsResolution
+            xsDataControlImageDozor.powderWilsonScale = xsDataResultDozor.powderWilsonScale
+            xsDataControlImageDozor.powderWilsonBfactor = xsDataResultDozor.powderWilsonBfactor
+            xsDataControlImageDozor.powderWilsonResolution = xsDataResultDozor.powderWilsonResolution
+            xsDataControlImageDozor.powderWilsonCorrelation = xsDataResultDozor.powderWilsonCorrelation
+            xsDataControlImageDozor.powderWilsonRfactor = xsDataResultDozor.powderWilsonRfactor
+            xsDataControlImageDozor.mainScore = xsDataResultDozor.mainScore
+            xsDataControlImageDozor.spotScore = xsDataResultDozor.spotScore
+            xsDataControlImageDozor.visibleResolution = xsDataResultDozor.visibleResolution
+            xsDataControlImageDozor.spotFile = xsDataResultDozor.spotFile
+            xsDataControlImageDozor.angle = xsDataResultDozor.angle
+            listXSDataControlImageDozor.append(xsDataControlImageDozor)
+            indexImage += 1
+        imageDozorBatchList = self.createImageDozorBatchList(listXSDataControlImageDozor,
+                                                             edPluginDozor.getWorkingDirectory())
+        return (xsDataInputDozor, edPluginDozor.dataOutput, listXSDataControlImageDozor, imageDozorBatchList)
+
+
+    def createImageDozorBatchList(self, _listXSDataControlImageDozor, _strWorkingDirectory):
+        """
+        Writes the spot lists of a batch in one spot store and returns the
+        results of the images to be sent to mxCuBE, which refer to the spot
+        lists by their index in the store.
+        """
+        listImageNumber = []
+        listSpotFile = []
+        for xsDataControlImageDozor in _listXSDataControlImageDozor:
+            listImageNumber.append(xsDataControlImageDozor.number.value)
+            if xsDataControlImageDozor.spotFile is not None:
+                listSpotFile.append(xsDataControlImageDozor.spotFile.path.value)
+            else:
+                listSpotFile.append(None)
+        strSpotStorePath = os.path.join(_strWorkingDirectory, self.strSpotStoreFileName)
+        edDozorSpotStore = EDHandlerDozorSpotStore.createStore(strSpotStorePath, listImageNumber, listSpotFile)
+        imageDozorBatchList = []
+        for (iIndex, xsDataControlImageDozor) in enumerate(_listXSDataControlImageDozor):
+            dozorSpotListShape = []
+            if listSpotFile[iIndex] is not None and os.path.exists(listSpotFile[iIndex]):
+                dozorSpotListShape = edDozorSpotStore.getLoadtxtShape(iIndex)
+            imageDozorDict = {"index": xsDataControlImageDozor.number.value,
+                              "imageName": xsDataControlImageDozor.image.path.value,
+                              "dozor_score": xsDataControlImageDozor.mainScore.value,
+                              "dozorSpotsNumOf" : xsDataControlImageDozor.spotsNumOf.value,
+                              "dozorSpotFile": listSpotFile[iIndex],
+                              "dozorSpotStore": strSpotStorePath,
+                              "dozorSpotStoreIndex": iIndex,
+                              "dozorSpotListShape": dozorSpotListShape,
+                              "dozorSpotsIntAver": xsDataControlImageDozor.spotsIntAver.value,
+                              "dozorSpotsResolution": xsDataControlImageDozor.spotsResolution.value
+                              }
+            if self.inlineSpotList:
+                # For mxCuBE versions which don't read the spot store
+                if dozorSpotListShape:
+                    imageDozorDict["dozorSpotList"] = base64.b64encode(edDozorSpotStore.getSpotList(iIndex).tobytes())
+                else:
+                    imageDozorDict["dozorSpotList"] = []
+            imageDozorBatchList.append(imageDozorDict)
+        return imageDozorBatchList
+
+
+    def deliverBatch(self, _edExecutorTask, _xsDataResultControlDozor):
+        """
+        Waits for a batch processed by processBatch, adds its results to the
+        plugin result and sends them to mxCuBE.
+        """
+        # If the batch is still queued it's run in this thread
+        _edExecutorTask.runInline()
+        xsDataInputDozor, xsDataResultDozor, listXSDataControlImageDozor, imageDozorBatchList = \
+            _edExecutorTask.future.result()
+        for xsDataControlImageDozor in listXSDataControlImageDozor:
+            _xsDataResultControlDozor.addImageDozor(xsDataControlImageDozor)
+        if _xsDataResultControlDozor.inputDozor is None:
+            _xsDataResultControlDozor.inputDozor = XSDataDozorInput().parseString(xsDataInputDozor.marshal())
+        _xsDataResultControlDozor.halfDoseTime = xsDataResultDozor.halfDoseTime
+        _xsDataResultControlDozor.pngPlots = xsDataResultDozor.pngPlots
+        self.sendResultToMXCuBE(imageDozorBatchList)
+        self.sendMessageToMXCuBE("Batch processed")
+
+    def cancelBatches(self, _dequeTask):
+        """
+        Cancels the batches not yet started and waits for the running ones,
+        so that no batch is still processed when the plugin fails.
+        """
+        for edExecutorTask in _dequeTask:
+            edExecutorTask.future.cancel()
+        while len(_dequeTask) > 0:
+            edExecutorTask = _dequeTask.popleft()
+            if not edExecutorTask.future.cancelled():
+                concurrent.futures.wait([edExecutorTask.future])
+
     def createImageDict(self, _xsDataControlDozorInput):
         # Create dictionary of all images with the image number as key
         dictImage = {}
@@ -587,6 +674,7 @@ class EDPluginControlDozorv1_0(EDPluginControl):
                     xsDataInputH5ToCBF.hdf5ImageNumber = XSDataInteger(batch[0])
                     xsDataInputH5ToCBF.startImageNumber = XSDataInteger(listAllBatches[0][0])
                     xsDataInputH5ToCBF.endImageNumber = XSDataInteger(listAllBatches[0][-1])
+                    xsDataInputH5ToCBF.forcedOutputImageNumber = XSDataInteger(batch[0])
                 else:
                     xsDataInputH5ToCBF.hdf5File = dictImage[startImage]
                     xsDataInputH5ToCBF.hdf5ImageNumber = XSDataInteger(1)
@@ -598,12 +686,10 @@ class EDPluginControlDozorv1_0(EDPluginControl):
                 if doRadiationDamage:
                     edPluginH5ToCBF.executeSynchronous()
                     if edPluginH5ToCBF.dataOutput is not None and edPluginH5ToCBF.dataOutput.outputCBFFileTemplate is not None:
+                        # The CBF files are written with their final names
                         outputCBFFileTemplate = edPluginH5ToCBF.dataOutput.outputCBFFileTemplate
                         for newImageNumber in batch:
-                            oldImageNumber = newImageNumber - batch[0] + 1
-                            oldPath = os.path.join(directory, outputCBFFileTemplate.path.value.replace("######", "{0:06d}".format(oldImageNumber)))
-                            newPath = os.path.join(directory, outputCBFFileTemplate.path.value.replace("######", "{0:04d}".format(newImageNumber)))
-                            os.rename(oldPath, newPath)
+                            newPath = os.path.join(directory, outputCBFFileTemplate.path.value.replace("####", "{0:04d}".format(newImageNumber)))
                             newDict[newImageNumber] = XSDataFile(XSDataString(newPath))
                     hasHdf5Prefix = False
                 else:
@@ -619,27 +705,18 @@ class EDPluginControlDozorv1_0(EDPluginControl):
         return newDict, hasHdf5Prefix
 
     def sendMessageToMXCuBE(self, _strMessage, level="info"):
-        if self._oServerProxy is not None:
+        if self._strMxCuBE_URI is not None:
             self.DEBUG("Sending message to mxCuBE: {0}".format(_strMessage))
-            try:
-                for strMessage in _strMessage.split("\n"):
-                    if strMessage != "":
-                        self._oServerProxy.log_message("EDNA | Dozor: " + _strMessage, level)
-            except:
-                self.DEBUG("Sending message to mxCuBE failed!")
+            for strMessage in _strMessage.split("\n"):
+                if strMessage != "":
+                    EDMXCuBENotifier.logMessage(self._strMxCuBE_URI, "EDNA | Dozor: " + strMessage, level)
 
     def sendResultToMXCuBE(self, _batchData):
-        if self._oServerProxy is not None:
+        if self._strMxCuBE_URI is not None:
             self.DEBUG("Sending Dozor results to mxCuBE")
-            try:
-                self._oServerProxy.dozor_batch_processed(_batchData)
-            except:
-                pass
+            EDMXCuBENotifier.send(self._strMxCuBE_URI, "dozor_batch_processed", (_batchData,))
 
     def setStatusToMXCuBE(self, status):
-        if self._oServerProxy is not None:
+        if self._strMxCuBE_URI is not None:
             self.DEBUG("Sending dozor status %s to mxCuBE" % status)
-            try:
-                self._oServerProxy.dozor_status_changed(status)
-            except:
-                pass
+            EDMXCuBENotifier.send(self._strMxCuBE_URI, "dozor_status_changed", (status,))
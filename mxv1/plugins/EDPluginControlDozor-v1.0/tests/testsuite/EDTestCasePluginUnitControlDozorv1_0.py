@@ -28,7 +28,12 @@ __copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
 
 
 import os
+import numpy
 import pprint
+import shutil
+import tempfile
+import threading
+import collections
 
 from EDAssert import EDAssert
 from EDTestCasePluginUnit import EDTestCasePluginUnit
@@ -37,6 +42,11 @@ from XSDataCommon import XSDataImage
 
 from XSDataControlDozorv1_0 import XSDataInputControlDozor
 
+from EDFactoryPluginStatic import EDFactoryPluginStatic
+from EDExecutor import EDExecutorTask
+EDFactoryPluginStatic.loadModule("EDHandlerDozorSpotStore")
+from EDHandlerDozorSpotStore import EDHandlerDozorSpotStore
+
 class EDTestCasePluginUnitControlDozorv1_0(EDTestCasePluginUnit):
 
 
@@ -64,8 +74,63 @@ class EDTestCasePluginUnitControlDozorv1_0(EDTestCasePluginUnit):
         EDAssert.equal([[1, 2], [4, 5, 6]], edPluginControlDozor.createListOfBatches(list(range(4, 7)) + list(range(1, 3)), 3))
 
 
+    def testSpotStore(self):
+        strTmpDir = tempfile.mkdtemp(prefix="EDTestCaseDozorSpotStore_")
+        try:
+            listImageNumber = [1, 2, 3, 4]
+            listSpotFile = []
+            listNumberOfSpots = [3, 0, 1, None]
+            for (iImageNumber, iNumberOfSpots) in zip(listImageNumber, listNumberOfSpots):
+                strSpotFile = os.path.join(strTmpDir, "%05d.spot" % iImageNumber)
+                if iNumberOfSpots is not None:
+                    with open(strSpotFile, "w") as pyFile:
+                        pyFile.write("  3\n %d\n  N    X      Y     I    sigma\n" % iNumberOfSpots)
+                        for iSpot in range(iNumberOfSpots):
+                            pyFile.write("%5d %8.2f %8.2f %8.1f %6.1f\n" % (iSpot + 1, 100.5 + iSpot, 200.25 * iImageNumber, 1234.5, 12.5))
+                listSpotFile.append(strSpotFile)
+            strStorePath = os.path.join(strTmpDir, "dozorSpots.bin")
+            edDozorSpotStore = EDHandlerDozorSpotStore.createStore(strStorePath, listImageNumber, listSpotFile)
+            EDAssert.equal(4, len(edDozorSpotStore), "Number of spot lists")
+            EDAssert.equal(2, edDozorSpotStore.getIndex(3), "Index of image 3")
+            EDAssert.equal(None, edDozorSpotStore.getIndex(5), "Index of missing image")
+            for iIndex in [0, 2]:
+                numpyReference = numpy.loadtxt(listSpotFile[iIndex], skiprows=3, ndmin=2)
+                numpySpotList = edDozorSpotStore.getSpotList(iIndex)
+                EDAssert.equal(numpyReference.shape, edDozorSpotStore.getShape(iIndex), "Shape of spot list %d" % iIndex)
+                EDAssert.equal(True, numpy.array_equal(numpyReference, numpySpotList), "Values of spot list %d" % iIndex)
+                EDAssert.equal(list(numpy.loadtxt(listSpotFile[iIndex], skiprows=3).shape), edDozorSpotStore.getLoadtxtShape(iIndex),
+                               "numpy.loadtxt shape of spot list %d" % iIndex)
+            EDAssert.equal([7], EDHandlerDozorSpotStore.getLoadtxtShape((7, 1)), "numpy.loadtxt shape of one column")
+            EDAssert.equal(0, edDozorSpotStore.getShape(1)[0], "Empty spot list")
+            EDAssert.equal(0, edDozorSpotStore.getSpotList(3).shape[0], "Missing spot file")
+        finally:
+            shutil.rmtree(strTmpDir)
+
+
+    def testCancelBatches(self):
+        edPluginControlDozor = self.createPlugin()
+        eventStarted = threading.Event()
+        eventRelease = threading.Event()
+        def processBatch():
+            eventStarted.set()
+            eventRelease.wait(10.0)
+        edExecutorTaskRunning = EDExecutorTask(processBatch)
+        threadRunning = threading.Thread(target=edExecutorTaskRunning.runInline)
+        threadRunning.start()
+        eventStarted.wait(10.0)
+        edExecutorTaskQueued = EDExecutorTask(processBatch)
+        threading.Timer(0.2, eventRelease.set).start()
+        edPluginControlDozor.cancelBatches(collections.deque([edExecutorTaskRunning, edExecutorTaskQueued]))
+        EDAssert.equal(True, edExecutorTaskRunning.future.done(), "Running batch waited for")
+        EDAssert.equal(True, edExecutorTaskQueued.future.cancelled(), "Queued batch cancelled")
+        EDAssert.equal(False, edExecutorTaskQueued.runInline(), "Cancelled batch not run")
+        threadRunning.join()
+
+
     def process(self):
         self.addTestMethod(self.testCreateDict)
         self.addTestMethod(self.testCreateListOfBatches)
+        self.addTestMethod(self.testSpotStore)
+        self.addTestMethod(self.testCancelBatches)
 
 
@@ -161,7 +161,7 @@ class EDPluginControlImageQualityIndicatorsv1_2(EDPluginControl):
                                              edPluginPluginExecImageQualityIndicator.dataOutput.imageQualityIndicators.marshal())
             self.xsDataResultControlImageQualityIndicators.addImageQualityIndicators(xsDataImageQualityIndicators)
             xsDataISPyBImageQualityIndicators = \
-                XSDataISPyBImageQualityIndicators.parseString(xsDataImageQualityIndicators.marshal())
+                XSDataISPyBImageQualityIndicators.convertFrom(xsDataImageQualityIndicators)
             xsDataInputStoreListOfImageQualityIndicators.addImageQualityIndicators(xsDataISPyBImageQualityIndicators)
 #        print xsDataInputStoreListOfImageQualityIndicators.marshal()
         if self.bDoISPyBUpload:
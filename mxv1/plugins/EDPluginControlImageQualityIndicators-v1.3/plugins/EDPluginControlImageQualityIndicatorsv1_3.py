@@ -181,7 +181,7 @@ class EDPluginControlImageQualityIndicatorsv1_3(EDPluginControl):
                 xsDataImageQualityIndicators.background3D_estimate = edPluginControlBackground3D.dataOutput.imageBackground[0].estimate
             self.xsDataResultControlImageQualityIndicators.addImageQualityIndicators(xsDataImageQualityIndicators)
             xsDataISPyBImageQualityIndicators = \
-                XSDataISPyBImageQualityIndicators.parseString(xsDataImageQualityIndicators.marshal())
+                XSDataISPyBImageQualityIndicators.convertFrom(xsDataImageQualityIndicators)
             xsDataInputStoreListOfImageQualityIndicators.addImageQualityIndicators(xsDataISPyBImageQualityIndicators)
 #        print xsDataInputStoreListOfImageQualityIndicators.marshal()
         if self.dataInput.doUploadToIspyb is not None and self.dataInput.doUploadToIspyb.value:
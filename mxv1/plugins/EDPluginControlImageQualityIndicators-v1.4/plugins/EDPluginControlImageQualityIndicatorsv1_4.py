@@ -359,7 +359,7 @@ class EDPluginControlImageQualityIndicatorsv1_4(EDPluginControl):
                                                    edPluginControlDozor.dataOutput.inputDozor.marshal())
                 if self.dataInput.doUploadToIspyb is not None and self.dataInput.doUploadToIspyb.value:
                     xsDataISPyBImageQualityIndicators = \
-                        XSDataISPyBImageQualityIndicators.parseString(xsDataImageQualityIndicators.marshal())
+                        XSDataISPyBImageQualityIndicators.convertFrom(xsDataImageQualityIndicators)
                     xsDataInputStoreListOfImageQualityIndicators.addImageQualityIndicators(xsDataISPyBImageQualityIndicators)
     #        print xsDataInputStoreListOfImageQualityIndicators.marshal()
             if self.dataInput.doUploadToIspyb is not None and self.dataInput.doUploadToIspyb.value:
@@ -34,6 +34,7 @@ import base64
 from EDVerbose import EDVerbose
 from EDUtilsParallel import EDUtilsParallel
 from EDUtilsPath import EDUtilsPath
+from EDFileWatcher import EDFileWatcher
 
 from EDPluginControl import EDPluginControl
 from EDFactoryPluginStatic import EDFactoryPluginStatic
@@ -72,6 +73,9 @@ from XSDataISPyBv1_4 import XSDataInputStoreListOfImageQualityIndicators
 EDFactoryPluginStatic.loadModule("XSDataControlDozorv1_0")
 from XSDataControlDozorv1_0 import XSDataInputControlDozor
 
+EDFactoryPluginStatic.loadModule("EDHandlerDozorSpotStore")
+from EDHandlerDozorSpotStore import EDHandlerDozorSpotStore
+
 EDFactoryPluginStatic.loadModule("XSDataControlH5ToCBFv1_1")
 from XSDataControlH5ToCBFv1_1 import XSDataInputControlH5ToCBF
 
@@ -192,6 +196,7 @@ class EDPluginControlImageQualityIndicatorsv1_5(EDPluginControl):
         # Loop over batches
         for listOfImagesInBatch in listOfAllBatches:
             # First wait for images
+            listImagePathToWait = []
             for image in listOfImagesInBatch:
                 strPathToImage = image.path.value
                 # If Eiger, just wait for the h5 file
@@ -219,64 +224,49 @@ class EDPluginControlImageQualityIndicatorsv1_5(EDPluginControl):
                         self.error(strError)
                         self.addErrorMessage(strError)
                         self.setFailure()
-                else:
-                    if not os.path.exists(strPathToImage):
-                        # self.screen("Waiting for file {0}".format(strPathToImage))
-                        self.edPluginMXWaitFile = self.loadPlugin(self.strPluginMXWaitFileName)
-                        xsDataInputMXWaitFile.file = XSDataFile(XSDataString(strPathToImage))
-                        xsDataInputMXWaitFile.setSize(XSDataInteger(self.minImageSize))
-                        xsDataInputMXWaitFile.setTimeOut(XSDataTime(self.fMXWaitFileTimeOut))
-                        self.screen("Wait file timeOut set to %.0f s" % self.fMXWaitFileTimeOut)
-                        self.edPluginMXWaitFile.setDataInput(xsDataInputMXWaitFile)
-                        self.edPluginMXWaitFile.executeSynchronous()
-                    if not os.path.exists(strPathToImage):
-                        strError = "Time-out while waiting for image %s" % strPathToImage
+                elif not os.path.exists(strPathToImage):
+                    listImagePathToWait.append(strPathToImage)
+            if len(listImagePathToWait) > 0:
+                # All the missing images of the batch are watched at once
+                self.screen("Waiting for %d image(s), time out set to %.0f s" % (len(listImagePathToWait),
+                                                                                 self.fMXWaitFileTimeOut))
+                listExpectation = EDFileWatcher.waitFiles(listImagePathToWait, self.minImageSize,
+                                                          self.fMXWaitFileTimeOut)
+                for edExpectation in listExpectation:
+                    if not edExpectation.isComplete() and not os.path.exists(edExpectation.path):
+                        strError = "Time-out while waiting for image %s" % edExpectation.path
                         self.error(strError)
                         self.addErrorMessage(strError)
                         self.setFailure()
             if not self.isFailure():
                 strPathToFirstImage = listOfImagesInBatch[0].path.value
                 if strPathToImage.endswith(".h5"):
-                    indexLoop = 1
-                    continueLoop = True
-                    while continueLoop:
-                        directory = os.path.dirname(strPathToFirstImage)
-                        firstImage = EDUtilsImage.getImageNumber(listOfImagesInBatch[0].path.value)
-                        lastImage = EDUtilsImage.getImageNumber(listOfImagesInBatch[-1].path.value)
-                        xsDataInputH5ToCBF = XSDataInputH5ToCBF()
-                        xsDataInputH5ToCBF.hdf5File = XSDataFile(listOfImagesInBatch[0].path)
-                        xsDataInputH5ToCBF.hdf5ImageNumber = XSDataInteger(1)
-                        xsDataInputH5ToCBF.startImageNumber = XSDataInteger(firstImage)
-                        xsDataInputH5ToCBF.endImageNumber = XSDataInteger(lastImage)
-                        xsDataInputH5ToCBF.forcedOutputDirectory = XSDataFile(XSDataString(directory))
-                        edPluginH5ToCBF = self.loadPlugin("EDPluginH5ToCBFv1_1")
-                        edPluginH5ToCBF.dataInput = xsDataInputH5ToCBF
-                        edPluginH5ToCBF.execute()
-                        edPluginH5ToCBF.synchronize()
-                        outputCBFFileTemplate = edPluginH5ToCBF.dataOutput.outputCBFFileTemplate
-                        if outputCBFFileTemplate is not None:
-                            lastCbfFile = outputCBFFileTemplate.path.value.replace("######", "{0:06d}".format(EDUtilsImage.getImageNumber(listOfImagesInBatch[-1].path.value)))
-                            strPathToImage = os.path.join(directory, lastCbfFile)
-    #                        print(cbfFile.path.value)
-                            if os.path.exists(strPathToImage):
-                                # Rename all images
-                                for image in listOfImagesInBatch:
-                                    image.path.value = image.path.value.replace(".h5", ".cbf")
-                                    imageNumber = EDUtilsImage.getImageNumber(image.path.value)
-                                    oldPath = os.path.join(directory, outputCBFFileTemplate.path.value.replace("######", "{0:06d}".format(imageNumber)))
-                                    newPath = os.path.join(directory, outputCBFFileTemplate.path.value.replace("######", "{0:04d}".format(imageNumber)))
-                                    os.rename(oldPath, newPath)
-                                lastCbfFile = outputCBFFileTemplate.path.value.replace("######", "{0:04d}".format(EDUtilsImage.getImageNumber(listOfImagesInBatch[-1].path.value)))
-                                strPathToImage = os.path.join(directory, lastCbfFile)
-                                self.screen("Image has been converted to CBF file: {0}".format(strPathToImage))
-                                continueLoop = False
-    #                    print(continueLoop)
-                        if continueLoop:
-                            self.screen("Still waiting for converting to CBF file: {0}".format(strPathToImage))
-                            indexLoop += 1
-                            time.sleep(5)
-                            if indexLoop > 10:
-                                continueLoop = False
+                    # The converter writes the CBF files with their final names
+                    directory = os.path.dirname(strPathToFirstImage)
+                    firstImage = EDUtilsImage.getImageNumber(listOfImagesInBatch[0].path.value)
+                    lastImage = EDUtilsImage.getImageNumber(listOfImagesInBatch[-1].path.value)
+                    xsDataInputH5ToCBF = XSDataInputH5ToCBF()
+                    xsDataInputH5ToCBF.hdf5File = XSDataFile(listOfImagesInBatch[0].path)
+                    xsDataInputH5ToCBF.hdf5ImageNumber = XSDataInteger(1)
+                    xsDataInputH5ToCBF.startImageNumber = XSDataInteger(firstImage)
+                    xsDataInputH5ToCBF.endImageNumber = XSDataInteger(lastImage)
+                    xsDataInputH5ToCBF.forcedOutputImageNumber = XSDataInteger(firstImage)
+                    xsDataInputH5ToCBF.forcedOutputDirectory = XSDataFile(XSDataString(directory))
+                    edPluginH5ToCBF = self.loadPlugin("EDPluginH5ToCBFv1_1")
+                    edPluginH5ToCBF.dataInput = xsDataInputH5ToCBF
+                    edPluginH5ToCBF.executeSynchronous()
+                    outputCBFFileTemplate = edPluginH5ToCBF.dataOutput.outputCBFFileTemplate
+                    if edPluginH5ToCBF.isFailure() or outputCBFFileTemplate is None:
+                        strError = "Error when converting {0} to CBF".format(strPathToFirstImage)
+                        self.error(strError)
+                        self.addErrorMessage(strError)
+                        self.setFailure()
+                    else:
+                        for image in listOfImagesInBatch:
+                            imageNumber = EDUtilsImage.getImageNumber(image.path.value)
+                            image.path.value = outputCBFFileTemplate.path.value.replace("####", "{0:04d}".format(imageNumber))
+                        strPathToImage = listOfImagesInBatch[-1].path.value
+                        self.screen("Image has been converted to CBF file: {0}".format(strPathToImage))
 
                 for image in listOfImagesInBatch:
                     strPathToImage = image.path.value
@@ -308,10 +298,11 @@ class EDPluginControlImageQualityIndicatorsv1_5(EDPluginControl):
                 listPluginDozor.append((edPluginControlDozor, list(listOfImagesInBatch)))
 
         if not self.isFailure():
-            listIndexing = []
             # Synchronize all image quality indicator plugins and upload to ISPyB
-            xsDataInputStoreListOfImageQualityIndicators = XSDataInputStoreListOfImageQualityIndicators()
-
+            # Per-image result table: the image quality indicators are indexed by
+            # image path and image number, the scores are kept as columns
+            dictIndexPath = {}
+            dictIndexNumber = {}
             for (xsDataImage, edPluginPluginExecImageQualityIndicator) in listPluginDistl:
                 xsDataImageQualityIndicators = XSDataImageQualityIndicators()
                 xsDataImageQualityIndicators.image = xsDataImage.copy()
@@ -322,6 +313,18 @@ class EDPluginControlImageQualityIndicatorsv1_5(EDPluginControl):
                             xsDataImageQualityIndicators = XSDataImageQualityIndicators.parseString(\
                                     edPluginPluginExecImageQualityIndicator.dataOutput.imageQualityIndicators.marshal())
                 self.xsDataResultControlImageQualityIndicators.addImageQualityIndicators(xsDataImageQualityIndicators)
+                iIndex = len(self.xsDataResultControlImageQualityIndicators.imageQualityIndicators) - 1
+                dictIndexPath[xsDataImage.path.value] = iIndex
+                if xsDataImageQualityIndicators.image is not None:
+                    dictIndexPath.setdefault(xsDataImageQualityIndicators.image.path.value, iIndex)
+                if xsDataImage.number is not None:
+                    dictIndexNumber[xsDataImage.number.value] = iIndex
+            listImageQualityIndicators = self.xsDataResultControlImageQualityIndicators.imageQualityIndicators
+            arrayDozorScore = numpy.full(len(listImageQualityIndicators), numpy.nan)
+            arrayTotalIntegratedSignal = numpy.full(len(listImageQualityIndicators), numpy.nan)
+            for iIndex, xsDataImageQualityIndicators in enumerate(listImageQualityIndicators):
+                if xsDataImageQualityIndicators.totalIntegratedSignal is not None:
+                    arrayTotalIntegratedSignal[iIndex] = xsDataImageQualityIndicators.totalIntegratedSignal.value
 
             for (edPluginControlDozor, listBatch) in listPluginDozor:
                 edPluginControlDozor.synchronize()
@@ -340,50 +343,51 @@ class EDPluginControlImageQualityIndicatorsv1_5(EDPluginControl):
                     edPluginControlDozor.dataInput = xsDataInputControlDozor
                     edPluginControlDozor.executeSynchronous()
                 for imageDozor in edPluginControlDozor.dataOutput.imageDozor:
-                    for xsDataImageQualityIndicators in self.xsDataResultControlImageQualityIndicators.imageQualityIndicators:
-                        if xsDataImageQualityIndicators.image.path.value == imageDozor.image.path.value:
-                            xsDataImageQualityIndicators.dozor_score = imageDozor.mainScore
-                            xsDataImageQualityIndicators.dozorSpotFile = imageDozor.spotFile
-                            if imageDozor.spotFile is not None:
-                                if os.path.exists(imageDozor.spotFile.path.value):
-                                    numpyArray = numpy.loadtxt(imageDozor.spotFile.path.value, skiprows=3)
-                                    xsDataImageQualityIndicators.dozorSpotList = XSDataString(base64.b64encode(numpyArray.tostring()))
-                                    xsDataImageQualityIndicators.addDozorSpotListShape(XSDataInteger(numpyArray.shape[0]))
-                                    if len(numpyArray.shape) > 1:
-                                        xsDataImageQualityIndicators.addDozorSpotListShape(XSDataInteger(numpyArray.shape[1]))
-                            xsDataImageQualityIndicators.dozorSpotsIntAver = imageDozor.spotsIntAver
-                            xsDataImageQualityIndicators.dozorSpotsResolution = imageDozor.spotsResolution
-                            xsDataImageQualityIndicators.dozorVisibleResolution = imageDozor.visibleResolution
-                            if self.xsDataResultControlImageQualityIndicators.inputDozor is None:
-                                if edPluginControlDozor.dataOutput.inputDozor is not None:
-                                    self.xsDataResultControlImageQualityIndicators.inputDozor = XSDataDozorInput().parseString(
-                                                   edPluginControlDozor.dataOutput.inputDozor.marshal())
-                if self.dataInput.doUploadToIspyb is not None and self.dataInput.doUploadToIspyb.value:
+                    iIndex = dictIndexPath.get(imageDozor.image.path.value)
+                    if iIndex is None and imageDozor.number is not None:
+                        iIndex = dictIndexNumber.get(imageDozor.number.value)
+                    if iIndex is None:
+                        continue
+                    xsDataImageQualityIndicators = listImageQualityIndicators[iIndex]
+                    xsDataImageQualityIndicators.dozor_score = imageDozor.mainScore
+                    if imageDozor.mainScore is not None:
+                        arrayDozorScore[iIndex] = imageDozor.mainScore.value
+                    xsDataImageQualityIndicators.dozorSpotFile = imageDozor.spotFile
+                    if imageDozor.spotFile is not None:
+                        if os.path.exists(imageDozor.spotFile.path.value):
+                            numpyArray = EDHandlerDozorSpotStore.readSpotList(imageDozor.spotFile.path.value)
+                            if numpyArray is not None:
+                                xsDataImageQualityIndicators.dozorSpotList = XSDataString(base64.b64encode(numpyArray.tobytes()))
+                                for iDimension in EDHandlerDozorSpotStore.getLoadtxtShape(numpyArray.shape):
+                                    xsDataImageQualityIndicators.addDozorSpotListShape(XSDataInteger(iDimension))
+                    xsDataImageQualityIndicators.dozorSpotsIntAver = imageDozor.spotsIntAver
+                    xsDataImageQualityIndicators.dozorSpotsResolution = imageDozor.spotsResolution
+                    xsDataImageQualityIndicators.dozorVisibleResolution = imageDozor.visibleResolution
+                    if self.xsDataResultControlImageQualityIndicators.inputDozor is None:
+                        if edPluginControlDozor.dataOutput.inputDozor is not None:
+                            self.xsDataResultControlImageQualityIndicators.inputDozor = XSDataDozorInput().parseString(
+                                           edPluginControlDozor.dataOutput.inputDozor.marshal())
+            if self.dataInput.doUploadToIspyb is not None and self.dataInput.doUploadToIspyb.value:
+                # One entry per image
+                xsDataInputStoreListOfImageQualityIndicators = XSDataInputStoreListOfImageQualityIndicators()
+                for xsDataImageQualityIndicators in listImageQualityIndicators:
                     xsDataISPyBImageQualityIndicators = \
-                        XSDataISPyBImageQualityIndicators.parseString(xsDataImageQualityIndicators.marshal())
+                        XSDataISPyBImageQualityIndicators.convertFrom(xsDataImageQualityIndicators)
                     xsDataInputStoreListOfImageQualityIndicators.addImageQualityIndicators(xsDataISPyBImageQualityIndicators)
-    #        print xsDataInputStoreListOfImageQualityIndicators.marshal()
-            if self.dataInput.doUploadToIspyb is not None and self.dataInput.doUploadToIspyb.value:
                 self.edPluginISPyB = self.loadPlugin(self.strISPyBPluginName)
                 self.edPluginISPyB.dataInput = xsDataInputStoreListOfImageQualityIndicators
                 self.edPluginISPyB.execute()
             #
             if bDoIndexing:
-                # Find the 5 most intensive images (TIS):
-                listImage = []
-                # Check that we have dozor_score from all images:
-                has_dozor_score = True
-                for imageQualityIndicators in self.xsDataResultControlImageQualityIndicators.imageQualityIndicators:
-                    if imageQualityIndicators.dozor_score is None:
-                        has_dozor_score = False
-                if has_dozor_score:
-                    listSorted = sorted(self.xsDataResultControlImageQualityIndicators.imageQualityIndicators,
-                                        key=lambda imageQualityIndicators: imageQualityIndicators.dozor_score.value)
+                # Find the 5 most intensive images (TIS), using dozor_score if available for all images
+                if not numpy.isnan(arrayDozorScore).any():
+                    arrayScore = arrayDozorScore
                 else:
-                    listSorted = sorted(self.xsDataResultControlImageQualityIndicators.imageQualityIndicators,
-                                        key=lambda imageQualityIndicators: imageQualityIndicators.totalIntegratedSignal.value)
-                for xsDataResultControlImageQualityIndicator in listSorted[-5:]:
-                    if xsDataResultControlImageQualityIndicator.dozor_score.value > 1:
+                    arrayScore = arrayTotalIntegratedSignal
+                for iIndex in self.getIndicesOfHighestScores(arrayScore, 5):
+                    xsDataResultControlImageQualityIndicator = listImageQualityIndicators[iIndex]
+                    if xsDataResultControlImageQualityIndicator.dozor_score is not None and \
+                            xsDataResultControlImageQualityIndicator.dozor_score.value > 1:
                         xsDataInputReadImageHeader = XSDataInputReadImageHeader()
                         xsDataInputReadImageHeader.image = XSDataFile(xsDataResultControlImageQualityIndicator.image.path)
                         self.edPluginReadImageHeader = self.loadPlugin(self.strPluginReadImageHeaderName)
@@ -434,6 +438,17 @@ class EDPluginControlImageQualityIndicatorsv1_5(EDPluginControl):
             if edPluginPluginExecImageQualityIndicator is not None:
                 self.appendExecutiveSummary(edPluginPluginExecImageQualityIndicator, "Distl.signal_strength : ", _bAddSeparator=False)
 
+    @staticmethod
+    def getIndicesOfHighestScores(_arrayScore, _iNumber):
+        """
+        Returns the indices of the _iNumber highest (not NaN) scores, sorted by
+        increasing score. Runs in linear time in the number of images.
+        """
+        arrayIndex = numpy.flatnonzero(~numpy.isnan(_arrayScore))
+        if len(arrayIndex) > _iNumber:
+            arrayIndex = arrayIndex[numpy.argpartition(_arrayScore[arrayIndex], -_iNumber)[-_iNumber:]]
+        return arrayIndex[numpy.argsort(_arrayScore[arrayIndex], kind="stable")]
+
     def getH5FilePath(self, filePath, batchSize=1, isFastMesh=False):
         imageNumber = EDUtilsImage.getImageNumber(filePath)
         prefix = EDUtilsImage.getPrefix(filePath)
@@ -28,9 +28,6 @@ __status__ = "production"
 
 import time
 
-from xmlrpc.client import ServerProxy
-from xmlrpc.client import Transport
-
 """
 This control plugin will launch in parallel indexing with Labelit (edPluginIndexingLabelitv1_0) 
 and the EDPluginControlImageQualityIndicators.
@@ -54,19 +51,7 @@ from XSDataMXv1 import XSDataIndexingInput
 from XSDataMXv1 import XSDataString
 from XSDataMXv1 import XSDataInputControlImageQualityIndicators
 
-class TokenTransport(Transport):
-
-    def __init__(self, token, use_datetime=0):
-        Transport.__init__(self, use_datetime=use_datetime)
-        self.token = token
-
-    def send_content(self, connection, request_body):
-        connection.putheader("Content-Type", "text/xml")
-        connection.putheader("Content-Length", str(len(request_body)))
-        connection.putheader("Token", self.token)
-        connection.endheaders()
-        if request_body:
-            connection.send(request_body)
+from EDMXCuBENotifier import EDMXCuBENotifier
 
 class EDPluginControlIndexingIndicatorsv1_1(EDPluginControl):
     """
@@ -151,10 +136,6 @@ class EDPluginControlIndexingIndicatorsv1_1(EDPluginControl):
         self.edPluginControlIndicators.setDataInput(xsDataInputControlImageQualityIndicators)
         if self.strMxCuBE_URI is not None:
             self.DEBUG("Enabling sending messages to mxCuBE via URI {0}".format(self.strMxCuBE_URI))
-            if self.strToken is None:
-                self._oServerProxy = ServerProxy(self._strMxCuBE_URI)
-            else:
-                self._oServerProxy = ServerProxy(self._strMxCuBE_URI, transport=TokenTransport(self.strToken))
 
 
     def process(self, _edObject=None):
@@ -407,9 +388,6 @@ class EDPluginControlIndexingIndicatorsv1_1(EDPluginControl):
             self.screen(_strMessage)
         if self.strMxCuBE_URI is not None:
             self.DEBUG("Sending message to mxCuBE: {0}".format(_strMessage))
-            try:
-                for strMessage in _strMessage.split("\n"):
-                    if strMessage != "":
-                        self._oServerProxy.log_message("Characterisation: " + strMessage, level)
-            except:
-                self.DEBUG("Sending message to mxCuBE failed!")
+            for strMessage in _strMessage.split("\n"):
+                if strMessage != "":
+                    EDMXCuBENotifier.logMessage(self.strMxCuBE_URI, "Characterisation: " + strMessage, level, self.strToken)
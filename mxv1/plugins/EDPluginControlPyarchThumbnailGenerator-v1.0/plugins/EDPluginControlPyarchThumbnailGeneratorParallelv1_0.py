@@ -25,8 +25,26 @@ __license__ = "GPLv3+"
 __copyright__ = "Copyrigth (c) 2010 ESRF"
 
 import os
+import time
+import tempfile
+import concurrent.futures
 
 from EDPluginControl import EDPluginControl
+from EDFactoryPluginStatic import EDFactoryPluginStatic
+from EDExecutor import EDExecutor
+from EDFileWatcher import EDFileWatcher
+
+EDFactoryPluginStatic.loadModule("EDHandlerESRFPyarchv1_0")
+from EDHandlerESRFPyarchv1_0 import EDHandlerESRFPyarchv1_0
+
+EDFactoryPluginStatic.loadModule("EDHandlerMXThumbnail")
+from EDHandlerMXThumbnail import EDHandlerMXThumbnail
+
+EDFactoryPluginStatic.loadModule("EDPluginControlPyarchThumbnailGeneratorv1_0")
+from EDPluginControlPyarchThumbnailGeneratorv1_0 import EDPluginControlPyarchThumbnailGeneratorv1_0
+
+from XSDataCommon import XSDataFile
+from XSDataCommon import XSDataString
 
 from XSDataPyarchThumbnailGeneratorv1_0 import XSDataInputPyarchThumbnailGenerator
 from XSDataPyarchThumbnailGeneratorv1_0 import XSDataInputPyarchThumbnailGeneratorParallel
@@ -36,9 +54,24 @@ from XSDataPyarchThumbnailGeneratorv1_0 import XSDataResultPyarchThumbnailGenera
 
 class EDPluginControlPyarchThumbnailGeneratorParallelv1_0(EDPluginControl):
     """
-    This control plugin runs the EDPluginControlPyarchThumbnailGeneratorv1_0 in parallel for many images
+    This control plugin creates the 1024x1024 and 256x256 thumbnails of many images.
+
+    With the default "process" backend the thumbnails of an image are made in the
+    EDExecutor process pool, with at most "maxWorkers" images in progress
+    (default: the size of the process pool). The images are submitted as soon as
+    they are on disk, in order of priority: first the first and the last image of
+    the data set, which are the ones displayed first, then the others in order of
+    collection.
+
+    The "plugin" backend runs the EDPluginControlPyarchThumbnailGeneratorv1_0 in
+    parallel for all images, it is used for HDF5 images.
     """
 
+    BACKEND_PROCESS = "process"
+    BACKEND_PLUGIN = "plugin"
+    DEFAULT_TIME_OUT = 120 # s, as EDPluginMXWaitFilev1_1
+    POLL_INTERVAL = 0.5 # s
+
 
     def __init__(self):
         EDPluginControl.__init__(self)
@@ -46,7 +79,12 @@ class EDPluginControlPyarchThumbnailGeneratorParallelv1_0(EDPluginControl):
         self.strControlThumbnailPluginName = "EDPluginControlPyarchThumbnailGeneratorv1_0"
         self.xsDataResult = XSDataResultPyarchThumbnailGeneratorParallel()
         self.setDataOutput(self.xsDataResult)
-
+        self.strBackend = self.BACKEND_PROCESS
+        self.iMaxWorkers = None
+        self.minImageSize = 1000000
+        self.strSuffix = "jpeg"
+        self.dictOutputDirectory = {}
+        self.dictFuture = {}
 
 
 
@@ -59,6 +97,14 @@ class EDPluginControlPyarchThumbnailGeneratorParallelv1_0(EDPluginControl):
         self.checkMandatoryParameters(self.getDataInput().getDiffractionImage(), "No diffraction image file path")
 
 
+    def configure(self):
+        EDPluginControl.configure(self)
+        self.strBackend = str(self.config.get("backend", self.strBackend)).lower()
+        iMaxWorkers = self.config.get("maxWorkers")
+        if iMaxWorkers is not None:
+            self.iMaxWorkers = max(1, int(iMaxWorkers))
+        self.minImageSize = int(self.config.get("minImageSize", self.minImageSize))
+
 
     def preProcess(self, _edObject=None):
         EDPluginControl.preProcess(self)
@@ -69,12 +115,24 @@ class EDPluginControlPyarchThumbnailGeneratorParallelv1_0(EDPluginControl):
         if not strImageFileNameExtension in [".img", ".marccd", ".mccd", ".cbf", ".h5"]:
             self.error("Unknown image file name extension for pyarch thumbnail generator: %s" % strPathToDiffractionImage)
             self.setFailure()
+        elif strImageFileNameExtension == ".h5":
+            # The data files of the HDF5 images are found and converted by the single image plugin
+            self.strBackend = self.BACKEND_PLUGIN
+        if self.dataInput.format is not None:
+            self.strSuffix = self.dataInput.format.value.lower()
 
 
 
     def process(self, _edObject=None):
         EDPluginControl.process(self)
         self.DEBUG("EDPluginControlPyarchThumbnailGeneratorParallelv1_0.process")
+        if self.strBackend == self.BACKEND_PROCESS:
+            self.processInProcessPool()
+        else:
+            self.processWithPlugins()
+
+
+    def processWithPlugins(self):
         listPlugins = []
         for xsDataFile in self.dataInput.diffractionImage:
             edPluginControlThumbnail = self.loadPlugin(self.strControlThumbnailPluginName)
@@ -92,4 +150,125 @@ class EDPluginControlPyarchThumbnailGeneratorParallelv1_0(EDPluginControl):
             self.dataOutput.addPathToThumbImage(edPlugin.dataOutput.pathToThumbImage)
 
 
+    def processInProcessPool(self):
+        listImagePath = [xsDataFile.path.value for xsDataFile in self.dataInput.diffractionImage]
+        fTimeOut = self.DEFAULT_TIME_OUT
+        if self.dataInput.waitForFileTimeOut is not None:
+            fTimeOut = self.dataInput.waitForFileTimeOut.value
+        iMaxWorkers = self.iMaxWorkers or EDExecutor.getMaxProcesses()
+        self.DEBUG("Thumbnails of %d images, at most %d in progress" % (len(listImagePath), iMaxWorkers))
+        listPending = []
+        for iIndex in self.getPriorityOrder(len(listImagePath)):
+            strImagePath = listImagePath[iIndex]
+            iMinImageSize = EDPluginControlPyarchThumbnailGeneratorv1_0.getMinImageSize(strImagePath, self.minImageSize)
+            listPending.append((iIndex, EDFileWatcher.expect(strImagePath, iMinImageSize)))
+        listOutput = [None] * len(listImagePath)
+        fTimeStart = time.time()
+        while listPending or self.dictFuture:
+            # Submit the images which are on disk, in order of priority
+            for (iIndex, edExpectation) in list(listPending):
+                if len(self.dictFuture) >= iMaxWorkers:
+                    break
+                if edExpectation.isComplete():
+                    listPending.remove((iIndex, edExpectation))
+                    self.submitThumbnails(iIndex, listImagePath[iIndex], listOutput)
+            if listPending and time.time() - fTimeStart > fTimeOut:
+                # The images on disk waiting for a worker are kept
+                for (iIndex, edExpectation) in list(listPending):
+                    if not edExpectation.isComplete():
+                        listPending.remove((iIndex, edExpectation))
+                        EDFileWatcher.cancel(edExpectation)
+                        self.error("Time-out while waiting for image %s" % listImagePath[iIndex])
+                        self.setFailure()
+            if self.dictFuture:
+                fWait = None
+                if listPending:
+                    fWait = self.POLL_INTERVAL
+                listDone = concurrent.futures.wait(list(self.dictFuture), timeout=fWait,
+                                                   return_when=concurrent.futures.FIRST_COMPLETED)[0]
+                for future in listDone:
+                    iIndex = self.dictFuture.pop(future)
+                    try:
+                        future.result()
+                    except Exception as exception:
+                        self.error("Cannot create thumbnails of %s: %s" % (listImagePath[iIndex], exception))
+                        self.setFailure()
+                        listOutput[iIndex] = None
+            elif listPending:
+                listPending[0][1].wait(self.POLL_INTERVAL)
+        for tupleOutput in listOutput:
+            if tupleOutput is not None:
+                self.dataOutput.addPathToJPEGImage(XSDataFile(XSDataString(tupleOutput[0])))
+                self.dataOutput.addPathToThumbImage(XSDataFile(XSDataString(tupleOutput[1])))
 
+
+    def submitThumbnails(self, _iIndex, _strImagePath, _listOutput):
+        """
+        Submits the creation of the thumbnails of an image to the process pool
+        """
+        strOutputDirectory = self.getOutputDirectory(os.path.dirname(_strImagePath))
+        if strOutputDirectory is None:
+            return
+        strOutputPathWithoutExtension = os.path.join(strOutputDirectory,
+                                                     os.path.basename(os.path.splitext(_strImagePath)[0]))
+        strOutputPath = strOutputPathWithoutExtension + "." + self.strSuffix
+        strOutputPathThumb = strOutputPathWithoutExtension + ".thumb." + self.strSuffix
+        listThumbnail = [(1024, 1024, strOutputPath, self.strSuffix),
+                         (256, 256, strOutputPathThumb, self.strSuffix)]
+        self.DEBUG("Submitting thumbnails of %s" % _strImagePath)
+        future = EDExecutor.submitProcess(EDHandlerMXThumbnail.createThumbnails, _strImagePath, listThumbnail)
+        self.dictFuture[future] = _iIndex
+        _listOutput[_iIndex] = (strOutputPath, strOutputPathThumb)
+
+
+    @staticmethod
+    def getPriorityOrder(_iNumberOfImages):
+        """
+        Returns the indices of the images in order of priority: the first and the
+        last image, then the others in order of collection
+        """
+        listIndex = list(range(_iNumberOfImages))
+        if _iNumberOfImages > 2:
+            listIndex = [0, _iNumberOfImages - 1] + listIndex[1:-1]
+        return listIndex
+
+
+    def getOutputDirectory(self, _strImageDirname):
+        """
+        Returns the forced output directory if given, otherwise the pyarch directory
+        of the images (or a temporary directory if it's not writable).
+        Returns None if the forced output directory is not writable.
+        """
+        if _strImageDirname in self.dictOutputDirectory:
+            return self.dictOutputDirectory[_strImageDirname]
+        strOutputDirname = None
+        if self.dataInput.forcedOutputDirectory is not None:
+            strForcedOutputDirectory = self.dataInput.forcedOutputDirectory.path.value
+            if not os.access(strForcedOutputDirectory, os.W_OK):
+                self.error("Cannot write to forced output directory : %s" % strForcedOutputDirectory)
+                self.setFailure()
+            else:
+                strOutputDirname = strForcedOutputDirectory
+        else:
+            # Try to store in the ESRF pyarch directory
+            strOutputDirname = EDHandlerESRFPyarchv1_0.createPyarchFilePath(_strImageDirname)
+            bIsOk = False
+            if strOutputDirname:
+                if not os.path.exists(strOutputDirname):
+                    try:
+                        os.makedirs(strOutputDirname)
+                        bIsOk = True
+                    except Exception:
+                        self.WARNING("Couldn't create the directory %s" % strOutputDirname)
+                elif os.access(strOutputDirname, os.W_OK):
+                    bIsOk = True
+            if not bIsOk:
+                self.warning("Cannot write to pyarch directory: %s" % strOutputDirname)
+                strTmpUser = os.path.join("/tmp", os.environ["USER"])
+                if not os.path.exists(strTmpUser):
+                    os.mkdir(strTmpUser, 0o755)
+                strOutputDirname = tempfile.mkdtemp(prefix="EDPluginPyarchThumbnailv10_", dir=strTmpUser)
+                os.chmod(strOutputDirname, 0o755)
+                self.warning("Writing thumbnail images to: %s" % strOutputDirname)
+        self.dictOutputDirectory[_strImageDirname] = strOutputDirname
+        return strOutputDirname
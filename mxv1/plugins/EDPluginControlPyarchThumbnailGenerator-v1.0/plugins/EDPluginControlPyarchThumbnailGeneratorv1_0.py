@@ -28,13 +28,13 @@ __copyright__ = "Copyrigth (c) 2010 ESRF"
 import os
 import time
 import tempfile
-from PIL import Image
 
 from EDVerbose import EDVerbose
 from EDPluginControl import EDPluginControl
 from EDFactoryPluginStatic import EDFactoryPluginStatic
 from EDUtilsPath import EDUtilsPath
 from EDUtilsImage import EDUtilsImage
+from EDFrameProviderHDF5 import EDFrameProviderHDF5
 
 EDFactoryPluginStatic.loadModule("EDHandlerESRFPyarchv1_0")
 
@@ -76,6 +76,7 @@ class EDPluginControlPyarchThumbnailGeneratorv1_0(EDPluginControl):
         self.edPluginMXWaitFile = None
         self.strOutputPath = None
         self.strOutputPathWithoutExtension = None
+        self.strOutputPathThumb = None
         self.xsDataFilePathToThumbnail = None
         self.xsDataFilePathToThumbnail2 = None
         self.minImageSize = 1000000
@@ -102,6 +103,25 @@ class EDPluginControlPyarchThumbnailGeneratorv1_0(EDPluginControl):
         self.minImageSize = self.config.get("minImageSize", self.minImageSize)
 
 
+    @staticmethod
+    def getMinImageSize(_strPathToDiffractionImage, _iDefault=None):
+        """
+        Returns the size of a complete image file of the detector of a beamline,
+        _iDefault if not known. Quite ugly hack to avoid lag problems at the ESRF.
+        """
+        iMinImageSize = _iDefault
+        if EDUtilsPath.isESRF() or EDUtilsPath.isALBA() or EDUtilsPath.isMAXIV():
+            if any(beamline in _strPathToDiffractionImage for beamline in ["id30b"]):
+                # Pilatus 6M
+                iMinImageSize = 6000000
+            elif any(beamline in _strPathToDiffractionImage for beamline in ["id23eh2", "id30a1"]):
+                # Pilatus3 2M
+                iMinImageSize = 2000000
+        elif EDUtilsPath.isEMBL():
+            iMinImageSize = 10000
+        return iMinImageSize
+
+
     def preProcess(self, _edObject=None):
         EDPluginControl.preProcess(self)
         self.DEBUG("EDPluginControlPyarchThumbnailGeneratorv1_0.preProcess")
@@ -115,20 +135,14 @@ class EDPluginControlPyarchThumbnailGeneratorv1_0(EDPluginControl):
             # Load the MXWaitFile plugin
             xsDataInputMXWaitFile = XSDataInputMXWaitFile()
             pathToImageFile = strPathToDiffractionImage
-            # Quite ugly hack to avoid lag problems at the ESRF:
-            if EDUtilsPath.isESRF() or EDUtilsPath.isALBA() or EDUtilsPath.isMAXIV():
-                if any(beamline in strPathToDiffractionImage for beamline in ["id30b"]):
-                    # Pilatus 6M
-                    self.minImageSize = 6000000
-                elif any(beamline in strPathToDiffractionImage for beamline in ["id23eh2", "id30a1"]):
-                    # Pilatus3 2M
-                    self.minImageSize = 2000000
-                elif strImageFileNameExtension == ".h5":
-                    self.h5MasterFilePath, self.h5DataFilePath, self.h5FileNumber = self.getH5FilePath(pathToImageFile)
-                    pathToImageFile = self.h5DataFilePath
-                    self.isH5 = True
-            elif EDUtilsPath.isEMBL():
-                    self.minImageSize = 10000
+            iMinImageSize = self.getMinImageSize(strPathToDiffractionImage)
+            if iMinImageSize is not None:
+                self.minImageSize = iMinImageSize
+            elif strImageFileNameExtension == ".h5" and \
+                    (EDUtilsPath.isESRF() or EDUtilsPath.isALBA() or EDUtilsPath.isMAXIV()):
+                self.h5MasterFilePath, self.h5DataFilePath, self.h5FileNumber = self.getH5FilePath(pathToImageFile)
+                pathToImageFile = self.h5DataFilePath
+                self.isH5 = True
             xsDataInputMXWaitFile.setSize(XSDataInteger(self.minImageSize))
             xsDataInputMXWaitFile.setFile(XSDataFile(XSDataString(pathToImageFile)))
             if self.getDataInput().getWaitForFileTimeOut():
@@ -182,6 +196,9 @@ class EDPluginControlPyarchThumbnailGeneratorv1_0(EDPluginControl):
             self.strOutputPath = os.path.join(self.strOutputPathWithoutExtension + "." + self.strSuffix)
             xsDataInputMXThumbnail.setOutputPath(XSDataFile(XSDataString(self.strOutputPath)))
             self.edPluginExecThumbnail.setDataInput(xsDataInputMXThumbnail)
+            # The small thumbnail is made from the same decoded frame
+            self.strOutputPathThumb = self.strOutputPathWithoutExtension + ".thumb." + self.strSuffix
+            self.edPluginExecThumbnail.addThumbnail(256, 256, self.strOutputPathThumb, self.strSuffix)
 
 
     def process(self, _edObject=None):
@@ -214,7 +231,8 @@ class EDPluginControlPyarchThumbnailGeneratorv1_0(EDPluginControl):
             # Workaround for ESRF lag problem
             if EDUtilsPath.isESRF():
                 time.sleep(2)
-                if self.isH5:
+                if self.isH5 and not EDFrameProviderHDF5.isAvailable():
+                    # The thumbnail plugin reads HDF5 frames directly if h5py is available
                     diffractionImagePath = self.dataInput.diffractionImage.path.value
                     imageNumber = EDUtilsImage.getImageNumber(diffractionImagePath)
                     xsDataInputControlH5ToCBF = XSDataInputControlH5ToCBF()
@@ -249,14 +267,7 @@ class EDPluginControlPyarchThumbnailGeneratorv1_0(EDPluginControl):
         self.DEBUG("EDPluginControlPyarchThumbnailGeneratorv1_0.doSuccessExecThumbnail")
         self.retrieveSuccessMessages(_edPlugin, "EDPluginControlPyarchThumbnailGeneratorv1_0.doSuccessExecThumbnail")
         self.xsDataFilePathToThumbnail = self.edPluginExecThumbnail.dataOutput.thumbnail
-        # Retrieve the output path
-        pathToThumbnail = self.xsDataFilePathToThumbnail.path.value
-        outfile = os.path.splitext(pathToThumbnail)[0] + ".thumb." + self.strSuffix
-        size = [256, 256]
-        im = Image.open(pathToThumbnail)
-        im.thumbnail(size, Image.LANCZOS)
-        im.save(outfile, self.strImageFormat)
-        self.xsDataFilePathToThumbnail2 = XSDataFile(XSDataString(outfile))
+        self.xsDataFilePathToThumbnail2 = XSDataFile(XSDataString(self.strOutputPathThumb))
 
 
     def doFailureExecThumbnail(self, _edPlugin=None):
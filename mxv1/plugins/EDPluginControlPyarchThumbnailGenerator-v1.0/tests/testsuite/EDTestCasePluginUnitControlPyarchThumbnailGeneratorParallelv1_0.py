@@ -0,0 +1,120 @@
+#
+#    Project: MXv1
+#             http://www.edna-site.org
+#
+#    Copyright (C) ESRF
+#
+#    Principal author:        Olof Svensson
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+__author__ = "Olof Svensson"
+__license__ = "GPLv3+"
+__copyright__ = "ESRF"
+
+import os
+import shutil
+import tempfile
+
+from EDAssert import EDAssert
+from EDTestCasePluginUnit import EDTestCasePluginUnit
+
+from EDFileWatcher import EDFileWatcher
+
+from XSDataCommon import XSDataFile
+from XSDataCommon import XSDataString
+from XSDataCommon import XSDataTime
+
+from XSDataPyarchThumbnailGeneratorv1_0 import XSDataInputPyarchThumbnailGeneratorParallel
+
+
+class EDTestCasePluginUnitControlPyarchThumbnailGeneratorParallelv1_0(EDTestCasePluginUnit):
+
+
+    def __init__(self, _edStringTestName=None):
+        EDTestCasePluginUnit.__init__(self, "EDPluginControlPyarchThumbnailGeneratorParallelv1_0")
+        self.strPathToReferenceInput = os.path.join(self.getPluginTestsDataHome(), \
+                                           "XSDataInputPyarchThumbnailGeneratorParallel_reference.xml")
+
+
+    def testCheckParameters(self):
+        strXMLInput = self.readAndParseFile(self.strPathToReferenceInput)
+        xsDataInput = XSDataInputPyarchThumbnailGeneratorParallel.parseString(strXMLInput)
+        edPlugin = self.createPlugin()
+        edPlugin.setDataInput(xsDataInput)
+        edPlugin.checkParameters()
+
+
+    def testGetPriorityOrder(self):
+        edPlugin = self.createPlugin()
+        EDAssert.equal([], edPlugin.getPriorityOrder(0), "No image")
+        EDAssert.equal([0, 1], edPlugin.getPriorityOrder(2), "Two images")
+        EDAssert.equal([0, 4, 1, 2, 3], edPlugin.getPriorityOrder(5), "First and last image first")
+
+
+    def testProcessInProcessPool(self):
+        import numpy
+        import fabio.cbfimage
+        strDirectory = tempfile.mkdtemp(prefix="EDTestCasePyarchThumbnailGeneratorParallel_")
+        try:
+            # Two images, a corrupted image and a missing image
+            listImagePath = [os.path.join(strDirectory, "image_%04d.cbf" % iImage) for iImage in range(1, 5)]
+            for strImagePath in [listImagePath[0], listImagePath[2]]:
+                numpyImage = numpy.random.RandomState(1).poisson(10, (300, 300)).astype(numpy.int32)
+                fabio.cbfimage.CbfImage(data=numpyImage).write(strImagePath)
+            with open(listImagePath[1], "w") as pyFile:
+                pyFile.write("Not an image\n" * 100)
+            xsDataInput = XSDataInputPyarchThumbnailGeneratorParallel()
+            for strImagePath in listImagePath:
+                xsDataInput.addDiffractionImage(XSDataFile(XSDataString(strImagePath)))
+            xsDataInput.forcedOutputDirectory = XSDataFile(XSDataString(strDirectory))
+            # Time-out already elapsed after the first image is submitted
+            xsDataInput.waitForFileTimeOut = XSDataTime(0.0)
+            edPlugin = self.createPlugin()
+            edPlugin.setDataInput(xsDataInput)
+            edPlugin.iMaxWorkers = 1
+            edPlugin.minImageSize = 0
+            listInProgress = []
+            submitThumbnails = edPlugin.submitThumbnails
+            def submitThumbnailsInProgress(_iIndex, _strImagePath, _listOutput):
+                listInProgress.append(len(edPlugin.dictFuture))
+                submitThumbnails(_iIndex, _strImagePath, _listOutput)
+            edPlugin.submitThumbnails = submitThumbnailsInProgress
+            edPlugin.processInProcessPool()
+            EDAssert.equal([0, 0, 0], listInProgress, "Images submitted one at a time")
+            listPathToJPEGImage = [xsDataFile.path.value for xsDataFile in edPlugin.dataOutput.pathToJPEGImage]
+            EDAssert.equal([os.path.join(strDirectory, "image_0001.jpeg"), os.path.join(strDirectory, "image_0003.jpeg")],
+                           listPathToJPEGImage, "Images on disk not timed out, corrupted image not in the output")
+            EDAssert.equal(2, len(edPlugin.dataOutput.pathToThumbImage), "Two pathToThumbImage")
+            for strPath in listPathToJPEGImage:
+                EDAssert.equal(True, os.path.exists(strPath), "Thumbnail created: %s" % strPath)
+            EDAssert.equal(True, edPlugin.isFailure(), "Failure for the corrupted and the missing image")
+            EDAssert.equal(False, os.path.abspath(strDirectory) in EDFileWatcher._dictPending, "Missing image no longer expected")
+        finally:
+            shutil.rmtree(strDirectory)
+
+
+
+    def process(self):
+        self.addTestMethod(self.testCheckParameters)
+        self.addTestMethod(self.testGetPriorityOrder)
+        self.addTestMethod(self.testProcessInProcessPool)
+
+
+
+if __name__ == '__main__':
+
+    edTestCasePluginUnitControlPyarchThumbnailGeneratorParallelv1_0 = EDTestCasePluginUnitControlPyarchThumbnailGeneratorParallelv1_0("EDTestCasePluginUnitControlPyarchThumbnailGeneratorParallelv1_0")
+    edTestCasePluginUnitControlPyarchThumbnailGeneratorParallelv1_0.execute()
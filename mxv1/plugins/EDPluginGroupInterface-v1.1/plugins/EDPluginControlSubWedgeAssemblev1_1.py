@@ -33,6 +33,7 @@ __copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
 
 from EDVerbose       import EDVerbose
 from EDPluginControl import EDPluginControl
+from EDHandlerReadImageHeaderv10 import EDHandlerReadImageHeaderv10
 
 from XSDataCommon import XSDataFile
 from XSDataCommon import XSDataInteger
@@ -114,31 +115,31 @@ class EDPluginControlSubWedgeAssemblev1_1(EDPluginControl):
         listXSDataFile = xsDataInputSubWedgeAssemble.getFile()
         if (len(listXSDataFile) > 0):
             listSubWedge = []
-            iIndex = 1
-            for xsDataFile in listXSDataFile:
-                xsDataFileCopy = XSDataFile.parseString(xsDataFile.marshal())
-                xsDataInputReadImageHeader = XSDataInputReadImageHeader()
-                xsDataInputReadImageHeader.setImage(xsDataFileCopy)
-                self.__edPluginReadImageHeader = self.loadPlugin(self.__strPluginReadImageHeaderName, "ReadImageHeader_%d" % (iIndex))
-                self.__edPluginReadImageHeader.setDataInput(xsDataInputReadImageHeader)
-                self.__edPluginReadImageHeader.executeSynchronous()
-                xsDataResultReadImageHeader = self.__edPluginReadImageHeader.getDataOutput()
-                bSuccess = False
-                if (xsDataResultReadImageHeader is not None):
-                    xsDataSubWedge = xsDataResultReadImageHeader.getSubWedge()
-                    if (xsDataSubWedge is not None):
-                        xsDataSubWedge.setSubWedgeNumber(XSDataInteger(iIndex))
-                        listSubWedge.append(xsDataSubWedge)
-                        bSuccess = True
-                if (not bSuccess):
+            # All headers are read at once, for a sweep only the first image is read by a read image header plugin
+            listPath = [xsDataFile.getPath().getValue() for xsDataFile in listXSDataFile]
+            try:
+                edSweepImageHeader = EDHandlerReadImageHeaderv10.readSweep(self, listPath)
+            except RuntimeError as error:
+                strErrorMessage = "EDPluginControlSubWedgeAssemblev1_1.createDataCollectionFromImageHeaders: %s" % error
+                self.error(strErrorMessage)
+                self.addErrorMessage(strErrorMessage)
+                self.setFailure()
+                return
+            for iIndex, strPath in enumerate(listPath):
+                xsDataSubWedge = None
+                if edSweepImageHeader is not None:
+                    xsDataSubWedge = edSweepImageHeader.getSubWedge(iIndex)
+                if (xsDataSubWedge is not None):
+                    xsDataSubWedge.setSubWedgeNumber(XSDataInteger(iIndex + 1))
+                    listSubWedge.append(xsDataSubWedge)
+                else:
                     # Fix for bug #223: raise an error if an image could not be read
                     strErrorMessage = "EDPluginControlSubWedgeAssemblev1_1.createDataCollectionFromImageHeaders: %s %s" % (
                                         self.__strPluginReadImageHeaderName, \
-                                        "Could not read header from image %s" % xsDataFileCopy.getPath().getValue())
+                                        "Could not read header from image %s" % strPath)
                     self.error(strErrorMessage)
                     self.addErrorMessage(strErrorMessage)
                     self.setFailure()
-                iIndex += 1
             if (not self.isFailure()):
                 xsDataInputSubWedgeMerge = XSDataInputSubWedgeMerge()
                 for xsDataSubWedge in listSubWedge:
@@ -29,13 +29,12 @@ __contact__ = "svensson@esrf.fr"
 __license__ = "GPLv3+"
 __copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
 
-import sys
-import struct
-
 from EDUtilsFile     import EDUtilsFile
 from EDPluginControl import EDPluginControl
 from EDFactoryPluginStatic import EDFactoryPluginStatic
 from EDConfiguration import EDConfiguration
+from EDHandlerReadImageHeaderv10 import EDHandlerReadImageHeaderv10
+from EDFrameProviderHDF5 import EDFrameProviderHDF5
 
 from XSDataCommon import XSDataFile
 from XSDataCommon import XSDataInteger
@@ -58,6 +57,7 @@ class EDPluginControlReadImageHeaderv10(EDPluginControl):
         self.strReadImageHeaderPluginName = None
         self.xsDataResultReadImageHeader = None
         self.strFileImagePath = None
+        self.edPluginExecMXWaitFile = None
         # Default time out for wait file
         self.fMXWaitFileTimeOut = 30  # s
         # Map between image suffix and image type
@@ -135,11 +135,22 @@ class EDPluginControlReadImageHeaderv10(EDPluginControl):
         xsDataInputReadImageHeader = self.getDataInput()
         xsDataFileImage = xsDataInputReadImageHeader.getImage()
         self.strFileImagePath = xsDataFileImage.getPath().getValue()
+        # Check if the header has already been read
+        self.xsDataResultReadImageHeader = EDHandlerReadImageHeaderv10.getCachedResult(self.strFileImagePath)
+        if self.xsDataResultReadImageHeader is not None:
+            self.DEBUG("Using cached header for image %s" % self.strFileImagePath)
+            return
         # Plugin for waiting for files
         self.edPluginExecMXWaitFile = self.loadPlugin(self.strPluginExecMXWaitFile)
         xsDataInputMXWaitFile = XSDataInputMXWaitFile()
-        xsDataInputMXWaitFile.setFile(XSDataFile(XSDataString(self.strFileImagePath)))
-        xsDataInputMXWaitFile.setSize(XSDataInteger(100000))
+        if self.isHDF5(self.strFileImagePath):
+            # Eiger HDF5 image: the header is read from the master file
+            strMasterFile = EDFrameProviderHDF5.getFrameReference(self.strFileImagePath)[0]
+            xsDataInputMXWaitFile.setFile(XSDataFile(XSDataString(strMasterFile)))
+            xsDataInputMXWaitFile.setSize(XSDataInteger(0))
+        else:
+            xsDataInputMXWaitFile.setFile(XSDataFile(XSDataString(self.strFileImagePath)))
+            xsDataInputMXWaitFile.setSize(XSDataInteger(100000))
         xsDataInputMXWaitFile.setTimeOut(XSDataTime(self.fMXWaitFileTimeOut))
         self.edPluginExecMXWaitFile.setDataInput(xsDataInputMXWaitFile)
 
@@ -147,7 +158,7 @@ class EDPluginControlReadImageHeaderv10(EDPluginControl):
     def process(self, _edObject=None):
         EDPluginControl.process(self)
         self.DEBUG("EDPluginControlReadImageHeaderv10.process")
-        if self.edPluginExecMXWaitFile is not None:
+        if self.xsDataResultReadImageHeader is None and self.edPluginExecMXWaitFile is not None:
             self.edPluginExecMXWaitFile.connectSUCCESS(self.doSuccessMXWaitFile)
             self.edPluginExecMXWaitFile.connectFAILURE(self.doFailureMXWaitFile)
             self.executePluginSynchronous(self.edPluginExecMXWaitFile)
@@ -170,6 +181,9 @@ class EDPluginControlReadImageHeaderv10(EDPluginControl):
         # Check that we have some output
         if not self.edPluginExecMXWaitFile.dataOutput.timedOut.value:
             self.retrieveSuccessMessages(_edPlugin, "EDPluginControlReadImageHeaderv10.doSuccessMXWaitFile")
+            if self.isHDF5(self.strFileImagePath):
+                self.readHeaderHDF5(self.strFileImagePath)
+                return
             # Read image header plugin
             strImageType = self.determineImageType(self.strFileImagePath)
             if (strImageType is not None):
@@ -184,6 +198,23 @@ class EDPluginControlReadImageHeaderv10(EDPluginControl):
             self.doFailureMXWaitFile(_edPlugin)
 
 
+    def isHDF5(self, _strImagePath):
+        return EDFrameProviderHDF5.isHDF5(_strImagePath) and EDFrameProviderHDF5.isAvailable()
+
+
+    def readHeaderHDF5(self, _strImagePath):
+        """
+        Reads the header of an Eiger HDF5 image directly from the master file
+        """
+        try:
+            self.xsDataResultReadImageHeader = EDHandlerReadImageHeaderv10.readHeaderHDF5(_strImagePath)
+        except Exception as error:
+            strErrorMessage = "EDPluginControlReadImageHeaderv10.readHeaderHDF5: couldn't read header of %s: %s" % (_strImagePath, error)
+            self.error(strErrorMessage)
+            self.addErrorMessage(strErrorMessage)
+            self.setFailure()
+
+
     def doFailureMXWaitFile(self, _edPlugin):
         """
         The file has not appeared on the disk 
@@ -203,6 +234,7 @@ class EDPluginControlReadImageHeaderv10(EDPluginControl):
         self.DEBUG("EDPluginControlReadImageHeaderv10.doSuccessActionReadImageHeader")
         self.retrieveSuccessMessages(_edPlugin, "EDPluginControlReadImageHeaderv10.doSuccessActionReadImageHeader")
         self.xsDataResultReadImageHeader = _edPlugin.getDataOutput()
+        EDHandlerReadImageHeaderv10.setCachedResult(self.strFileImagePath, self.xsDataResultReadImageHeader)
 
 
     def doFailureActionReadImageHeader(self, _edPlugin):
@@ -214,262 +246,23 @@ class EDPluginControlReadImageHeaderv10(EDPluginControl):
         self.retrieveFailureMessages(_edPlugin, "EDPluginControlReadImageHeaderv10.doFailureActionReadImageHeader")
 
 
-    def isAdscImageFormat(self, _strImageFileName):
-        """
-        Detects ADSC image format and returns True after successful identification.
-        """
-        strKeyword = None
-        pyFile = None
-        bIsAdscFormat = False
-        try:
-            if sys.version.startswith('3'):
-                pyFile = open(_strImageFileName, "r", encoding="ISO-8859-1")
-            else:
-                pyFile = open(_strImageFileName, "r")
-        except:
-            self.warning("EDPluginControlReadImageHeaderv10.isAdscImageFormat: couldn't open file: " + _strImageFileName)
-
-        if pyFile != None:
-            self.DEBUG("EDPluginControlReadImageHeaderv10.isAdscImageFormat: detecting image format from file " + _strImageFileName)
-            pyFile.seek(0, 0)
-            strLine = pyFile.readline()
-            if strLine[0] == "{":
-                strLine = pyFile.readline()
-                listSplit = strLine.split("=")
-                strKeyword = listSplit[0]
-        if strKeyword == "HEADER_BYTES":
-            bIsAdscFormat = True
-            pyFile.close()
-        return bIsAdscFormat
-
-
-    def isMarccdImageFormat(self, _strFileName):
-        """
-        Detects MARCCD image format and returns True after successful identification.
-        """
-        strValue = None
-        strFormat = None
-        #
-        #  Created by Krister Larsson on 08/11/5.
-        #  Modified by Olof Svensson 20090401
-        #  Reduced to simple format checking by Michael Hellmig 20091008
-        #
-        strChar = 's'
-
-        pyListRow = [strChar, 'header_name', 16]
-
-        pyFile = None
-        try:
-        	pyFile = open(_strFileName, "rb")
-        except:
-        	self.warning("EDPluginControlReadImageHeaderv10.isMarccdImageFormat: couldn't open file: " + _strFileName)
-        if (pyFile is not None):
-            self.DEBUG("EDPluginControlReadImageHeaderv10.isMarccdImageFormat: detecting image format from file " + _strFileName)
-
-            # Move to marccd part of header
-            pyFile.seek(1028)
-
-            if len(pyListRow) == 3:
-                strFormat = str(pyListRow[2]) + str(pyListRow[0])
-            else:
-                strFormat = pyListRow[0]
-
-            iReadSize = struct.calcsize(strFormat)
-            pyRawData = pyFile.read(iReadSize)
-            pyFile.close()
-
-            strValue = struct.unpack(strFormat, pyRawData)
-            if len(strValue) == 1:
-                strValue = strValue[0]
-            strValue = strValue.decode('ISO-8859-1')
-            if pyListRow[0] == strChar:
-                strValue = strValue.strip('\x00')
-
-        # identify MARCCD format, implementation based on CCP4 DiffractionImage library
-        if ((strValue == 'MMX') or (strValue == 'MARCCD')):
-            return True
-        else:
-            return False
-
-
-    def isPilatus2MImageFormat(self, _strImageFileName):
-        """
-        Detects Pilatus 2M CBF image format and returns True after successful identification.
-        """
-        strKeyword = None
-        pyFile = None
-        bIsPilatus2MFormat = False
-        try:
-            if sys.version.startswith('3'):
-                pyFile = open(_strImageFileName, "r", encoding="ISO-8859-1")
-            else:
-                pyFile = open(_strImageFileName, "r")
-        except:
-            self.warning("EDPluginControlReadImageHeaderv10.isPilatus6MImageFormat: couldn't open file: " + _strImageFileName)
-
-        if pyFile != None:
-            self.DEBUG("EDPluginControlReadImageHeaderv10.isPilatus6MImageFormat: detecting image format from file " + _strImageFileName)
-            pyFile.seek(0, 0)
-            for iIndex in range(20):
-                strLine = pyFile.readline()
-                if strLine.find("Detector: PILATUS2 3M") != -1 or \
-                   strLine.find("Detector: PILATUS3 2M") != -1 or \
-                   strLine.find("Detector: PILATUS 2M") != -1 :
-                    bIsPilatus2MFormat = True
-            pyFile.close()
-        return bIsPilatus2MFormat
-
-    def isPilatus6MImageFormat(self, _strImageFileName):
-        """
-        Detects Pilatus 6M CBF image format and returns True after successful identification.
-        """
-        strKeyword = None
-        pyFile = None
-        bIsPilatus6MFormat = False
-        try:
-            if sys.version.startswith('3'):
-                pyFile = open(_strImageFileName, "r", encoding="ISO-8859-1")
-            else:
-                pyFile = open(_strImageFileName, "r")
-        except:
-            self.warning("EDPluginControlReadImageHeaderv10.isPilatus6MImageFormat: couldn't open file: " + _strImageFileName)
-
-        if pyFile != None:
-            self.DEBUG("EDPluginControlReadImageHeaderv10.isPilatus6MImageFormat: detecting image format from file " + _strImageFileName)
-            pyFile.seek(0, 0)
-            for iIndex in range(20):
-                strLine = pyFile.readline()
-                if strLine.find("Detector: PILATUS 6M") != -1 or strLine.find("Detector: PILATUS3 6M") != -1:
-                    bIsPilatus6MFormat = True
-            pyFile.close()
-        return bIsPilatus6MFormat
-
-
-    def isEiger4MImageFormat(self, _strImageFileName):
-        """
-        Detects Eiger 4M CBF image format and returns True after successful identification.
-        """
-        strKeyword = None
-        pyFile = None
-        bIsEiger4MFormat = False
-        try:
-            pyFile = open(_strImageFileName, "rb")
-        except:
-            self.warning("EDPluginControlReadImageHeaderv10.isEiger4MImageFormat: couldn't open file: " + _strImageFileName)
-
-        if pyFile != None:
-            self.DEBUG("EDPluginControlReadImageHeaderv10.isEiger4MImageFormat: detecting image format from file " + _strImageFileName)
-            pyFile.seek(0, 0)
-            for iIndex in range(10):
-                strLine = pyFile.readline().decode('utf-8')
-                if strLine.find("Detector: Dectris Eiger 4M") != -1:
-                    bIsEiger4MFormat = True
-            pyFile.close()
-        return bIsEiger4MFormat
-
-    def isEiger9MImageFormat(self, _strImageFileName):
-        """
-        Detects Eiger 9M CBF image format and returns True after successful identification.
-        """
-        strKeyword = None
-        pyFile = None
-        bIsEiger9MFormat = False
-        try:
-            pyFile = open(_strImageFileName, "rb")
-        except:
-            self.warning("EDPluginControlReadImageHeaderv10.isEiger9MImageFormat: couldn't open file: " + _strImageFileName)
-
-        if pyFile != None:
-            self.DEBUG("EDPluginControlReadImageHeaderv10.isEiger9MImageFormat: detecting image format from file " + _strImageFileName)
-            pyFile.seek(0, 0)
-            for iIndex in range(10):
-                strLine = pyFile.readline().decode('utf-8')
-                if strLine.find("Detector: Dectris Eiger 9M") != -1:
-                    bIsEiger9MFormat = True
-                elif strLine.find("Detector: Dectris EIGER2 Si 9M") != -1:
-                    bIsEiger9MFormat = True
-            pyFile.close()
-        return bIsEiger9MFormat
-
-    def isEiger16MImageFormat(self, _strImageFileName):
-        """
-        Detects Eiger 16M CBF image format and returns True after successful identification.
-        """
-        strKeyword = None
-        pyFile = None
-        bIsEiger16MFormat = False
-        try:
-            pyFile = open(_strImageFileName, "rb")
-        except:
-            self.warning("EDPluginControlReadImageHeaderv10.isEiger16MImageFormat: couldn't open file: " + _strImageFileName)
-
-        if pyFile != None:
-            self.DEBUG("EDPluginControlReadImageHeaderv10.isEiger16MImageFormat: detecting image format from file " + _strImageFileName)
-            pyFile.seek(0, 0)
-            for iIndex in range(20):
-                strLine = pyFile.readline().decode('utf-8')
-                if strLine.find("Detector: Dectris Eiger 16M") != -1:
-                    bIsEiger16MFormat = True
-            pyFile.close()
-        return bIsEiger16MFormat
-
-
-    def isEiger2_16MImageFormat(self, _strImageFileName):
-        """
-        Detects Eiger2 16M CBF image format and returns True after successful identification.
-        """
-        strKeyword = None
-        pyFile = None
-        bIsEiger2_16MFormat = False
-        try:
-            pyFile = open(_strImageFileName, "rb")
-        except:
-            self.warning("EDPluginControlReadImageHeaderv10.isEiger2_16MImageFormat: couldn't open file: " + _strImageFileName)
-
-        if pyFile != None:
-            self.DEBUG("EDPluginControlReadImageHeaderv10.isEiger2_16MImageFormat: detecting image format from file " + _strImageFileName)
-            pyFile.seek(0, 0)
-            for iIndex in range(20):
-                strLine = pyFile.readline().decode('utf-8')
-                if strLine.find("Detector: Dectris EIGER2 CdTe 16M)"):
-                    bIsEiger2_16MFormat = True
-            pyFile.close()
-        return bIsEiger2_16MFormat
-
-
     def determineImageType(self, _strImagePath):
         """
         This method determines the type of an image, i.e. ADSC, MAR CCD etc.
+        The header block of the image is read only once (see EDHandlerReadImageHeaderv10)
+        and the type is determined from the registered detector signatures.
         """
         strImageType = None
-        bUnknownImageType = False
         self.DEBUG("EDPluginControlReadImageHeaderv10.determineImageType")
-        # First look at the image extension, then try to distinguish between MARCCD and ADSC based on header information
+        # First look at the image extension, then find out the image type depending on the content of the image header
         strImageSuffix = EDUtilsFile.getFileExtension(_strImagePath)
         if strImageSuffix in self.dictSuffixToImageType.keys():
-            # find out image type depending on the content of the respective image header
-            if self.isMarccdImageFormat(_strImagePath):
-                strImageType = self.strMARCCD
-            elif self.isAdscImageFormat(_strImagePath):
-                strImageType = self.strADSC
-            elif self.isPilatus2MImageFormat(_strImagePath):
-                strImageType = self.strPilatus2M
-            elif self.isPilatus6MImageFormat(_strImagePath):
-                strImageType = self.strPilatus6M
-            elif self.isEiger4MImageFormat(_strImagePath):
-                strImageType = self.strEiger4M
-            elif self.isEiger9MImageFormat(_strImagePath):
-                strImageType = self.strEiger9M
-            elif self.isEiger16MImageFormat(_strImagePath):
-                strImageType = self.strEiger16M
-            elif self.isEiger2_16MImageFormat(_strImagePath):
-                strImageType = self.strEiger2_16M
-            else:
-                bUnknownImageType = True
-        else:
-            bUnknownImageType = True
+            try:
+                strImageType = EDHandlerReadImageHeaderv10.determineImageType(_strImagePath)
+            except Exception as error:
+                self.warning("EDPluginControlReadImageHeaderv10.determineImageType: couldn't read file %s: %s" % (_strImagePath, error))
 
-        if bUnknownImageType:
+        if strImageType is None:
             strErrorMessage = "EDPluginControlReadImageHeaderv10.determineImageType: Unknown image type for image %s " % _strImagePath
             self.error(strErrorMessage)
             self.addErrorMessage(strErrorMessage)
@@ -33,6 +33,7 @@ import sys
 from EDVerbose    import EDVerbose
 from EDPlugin     import EDPlugin
 from EDPluginExec import EDPluginExec
+from EDHandlerReadImageHeaderv10 import EDHandlerReadImageHeaderv10
 from EDUtilsImage import EDUtilsImage
 from EDMessage    import EDMessage
 
@@ -194,10 +195,7 @@ class EDPluginExecReadImageHeaderADSCv10(EDPluginExec):
         pyFile = None
         dictionary = None
         try:
-            if sys.version.startswith('3'):
-                pyFile = open(_strImageFileName, "r", encoding = "ISO-8859-1")
-            else:
-                pyFile = open(_strImageFileName, "r")
+            pyFile = EDHandlerReadImageHeaderv10.openHeader(_strImageFileName, "r")
         except:
             self.warning("**** EDPluginExecReadImageHeaderADSCv10.readHeaderADSC: couldn't open file: " + _strImageFileName)
 
@@ -35,6 +35,7 @@ from EDMessage      import EDMessage
 from EDUtilsImage   import EDUtilsImage
 
 from EDPluginExec import EDPluginExec
+from EDHandlerReadImageHeaderv10 import EDHandlerReadImageHeaderv10
 
 from XSDataCommon import XSDataWavelength
 from XSDataCommon import XSDataImage
@@ -164,7 +165,7 @@ class EDPluginExecReadImageHeaderEiger16Mv10(EDPluginExec):
         dictEiger4M = None
         pyFile = None
         try:
-            pyFile = open(_strImageFileName, "rb")
+            pyFile = EDHandlerReadImageHeaderv10.openHeader(_strImageFileName, "rb")
         except:
             self.ERROR("EDPluginExecReadImageHeaderEiger4Mv10.readHeaderEiger4M: couldn't open file: " + _strImageFileName)
             self.setFailure()
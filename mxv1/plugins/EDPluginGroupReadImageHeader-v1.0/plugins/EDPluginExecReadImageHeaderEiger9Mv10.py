@@ -35,6 +35,7 @@ from EDMessage      import EDMessage
 from EDUtilsImage   import EDUtilsImage
 
 from EDPluginExec import EDPluginExec
+from EDHandlerReadImageHeaderv10 import EDHandlerReadImageHeaderv10
 
 from XSDataCommon import XSDataWavelength
 from XSDataCommon import XSDataImage
@@ -162,7 +163,7 @@ class EDPluginExecReadImageHeaderEiger9Mv10(EDPluginExec):
         dictEiger9M = None
         pyFile = None
         try:
-            pyFile = open(_strImageFileName, "rb")
+            pyFile = EDHandlerReadImageHeaderv10.openHeader(_strImageFileName, "rb")
         except:
             self.ERROR("EDPluginExecReadImageHeaderEiger9Mv10.readHeaderEiger9M: couldn't open file: " + _strImageFileName)
             self.setFailure()
@@ -35,6 +35,7 @@ from EDMessage      import EDMessage
 from EDUtilsImage   import EDUtilsImage
 
 from EDPluginExec import EDPluginExec
+from EDHandlerReadImageHeaderv10 import EDHandlerReadImageHeaderv10
 
 from XSDataCommon import XSDataWavelength
 from XSDataCommon import XSDataImage
@@ -363,7 +364,7 @@ class EDPluginExecReadImageHeaderMARCCDv10(EDPluginExec):
         pyFile = None
         dictMarccd = None
         try:
-            pyFile = open(_strFileName, "rb")
+            pyFile = EDHandlerReadImageHeaderv10.openHeader(_strFileName, "rb")
         except:
             self.warning("EDPluginExecReadImageHeaderMARCCDv10.readHeaderMarccd: couldn't open file: " + _strFileName)
         if (pyFile is not None):
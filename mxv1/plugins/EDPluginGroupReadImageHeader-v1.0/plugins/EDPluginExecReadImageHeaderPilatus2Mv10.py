@@ -36,6 +36,7 @@ from EDMessage      import EDMessage
 from EDUtilsImage   import EDUtilsImage
 
 from EDPluginExec import EDPluginExec
+from EDHandlerReadImageHeaderv10 import EDHandlerReadImageHeaderv10
 
 from XSDataCommon import XSDataWavelength
 from XSDataCommon import XSDataImage
@@ -165,10 +166,7 @@ class EDPluginExecReadImageHeaderPilatus2Mv10(EDPluginExec):
         dictPilatus2M = None
         pyFile = None
         try:
-            if sys.version.startswith('3'):
-                pyFile = open(_strImageFileName, "r", encoding = "ISO-8859-1")
-            else:
-                pyFile = open(_strImageFileName, "r")
+            pyFile = EDHandlerReadImageHeaderv10.openHeader(_strImageFileName, "r")
         except:
             self.ERROR("EDPluginExecReadImageHeaderPilatus2Mv10.readHeaderPilauts6M: couldn't open file: " + _strImageFileName)
             self.setFailure()
@@ -37,6 +37,28 @@ from EDAssert                            import EDAssert
 from EDTestCasePluginUnit                import EDTestCasePluginUnit
 from EDUtilsPath                         import EDUtilsPath
 from EDUtilsFile                         import EDUtilsFile
+from EDHandlerReadImageHeaderv10         import EDHandlerReadImageHeaderv10
+from EDHandlerReadImageHeaderv10         import readVaryingHeaderCBF
+from EDHandlerReadImageHeaderv10         import isEiger2_16MImageFormat
+import EDHandlerReadImageHeaderv10 as EDHandlerReadImageHeaderv10Module
+
+STR_PILATUS_HEADER = """###CBF: VERSION 1.5\r
+data_%(name)s\r
+_array_data.header_convention "PILATUS_1.2"\r
+_array_data.header_contents\r
+;\r
+# Detector: %(detector)s, S/N 60-0100\r
+# 2011/Apr/20 12:00:%(second)02d.000\r
+# Pixel_size 172e-6 m x 172e-6 m\r
+# Exposure_time 0.1000000 s\r
+# Wavelength 0.9334 A\r
+# Detector_distance 0.30000 m\r
+# Beam_xy (1231.50, 1263.50) pixels\r
+# Start_angle %(angle).4f deg.\r
+# Angle_increment 0.1000 deg.\r
+;\r
+_array_data.data\r
+"""
 
 class EDTestCasePluginUnitPluginControlReadImageHeaderv10(EDTestCasePluginUnit):
 
@@ -100,11 +122,96 @@ class EDTestCasePluginUnitPluginControlReadImageHeaderv10(EDTestCasePluginUnit):
 
 
 
+    def testHeaderBlockCache(self):
+        strImage = tempfile.mktemp(suffix="_1_001.img", prefix="header_cache_")
+        EDUtilsFile.writeFile(strImage, "{\nHEADER_BYTES=  512;\nDIM=2;\n}\n")
+        pyBlock1 = EDHandlerReadImageHeaderv10.readHeaderBlock(strImage)
+        pyBlock2 = EDHandlerReadImageHeaderv10.readHeaderBlock(strImage)
+        EDAssert.equal(True, pyBlock1 is pyBlock2, "Header block read only once")
+        EDAssert.equal("ADSC", EDHandlerReadImageHeaderv10.determineImageType(strImage), "ADSC signature")
+        # A modified image is read again
+        EDUtilsFile.writeFile(strImage, "{\nHEADER_BYTES=  512;\nDIM=2;\nSIZE1=4096;\n}\n")
+        pyBlock3 = EDHandlerReadImageHeaderv10.readHeaderBlock(strImage)
+        EDAssert.equal(True, pyBlock3.find(b"SIZE1") != -1, "Modified image read again")
+        os.remove(strImage)
+
+
+    def testReadVaryingHeaderCBF(self):
+        pyBlock = b"###CBF: VERSION 1.5\r\n_array_data.header_contents\r\n;\r\n" + \
+                  b"# Detector: PILATUS 6M, S/N 60-0100\r\n# 2011/Apr/20 12:00:00.000\r\n" + \
+                  b"# Start_angle 12.5000 deg.\r\n# Angle_increment 0.1000 deg.\r\n;\r\n_array_data.data\r\n"
+        fRotationAxisStart, strDate = readVaryingHeaderCBF(pyBlock)
+        EDAssert.equal(12.5, fRotationAxisStart, "Start angle")
+        EDAssert.equal("2011/Apr/20 12:00:00.000", strDate.strip(), "Date")
+
+
+    def testIsSweep(self):
+        strDirectory = tempfile.mkdtemp(prefix="is_sweep_")
+        listPath = []
+        for strName in ["ref-sweep_1_0001.img", "ref-sweep_1_0002.img", "ref-sweep_2_0001.img"]:
+            strPath = os.path.join(strDirectory, strName)
+            EDUtilsFile.writeFile(strPath, "{\nHEADER_BYTES=  512;\nDIM=2;\n}\n")
+            listPath.append(strPath)
+        EDAssert.equal(True, EDHandlerReadImageHeaderv10.isSweep(listPath[0:2]), "Same template")
+        EDAssert.equal(False, EDHandlerReadImageHeaderv10.isSweep(listPath), "Different templates")
+        # Only the first image is read
+        EDAssert.equal(True, EDHandlerReadImageHeaderv10.isSweep([listPath[0], os.path.join(strDirectory, "ref-sweep_1_0003.img")]),
+                       "Type of the other images not checked")
+        EDAssert.equal(False, EDHandlerReadImageHeaderv10.isSweep([os.path.join(strDirectory, "ref-sweep_1_%06d.h5" % iImage) for iImage in [1, 2]]),
+                       "Eiger HDF5 images not read as a sweep")
+        shutil.rmtree(strDirectory)
+
+
+    def testEiger2_16MImageFormat(self):
+        EDAssert.equal(True, isEiger2_16MImageFormat(b"###CBF: VERSION 1.5\r\n# Detector: Dectris EIGER2 CdTe 16M, E-32-0100\r\n"), "Eiger2 16M")
+        EDAssert.equal(False, isEiger2_16MImageFormat(b"###CBF: VERSION 1.5\r\n# Detector: PILATUS 6M, S/N 60-0100\r\n"), "Not Eiger2 16M")
+        EDAssert.equal(None, EDHandlerReadImageHeaderv10.getImageType(b"\x89HDF\r\n\x1a\n" + b"\x00" * 1024), "HDF5 not recognised")
+
+
+    def testReadSweep(self):
+        strDirectory = tempfile.mkdtemp(prefix="read_sweep_")
+        listPath = []
+        for iImage in range(1, 21):
+            strPath = os.path.join(strDirectory, "ref-sweep_1_%04d.cbf" % iImage)
+            strDetector = "PILATUS 6M"
+            if iImage == 5:
+                strDetector = "PILATUS 2M"
+            strHeader = STR_PILATUS_HEADER % {"name": os.path.basename(strPath), "detector": strDetector,
+                                              "second": iImage, "angle": 10.0 + 0.1 * iImage}
+            with open(strPath, "wb") as pyFile:
+                pyFile.write(strHeader.encode("ISO-8859-1") + b"\x00" * 200000)
+            listPath.append(strPath)
+        EDHandlerReadImageHeaderv10.clearCache()
+        listOpen = []
+        def openAndCount(_strPath, *args):
+            listOpen.append(_strPath)
+            return open(_strPath, *args)
+        EDHandlerReadImageHeaderv10Module.open = openAndCount
+        try:
+            edSweepImageHeader = EDHandlerReadImageHeaderv10.readSweep(self.createPlugin(), listPath, _iMaxConcurrentIO=4)
+        finally:
+            del EDHandlerReadImageHeaderv10Module.open
+        EDAssert.equal(sorted(listPath), sorted(listOpen), "Each image read once")
+        EDAssert.equal(True, all(edSweepImageHeader.isValid(iIndex) for iIndex in range(20)), "All headers read")
+        xsDataSubWedge = edSweepImageHeader.getSubWedge(9)
+        EDAssert.equal(11.0, xsDataSubWedge.experimentalCondition.goniostat.rotationAxisStart.value, "Rotation axis start")
+        EDAssert.equal(10, xsDataSubWedge.image[0].number.value, "Image number")
+        xsDataSubWedge = edSweepImageHeader.getSubWedge(4)
+        EDAssert.equal("pilatus2m", xsDataSubWedge.experimentalCondition.detector.type.value, "Image of another detector read completely")
+        EDAssert.equal(10.5, xsDataSubWedge.experimentalCondition.goniostat.rotationAxisStart.value, "Rotation axis start of the other detector")
+        shutil.rmtree(strDirectory)
+
+
     def process(self):
         """
         """
         self.addTestMethod(self.testDetermineImageType)
         self.addTestMethod(self.testDetermineExecReadImageHeaderPluginName)
+        self.addTestMethod(self.testHeaderBlockCache)
+        self.addTestMethod(self.testReadVaryingHeaderCBF)
+        self.addTestMethod(self.testIsSweep)
+        self.addTestMethod(self.testEiger2_16MImageFormat)
+        self.addTestMethod(self.testReadSweep)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,675 @@
+#
+#    Project: EDNA MXv1
+#             http://www.edna-site.org
+#
+#    Copyright (C) European Synchrotron Radiation Facility
+#                            Grenoble, France
+#
+#    Principal authors:      Olof Svensson (svensson@esrf.fr)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+__authors__ = [ "Olof Svensson" ]
+__contact__ = "svensson@esrf.fr"
+__license__ = "GPLv3+"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+
+"""
+Image header block cache, detector format registry and sweep header reader
+used by the EDPluginGroupReadImageHeader-v1.0 plugins.
+
+The first block of an image (which contains the complete header for all
+supported formats) is read once and cached with the key (path, mtime, size).
+The format is determined from this block with the signatures registered in
+listImageFormat, and the exec plugins parse the header from the same block.
+The parsed results (XSDataResultReadImageHeader) are cached with the same
+key, so that reading the header of the same image again is free.
+
+readSweep reads the headers of all the images of a sweep: if the images have
+the same directory and template, the complete header is only read from the
+first image, for the other images only the fields which vary within a sweep
+(rotation axis start and date) are extracted from their header block, after
+checking that the block has the format of the first image. Otherwise the
+complete header of each image is read. The images are read on the shared
+EDExecutor with a bounded number of concurrent reads. The result is an
+EDSweepImageHeader.
+
+The headers of Eiger HDF5 images are read by readHeaderHDF5 from the metadata
+of the master file (EDFrameProviderHDF5), without conversion to CBF.
+"""
+
+import io
+import os
+import time
+import datetime
+import collections
+
+from EDThreading import Semaphore
+from EDVerbose import EDVerbose
+from EDUtilsImage import EDUtilsImage
+from EDFileWatcher import EDFileWatcher
+from EDExecutor import EDExecutor, EDExecutorTask
+from EDFrameProviderHDF5 import EDFrameProviderHDF5
+
+from XSDataCommon import XSDataAngle
+from XSDataCommon import XSDataFile
+from XSDataCommon import XSDataImage
+from XSDataCommon import XSDataInteger
+from XSDataCommon import XSDataLength
+from XSDataCommon import XSDataString
+from XSDataCommon import XSDataTime
+from XSDataCommon import XSDataWavelength
+
+from XSDataMXv1 import XSDataBeam
+from XSDataMXv1 import XSDataDetector
+from XSDataMXv1 import XSDataExperimentalCondition
+from XSDataMXv1 import XSDataGoniostat
+from XSDataMXv1 import XSDataInputReadImageHeader
+from XSDataMXv1 import XSDataResultReadImageHeader
+from XSDataMXv1 import XSDataSubWedge
+
+
+def _listLines(_pyBlock, _iNumberOfLines, _bText):
+    """
+    Returns the first lines of a header block, as read by readline on a file
+    opened in text mode (ISO-8859-1) or in binary mode (utf-8 decoded).
+    """
+    pyFile = EDHandlerReadImageHeaderv10.openBlock(_pyBlock, _bText)
+    listLines = []
+    for iIndex in range(_iNumberOfLines):
+        strLine = pyFile.readline()
+        if not _bText:
+            strLine = strLine.decode("utf-8", "replace")
+        listLines.append(strLine)
+    return listLines
+
+
+def _containsAny(_pyBlock, _iNumberOfLines, _bText, _listSignature):
+    for strLine in _listLines(_pyBlock, _iNumberOfLines, _bText):
+        for strSignature in _listSignature:
+            if strLine.find(strSignature) != -1:
+                return True
+    return False
+
+
+def isMarccdImageFormat(_pyBlock):
+    # Implementation based on CCP4 DiffractionImage library
+    strValue = _pyBlock[1028:1044].decode("ISO-8859-1").strip("\x00")
+    return strValue in ["MMX", "MARCCD"]
+
+
+def isAdscImageFormat(_pyBlock):
+    listLines = _listLines(_pyBlock, 2, True)
+    return listLines[0][:1] == "{" and listLines[1].split("=")[0] == "HEADER_BYTES"
+
+
+def isPilatus2MImageFormat(_pyBlock):
+    return _containsAny(_pyBlock, 20, True, ["Detector: PILATUS2 3M", "Detector: PILATUS3 2M", "Detector: PILATUS 2M"])
+
+
+def isPilatus6MImageFormat(_pyBlock):
+    return _containsAny(_pyBlock, 20, True, ["Detector: PILATUS 6M", "Detector: PILATUS3 6M"])
+
+
+def isEiger4MImageFormat(_pyBlock):
+    return _containsAny(_pyBlock, 10, False, ["Detector: Dectris Eiger 4M"])
+
+
+def isEiger9MImageFormat(_pyBlock):
+    return _containsAny(_pyBlock, 10, False, ["Detector: Dectris Eiger 9M", "Detector: Dectris EIGER2 Si 9M"])
+
+
+def isEiger16MImageFormat(_pyBlock):
+    return _containsAny(_pyBlock, 20, False, ["Detector: Dectris Eiger 16M"])
+
+
+def isEiger2_16MImageFormat(_pyBlock):
+    return _containsAny(_pyBlock, 20, False, ["Detector: Dectris EIGER2 CdTe 16M", "Detector: Dectris EIGER2 Si 16M"])
+
+
+
+def readVaryingHeaderCBF(_pyBlock):
+    """
+    Returns the rotation axis start and the date from a CBF header block
+    """
+    fRotationAxisStart = None
+    strDate = None
+    bHeader = False
+    for strLine in EDHandlerReadImageHeaderv10.openBlock(_pyBlock, True):
+        if strLine.find("_array_data.header_contents") != -1:
+            bHeader = True
+        if strLine.find("_array_data.data") != -1:
+            break
+        if bHeader and strLine[0] == "#" and len(strLine) > 10:
+            strTmp = strLine[2:].replace("\r\n", "")
+            if strLine[6] == "/" and strLine[10] == "/":
+                strDate = strTmp
+            elif strLine[6] == "-" and strLine[9] == "-":
+                dt = datetime.datetime.strptime(strTmp.strip(), "%Y-%m-%dT%H:%M:%S.%f")
+                strDate = dt.strftime("%Y/%b/%d %H:%M:%S.%f")[:-3]
+            elif strTmp.startswith("Start_angle "):
+                fRotationAxisStart = float(strTmp.split(" ")[1])
+    return fRotationAxisStart, strDate
+
+
+def readVaryingHeaderADSC(_pyBlock):
+    """
+    Returns the rotation axis start and the date from an ADSC header block
+    """
+    fRotationAxisStart = None
+    strDate = None
+    for strLine in EDHandlerReadImageHeaderv10.openBlock(_pyBlock, True):
+        if strLine[0] == "}":
+            break
+        listSplit = strLine.split("=")
+        if len(listSplit) > 1:
+            strValue = listSplit[1].split(";")[0]
+            if listSplit[0] == "OSC_START":
+                fRotationAxisStart = float(strValue)
+            elif listSplit[0] == "DATE":
+                strDate = strValue
+    return fRotationAxisStart, strDate
+
+
+
+class EDSweepImageHeader(object):
+    """
+    Compact header of a sweep: the experimental condition is stored once (from
+    the first image) together with one entry per image for the path, the image
+    number, the rotation axis start and the date. XSData objects for individual
+    images are only created on demand.
+    """
+
+    def __init__(self, _xsDataSubWedgeReference, _listPath):
+        self.xsDataSubWedgeReference = _xsDataSubWedgeReference
+        self.listPath = list(_listPath)
+        self.listImageNumber = [EDUtilsImage.getImageNumber(strPath) for strPath in self.listPath]
+        self.listRotationAxisStart = [None] * len(self.listPath)
+        self.listDate = [None] * len(self.listPath)
+        # Complete sub wedges of the images whose header has been read completely
+        self.listSubWedge = [None] * len(self.listPath)
+        # False for images which couldn't be read
+        self.listValid = [False] * len(self.listPath)
+
+
+    def getNumberOfImages(self):
+        return len(self.listPath)
+
+
+    def isValid(self, _iIndex):
+        return self.listValid[_iIndex]
+
+
+    def getSubWedge(self, _iIndex):
+        """
+        Returns a XSDataSubWedge for one image, None if the header couldn't be read
+        """
+        if not self.listValid[_iIndex]:
+            return None
+        if self.listSubWedge[_iIndex] is not None:
+            return self.listSubWedge[_iIndex].copy()
+        xsDataSubWedge = self.xsDataSubWedgeReference.copy()
+        xsDataGoniostat = xsDataSubWedge.experimentalCondition.goniostat
+        fRotationAxisStart = self.listRotationAxisStart[_iIndex]
+        if xsDataGoniostat is not None and fRotationAxisStart is not None:
+            xsDataGoniostat.rotationAxisStart = XSDataAngle(fRotationAxisStart)
+            if xsDataGoniostat.oscillationWidth is not None:
+                xsDataGoniostat.rotationAxisEnd = XSDataAngle(fRotationAxisStart + xsDataGoniostat.oscillationWidth.value)
+        xsDataImage = xsDataSubWedge.image[0]
+        xsDataImage.path = XSDataString(self.listPath[_iIndex])
+        xsDataImage.number = XSDataInteger(self.listImageNumber[_iIndex])
+        if self.listDate[_iIndex] is not None:
+            xsDataImage.date = XSDataString(self.listDate[_iIndex])
+        return xsDataSubWedge
+
+
+    def setSubWedge(self, _iIndex, _xsDataSubWedge):
+        """
+        Sets the complete sub wedge of an image read with its own experimental condition
+        """
+        self.listSubWedge[_iIndex] = _xsDataSubWedge
+        self.listValid[_iIndex] = _xsDataSubWedge is not None
+
+
+    def getXSDataResultReadImageHeader(self, _iIndex):
+        xsDataSubWedge = self.getSubWedge(_iIndex)
+        if xsDataSubWedge is None:
+            return None
+        return XSDataResultReadImageHeader(subWedge=xsDataSubWedge)
+
+
+
+class EDHandlerReadImageHeaderv10(object):
+    """
+    Static class holding the header block cache, the parsed header cache
+    and the detector format registry.
+    """
+    # Size of the block read from the beginning of the images, large enough
+    # for the complete ADSC, MARCCD and CBF headers
+    iHeaderBlockSize = 16384
+    iMaxCachedBlocks = 256
+    iMaxCachedResults = 8192
+    # Max number of images read concurrently by readSweep
+    iMaxConcurrentIO = 8
+    # An image is considered complete when larger than this size (as in EDPluginControlReadImageHeaderv10)
+    iMinImageSize = 100000
+
+    # Registry of image formats: (image type, signature function), tested in order
+    listImageFormat = [
+        ("MARCCD", isMarccdImageFormat),
+        ("ADSC", isAdscImageFormat),
+        ("Pilatus2M", isPilatus2MImageFormat),
+        ("Pilatus6M", isPilatus6MImageFormat),
+        ("Eiger4M", isEiger4MImageFormat),
+        ("Eiger9M", isEiger9MImageFormat),
+        ("Eiger16M", isEiger16MImageFormat),
+        ("Eiger16M", isEiger2_16MImageFormat),
+        ]
+
+    # Readers of the header fields varying within a sweep
+    dictVaryingHeaderReader = {
+        "ADSC": readVaryingHeaderADSC,
+        "Pilatus2M": readVaryingHeaderCBF,
+        "Pilatus6M": readVaryingHeaderCBF,
+        "Eiger4M": readVaryingHeaderCBF,
+        "Eiger9M": readVaryingHeaderCBF,
+        "Eiger16M": readVaryingHeaderCBF,
+        }
+
+    # Eiger detectors read directly from HDF5 master files:
+    # (number of pixels X, number of pixels Y, name, type)
+    listDetectorHDF5 = [
+        (2070, 2167, "EIGER 4M", "eiger4m"),
+        (3108, 3262, "EIGER 9M", "eiger9m"),
+        (4150, 4371, "EIGER 16M", "eiger16m"),
+        (4148, 4362, "EIGER2 16M", "eiger2_16m"),
+        ]
+
+    __semaphore = Semaphore()
+    __dictBlock = collections.OrderedDict()
+    __dictResult = collections.OrderedDict()
+
+
+    @classmethod
+    def registerImageFormat(cls, _strImageType, _pyFunction, _iIndex=None):
+        """
+        Registers a new image format. The signature function takes the header
+        block (bytes) as argument and returns True if the format is recognised.
+        """
+        with cls.__semaphore:
+            if _iIndex is None:
+                _iIndex = len(cls.listImageFormat) - 1
+            cls.listImageFormat.insert(_iIndex, (_strImageType, _pyFunction))
+
+
+    @classmethod
+    def getKey(cls, _strPath):
+        """
+        Returns the cache key (path, mtime, size) of an image, None if the image doesn't exist.
+        """
+        try:
+            pyStat = os.stat(_strPath)
+        except OSError:
+            return None
+        return (os.path.abspath(_strPath), pyStat.st_mtime, pyStat.st_size)
+
+
+    @classmethod
+    def readHeaderBlock(cls, _strPath):
+        """
+        Returns the first iHeaderBlockSize bytes of an image, the file is only read
+        once as long as its modification time and size don't change.
+        """
+        tupleKey = cls.getKey(_strPath)
+        if tupleKey is not None:
+            with cls.__semaphore:
+                pyBlock = cls.__dictBlock.get(tupleKey)
+                if pyBlock is not None:
+                    cls.__dictBlock.move_to_end(tupleKey)
+                    return pyBlock
+        with open(_strPath, "rb") as pyFile:
+            pyBlock = pyFile.read(cls.iHeaderBlockSize)
+        if tupleKey is not None:
+            with cls.__semaphore:
+                cls.__dictBlock[tupleKey] = pyBlock
+                while len(cls.__dictBlock) > cls.iMaxCachedBlocks:
+                    cls.__dictBlock.popitem(last=False)
+        return pyBlock
+
+
+    @staticmethod
+    def openBlock(_pyBlock, _bText=True):
+        """
+        Returns a file object for a header block, in text mode (ISO-8859-1) or binary mode.
+        """
+        if _bText:
+            return io.TextIOWrapper(io.BytesIO(_pyBlock), encoding="ISO-8859-1")
+        return io.BytesIO(_pyBlock)
+
+
+    @classmethod
+    def openHeader(cls, _strPath, _strMode="r"):
+        """
+        Replacement for open(_strPath, _strMode) for reading image headers:
+        the returned file object only contains the header block of the image.
+        """
+        return cls.openBlock(cls.readHeaderBlock(_strPath), "b" not in _strMode)
+
+
+    @classmethod
+    def determineImageType(cls, _strPath):
+        """
+        Determines the image type from the header block, None if not recognised
+        """
+        return cls.getImageType(cls.readHeaderBlock(_strPath), _strPath)
+
+
+    @classmethod
+    def getImageType(cls, _pyBlock, _strPath=None):
+        """
+        Determines the image type from a header block, None if not recognised
+        """
+        for strImageType, pyFunction in cls.listImageFormat:
+            try:
+                if pyFunction(_pyBlock):
+                    return strImageType
+            except Exception as error:
+                EDVerbose.DEBUG("EDHandlerReadImageHeaderv10.getImageType: %s check failed for %s: %s" % \
+                                (strImageType, _strPath, error))
+        return None
+
+
+    @classmethod
+    def getCachedResult(cls, _strPath):
+        """
+        Returns a copy of the cached XSDataResultReadImageHeader for an image,
+        None if the header hasn't been read or if the image has changed.
+        """
+        tupleKey = cls.getKey(_strPath)
+        if tupleKey is None:
+            return None
+        with cls.__semaphore:
+            xsDataResult = cls.__dictResult.get(tupleKey)
+            if xsDataResult is not None:
+                cls.__dictResult.move_to_end(tupleKey)
+        if xsDataResult is None:
+            return None
+        return xsDataResult.copy()
+
+
+    @classmethod
+    def setCachedResult(cls, _strPath, _xsDataResultReadImageHeader):
+        tupleKey = cls.getKey(_strPath)
+        if tupleKey is None or _xsDataResultReadImageHeader is None:
+            return
+        xsDataResult = _xsDataResultReadImageHeader.copy()
+        with cls.__semaphore:
+            cls.__dictResult[tupleKey] = xsDataResult
+            while len(cls.__dictResult) > cls.iMaxCachedResults:
+                cls.__dictResult.popitem(last=False)
+
+
+    @classmethod
+    def clearCache(cls):
+        with cls.__semaphore:
+            cls.__dictBlock.clear()
+            cls.__dictResult.clear()
+
+
+    @classmethod
+    def readHeaderHDF5(cls, _strPath, _iHdf5ImageNumber=None):
+        """
+        Returns the XSDataResultReadImageHeader of an Eiger image (HDF5), read from
+        the metadata of the master file with EDFrameProviderHDF5.
+        """
+        strMasterFile, iFrameNumber = EDFrameProviderHDF5.getFrameReference(_strPath, _iHdf5ImageNumber)
+        dictMetadata = EDFrameProviderHDF5.getMetadata(strMasterFile)
+        xsDataDetector = XSDataDetector()
+        iNoPixelsX = dictMetadata["numberPixelX"]
+        iNoPixelsY = dictMetadata["numberPixelY"]
+        strName = dictMetadata["description"]
+        strType = "eiger"
+        for (iDetectorPixelsX, iDetectorPixelsY, strDetectorName, strDetectorType) in cls.listDetectorHDF5:
+            if iNoPixelsX == iDetectorPixelsX and iNoPixelsY == iDetectorPixelsY:
+                strName = strDetectorName
+                strType = strDetectorType
+                break
+        xsDataDetector.numberPixelX = XSDataInteger(iNoPixelsX)
+        xsDataDetector.numberPixelY = XSDataInteger(iNoPixelsY)
+        fPixelSizeX = dictMetadata["pixelSizeX"] * 1000
+        fPixelSizeY = dictMetadata["pixelSizeY"] * 1000
+        xsDataDetector.pixelSizeX = XSDataLength(fPixelSizeX)
+        xsDataDetector.pixelSizeY = XSDataLength(fPixelSizeY)
+        # Same convention as for the Eiger CBF headers: X and Y are swapped
+        xsDataDetector.beamPositionX = XSDataLength(dictMetadata["beamY"] * fPixelSizeX)
+        xsDataDetector.beamPositionY = XSDataLength(dictMetadata["beamX"] * fPixelSizeY)
+        xsDataDetector.distance = XSDataLength(dictMetadata["distance"] * 1000)
+        xsDataDetector.serialNumber = XSDataString(dictMetadata["serialNumber"])
+        xsDataDetector.name = XSDataString(strName)
+        xsDataDetector.type = XSDataString(strType)
+        xsDataBeam = XSDataBeam()
+        xsDataBeam.wavelength = XSDataWavelength(dictMetadata["wavelength"])
+        xsDataBeam.exposureTime = XSDataTime(dictMetadata["exposureTime"])
+        xsDataGoniostat = XSDataGoniostat()
+        listAngle = dictMetadata["listAngle"]
+        fOscillationWidth = dictMetadata["angleIncrement"]
+        if iFrameNumber - 1 < len(listAngle):
+            fRotationAxisStart = listAngle[iFrameNumber - 1]
+        elif len(listAngle) > 0:
+            fRotationAxisStart = listAngle[0] + (iFrameNumber - 1) * fOscillationWidth
+        else:
+            fRotationAxisStart = (iFrameNumber - 1) * fOscillationWidth
+        xsDataGoniostat.rotationAxisStart = XSDataAngle(fRotationAxisStart)
+        xsDataGoniostat.rotationAxisEnd = XSDataAngle(fRotationAxisStart + fOscillationWidth)
+        xsDataGoniostat.oscillationWidth = XSDataAngle(fOscillationWidth)
+        xsDataExperimentalCondition = XSDataExperimentalCondition()
+        xsDataExperimentalCondition.detector = xsDataDetector
+        xsDataExperimentalCondition.beam = xsDataBeam
+        xsDataExperimentalCondition.goniostat = xsDataGoniostat
+        xsDataImage = XSDataImage()
+        xsDataImage.path = XSDataString(_strPath)
+        if dictMetadata["date"]:
+            xsDataImage.date = XSDataString(dictMetadata["date"])
+        if _strPath.endswith("_master.h5"):
+            xsDataImage.number = XSDataInteger(iFrameNumber)
+        else:
+            xsDataImage.number = XSDataInteger(EDUtilsImage.getImageNumber(_strPath))
+        xsDataSubWedge = XSDataSubWedge()
+        xsDataSubWedge.experimentalCondition = xsDataExperimentalCondition
+        xsDataSubWedge.addImage(xsDataImage)
+        xsDataResultReadImageHeader = XSDataResultReadImageHeader()
+        xsDataResultReadImageHeader.subWedge = xsDataSubWedge
+        return xsDataResultReadImageHeader
+
+
+    @classmethod
+    def __readImageHeader(cls, _edPluginControl, _strPath, _strBaseName):
+        """
+        Reads a complete header, with readHeaderHDF5 for Eiger HDF5 images and
+        with a EDPluginControlReadImageHeaderv10 plugin for the other images
+        """
+        if cls.isHDF5(_strPath):
+            return cls.readHeaderHDF5(_strPath).subWedge
+        xsDataInputReadImageHeader = XSDataInputReadImageHeader()
+        xsDataInputReadImageHeader.image = XSDataFile(XSDataString(_strPath))
+        edPluginReadImageHeader = _edPluginControl.loadPlugin("EDPluginControlReadImageHeaderv10", _strBaseName)
+        edPluginReadImageHeader.dataInput = xsDataInputReadImageHeader
+        edPluginReadImageHeader.executeSynchronous()
+        xsDataResultReadImageHeader = edPluginReadImageHeader.dataOutput
+        if xsDataResultReadImageHeader is None or xsDataResultReadImageHeader.subWedge is None:
+            return None
+        return xsDataResultReadImageHeader.subWedge
+
+
+    @staticmethod
+    def isHDF5(_strPath):
+        return EDFrameProviderHDF5.isHDF5(_strPath) and EDFrameProviderHDF5.isAvailable()
+
+
+    @classmethod
+    def isSweep(cls, _listPath):
+        """
+        Returns True if the images are in the same directory and have the same
+        template, and if the image type of the first image is recognised, i.e.
+        the experimental condition of the first image applies to all of them.
+        Only the first image is read (it must exist), the type of the other images
+        is checked when their header is read. Eiger HDF5 images are not read as a sweep.
+        """
+        setDirectory = set()
+        setTemplate = set()
+        for strPath in _listPath:
+            if cls.isHDF5(strPath):
+                return False
+            setDirectory.add(os.path.dirname(strPath))
+            setTemplate.add(EDUtilsImage.getTemplate(os.path.basename(strPath)))
+        if len(setDirectory) != 1 or len(setTemplate) != 1 or None in setTemplate:
+            return False
+        return cls.determineImageType(_listPath[0]) is not None
+
+
+    @classmethod
+    def waitImages(cls, _listPath, _fTimeOut):
+        """
+        Waits for the images, for Eiger HDF5 images for their master file (as
+        EDPluginControlReadImageHeaderv10)
+        @return: the list of the images still missing after the time out
+        """
+        dictMasterFile = {}
+        listPath = []
+        for strPath in _listPath:
+            if cls.isHDF5(strPath):
+                dictMasterFile[strPath] = EDFrameProviderHDF5.getFrameReference(strPath)[0]
+            else:
+                listPath.append(strPath)
+        listMasterFile = sorted(set(dictMasterFile.values()))
+        fTimeEnd = time.time() + _fTimeOut
+        listExpectation = EDFileWatcher.waitFiles(listPath, cls.iMinImageSize, _fTimeOut)
+        setMissing = set(listPath[iIndex] for iIndex, edExpectation in enumerate(listExpectation) \
+                         if not edExpectation.isComplete())
+        listExpectation = EDFileWatcher.waitFiles(listMasterFile, None, max(0.0, fTimeEnd - time.time()))
+        setMissingMasterFile = set(listMasterFile[iIndex] for iIndex, edExpectation in enumerate(listExpectation) \
+                                   if not edExpectation.isComplete())
+        return [strPath for strPath in _listPath \
+                if strPath in setMissing or dictMasterFile.get(strPath) in setMissingMasterFile]
+
+
+    @classmethod
+    def readSweep(cls, _edPluginControl, _listPath, _fTimeOut=30.0, _iMaxConcurrentIO=None):
+        """
+        Reads the headers of all images of a sweep.
+
+        If the images are one sweep (see isSweep) the complete header of the first
+        image is read and only the fields varying within a sweep (rotation axis start
+        and date) are read from the header block of the other images. The complete
+        header is read for the images whose block doesn't have the type of the first
+        image, and for all images if they are not one sweep (e.g. images of different
+        data collections, or Eiger HDF5 images).
+        @param _edPluginControl: the control plugin used for loading the plugins reading the headers
+        @param _listPath: list of image paths
+        @param _fTimeOut: time out for waiting for the images
+        @param _iMaxConcurrentIO: max number of images read concurrently
+        @return: the sweep header, None if no header could be read
+        @rtype: EDSweepImageHeader
+        @raise RuntimeError: if images are still missing after the time out
+        """
+        if _iMaxConcurrentIO is None:
+            _iMaxConcurrentIO = cls.iMaxConcurrentIO
+        listPath = list(_listPath)
+        if len(listPath) == 0:
+            return None
+        listMissing = cls.waitImages(listPath, _fTimeOut)
+        if listMissing != []:
+            strErrorMessage = "EDHandlerReadImageHeaderv10.readSweep: time out after %.1f s waiting for %d image(s): %s" % \
+                              (_fTimeOut, len(listMissing), ", ".join(listMissing))
+            EDVerbose.ERROR(strErrorMessage)
+            raise RuntimeError(strErrorMessage)
+        strImageType = None
+        pyReader = None
+        if cls.isSweep(listPath):
+            strImageType = cls.determineImageType(listPath[0])
+            pyReader = cls.dictVaryingHeaderReader.get(strImageType)
+        def readImageHeader(_iIndex):
+            return cls.__readImageHeader(_edPluginControl, listPath[_iIndex], "ReadImageHeader_%d" % (_iIndex + 1))
+        if pyReader is None:
+            # Not one sweep, or no reader for the varying fields (e.g. MARCCD): the complete headers are read
+            edSweepImageHeader = EDSweepImageHeader(None, listPath)
+            listResult = cls.__mapOnExecutor(readImageHeader, range(len(listPath)), _iMaxConcurrentIO)
+            for iIndex, (xsDataSubWedge, error) in enumerate(listResult):
+                if error is not None:
+                    EDVerbose.WARNING("EDHandlerReadImageHeaderv10.readSweep: cannot read header of %s: %s" % \
+                                      (listPath[iIndex], error))
+                edSweepImageHeader.setSubWedge(iIndex, xsDataSubWedge)
+            return edSweepImageHeader
+        # Complete header from the first image
+        xsDataSubWedgeReference = cls.__readImageHeader(_edPluginControl, listPath[0], "ReadImageHeader_sweep")
+        if xsDataSubWedgeReference is None:
+            return None
+        edSweepImageHeader = EDSweepImageHeader(xsDataSubWedgeReference, listPath)
+        def readVaryingHeader(_iIndex):
+            # The header block is read once, for checking the type and for the varying fields
+            pyBlock = cls.readHeaderBlock(listPath[_iIndex])
+            if _iIndex > 0 and cls.getImageType(pyBlock, listPath[_iIndex]) != strImageType:
+                return (None, readImageHeader(_iIndex))
+            return (pyReader(pyBlock), None)
+        listResult = cls.__mapOnExecutor(readVaryingHeader, range(len(listPath)), _iMaxConcurrentIO)
+        for iIndex, (tupleResult, error) in enumerate(listResult):
+            if error is not None:
+                EDVerbose.WARNING("EDHandlerReadImageHeaderv10.readSweep: cannot read header of %s: %s" % \
+                                  (listPath[iIndex], error))
+                continue
+            tupleVarying, xsDataSubWedge = tupleResult
+            if tupleVarying is None:
+                # Not the type of the first image
+                EDVerbose.WARNING("EDHandlerReadImageHeaderv10.readSweep: %s is not a %s image, complete header read" % \
+                                  (listPath[iIndex], strImageType))
+                edSweepImageHeader.setSubWedge(iIndex, xsDataSubWedge)
+            else:
+                edSweepImageHeader.listRotationAxisStart[iIndex], edSweepImageHeader.listDate[iIndex] = tupleVarying
+                edSweepImageHeader.listValid[iIndex] = True
+        return edSweepImageHeader
+
+
+    @classmethod
+    def __mapOnExecutor(cls, _pyFunction, _listArgument, _iMaxConcurrent):
+        """
+        Runs _pyFunction on each argument on the shared EDExecutor, at most _iMaxConcurrent
+        at a time. A task not yet started when its result is needed is run by the caller.
+        @return: list of (result, exception) in the order of the arguments
+        """
+        listTask = [EDExecutorTask(_pyFunction, oArgument) for oArgument in _listArgument]
+        iMaxConcurrent = max(1, _iMaxConcurrent)
+        for edExecutorTask in listTask[:iMaxConcurrent]:
+            EDExecutor.submitTask(edExecutorTask)
+        listResult = []
+        for iIndex, edExecutorTask in enumerate(listTask):
+            edExecutorTask.runInline()
+            try:
+                listResult.append((edExecutorTask.future.result(), None))
+            except Exception as error:
+                listResult.append((None, error))
+            if iIndex + iMaxConcurrent < len(listTask):
+                EDExecutor.submitTask(listTask[iIndex + iMaxConcurrent])
+        return listResult
+
+
+    @classmethod
+    def readSweepFromTemplate(cls, _edPluginControl, _strDirectory, _strTemplate, _iStartImage, _iEndImage, \
+                              _fTimeOut=30.0, _iMaxConcurrentIO=None):
+        """
+        Reads the headers of a sweep given as directory, template (e.g. "prefix_1_%04d.cbf")
+        and image range (inclusive).
+        """
+        listPath = [os.path.join(_strDirectory, _strTemplate % iImage) for iImage in range(_iStartImage, _iEndImage + 1)]
+        return cls.readSweep(_edPluginControl, listPath, _fTimeOut, _iMaxConcurrentIO)
@@ -0,0 +1,275 @@
+# coding: utf8
+#
+#    Project: MXv1
+#             http://www.edna-site.org
+#
+#    Copyright (C) ESRF
+#
+#    Principal author:       Olof Svensson
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+__author__ = "Olof Svensson"
+__license__ = "GPLv3+"
+__copyright__ = "ESRF"
+
+"""
+Process-wide sender of the messages and results pushed to mxCuBE (XML-RPC).
+
+The plugins only queue the calls. A single background thread makes the
+XML-RPC calls in the order they were queued, with one server proxy (i.e.
+one HTTP connection) per mxCuBE URI and token, so a slow or unreachable
+mxCuBE doesn't stall the data analysis.
+
+The queue is bounded: if it's full the oldest call is dropped. The results
+of successive batches ("dozor_batch_processed") waiting at the end of the
+queue are coalesced into one call. The calls have a time-out, and after a connection
+error the calls to the same URI are dropped for a while instead of each
+waiting for the time-out. The outcome of the calls is counted per URI
+(getStatistics).
+
+Pending calls are sent when the process exits (at most for fExitTimeOut
+seconds). In a child process a new sender thread is started.
+"""
+
+import os
+import time
+import atexit
+import threading
+import collections
+
+try:
+    from xmlrpclib import ServerProxy
+    from xmlrpclib import Transport
+    from xmlrpclib import SafeTransport
+    from xmlrpclib import Fault
+except ImportError:
+    from xmlrpc.client import ServerProxy
+    from xmlrpc.client import Transport
+    from xmlrpc.client import SafeTransport
+    from xmlrpc.client import Fault
+
+from EDVerbose import EDVerbose
+
+
+class EDMXCuBETransport(Transport):
+    """
+    XML-RPC transport with a time-out and an optional token sent in the HTTP header
+    """
+
+    # Transport class making the connections, SafeTransport for https
+    _transportClass = Transport
+
+    def __init__(self, _fTimeOut=None, _strToken=None, use_datetime=0):
+        self._transportClass.__init__(self, use_datetime=use_datetime)
+        self.timeOut = _fTimeOut
+        self.token = _strToken
+
+    def make_connection(self, host):
+        # The connection is kept by the transport and reused for the next calls
+        connection = self._transportClass.make_connection(self, host)
+        if self.timeOut is not None:
+            connection.timeout = self.timeOut
+        return connection
+
+    def send_content(self, connection, request_body):
+        if self.token is not None:
+            connection.putheader("Token", self.token)
+        self._transportClass.send_content(self, connection, request_body)
+
+
+
+class EDMXCuBESafeTransport(EDMXCuBETransport, SafeTransport):
+    """
+    https version of EDMXCuBETransport
+    """
+
+    _transportClass = SafeTransport
+
+
+
+class EDMXCuBENotifier(object):
+    """
+    Static class sending the XML-RPC calls to mxCuBE in a background thread.
+    """
+
+    # Calls whose only argument is a list, successive calls are coalesced
+    LIST_COALESCED_METHOD = ["dozor_batch_processed"]
+    LIST_STATISTICS = ["queued", "coalesced", "dropped", "calls", "delivered", "failed"]
+
+    iMaxQueueSize = 1000
+    fTimeOut = 10.0 # s, time-out of a call
+    fRetryDelay = 30.0 # s, delay before trying again to connect to an unreachable mxCuBE
+    fExitTimeOut = 10.0 # s
+
+    _condition = threading.Condition()
+    _dequeCall = collections.deque()
+    _thread = None
+    _iPid = None
+    _iPending = 0
+    _dictServerProxy = {}
+    _dictRetryTime = {}
+    _dictStatistics = {}
+
+
+    @classmethod
+    def send(cls, _strURI, _strMethod, _tupleArgs=(), _strToken=None):
+        """
+        Queues an XML-RPC call to mxCuBE, e.g. send(uri, "dozor_status_changed", ("Success",))
+        """
+        if cls._iPid is not None and cls._iPid != os.getpid():
+            # Child process, the lock may have been held by a thread of the parent process
+            cls._condition = threading.Condition()
+        with cls._condition:
+            if cls._iPid != os.getpid():
+                cls.__startThread()
+            dictStatistics = cls.__getStatistics(_strURI)
+            dictStatistics["queued"] += 1
+            if _strMethod in cls.LIST_COALESCED_METHOD and len(_tupleArgs) == 1:
+                # Added to the last call in the queue if it's the same method, so
+                # that the order of the calls is kept
+                if len(cls._dequeCall) > 0:
+                    listCall = cls._dequeCall[-1]
+                    if listCall[0] == _strURI and listCall[1] == _strToken and listCall[2] == _strMethod:
+                        listCall[3][0].extend(_tupleArgs[0])
+                        listCall[4] += 1
+                        dictStatistics["coalesced"] += 1
+                        return
+                _tupleArgs = (list(_tupleArgs[0]),)
+            if len(cls._dequeCall) >= cls.iMaxQueueSize:
+                listCallDropped = cls._dequeCall.popleft()
+                cls.__getStatistics(listCallDropped[0])["dropped"] += listCallDropped[4]
+                cls._iPending -= 1
+            cls._dequeCall.append([_strURI, _strToken, _strMethod, list(_tupleArgs), 1])
+            cls._iPending += 1
+            cls._condition.notify_all()
+
+
+    @classmethod
+    def logMessage(cls, _strURI, _strMessage, _strLevel="info", _strToken=None):
+        """
+        Queues a message for the mxCuBE log, one call per line
+        """
+        for strMessage in _strMessage.split("\n"):
+            if strMessage != "":
+                cls.send(_strURI, "log_message", (strMessage, _strLevel), _strToken)
+
+
+    @classmethod
+    def flush(cls, _fTimeOut=None):
+        """
+        Waits until all the queued calls have been sent
+        @return: True if there are no more calls to send
+        """
+        fTimeEnd = None
+        if _fTimeOut is not None:
+            fTimeEnd = time.time() + _fTimeOut
+        with cls._condition:
+            if cls._iPid != os.getpid():
+                return True
+            while cls._iPending > 0:
+                if fTimeEnd is None:
+                    cls._condition.wait()
+                else:
+                    fTimeLeft = fTimeEnd - time.time()
+                    if fTimeLeft <= 0:
+                        break
+                    cls._condition.wait(fTimeLeft)
+            return cls._iPending == 0
+
+
+    @classmethod
+    def getStatistics(cls, _strURI):
+        """
+        Returns a dictionary with the number of updates (calls asked for by the plugins)
+        queued, coalesced, dropped (queue full), delivered and failed, and the number of
+        XML-RPC calls made
+        """
+        with cls._condition:
+            return dict(cls.__getStatistics(_strURI))
+
+
+    @classmethod
+    def __getStatistics(cls, _strURI):
+        if _strURI not in cls._dictStatistics:
+            cls._dictStatistics[_strURI] = dict.fromkeys(cls.LIST_STATISTICS, 0)
+        return cls._dictStatistics[_strURI]
+
+
+    @classmethod
+    def __startThread(cls):
+        if cls._iPid is None:
+            atexit.register(cls.__flushAtExit)
+        else:
+            # Child process: the calls queued by the parent process are not sent
+            cls._dequeCall.clear()
+            cls._iPending = 0
+            cls._dictServerProxy = {}
+        thread = threading.Thread(target=cls.__run, name="EDMXCuBENotifier")
+        thread.daemon = True
+        thread.start()
+        cls._thread = thread
+        cls._iPid = os.getpid()
+
+
+    @classmethod
+    def __flushAtExit(cls):
+        cls.flush(cls.fExitTimeOut)
+
+
+    @classmethod
+    def __run(cls):
+        while True:
+            with cls._condition:
+                while len(cls._dequeCall) == 0:
+                    cls._condition.wait()
+                listCall = cls._dequeCall.popleft()
+            try:
+                cls.__call(*listCall)
+            except Exception:
+                pass
+            finally:
+                with cls._condition:
+                    cls._iPending -= 1
+                    cls._condition.notify_all()
+
+
+    @classmethod
+    def __call(cls, _strURI, _strToken, _strMethod, _listArgs, _iNumberOfUpdates):
+        strOutcome = "failed"
+        if time.time() >= cls._dictRetryTime.get(_strURI, 0.0):
+            tupleKey = (_strURI, _strToken)
+            serverProxy = cls._dictServerProxy.get(tupleKey)
+            if serverProxy is None:
+                if _strURI.startswith("https"):
+                    transport = EDMXCuBESafeTransport(cls.fTimeOut, _strToken)
+                else:
+                    transport = EDMXCuBETransport(cls.fTimeOut, _strToken)
+                serverProxy = ServerProxy(_strURI, transport=transport, allow_none=True)
+                cls._dictServerProxy[tupleKey] = serverProxy
+            try:
+                getattr(serverProxy, _strMethod)(*_listArgs)
+                strOutcome = "delivered"
+            except Fault as fault:
+                EDVerbose.DEBUG("EDMXCuBENotifier: %s failed on mxCuBE %s: %s" % (_strMethod, _strURI, fault))
+            except Exception as ex:
+                # Connection error or time-out: a new connection is made after the retry delay
+                EDVerbose.DEBUG("EDMXCuBENotifier: cannot send %s to mxCuBE %s: %r" % (_strMethod, _strURI, ex))
+                del cls._dictServerProxy[tupleKey]
+                cls._dictRetryTime[_strURI] = time.time() + cls.fRetryDelay
+            with cls._condition:
+                cls.__getStatistics(_strURI)["calls"] += 1
+        with cls._condition:
+            cls.__getStatistics(_strURI)[strOutcome] += _iNumberOfUpdates
@@ -55,6 +55,7 @@ try:
     from XSDataCommon import XSDataTime
     from XSDataCommon import XSDataWavelength
     from XSDataCommon import XSDataAngle
+    from XSDataCommon import copyObject
 except ImportError as error:
     if strEdnaHome is not None:
         for strXsdName in dictLocation:
@@ -85,6 +86,7 @@ from XSDataCommon import XSDataLength
 from XSDataCommon import XSDataTime
 from XSDataCommon import XSDataWavelength
 from XSDataCommon import XSDataAngle
+from XSDataCommon import copyObject
 
 
 
@@ -311,7 +313,7 @@ class XSDataStatisticsIntegrationAverageAndNumberOfReflections(object):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataStatisticsIntegrationAverageAndNumberOfReflections.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -453,7 +455,7 @@ class XSDataAtom(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataAtom.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -561,7 +563,7 @@ class XSDataAtomicComposition(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataAtomicComposition.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -811,7 +813,7 @@ class XSDataBeam(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataBeam.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -1041,7 +1043,7 @@ class XSDataCell(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataCell.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -1215,7 +1217,7 @@ class XSDataChain(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataChain.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -1333,7 +1335,7 @@ class XSDataChemicalCompositionMM(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataChemicalCompositionMM.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -1533,7 +1535,7 @@ class XSDataCollectionPlan(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataCollectionPlan.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -2069,7 +2071,7 @@ class XSDataDetector(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataDetector.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -2841,7 +2843,7 @@ class XSDataDiffractionPlan(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataDiffractionPlan.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -3004,7 +3006,7 @@ class XSDataCollection(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataCollection.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -3778,7 +3780,7 @@ class XSDataImageQualityIndicators(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataImageQualityIndicators.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -3923,7 +3925,7 @@ class XSDataIndexingSolution(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataIndexingSolution.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -4040,7 +4042,7 @@ class XSDataInputControlKappa(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataInputControlKappa.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -4157,7 +4159,7 @@ class XSDataOrientation(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataOrientation.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -4405,7 +4407,7 @@ class XSDataSample(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataSample.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -4495,7 +4497,7 @@ class XSDataSolvent(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataSolvent.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -4611,7 +4613,7 @@ class XSDataSpaceGroup(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataSpaceGroup.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -4755,7 +4757,7 @@ class XSDataCrystal(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataCrystal.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -5111,7 +5113,7 @@ class XSDataGoniostat(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataGoniostat.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -5251,7 +5253,7 @@ class XSDataExperimentalCondition(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataExperimentalCondition.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -5480,7 +5482,7 @@ class XSDataStatisticsIndexing(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataStatisticsIndexing.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -5793,7 +5795,7 @@ class XSDataStatisticsIntegration(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataStatisticsIntegration.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -5910,7 +5912,7 @@ class XSDataStatisticsIntegrationPerReflectionType(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataStatisticsIntegrationPerReflectionType.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -6083,7 +6085,7 @@ class XSDataStatisticsIntegrationPerResolutionBin(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataStatisticsIntegrationPerResolutionBin.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -6417,7 +6419,7 @@ class XSDataIntegrationSubWedgeResult(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataIntegrationSubWedgeResult.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -6562,7 +6564,7 @@ class XSDataKappaSolution(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataKappaSolution.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -6708,7 +6710,7 @@ class XSDataLigand(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataLigand.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -7125,7 +7127,7 @@ class XSDataResolutionBin(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataResolutionBin.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -7233,7 +7235,7 @@ class XSDataStatisticsStrategy(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataStatisticsStrategy.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -7545,7 +7547,7 @@ class XSDataStrategySummary(XSData):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataStrategySummary.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -7730,7 +7732,7 @@ This structure is also defined by its number in the asymmetric unit."""
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataStructure.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -7920,7 +7922,7 @@ The subWedgeNumber is an optional number for relating different subwedges, espec
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataSubWedge.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -8367,7 +8369,7 @@ class XSDataDozorInput(XSDataInput):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataDozorInput.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -8477,7 +8479,7 @@ class XSDataGeneratePredictionResult(XSDataResult):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataGeneratePredictionResult.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -8618,7 +8620,7 @@ class XSDataIndexingInput(XSDataInput):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataIndexingInput.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -8789,7 +8791,7 @@ class XSDataIndexingSolutionSelected(XSDataIndexingSolution):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataIndexingSolutionSelected.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -8907,7 +8909,7 @@ class XSDataGeneratePredictionInput(XSDataInput):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataGeneratePredictionInput.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -9170,7 +9172,7 @@ class XSDataIndexingResult(XSDataResult):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataIndexingResult.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -9311,7 +9313,7 @@ class XSDataInputCharacterisation(XSDataInput):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataInputCharacterisation.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -9478,7 +9480,7 @@ class XSDataInputControlISPyB(XSDataInput):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataInputControlISPyB.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -9846,7 +9848,7 @@ class XSDataInputControlImageQualityIndicators(XSDataInput):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataInputControlImageQualityIndicators.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -9935,7 +9937,7 @@ class XSDataInputControlXDSGenerateBackgroundImage(XSDataInput):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataInputControlXDSGenerateBackgroundImage.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -10025,7 +10027,7 @@ class XSDataInputReadImageHeader(XSDataInput):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataInputReadImageHeader.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -10355,7 +10357,7 @@ class XSDataInputStrategy(XSDataInput):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataInputStrategy.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -10799,7 +10801,7 @@ class XSDataResultCharacterisation(XSDataResult):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataResultCharacterisation.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -10888,7 +10890,7 @@ class XSDataInputInducedRadiationProcess(XSDataInput):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataInputInducedRadiationProcess.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -10999,7 +11001,7 @@ class XSDataInputSubWedgeAssemble(XSDataInput):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataInputSubWedgeAssemble.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -11110,7 +11112,7 @@ class XSDataInputSubWedgeMerge(XSDataInput):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataInputSubWedgeMerge.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -11218,7 +11220,7 @@ class XSDataIntegrationResult(XSDataResult):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataIntegrationResult.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -11331,7 +11333,7 @@ class XSDataResultControlISPyB(XSDataResult):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataResultControlISPyB.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -11465,7 +11467,7 @@ class XSDataResultControlImageQualityIndicators(XSDataResult):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataResultControlImageQualityIndicators.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -11599,7 +11601,7 @@ class XSDataResultControlKappa(XSDataResult):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataResultControlKappa.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -11688,7 +11690,7 @@ class XSDataResultControlXDSGenerateBackgroundImage(XSDataResult):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataResultControlXDSGenerateBackgroundImage.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -11833,7 +11835,7 @@ class XSDataResultInducedRadiationProcess(XSDataResult):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataResultInducedRadiationProcess.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -11923,7 +11925,7 @@ class XSDataResultReadImageHeader(XSDataResult):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataResultReadImageHeader.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -12209,7 +12211,7 @@ class XSDataResultStrategy(XSDataResult):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataResultStrategy.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -12320,7 +12322,7 @@ class XSDataResultSubWedgeAssemble(XSDataResult):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataResultSubWedgeAssemble.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -12431,7 +12433,7 @@ class XSDataResultSubWedgeMerge(XSDataResult):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataResultSubWedgeMerge.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -12521,7 +12523,7 @@ class XSDataSampleCrystal(XSDataSample):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataSampleCrystal.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -12635,7 +12637,7 @@ class XSDataIntegrationInput(XSDataGeneratePredictionInput):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataIntegrationInput.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
@@ -12725,7 +12727,7 @@ class XSDataSampleCrystalMM(XSDataSampleCrystal):
         self.exportToFile(_outfileName)
     #Method for making a copy in a new instance
     def copy( self ):
-        return XSDataSampleCrystalMM.parseString(self.marshal())
+        return copyObject(self)
     #Static method for parsing a string
     def parseString( _inString ):
         doc = minidom.parseString(_inString)
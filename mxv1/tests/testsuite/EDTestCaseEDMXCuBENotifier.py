@@ -0,0 +1,190 @@
+#
+#    Project: EDNA MXv1
+#             http://www.edna-site.org
+#
+#    Copyright (C) European Synchrotron Radiation Facility
+#                            Grenoble, France
+#
+#    Principal authors:      Olof Svensson (svensson@esrf.fr)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+__author__ = "Olof Svensson"
+__license__ = "GPLv3+"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+
+import time
+import socket
+import threading
+
+try:
+    from SimpleXMLRPCServer import SimpleXMLRPCServer
+    from SimpleXMLRPCServer import SimpleXMLRPCRequestHandler
+    from SocketServer import ThreadingMixIn
+except ImportError:
+    from xmlrpc.server import SimpleXMLRPCServer
+    from xmlrpc.server import SimpleXMLRPCRequestHandler
+    from socketserver import ThreadingMixIn
+
+from EDAssert import EDAssert
+from EDTestCase import EDTestCase
+
+from EDMXCuBENotifier import EDMXCuBENotifier
+from EDMXCuBENotifier import EDMXCuBESafeTransport
+
+
+class EDThreadingXMLRPCServer(ThreadingMixIn, SimpleXMLRPCServer):
+    daemon_threads = True
+    block_on_close = False
+
+
+
+class EDMXCuBEStandIn(object):
+    """
+    Local XML-RPC server standing in for mxCuBE, each call takes fLatency seconds
+    """
+
+    def __init__(self, _fLatency=0.0):
+        self.fLatency = _fLatency
+        self.listCall = []
+        self.listToken = []
+        self.iConnections = 0
+        edMXCuBEStandIn = self
+
+        class RequestHandler(SimpleXMLRPCRequestHandler):
+            # Keep-alive connections, as the mxCuBE XML-RPC server
+            protocol_version = "HTTP/1.1"
+            def setup(self):
+                edMXCuBEStandIn.iConnections += 1
+                SimpleXMLRPCRequestHandler.setup(self)
+            def decode_request_content(self, data):
+                edMXCuBEStandIn.listToken.append(self.headers.get("Token"))
+                return SimpleXMLRPCRequestHandler.decode_request_content(self, data)
+
+        self.server = EDThreadingXMLRPCServer(("127.0.0.1", 0), requestHandler=RequestHandler,
+                                               logRequests=False, allow_none=True)
+        self.server.register_function(self.log_message, "log_message")
+        self.server.register_function(self.dozor_batch_processed, "dozor_batch_processed")
+        self.uri = "http://127.0.0.1:%d" % self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def log_message(self, _strMessage, _strLevel):
+        time.sleep(self.fLatency)
+        self.listCall.append(("log_message", _strMessage))
+        return True
+
+    def dozor_batch_processed(self, _listImageDozor):
+        time.sleep(self.fLatency)
+        self.listCall.append(("dozor_batch_processed", _listImageDozor))
+        return True
+
+    def shutdown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+
+class EDTestCaseEDMXCuBENotifier(EDTestCase):
+
+
+    def testCoalescing(self):
+        edMXCuBEStandIn = EDMXCuBEStandIn(0.2)
+        try:
+            fTimeStart = time.time()
+            EDMXCuBENotifier.logMessage(edMXCuBEStandIn.uri, "Processing started...\n", "info", "token")
+            for iBatch in range(10):
+                listImageDozor = [{"index": iBatch * 5 + iImage, "dozor_score": 1.0} for iImage in range(5)]
+                EDMXCuBENotifier.send(edMXCuBEStandIn.uri, "dozor_batch_processed", (listImageDozor,), "token")
+            EDMXCuBENotifier.logMessage(edMXCuBEStandIn.uri, "Processing finished", "info", "token")
+            self.screen("12 calls queued in %.3f s" % (time.time() - fTimeStart))
+            EDAssert.equal(True, EDMXCuBENotifier.flush(10.0), "All calls sent")
+            listMethod = [tupleCall[0] for tupleCall in edMXCuBEStandIn.listCall]
+            EDAssert.equal(["log_message", "dozor_batch_processed", "log_message"], listMethod, "Order of the calls")
+            listIndex = [dictImage["index"] for dictImage in edMXCuBEStandIn.listCall[1][1]]
+            EDAssert.equal(list(range(50)), listIndex, "Results of the batches coalesced in order")
+            EDAssert.equal(["token"] * 3, edMXCuBEStandIn.listToken, "Token sent")
+            EDAssert.equal(1, edMXCuBEStandIn.iConnections, "Connection reused")
+            dictStatistics = EDMXCuBENotifier.getStatistics(edMXCuBEStandIn.uri)
+            EDAssert.equal(12, dictStatistics["queued"], "Queued")
+            EDAssert.equal(9, dictStatistics["coalesced"], "Coalesced")
+            EDAssert.equal(3, dictStatistics["calls"], "Calls")
+            EDAssert.equal(12, dictStatistics["delivered"], "Delivered")
+            EDAssert.equal(0, dictStatistics["failed"], "Failed")
+        finally:
+            edMXCuBEStandIn.shutdown()
+
+
+    def testOrder(self):
+        edMXCuBEStandIn = EDMXCuBEStandIn(0.2)
+        try:
+            EDMXCuBENotifier.logMessage(edMXCuBEStandIn.uri, "Processing started...")
+            EDMXCuBENotifier.send(edMXCuBEStandIn.uri, "dozor_batch_processed", ([{"index": 1}],))
+            EDMXCuBENotifier.logMessage(edMXCuBEStandIn.uri, "Batch processed")
+            EDMXCuBENotifier.send(edMXCuBEStandIn.uri, "dozor_batch_processed", ([{"index": 2}],))
+            EDAssert.equal(True, EDMXCuBENotifier.flush(10.0), "All calls sent")
+            listMethod = [tupleCall[0] for tupleCall in edMXCuBEStandIn.listCall]
+            EDAssert.equal(["log_message", "dozor_batch_processed", "log_message", "dozor_batch_processed"],
+                           listMethod, "Results not coalesced across a message")
+        finally:
+            edMXCuBEStandIn.shutdown()
+
+
+    def testSafeTransport(self):
+        edMXCuBESafeTransport = EDMXCuBESafeTransport(0.5, "token")
+        connection = edMXCuBESafeTransport.make_connection("127.0.0.1:8443")
+        EDAssert.equal("HTTPSConnection", connection.__class__.__name__, "https connection")
+        EDAssert.equal(0.5, connection.timeout, "Time-out of the https connection")
+
+
+    def testTimeOut(self):
+        fTimeOut = EDMXCuBENotifier.fTimeOut
+        EDMXCuBENotifier.fTimeOut = 0.2
+        edMXCuBEStandIn = EDMXCuBEStandIn(1.0)
+        try:
+            for iMessage in range(5):
+                EDMXCuBENotifier.logMessage(edMXCuBEStandIn.uri, "Message %d" % iMessage)
+            EDAssert.equal(True, EDMXCuBENotifier.flush(5.0), "Calls to a slow mxCuBE given up")
+            dictStatistics = EDMXCuBENotifier.getStatistics(edMXCuBEStandIn.uri)
+            EDAssert.equal(1, dictStatistics["calls"], "No call until the retry delay")
+            EDAssert.equal(5, dictStatistics["failed"], "Failed")
+        finally:
+            EDMXCuBENotifier.fTimeOut = fTimeOut
+            edMXCuBEStandIn.shutdown()
+
+
+    def testUnreachable(self):
+        # Port without server
+        pySocket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        pySocket.bind(("127.0.0.1", 0))
+        strURI = "http://127.0.0.1:%d" % pySocket.getsockname()[1]
+        pySocket.close()
+        fTimeStart = time.time()
+        for iMessage in range(100):
+            EDMXCuBENotifier.logMessage(strURI, "Message %d" % iMessage)
+        self.screen("100 calls to an unreachable mxCuBE queued in %.3f s" % (time.time() - fTimeStart))
+        EDAssert.equal(True, EDMXCuBENotifier.flush(5.0), "Calls to an unreachable mxCuBE given up")
+        dictStatistics = EDMXCuBENotifier.getStatistics(strURI)
+        EDAssert.equal(100, dictStatistics["failed"], "Failed")
+        EDAssert.equal(0, dictStatistics["delivered"], "Delivered")
+
+
+    def process(self):
+        self.addTestMethod(self.testCoalescing)
+        self.addTestMethod(self.testOrder)
+        self.addTestMethod(self.testSafeTransport)
+        self.addTestMethod(self.testTimeOut)
+        self.addTestMethod(self.testUnreachable)
@@ -0,0 +1,166 @@
+#
+#    Project: EDNA MXv1
+#             http://www.edna-site.org
+#
+#    Copyright (C) European Synchrotron Radiation Facility
+#                            Grenoble, France
+#
+#    Principal authors:      Olof Svensson (svensson@esrf.fr)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+__authors__ = [ "Olof Svensson" ]
+__contact__ = "svensson@esrf.fr"
+__license__ = "GPLv3+"
+__copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
+
+import time
+
+from EDAssert import EDAssert
+from EDTestCase import EDTestCase
+from EDFactoryPluginStatic import EDFactoryPluginStatic
+
+from XSDataCommon import XSDataAngle
+from XSDataCommon import XSDataBoolean
+from XSDataCommon import XSDataDouble
+from XSDataCommon import XSDataFile
+from XSDataCommon import XSDataInteger
+from XSDataCommon import XSDataString
+from XSDataCommon import XSDataTime
+from XSDataCommon import XSDataWavelength
+
+from XSDataMXv1 import XSDataCollection
+from XSDataMXv1 import XSDataExperimentalCondition
+from XSDataMXv1 import XSDataGoniostat
+from XSDataMXv1 import XSDataImageQualityIndicators
+from XSDataMXv1 import XSDataResultControlImageQualityIndicators
+from XSDataMXv1 import XSDataBeam
+from XSDataMXv1 import XSDataImage
+from XSDataMXv1 import XSDataSubWedge
+
+
+class EDTestCaseXSDataMXv1(EDTestCase):
+    """
+    Test case for copying the MXv1 data model objects and converting them
+    between structurally identical classes.
+    """
+
+    def getImageQualityIndicators(self, _iImageNumber):
+        xsDataImageQualityIndicators = XSDataImageQualityIndicators()
+        xsDataImageQualityIndicators.image = XSDataImage(path=XSDataString("/data/visitor/mx415/id30a2/ref-x_1_%04d.cbf" % _iImageNumber),
+                                                         number=XSDataInteger(_iImageNumber))
+        xsDataImageQualityIndicators.binPopCutOffMethod2Res = XSDataDouble(2.1 + _iImageNumber / 100.0)
+        xsDataImageQualityIndicators.goodBraggCandidates = XSDataInteger(120 + _iImageNumber)
+        xsDataImageQualityIndicators.iceRings = XSDataInteger(0)
+        xsDataImageQualityIndicators.inResTotal = XSDataInteger(300 + _iImageNumber)
+        xsDataImageQualityIndicators.inResolutionOvrlSpots = XSDataInteger(2)
+        xsDataImageQualityIndicators.maxUnitCell = XSDataDouble(123.45)
+        xsDataImageQualityIndicators.method1Res = XSDataDouble(1.98)
+        xsDataImageQualityIndicators.method2Res = XSDataDouble(2.03)
+        xsDataImageQualityIndicators.pctSaturationTop50Peaks = XSDataDouble(0.5)
+        xsDataImageQualityIndicators.spotTotal = XSDataInteger(400 + _iImageNumber)
+        xsDataImageQualityIndicators.totalIntegratedSignal = XSDataDouble(1.5e6 * _iImageNumber)
+        xsDataImageQualityIndicators.dozor_score = XSDataDouble(12.5)
+        xsDataImageQualityIndicators.dozorSpotsIntAver = XSDataDouble(35.5)
+        xsDataImageQualityIndicators.dozorSpotFile = XSDataFile(XSDataString("/tmp/dozor/spots_%04d.dat" % _iImageNumber))
+        return xsDataImageQualityIndicators
+
+
+    def getResult(self, _iNumberOfImages):
+        xsDataResult = XSDataResultControlImageQualityIndicators()
+        for iImageNumber in range(1, _iNumberOfImages + 1):
+            xsDataResult.addImageQualityIndicators(self.getImageQualityIndicators(iImageNumber))
+        return xsDataResult
+
+
+    def getDataCollection(self, _iNumberOfImages):
+        xsDataCollection = XSDataCollection()
+        xsDataSubWedge = XSDataSubWedge()
+        xsDataSubWedge.subWedgeNumber = XSDataInteger(1)
+        xsDataExperimentalCondition = XSDataExperimentalCondition()
+        xsDataBeam = XSDataBeam()
+        xsDataBeam.wavelength = XSDataWavelength(0.966)
+        xsDataBeam.exposureTime = XSDataTime(0.037)
+        xsDataExperimentalCondition.beam = xsDataBeam
+        xsDataGoniostat = XSDataGoniostat()
+        xsDataGoniostat.rotationAxisStart = XSDataAngle(0.0)
+        xsDataGoniostat.oscillationWidth = XSDataAngle(0.1)
+        xsDataExperimentalCondition.goniostat = xsDataGoniostat
+        xsDataSubWedge.experimentalCondition = xsDataExperimentalCondition
+        for iImageNumber in range(1, _iNumberOfImages + 1):
+            xsDataImage = XSDataImage()
+            xsDataImage.path = XSDataString("/data/visitor/mx415/id30a2/ref-x_1_%04d.cbf" % iImageNumber)
+            xsDataImage.number = XSDataInteger(iImageNumber)
+            xsDataSubWedge.addImage(xsDataImage)
+        xsDataCollection.addSubWedge(xsDataSubWedge)
+        return xsDataCollection
+
+
+    def testCopy(self):
+        for xsDataObject in [self.getResult(10), self.getDataCollection(10)]:
+            xsDataCopy = xsDataObject.copy()
+            EDAssert.equal(xsDataObject.marshal(), xsDataCopy.marshal(), "Copy of %s" % xsDataObject.__class__.__name__)
+            EDAssert.equal(xsDataObject.__class__, xsDataCopy.__class__, "Class of the copy")
+        # The copy is independent of the original object
+        xsDataResult = self.getResult(2)
+        xsDataCopy = xsDataResult.copy()
+        xsDataCopy.imageQualityIndicators[0].spotTotal.value = 0
+        xsDataCopy.addImageQualityIndicators(self.getImageQualityIndicators(3))
+        EDAssert.equal(401, xsDataResult.imageQualityIndicators[0].spotTotal.value, "Original value not changed")
+        EDAssert.equal(2, len(xsDataResult.imageQualityIndicators), "Original list not changed")
+        xsDataBoolean = XSDataBoolean(True).copy()
+        EDAssert.equal(True, xsDataBoolean.value, "Copy of boolean")
+
+
+    def testConvertFrom(self):
+        EDFactoryPluginStatic.loadModule("XSDataISPyBv1_4")
+        from XSDataISPyBv1_4 import XSDataISPyBImageQualityIndicators
+        xsDataImageQualityIndicators = self.getImageQualityIndicators(7)
+        xsDataISPyBImageQualityIndicators = XSDataISPyBImageQualityIndicators.convertFrom(xsDataImageQualityIndicators)
+        xsDataReference = XSDataISPyBImageQualityIndicators.parseString(xsDataImageQualityIndicators.marshal())
+        EDAssert.equal(XSDataISPyBImageQualityIndicators, xsDataISPyBImageQualityIndicators.__class__, "Converted class")
+        EDAssert.equal(xsDataReference.marshal(), xsDataISPyBImageQualityIndicators.marshal(), "Converted object")
+        EDAssert.equal(1.5e6 * 7, xsDataISPyBImageQualityIndicators.totalIntegratedSignal.value, "Double value")
+
+
+    def testCopyBenchmark(self):
+        """
+        Compares the copy via XML with the structural copy
+        """
+        for xsDataObject in [self.getResult(200), self.getDataCollection(1000)]:
+            strClassName = xsDataObject.__class__.__name__
+            fTimeStart = time.time()
+            for iLoop in range(5):
+                xsDataObject.__class__.parseString(xsDataObject.marshal())
+            fTimeXML = (time.time() - fTimeStart) / 5
+            fTimeStart = time.time()
+            for iLoop in range(5):
+                xsDataObject.copy()
+            fTimeCopy = (time.time() - fTimeStart) / 5
+            self.screen("%s: copy via XML %.4f s, structural copy %.4f s" % (strClassName, fTimeXML, fTimeCopy))
+            EDAssert.lowerThan(fTimeCopy, fTimeXML, "Structural copy of %s is faster" % strClassName)
+
+
+    def process(self):
+        self.addTestMethod(self.testCopy)
+        self.addTestMethod(self.testConvertFrom)
+        self.addTestMethod(self.testCopyBenchmark)
+
+
+
+if __name__ == '__main__':
+
+    edTestCaseXSDataMXv1 = EDTestCaseXSDataMXv1("EDTestCaseXSDataMXv1")
+    edTestCaseXSDataMXv1.execute()
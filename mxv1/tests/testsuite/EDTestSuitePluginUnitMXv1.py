@@ -45,6 +45,8 @@ class EDTestSuitePluginUnitMXv1(EDTestSuite):
         self.addTestCaseFromName("EDTestCaseEDHandlerRaddosev10")
         self.addTestCaseFromName("EDTestCaseEDHandlerBestv1_2")
         self.addTestCaseFromName("EDTestCaseEDHandlerESRFPyarchv1_0")
+        self.addTestCaseFromName("EDTestCaseEDMXCuBENotifier")
+        self.addTestCaseFromName("EDTestCaseXSDataMXv1")
         self.addTestCaseFromName("EDTestCasePluginUnitControlIndexingIndicatorsv10")
         self.addTestSuiteFromName("EDTestSuitePluginUnitControlIndexingv10")
         self.addTestSuiteFromName("EDTestSuitePluginUnitControlIntegrationv10")
@@ -54,6 +56,7 @@ class EDTestSuitePluginUnitMXv1(EDTestSuite):
         self.addTestSuiteFromName("EDTestSuitePluginUnitReadImageHeaderv10")
         self.addTestSuiteFromName("EDTestSuitePluginUnitControlInterfaceToMXCuBEv1_3")
         self.addTestSuiteFromName("EDTestSuitePluginUnitExecEvaluationIndexingv10")
+        self.addTestCaseFromName("EDTestCasePluginUnitControlPyarchThumbnailGeneratorParallelv1_0")
 
 
 if __name__ == '__main__':